@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+POE Macro v3 Client.txt Analysis Script
+過去の Client.txt 全体を集計し、エリア別のプレイ時間・マップ周回数・町/戦闘時間を表示する
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.log_analytics import SessionAnalytics, index_log  # noqa: E402
+
+
+def format_duration(seconds):
+    """秒数を h:mm:ss 形式に変換"""
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def print_report(summary, elapsed, size_mb):
+    """集計結果を表形式で出力"""
+    print(f"Indexed {size_mb:.1f} MB in {elapsed:.2f} s ({size_mb / elapsed if elapsed else 0:.1f} MB/s)")
+    print(f"Since:          {summary['first_timestamp']}")
+    print(f"Active time:    {format_duration(summary['active_seconds'])}"
+          f"  (idle/away {format_duration(summary['idle_seconds'])})")
+    print(f"Combat time:    {format_duration(summary['combat_seconds'])}  ({summary['combat_ratio'] * 100:.1f}%)")
+    print(f"Town time:      {format_duration(summary['town_seconds'])}")
+    print(f"Map runs:       {summary['map_runs']}  ({summary['maps_per_hour']:.1f} per hour)")
+    print(f"Area changes:   {summary['area_changes']}")
+    print(f"Deaths:         {summary['deaths']}  (level ups {summary['level_ups']},"
+          f" disconnects {summary['disconnects']})")
+    print()
+    print(f"{'area':<40}{'time':>12}{'visits':>8}")
+    for entry in summary['top_areas']:
+        print(f"{entry['area'][:39]:<40}{format_duration(entry['seconds']):>12}{entry['visits']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize playtime from a Path of Exile Client.txt")
+    parser.add_argument("log", help="Path to Client.txt")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"Parallel worker processes (this machine has {os.cpu_count()} CPUs)")
+    parser.add_argument("--chunk-mb", type=int, default=64, help="Bytes per worker task in MB")
+    parser.add_argument("--max-segment", type=float, default=3600,
+                        help="Longest stay in one area counted as active play (seconds)")
+    parser.add_argument("--top", type=int, default=20, help="Number of areas to list")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    start = time.perf_counter()
+    analytics = index_log(args.log, workers=args.workers, chunk_size=args.chunk_mb * 1024 * 1024,
+                          analytics=SessionAnalytics(max_segment_seconds=args.max_segment))
+    elapsed = time.perf_counter() - start
+
+    # 最後のエリアの滞在時間は分からないため、最後のエリア変更時刻で集計を締める
+    last_time = analytics.current_since or datetime.now()
+    summary = analytics.get_summary(now=last_time, top=args.top)
+    summary.pop('macro_on_seconds')
+    summary.pop('macro_duty_cycle')
+
+    if args.json:
+        print(json.dumps({**summary, 'index_seconds': elapsed}, indent=2, ensure_ascii=False))
+    else:
+        print_report(summary, elapsed, os.path.getsize(args.log) / 1e6)
+
+
+if __name__ == "__main__":
+    main()
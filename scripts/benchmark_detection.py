@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+POE Macro v3 Detection Benchmark Script
+記録済みフレームを再生してTincture検出のFPS・段階別レイテンシ・判定精度を計測する（画面不要）
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.frame_replay import ReplayFrameProvider  # noqa: E402
+from src.features.image_recognition import TinctureDetector  # noqa: E402
+
+STAGES = ('capture', 'convert', 'match', 'decide')
+
+
+def percentile(values, ratio):
+    """ソート済みでない値リストのパーセンタイルを取得"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))]
+
+
+def build_detector(provider, args):
+    """リプレイフレーム全体を手動検出エリアとする検出器を作成"""
+    monitor = provider.get_monitors()[1]
+    tincture_config = {
+        'detection_mode': 'manual',
+        'detection_area': {'x': monitor['left'], 'y': monitor['top'],
+                           'width': monitor['width'], 'height': monitor['height']},
+        'match_strategy': args.strategy,
+        'roi_tracking': args.roi,
+        'frame_change_gate': args.gate
+    }
+    if args.area:
+        x, y, width, height = args.area
+        tincture_config['detection_area'] = {'x': x, 'y': y, 'width': width, 'height': height}
+
+    detector = TinctureDetector(sensitivity=args.sensitivity, config={'tincture': tincture_config},
+                                template_dir=args.template_dir)
+    detector.frame_provider = provider
+    return detector
+
+
+def run_benchmark(args):
+    """ベンチマークを実行して結果の辞書を返す"""
+    provider = ReplayFrameProvider(args.source)
+    detector = build_detector(provider, args)
+
+    timings = {stage: [] for stage in STAGES}
+    totals = []
+    labelled = 0
+    correct = 0
+    confusion = {}
+
+    for _ in range(args.loops):
+        provider.rewind()
+        while True:
+            start = time.perf_counter()
+            detection = detector.detect_states()
+            totals.append((time.perf_counter() - start) * 1000)
+
+            stage_times = detection.get('timings', {})
+            timings['capture'].append(provider.stats['last_capture_ms'])
+            timings['convert'].append(provider.stats['last_convert_ms'])
+            timings['match'].append(stage_times.get('match_ms', 0.0))
+            timings['decide'].append(stage_times.get('decide_ms', 0.0))
+
+            label = provider.current_label()
+            if label:
+                labelled += 1
+                state = detection['state']
+                if state == label:
+                    correct += 1
+                else:
+                    key = f"{label}->{state}"
+                    confusion[key] = confusion.get(key, 0) + 1
+
+            if not provider.advance():
+                break
+
+    total_ms = sum(totals)
+    return {
+        'source': str(args.source),
+        'frames': len(totals),
+        'fps': len(totals) / (total_ms / 1000) if total_ms else 0.0,
+        'latency_ms': {
+            stage: {
+                'mean': sum(values) / len(values) if values else 0.0,
+                'p50': percentile(values, 0.5),
+                'p95': percentile(values, 0.95)
+            }
+            for stage, values in list(timings.items()) + [('total', totals)]
+        },
+        'accuracy': correct / labelled if labelled else None,
+        'labelled_frames': labelled,
+        'errors': confusion,
+        'detection_stats': detector.get_detection_stats()
+    }
+
+
+def print_report(result):
+    """結果を表形式で出力"""
+    print(f"Source: {result['source']}")
+    print(f"Frames: {result['frames']}  FPS: {result['fps']:.1f}")
+    print(f"{'stage':<10}{'mean':>10}{'p50':>10}{'p95':>10}  (ms)")
+    for stage, values in result['latency_ms'].items():
+        print(f"{stage:<10}{values['mean']:>10.3f}{values['p50']:>10.3f}{values['p95']:>10.3f}")
+    if result['accuracy'] is None:
+        print("Accuracy: n/a (no labels)")
+    else:
+        print(f"Accuracy: {result['accuracy'] * 100:.1f}% ({result['labelled_frames']} labelled frames)")
+        for key, count in sorted(result['errors'].items()):
+            print(f"  {key}: {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tincture detection on recorded frames")
+    parser.add_argument("source", help="Frame directory (with optional labels.csv) or .npz recording")
+    parser.add_argument("--template-dir", help="Tincture template folder (idle/active/cooldown)")
+    parser.add_argument("--sensitivity", type=float, default=0.7, help="Detection sensitivity")
+    parser.add_argument("--strategy", choices=TinctureDetector.MATCH_STRATEGIES, default="full",
+                        help="Template matching strategy")
+    parser.add_argument("--area", type=int, nargs=4, metavar=("X", "Y", "W", "H"),
+                        help="Detection area in screen coordinates (default: whole frame)")
+    parser.add_argument("--roi", action=argparse.BooleanOptionalAction, default=True, help="ROI tracking")
+    parser.add_argument("--gate", action=argparse.BooleanOptionalAction, default=False,
+                        help="Frame change gate")
+    parser.add_argument("--loops", type=int, default=1, help="Number of passes over the recording")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show detector logs")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    result = run_benchmark(args)
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
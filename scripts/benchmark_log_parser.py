@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+POE Macro v3 Log Parser Benchmark Script
+記録済み（または生成した）Client.txt をチャンク単位で解析し、処理速度とイベント数を計測する
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.log_parser import LogLineParser  # noqa: E402
+
+# 以前の LogMonitor と同じ行単位の正規表現（比較用）
+LEGACY_ENTER = re.compile(r'.*You have entered (.+)\.$', re.IGNORECASE)
+LEGACY_EXIT = re.compile(r'.*You have left (.+)\.$', re.IGNORECASE)
+
+SPAM_MESSAGES = [
+    '#Exile: WTB 10 divine for my mirror shard',
+    '$TradeGuy: WTS 6L body armour, pm me',
+    '@From Buyer: Hi, I would like to buy your Tabula Rasa listed for 5 chaos in Settlers',
+    '[SHADER] Delay: ON',
+    '[DOWNLOAD] Waiting on 3 files',
+    'Connecting to instance server at 159.122.142.212:6112',
+    ': Trade accepted.',
+    '%Party: ready?',
+]
+AREAS = ['The Coast', 'Karui Shore', 'Strand Map', 'Kingsmarch', 'Dunes Map', "Lioneye's Watch"]
+
+
+def generate_log(path, size_mb, area_every=2000, seed=0):
+    """チャット・取引・デバッグ出力を中心とした疑似 Client.txt を生成"""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    written = 0
+    uptime = 100000
+    with open(path, 'wb') as f:
+        while written < target:
+            lines = []
+            for i in range(1000):
+                uptime += rng.randint(1, 500)
+                if rng.randrange(area_every) == 0:
+                    message = f": You have entered {rng.choice(AREAS)}."
+                else:
+                    message = rng.choice(SPAM_MESSAGES)
+                lines.append(f"2025/07/05 06:07:24 {uptime} cff945b9 [INFO Client 14940] {message}\n")
+            chunk = ''.join(lines).encode('utf-8')
+            f.write(chunk)
+            written += len(chunk)
+    return Path(path)
+
+
+def iter_chunks(path, chunk_size):
+    """改行で終わるチャンク単位でファイルを読み取り（LogTailer の読み取り単位と同じ）"""
+    remainder = b''
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            data = remainder + data
+            end = data.rfind(b'\n') + 1
+            remainder = data[end:]
+            if end:
+                yield data[:end]
+    if remainder:
+        yield remainder
+
+
+def run_parser(path, chunk_size):
+    """バッチ解析器で全体を解析"""
+    parser = LogLineParser()
+    events = {}
+    start = time.perf_counter()
+    for data in iter_chunks(path, chunk_size):
+        for event in parser.parse_batch(data):
+            events[event.type] = events.get(event.type, 0) + 1
+    return time.perf_counter() - start, events, parser.get_stats()
+
+
+def run_legacy(path, chunk_size):
+    """以前の行単位の正規表現で全体を解析"""
+    events = {}
+    start = time.perf_counter()
+    for data in iter_chunks(path, chunk_size):
+        for line in data.decode('utf-8', errors='ignore').splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if LEGACY_ENTER.search(line):
+                events['area_enter'] = events.get('area_enter', 0) + 1
+            elif LEGACY_EXIT.search(line):
+                events['area_exit'] = events.get('area_exit', 0) + 1
+    return time.perf_counter() - start, events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Client.txt parsing")
+    parser.add_argument("log", nargs="?", help="Recorded Client.txt (omit to generate a synthetic one)")
+    parser.add_argument("--generate-mb", type=float, default=200, help="Size of the synthetic log in MB")
+    parser.add_argument("--chunk-kb", type=int, default=1024, help="Bytes parsed per batch in KB")
+    parser.add_argument("--legacy", action="store_true", help="Also run the previous per-line regex parser")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    if args.log:
+        path = Path(args.log)
+    else:
+        path = Path(tempfile.gettempdir()) / "poe_macro_benchmark_client.txt"
+        generate_log(path, args.generate_mb)
+
+    size_mb = path.stat().st_size / 1e6
+    chunk_size = args.chunk_kb * 1024
+
+    elapsed, events, stats = run_parser(path, chunk_size)
+    result = {
+        'log': str(path),
+        'size_mb': size_mb,
+        'parser': {'seconds': elapsed, 'mb_per_second': size_mb / elapsed if elapsed else 0.0,
+                   'events': events, 'candidates': stats['candidates'], 'malformed': stats['malformed']}
+    }
+    if args.legacy:
+        legacy_elapsed, legacy_events = run_legacy(path, chunk_size)
+        result['legacy'] = {'seconds': legacy_elapsed,
+                            'mb_per_second': size_mb / legacy_elapsed if legacy_elapsed else 0.0,
+                            'events': legacy_events}
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Log: {result['log']} ({size_mb:.1f} MB)")
+    for name in ('parser', 'legacy'):
+        if name in result:
+            entry = result[name]
+            print(f"{name:<8}{entry['seconds']:>8.2f} s{entry['mb_per_second']:>10.1f} MB/s  events: {entry['events']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+設定ストアモジュール
+デフォルト設定とユーザー設定をマージした結果を不変のスナップショットとしてキャッシュし、
+ファイルの更新時刻・サイズが変わった時だけ再読み込みする
+"""
+import os
+import copy
+import itertools
+import threading
+import logging
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Optional, Mapping, Tuple
+
+import yaml
+
+from src.utils.resource_path import get_config_path, get_user_config_path, ensure_directory_exists
+
+logger = logging.getLogger(__name__)
+
+# 読み込みに失敗し、以前のスナップショットも無い場合の設定
+FALLBACK_CONFIG = {
+    'flask': {'enabled': False},
+    'skills': {'enabled': False},
+    'tincture': {'enabled': False}
+}
+
+
+def freeze(value: Any) -> Any:
+    """辞書・リストを再帰的に読み取り専用（MappingProxyType・タプル）に変換"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """freeze() した設定を変更可能な辞書・リストに戻す（深いコピー）"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return copy.deepcopy(value)
+
+
+def merge_config(base: Dict, override: Dict) -> None:
+    """設定を再帰的にマージ"""
+    for key, value in override.items():
+        if key in base and isinstance(base[key], dict) and isinstance(value, dict):
+            merge_config(base[key], value)
+        else:
+            base[key] = value
+
+
+def diff_config(old: Any, new: Any, prefix: str = '') -> List[str]:
+    """
+    2つの設定を比較し、値が変わった項目のパス（'flask_slots.slot_1.key' 形式）を返す
+
+    辞書は項目ごとに再帰的に比較し、それ以外の値（リストを含む）は値全体で比較する
+    """
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        changed = []
+        for key in list(old.keys()) + [key for key in new.keys() if key not in old]:
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if key not in old or key not in new:
+                changed.append(path)
+            else:
+                changed.extend(diff_config(old[key], new[key], path))
+        return changed
+    if old != new:
+        return [prefix]
+    return []
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """ファイルの (更新時刻ns, サイズ)。存在しない場合はNone"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ConfigStore:
+    """
+    プロセス共通の設定ストア
+
+    - snapshot() は不変のスナップショットを返す。ファイルの stat だけで変更を確認し、
+      更新時刻かサイズが変わった場合のみYAMLを解析する
+    - 再読み込みで内容が変わった場合は購読者に (新しいスナップショット, 以前のスナップショット) を通知する
+    - load() は変更して保存する呼び出し元向けに、スナップショットの変更可能なコピーを返す
+    """
+
+    def __init__(self, config_path: Path, user_config_path: Path):
+        """
+        Args:
+            config_path: デフォルト設定ファイル
+            user_config_path: ユーザー設定ファイル（存在する場合はデフォルト設定に上書きマージ）
+        """
+        self.config_path = Path(config_path)
+        self.user_config_path = Path(user_config_path)
+
+        self._lock = threading.RLock()
+        self._snapshot: Optional[Mapping[str, Any]] = None
+        self._signatures: Optional[Tuple] = None
+        self._ids = itertools.count(1)
+        self._subscribers: Dict[int, Callable[[Mapping, Optional[Mapping]], Any]] = {}
+
+        self._watch_stop = threading.Event()
+        self._watch_thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'snapshots': 0,
+            'parses': 0,
+            'changes': 0,
+            'errors': 0
+        }
+
+    def _current_signatures(self) -> Tuple:
+        return _file_signature(self.config_path), _file_signature(self.user_config_path)
+
+    def snapshot(self) -> Mapping[str, Any]:
+        """現在の設定（読み取り専用）。ファイルが変わっていなければ解析しない"""
+        with self._lock:
+            self.stats['snapshots'] += 1
+            signatures = self._current_signatures()
+            if self._snapshot is not None and signatures == self._signatures:
+                return self._snapshot
+            return self._reload(signatures)
+
+    def load(self) -> Dict[str, Any]:
+        """現在の設定の変更可能なコピー"""
+        return thaw(self.snapshot())
+
+    def reload(self) -> Mapping[str, Any]:
+        """ファイルの状態に関わらず再読み込み"""
+        with self._lock:
+            return self._reload(self._current_signatures())
+
+    def _reload(self, signatures: Tuple) -> Mapping[str, Any]:
+        """設定ファイルを解析してスナップショットを更新（ロック保持中に呼ぶ）"""
+        previous = self._snapshot
+        try:
+            config = self._parse()
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Failed to load config: {e}")
+            if previous is not None:
+                # 書き込み途中などで解析できない場合は直前の設定を使い続け、次回の呼び出しで再試行
+                return previous
+            logger.warning(f"Using fallback config: {FALLBACK_CONFIG}")
+            config = copy.deepcopy(FALLBACK_CONFIG)
+            signatures = None
+
+        self._signatures = signatures
+        snapshot = freeze(config)
+        if previous is not None and snapshot == previous:
+            return previous
+
+        self._snapshot = snapshot
+        if previous is not None:
+            self.stats['changes'] += 1
+            logger.info("Config files changed - snapshot reloaded")
+            self._notify(snapshot, previous)
+        return snapshot
+
+    def _parse(self) -> Dict[str, Any]:
+        """デフォルト設定とユーザー設定を解析してマージ"""
+        self.stats['parses'] += 1
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+        if not isinstance(config, dict):
+            raise ValueError(f"Config is not a dictionary: {type(config)}")
+        logger.info(f"Loaded default config from {self.config_path}")
+
+        if self.user_config_path.exists():
+            with open(self.user_config_path, 'r', encoding='utf-8') as f:
+                user_config = yaml.safe_load(f)
+            if isinstance(user_config, dict):
+                merge_config(config, user_config)
+                logger.info(f"Loaded user config from {self.user_config_path}")
+            elif user_config is not None:
+                logger.warning(f"User config is not a dictionary, skipping: {type(user_config)}")
+        return config
+
+    def save_user_config(self, config: Dict[str, Any]) -> None:
+        """設定をユーザー設定ファイルに保存し、スナップショットを更新"""
+        with self._lock:
+            ensure_directory_exists(self.user_config_path)
+            with open(self.user_config_path, 'w', encoding='utf-8') as f:
+                yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+            logger.info(f"Saved user config to {self.user_config_path}")
+            self._reload(self._current_signatures())
+
+    def subscribe(self, callback: Callable[[Mapping, Optional[Mapping]], Any]) -> int:
+        """
+        設定変更の通知を登録
+
+        Args:
+            callback: (新しいスナップショット, 以前のスナップショット) を受け取る関数
+
+        Returns:
+            購読ID（unsubscribe() に使用）
+        """
+        with self._lock:
+            subscription_id = next(self._ids)
+            self._subscribers[subscription_id] = callback
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: int) -> bool:
+        """通知の登録を解除"""
+        with self._lock:
+            return self._subscribers.pop(subscription_id, None) is not None
+
+    def _notify(self, snapshot: Mapping, previous: Optional[Mapping]) -> None:
+        """購読者に変更を通知"""
+        for callback in list(self._subscribers.values()):
+            try:
+                callback(snapshot, previous)
+            except Exception as e:
+                logger.error(f"Error in config subscriber: {e}")
+                import traceback
+                logger.error(f"Traceback: {traceback.format_exc()}")
+
+    def start_watcher(self, interval: float = 1.0) -> None:
+        """バックグラウンドでファイルの変更を確認し、変更があれば購読者に通知"""
+        if self._watch_thread and self._watch_thread.is_alive():
+            return
+        self._watch_stop.clear()
+
+        def watch():
+            while not self._watch_stop.wait(interval):
+                try:
+                    self.snapshot()
+                except Exception as e:
+                    logger.error(f"Error in config watcher: {e}")
+
+        self._watch_thread = threading.Thread(target=watch, name="ConfigWatcher", daemon=True)
+        self._watch_thread.start()
+        logger.debug(f"Config watcher started (interval: {interval}s)")
+
+    def stop_watcher(self) -> None:
+        """バックグラウンド監視を停止"""
+        self._watch_stop.set()
+        if self._watch_thread and self._watch_thread is not threading.current_thread():
+            self._watch_thread.join(timeout=1.0)
+        self._watch_thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        return {
+            **self.stats,
+            'subscribers': len(self._subscribers),
+            'watching': bool(self._watch_thread and self._watch_thread.is_alive())
+        }
+
+
+_config_stores: Dict[Tuple[str, str], ConfigStore] = {}
+_config_stores_lock = threading.Lock()
+
+
+def get_config_store(config_path: str = "default_config.yaml",
+                     user_config_path: Optional[str] = None) -> ConfigStore:
+    """
+    プロセス共通のConfigStoreを取得（同じファイルの組み合わせには同じストアを返す）
+
+    Args:
+        config_path: デフォルト設定ファイル名（configフォルダ内）
+        user_config_path: ユーザー設定ファイルのパス（Noneの場合はユーザー設定フォルダの user_config.yaml）
+    """
+    resolved = Path(get_config_path(config_path)).resolve()
+    user_resolved = Path(user_config_path or get_user_config_path("user_config.yaml")).resolve()
+    key = (str(resolved), str(user_resolved))
+    with _config_stores_lock:
+        store = _config_stores.get(key)
+        if store is None:
+            store = _config_stores[key] = ConfigStore(resolved, user_resolved)
+        return store
@@ -1,24 +1,22 @@
 """
 マクロ統合制御モジュール
 """
+import copy
 import logging
 import threading
 from typing import Dict, Any, Optional
 
-# pynputの条件付きインポート
-try:
-    import pynput
-    PYNPUT_AVAILABLE = True
-except ImportError:
-    PYNPUT_AVAILABLE = False
-    pynput = None
-
 from src.modules.flask_module import FlaskModule
 from src.modules.skill_module import SkillModule
 from src.modules.tincture_module import TinctureModule
 from src.modules.log_monitor import LogMonitor
+from src.utils.log_parser import EVENT_SLAIN, EVENT_DISCONNECT
 from src.core.config_manager import ConfigManager
+from src.core.config_store import diff_config, thaw
 from src.utils.window_manager import WindowManager
+from src.utils.window_geometry import get_window_geometry
+from src.utils.input_dispatcher import PRIORITY_HIGH
+from src.utils.input_hub import get_input_hub
 
 logger = logging.getLogger(__name__)
 
@@ -51,14 +49,25 @@ class MacroController:
             skills_config = {'enabled': False}
         logger.debug(f"Skills config for init: {skills_config}")
         
-        tincture_config = self.config.get('tincture', {})
+        tincture_config = self._convert_tincture_config()
         if not isinstance(tincture_config, dict):
             logger.warning(f"Tincture config is not dict: {type(tincture_config)}, using fallback")
             tincture_config = {'enabled': False}
         logger.debug(f"Tincture config for init: {tincture_config}")
         
+        # 各モジュールに反映済みの設定（update_config() で変更箇所を求めるための複製）
+        self._applied_configs = {
+            'flask': copy.deepcopy(flask_config),
+            'skills': copy.deepcopy(skills_config),
+            'tincture': copy.deepcopy(tincture_config)
+        }
+        
         # ウィンドウマネージャー
-        self.window_manager = WindowManager()
+        self.window_manager = WindowManager(
+            process_watch_interval=self.config.get('general', {}).get('process_watch_interval', 0)
+        )
+        # 検出エリアの基準となるクライアント領域はこのWindowManagerから取得
+        get_window_geometry().set_rect_provider(self.window_manager.get_poe_client_rect)
         
         # モジュールの初期化（エラー処理付き、window_manager付き）
         try:
@@ -92,10 +101,12 @@ class MacroController:
             raise
         
         # LogMonitorの初期化
+        self._log_subscriptions = []  # ログイベントバスの購読ID
         try:
             logger.debug("Initializing LogMonitor...")
             log_monitor_config = self.config.get('log_monitor', {})
             self.log_monitor = LogMonitor(log_monitor_config, macro_controller=self, full_config=self.config)
+            self._subscribe_log_events(log_monitor_config)
             logger.debug("LogMonitor initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize LogMonitor: {e}")
@@ -111,11 +122,10 @@ class MacroController:
         self.grace_period_active = False  # Grace Period活性状態
         self.grace_period_enabled = self.config.get('grace_period', {}).get('enabled', True)
         
-        # グローバルホットキーリスナー
-        self.hotkey_listener = None
-        self.toggle_listener = None  # F12トグル用リスナー
-        self.alt_toggle_listener = None  # 代替トグル用リスナー
-        self.input_listener = None  # Grace Period入力検知用リスナー
+        # グローバル入力フック（プロセス共通の1組のフックにハンドラーを登録する）
+        self.input_hub = get_input_hub()
+        self._hotkey_bindings = []  # ホットキーの登録ID
+        self._grace_input_bindings = []  # Grace Period入力検知の登録ID
         
         # MainWindowとの同期用コールバック
         self.status_changed_callback = None
@@ -126,9 +136,12 @@ class MacroController:
         # グローバルホットキーを設定（初期化時に設定）
         self._setup_global_hotkeys()
         
-        # リスナー監視タイマー
-        self._listener_check_timer = None
-        self._start_listener_monitor()
+        # 設定ファイルの変更（外部エディタでの編集を含む）をモジュールに反映
+        self.config_store = config_manager.store
+        self._config_subscription = self.config_store.subscribe(self._on_config_changed)
+        config_watch_interval = self.config.get('general', {}).get('config_watch_interval', 0)
+        if config_watch_interval and config_watch_interval > 0:
+            self.config_store.start_watcher(config_watch_interval)
         
         logger.info("MacroController initialized successfully")
         
@@ -144,9 +157,11 @@ class MacroController:
             logger.warning("MacroController already running")
             return False
         
-        # 緊急停止ホットキーの設定（初回のみ）
-        if self.hotkey_listener is None or self.toggle_listener is None:
+        # 緊急停止ホットキーの設定（初回のみ）。停止したフックはここで作り直す
+        if not self._hotkey_bindings:
             self._setup_global_hotkeys()
+        else:
+            self.input_hub.ensure_running()
         
         # Grace Period中は強制指定がない限り開始を拒否
         if self.grace_period_active and not force:
@@ -188,7 +203,7 @@ class MacroController:
                 # 各設定値を取得
                 flask_raw = self._convert_flask_config()
                 skills_raw = self.config.get('skills', {})
-                tincture_raw = self.config.get('tincture', {})
+                tincture_raw = self._convert_tincture_config()
                 
                 # デバッグ：設定値を確認
                 logger.debug(f"MacroController start - skills_raw: {skills_raw}")
@@ -335,13 +350,8 @@ class MacroController:
                 except Exception as e:
                     logger.error(f"Error stopping LogMonitor: {e}")
             
-            # Grace Period関連リスナーのみ停止
-            if self.input_listener:
-                self.input_listener.stop()
-                self.input_listener = None
-            if hasattr(self, 'mouse_listener') and self.mouse_listener:
-                self.mouse_listener.stop()
-                self.mouse_listener = None
+            # Grace Period入力検知の登録のみ解除
+            self._clear_grace_input_bindings()
             
             # 待機状態をリセット
             self.waiting_for_input = False
@@ -368,6 +378,40 @@ class MacroController:
             logger.info("Toggling macro ON - FAST")
             self.start()
     
+    def _subscribe_log_events(self, log_monitor_config: Dict[str, Any]):
+        """ログイベントバスに死亡・切断時の停止処理を登録（登録済みの購読は置き換える）"""
+        self._unsubscribe_log_events()
+        bus = self.log_monitor.event_bus
+        
+        if log_monitor_config.get('stop_on_death', False):
+            # キャラクター名が設定されている場合は自キャラクターの死亡のみ
+            character_name = log_monitor_config.get('character_name', '')
+            self._log_subscriptions.append(bus.subscribe(
+                self._on_log_stop_event, (EVENT_SLAIN,),
+                predicate=(lambda event: event.payload.get('character') == character_name) if character_name else None,
+                name='MacroController.stop_on_death'
+            ))
+        
+        if log_monitor_config.get('stop_on_disconnect', False):
+            self._log_subscriptions.append(bus.subscribe(
+                self._on_log_stop_event, (EVENT_DISCONNECT,), name='MacroController.stop_on_disconnect'
+            ))
+        
+        self._applied_configs['log_monitor'] = copy.deepcopy(log_monitor_config)
+    
+    def _unsubscribe_log_events(self):
+        """ログイベントバスの購読を解除（バスはプロセス共通のため、破棄・再登録の前に必ず解除する）"""
+        if self.log_monitor:
+            for subscription_id in self._log_subscriptions:
+                self.log_monitor.event_bus.unsubscribe(subscription_id)
+        self._log_subscriptions = []
+    
+    def _on_log_stop_event(self, event):
+        """死亡・切断イベントでマクロを停止"""
+        if self.running:
+            logger.info(f"Stopping macro on log event: {event.type} {event.payload}")
+            self.stop()
+    
     def set_status_changed_callback(self, callback):
         """MainWindowとの同期用コールバックを設定"""
         self.status_changed_callback = callback
@@ -378,6 +422,13 @@ class MacroController:
     
     def _notify_status_changed(self):
         """ステータス変更をMainWindowに通知"""
+        # セッション分析にマクロのON/OFFを記録
+        if self.log_monitor:
+            try:
+                self.log_monitor.on_macro_state_changed(self.running)
+            except Exception as e:
+                logger.error(f"Error recording macro state: {e}")
+        
         if self.status_changed_callback:
             try:
                 self.status_changed_callback(self.running)
@@ -413,23 +464,64 @@ class MacroController:
         
         self.config = config
         
-        # 各モジュールの設定更新（安全な取得）
-        flask_config = self._convert_flask_config()
-        self.flask_module.update_config(flask_config)
+        # 反映済みの設定と比較し、変更のあったモジュールにだけ反映（変更のないタイマーは止めない）
+        changed = {}
+        sections = [
+            ('flask', self.flask_module, self._convert_flask_config()),
+            ('skills', self.skill_module, config.get('skills', {})),
+            ('tincture', self.tincture_module, self._convert_tincture_config())
+        ]
+        for section, module, section_config in sections:
+            if not isinstance(section_config, dict):
+                logger.warning(f"{section} config is not dict in update_config: {type(section_config)}")
+                continue
+            # GUIからモジュールへ直接一時適用された設定も戻せるよう、モジュールの現在の設定とも比較
+            paths = (diff_config(self._applied_configs.get(section), section_config)
+                     or diff_config(module.config, section_config))
+            if not paths:
+                continue
+            module.update_config(section_config)
+            self._applied_configs[section] = copy.deepcopy(section_config)
+            changed[section] = paths
+        
+        # ログ監視設定（死亡・切断時の停止条件など）が変わった場合は反映して購読し直す
+        log_monitor_config = config.get('log_monitor', {})
+        if self.log_monitor and isinstance(log_monitor_config, dict):
+            paths = diff_config(self._applied_configs.get('log_monitor'), log_monitor_config)
+            if paths:
+                self.log_monitor.update_config(log_monitor_config)
+                self._subscribe_log_events(log_monitor_config)
+                changed['log_monitor'] = paths
+        
+        logger.info(f"Configuration updated (changed: {changed or 'none'})")
+    
+    def _on_config_changed(self, snapshot, previous):
+        """設定ファイルの変更通知（ConfigStoreの変更確認スレッド、または保存した呼び出し元から呼ばれる）"""
+        logger.info("Config files changed - applying to modules")
+        self.update_config(thaw(snapshot))
+    
+    def update_tincture_config(self, tincture_config: Dict[str, Any], temporary: bool = False):
+        """
+        Tincture設定のみを更新（Tinctureスロット情報を付加してモジュールに反映）
         
-        skills_config = config.get('skills', {})
-        if isinstance(skills_config, dict):
-            self.skill_module.update_config(skills_config)
-        else:
-            logger.warning(f"Skills config is not dict in update_config: {type(skills_config)}")
+        Args:
+            tincture_config: 上書きするTincture設定
+            temporary: Trueの場合はモジュールにだけ反映し、保持している設定は変更しない
+                       （次回の update_config() で元に戻る）
+        """
+        if not isinstance(tincture_config, dict):
+            logger.warning(f"Tincture config is not dict in update_tincture_config: {type(tincture_config)}")
+            return
         
-        tincture_config = config.get('tincture', {})
-        if isinstance(tincture_config, dict):
-            self.tincture_module.update_config(tincture_config)
-        else:
-            logger.warning(f"Tincture config is not dict in update_config: {type(tincture_config)}")
+        merged = {**self.config.get('tincture', {}), **tincture_config}
+        if temporary:
+            self.tincture_module.update_config(self._convert_tincture_config(merged))
+            return
         
-        logger.info("Configuration updated")
+        self.config['tincture'] = merged
+        converted = self._convert_tincture_config()
+        self.tincture_module.update_config(converted)
+        self._applied_configs['tincture'] = copy.deepcopy(converted)
     
     def get_status(self) -> Dict[str, Any]:
         """全モジュールのステータスを取得"""
@@ -450,7 +542,7 @@ class MacroController:
                 'flask': self.flask_module.get_status(),
                 'skill': {
                     'running': self.skill_module.running,
-                    'threads': len(self.skill_module.threads),
+                    'threads': len(self.skill_module.jobs),
                     'stats': self.skill_module.get_stats()
                 },
                 'tincture': {
@@ -471,250 +563,73 @@ class MacroController:
     
     def _setup_global_hotkeys(self):
         """ホットキーを設定（緊急停止: Ctrl+Shift+F12, トグル: F12/F11/Pause）"""
-        # 既存のリスナーを停止
-        if self.hotkey_listener:
-            self.hotkey_listener.stop()
-            self.hotkey_listener = None
-        if self.toggle_listener:
-            self.toggle_listener.stop()
-            self.toggle_listener = None
-        if self.alt_toggle_listener:
-            self.alt_toggle_listener.stop()
-            self.alt_toggle_listener = None
-        
-        # Ctrl+Shift+F12 緊急停止用
-        def on_press_emergency(key):
-            try:
-                # 現在押されているキーを追跡
-                current_keys = getattr(on_press_emergency, 'current_keys', set())
-                
-                if hasattr(key, 'char'):
-                    current_keys.add(key)
-                elif hasattr(key, 'name'):
-                    current_keys.add(key)
-                
-                # Ctrl+Shift+F12の検出
-                ctrl_pressed = any(k in current_keys for k in [pynput.keyboard.Key.ctrl_l, pynput.keyboard.Key.ctrl_r])
-                shift_pressed = any(k in current_keys for k in [pynput.keyboard.Key.shift_l, pynput.keyboard.Key.shift_r])
-                
-                if ctrl_pressed and shift_pressed and key == pynput.keyboard.Key.f12:
-                    logger.warning("Emergency stop triggered (Ctrl+Shift+F12)")
-                    self.emergency_stop = True
-                    self.stop()
-                    # プログラムを終了
-                    import sys
-                    sys.exit(0)
-                
-                on_press_emergency.current_keys = current_keys
-                
-            except Exception as e:
-                logger.error(f"Error in emergency stop handler: {e}")
-        
-        def on_release_emergency(key):
-            try:
-                current_keys = getattr(on_press_emergency, 'current_keys', set())
-                current_keys.discard(key)
-                on_press_emergency.current_keys = current_keys
-            except Exception as e:
-                logger.error(f"Error in key release handler: {e}")
-        
-        # F12トグル機能（リスナー継続版）
-        def on_press_toggle(key):
-            try:
-                # デバッグログ: 検知したキーを記録
-                if hasattr(key, 'name'):
-                    key_name = key.name
-                elif hasattr(key, 'char'):
-                    key_name = f"'{key.char}'"
-                else:
-                    key_name = str(key)
-                
-                logger.debug(f"Key detected: {key_name}")
-                
-                # F12キーのみでトグル（シンプル化）
-                if key == pynput.keyboard.Key.f12:
-                    if self.running:
-                        logger.info(f"Macro stopped by F12")
-                        self.stop()
-                        # オーバーレイ更新確認
-                        if self.status_overlay:
-                            logger.debug("F12: Status overlay updated to OFF")
-                    else:
-                        logger.info(f"Macro started by F12")
-                        self.start()
-                        # オーバーレイ更新確認
-                        if self.status_overlay:
-                            logger.debug("F12: Status overlay updated to ON")
-                    # return False を削除 - リスナーを継続させる
-                
-            except Exception as e:
-                logger.error(f"Error in toggle handler: {e}")
-        
-        # 代替キー検知（F11/Pauseなど）
-        def on_press_alt_toggle(key):
-            """代替のキー検知方法（F11/Pause用）"""
-            try:
-                # F11とPauseキーのトグル機能
-                if key == pynput.keyboard.Key.f11 or key == pynput.keyboard.Key.pause:
-                    key_name = key.name if hasattr(key, 'name') else str(key)
-                    if self.running:
-                        logger.info(f"Macro stopped by {key_name}")
-                        self.stop()
-                    else:
-                        logger.info(f"Macro started by {key_name}")
-                        self.start()
-                    # return文なし - リスナーを継続させる
-                
-                # raw値による検知（仮想キー対応）
-                elif hasattr(key, 'vk'):
-                    # F11のVKコード: 122, PauseのVKコード: 19
-                    if key.vk in [122, 19]:  # F11, Pause
-                        key_names = {122: 'F11', 19: 'Pause'}
-                        key_name = key_names.get(key.vk, f'VK{key.vk}')
-                        if self.running:
-                            logger.info(f"Macro stopped by {key_name}")
-                            self.stop()
-                        else:
-                            logger.info(f"Macro started by {key_name}")
-                            self.start()
-                            
-            except Exception as e:
-                logger.error(f"Error in alternative toggle handler: {e}")
-        
-        # 緊急停止リスナー（suppress=False で仮想キーも検知）
-        self.hotkey_listener = pynput.keyboard.Listener(
-            on_press=on_press_emergency,
-            on_release=on_release_emergency,
-            suppress=False  # 仮想キー入力も検知
-        )
-        self.hotkey_listener.daemon = True
-        self.hotkey_listener.start()
-        
-        # メイントグルリスナー（suppress=False で仮想キーも検知）
-        self.toggle_listener = pynput.keyboard.Listener(
-            on_press=on_press_toggle,
-            suppress=False  # 仮想キー入力も検知
-        )
-        self.toggle_listener.daemon = True
-        self.toggle_listener.start()
-        
-        # 代替トグルリスナー（より低レベルな検知）
-        try:
-            self.alt_toggle_listener = pynput.keyboard.Listener(
-                on_press=on_press_alt_toggle,
-                suppress=False,
-                win32_event_filter=lambda msg, data: True  # Windowsイベントフィルターを無効化
-            )
-            self.alt_toggle_listener.daemon = True
-            self.alt_toggle_listener.start()
-            logger.info("Alternative toggle listener started")
-        except Exception as e:
-            logger.warning(f"Alternative toggle listener failed to start: {e}")
-        
+        # 既存の登録を解除
+        self.input_hub.unregister_all(self._hotkey_bindings)
+        self._hotkey_bindings = [
+            # Ctrl+Shift+F12 緊急停止（修飾キー付きの登録が優先され、F12トグルは呼ばれない）
+            self.input_hub.register_key('f12', self._on_emergency_hotkey, modifiers=('ctrl', 'shift'),
+                                        label='emergency_stop'),
+            self.input_hub.register_key('f12', self._on_toggle_hotkey, label='toggle'),
+            # 代替トグル（F11/Pause。名前を持たない仮想キーもキー名に変換済み）
+            self.input_hub.register_key('f11', self._on_toggle_hotkey, label='toggle'),
+            self.input_hub.register_key('pause', self._on_toggle_hotkey, label='toggle'),
+        ]
         logger.info("Hotkeys registered - Toggle: F12/F11/Pause, Emergency stop: Ctrl+Shift+F12")
     
-    def _start_listener_monitor(self):
-        """リスナーの健全性を監視し、必要に応じて再起動"""
-        def check_listeners():
-            try:
-                # リスナーの状態をチェック
-                listeners_ok = True
-                
-                if self.toggle_listener and not self.toggle_listener.running:
-                    logger.warning("Toggle listener has stopped, restarting...")
-                    listeners_ok = False
-                
-                if self.alt_toggle_listener and not self.alt_toggle_listener.running:
-                    logger.warning("Alternative toggle listener has stopped, restarting...")
-                    listeners_ok = False
-                
-                if self.hotkey_listener and not self.hotkey_listener.running:
-                    logger.warning("Hotkey listener has stopped, restarting...")
-                    listeners_ok = False
-                
-                # リスナーが停止している場合は再起動
-                if not listeners_ok:
-                    logger.info("Restarting stopped listeners...")
-                    self._setup_global_hotkeys()
-                
-                # 次回チェックをスケジュール（10秒後）
-                if not self.emergency_stop:
-                    self._listener_check_timer = threading.Timer(10.0, check_listeners)
-                    self._listener_check_timer.daemon = True
-                    self._listener_check_timer.start()
-                    
-            except Exception as e:
-                logger.error(f"Error in listener monitor: {e}")
-                # エラーが発生してもチェックを継続
-                if not self.emergency_stop:
-                    self._listener_check_timer = threading.Timer(10.0, check_listeners)
-                    self._listener_check_timer.daemon = True
-                    self._listener_check_timer.start()
-        
-        # 初回チェックを10秒後に開始
-        self._listener_check_timer = threading.Timer(10.0, check_listeners)
-        self._listener_check_timer.daemon = True
-        self._listener_check_timer.start()
-        logger.debug("Listener monitor started")
+    def _on_emergency_hotkey(self, key_name: str):
+        """Ctrl+Shift+F12: 緊急停止してプログラムを終了"""
+        logger.warning("Emergency stop triggered (Ctrl+Shift+F12)")
+        self.emergency_stop = True
+        self.stop()
+        # プログラムを終了
+        import sys
+        sys.exit(0)
+    
+    def _on_toggle_hotkey(self, key_name: str):
+        """F12/F11/Pause: マクロのON/OFFを切り替え"""
+        if self.running:
+            logger.info(f"Macro stopped by {key_name.upper()}")
+            self.stop()
+        else:
+            logger.info(f"Macro started by {key_name.upper()}")
+            self.start()
     
     def _setup_input_listener(self):
-        """Grace Period入力検知リスナーを設定"""
-        if self.input_listener:
-            self.input_listener.stop()
-            self.input_listener = None
+        """Grace Period入力検知を登録（左・右・中央クリックまたはQキー）"""
+        self._clear_grace_input_bindings()
         
         logger.info("Setting up Grace Period input listener...")
         self.grace_period_active = True
         
-        def on_click(x, y, button, pressed):
-            """マウスクリック検知"""
-            if not pressed or not self.waiting_for_input:
-                return
-            
-            # 左、右、中央クリックを検知
-            if button in [pynput.mouse.Button.left, pynput.mouse.Button.right, pynput.mouse.Button.middle]:
-                logger.info(f"Grace Period ended by {button.name} click")
-                self._end_grace_period()
-                # return Falseを削除 - リスナーは_end_grace_period()で管理
-        
-        def on_press(key):
-            """キーボード入力検知"""
-            if not self.waiting_for_input:
-                return
-            
-            # Qキーを検知
-            try:
-                if hasattr(key, 'char') and key.char and key.char.lower() == 'q':
-                    logger.info("Grace Period ended by Q key")
-                    self._end_grace_period()
-                    # return Falseを削除 - リスナーは_end_grace_period()で管理
-            except Exception as e:
-                logger.error(f"Error in key detection: {e}")
-        
-        # マウスリスナー
-        self.mouse_listener = pynput.mouse.Listener(on_click=on_click)
-        self.mouse_listener.daemon = True
-        self.mouse_listener.start()
-        
-        # キーボードリスナー
-        self.input_listener = pynput.keyboard.Listener(on_press=on_press)
-        self.input_listener.daemon = True
-        self.input_listener.start()
+        self._grace_input_bindings = [
+            self.input_hub.register_button(button, self._on_grace_input, label='grace_period')
+            for button in ('left', 'right', 'middle')
+        ]
+        self._grace_input_bindings.append(
+            self.input_hub.register_key('q', self._on_grace_input, label='grace_period')
+        )
         
         logger.info("Grace Period input listener started - waiting for left/right/middle click or Q key")
     
+    def _on_grace_input(self, input_name: str):
+        """Grace Period中の入力検知"""
+        if not self.waiting_for_input:
+            return
+        logger.info(f"Grace Period ended by {input_name} input")
+        self._end_grace_period()
+    
+    def _clear_grace_input_bindings(self):
+        """Grace Period入力検知の登録を解除（フックは停止しない）"""
+        self.input_hub.unregister_all(self._grace_input_bindings)
+        self._grace_input_bindings = []
+    
     def _end_grace_period(self):
         """Grace Period待機を終了して通常のマクロ開始"""
         self.waiting_for_input = False
         self.grace_period_active = False
         
-        # 入力リスナーを停止
-        if hasattr(self, 'mouse_listener') and self.mouse_listener:
-            self.mouse_listener.stop()
-            self.mouse_listener = None
-        if self.input_listener:
-            self.input_listener.stop()
-            self.input_listener = None
+        # 入力検知の登録を解除
+        self._clear_grace_input_bindings()
         
         # 通常のマクロ開始
         logger.info("Grace Period ended, starting macro normally")
@@ -742,7 +657,7 @@ class MacroController:
                 if isinstance(slot_config, dict):
                     key = slot_config.get('key')
                     if key:
-                        self.flask_module.keyboard.press_key(key)
+                        self._press_manual_key(key)
                         logger.info(f"Manual flask use (old format): {slot} -> {key}")
                     else:
                         logger.warning(f"No key configured for flask slot: {slot}")
@@ -762,7 +677,7 @@ class MacroController:
                 
                 key = slot_config.get('key')
                 if key:
-                    self.flask_module.keyboard.press_key(key)
+                    self._press_manual_key(key)
                     logger.info(f"Manual flask use: {slot} -> {key}")
                 else:
                     logger.warning(f"No key configured for flask slot: {slot}")
@@ -774,6 +689,11 @@ class MacroController:
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
     
+    def _press_manual_key(self, key: str):
+        """手動操作のキー押下を入力ディスパッチャーに最優先で要求（GUIスレッドを待たせない）"""
+        self.flask_module.dispatcher.submit(key, PRIORITY_HIGH, source='manual',
+                                            press=self.flask_module.keyboard.press_key)
+    
     def manual_skill_use(self, skill_name: str):
         """手動でスキルを使用"""
         self.skill_module.manual_use(skill_name)
@@ -812,20 +732,23 @@ class MacroController:
             return False
     
     def restart_hotkey_listeners(self):
-        """ホットキーリスナーを手動で再起動"""
+        """ホットキーを手動で再登録（停止したフックは作り直す）"""
         logger.info("Manually restarting hotkey listeners...")
         self._setup_global_hotkeys()
+        self.input_hub.ensure_running()
         logger.info("Hotkey listeners restarted")
     
     def get_listener_status(self) -> dict:
-        """リスナーの状態を取得"""
-        return {
-            'hotkey_listener': self.hotkey_listener.running if self.hotkey_listener else False,
-            'toggle_listener': self.toggle_listener.running if self.toggle_listener else False,
-            'alt_toggle_listener': self.alt_toggle_listener.running if self.alt_toggle_listener else False,
-            'input_listener': self.input_listener.running if self.input_listener else False,
-            'mouse_listener': self.mouse_listener.running if hasattr(self, 'mouse_listener') and self.mouse_listener else False
+        """入力フックの状態を取得（全てTrueなら正常）"""
+        status = self.input_hub.get_status()
+        listener_status = {
+            'keyboard_hook': status['keyboard_hook'],
+            'hotkeys_registered': bool(self._hotkey_bindings)
         }
+        # マウスフックはGrace Period入力検知の登録中のみ対象
+        if self._grace_input_bindings:
+            listener_status['mouse_hook'] = status['mouse_hook']
+        return listener_status
     
     def __enter__(self):
         """コンテキストマネージャーとして使用"""
@@ -836,25 +759,23 @@ class MacroController:
         """完全にシャットダウン（ホットキーリスナーも含む）"""
         self.stop()
         
-        # ホットキーリスナーの停止
-        if self.hotkey_listener:
-            self.hotkey_listener.stop()
-            self.hotkey_listener = None
-            logger.info("Hotkey listener stopped")
-        if self.toggle_listener:
-            self.toggle_listener.stop()
-            self.toggle_listener = None
-            logger.info("Toggle listener stopped")
-        if self.alt_toggle_listener:
-            self.alt_toggle_listener.stop()
-            self.alt_toggle_listener = None
-            logger.info("Alt toggle listener stopped")
-        
-        # リスナー監視タイマーの停止
-        if self._listener_check_timer:
-            self._listener_check_timer.cancel()
-            self._listener_check_timer = None
-            logger.info("Listener monitor stopped")
+        # ホットキー・入力検知の登録を解除（フック自体はプロセス共通のため停止しない）
+        self.input_hub.unregister_all(self._hotkey_bindings)
+        self._hotkey_bindings = []
+        self._clear_grace_input_bindings()
+        logger.info("Hotkey bindings removed")
+        
+        # 設定変更の通知を解除し、変更確認スレッドを停止
+        self.config_store.unsubscribe(self._config_subscription)
+        self.config_store.stop_watcher()
+        
+        # ログイベントの購読を解除（バスはプロセス共通のため、残すと再作成時に重複する）
+        self._unsubscribe_log_events()
+        if self.log_monitor:
+            self.log_monitor.stop()
+        
+        # プロセス監視の停止
+        self.window_manager.close()
         
         logger.info("MacroController completely shut down")
     
@@ -862,6 +783,7 @@ class MacroController:
         """新しい設定形式に変換"""
         flask_config = {
             'enabled': self.config.get('flask', {}).get('enabled', False),
+            'burst_window_ms': self.config.get('flask', {}).get('burst_window_ms', 200),
             'flask_slots': {}
         }
         
@@ -886,6 +808,51 @@ class MacroController:
         flask_config['flask_slots'] = flask_slots
         return flask_config
     
+    def _convert_tincture_config(self, tincture_config: Optional[Dict[str, Any]] = None):
+        """
+        Tincture設定にFlask&Tinctureタブのスロット情報（slots）を追加
+        
+        Args:
+            tincture_config: 変換するTincture設定（Noneの場合は保持している設定）
+        """
+        if tincture_config is None:
+            tincture_config = self.config.get('tincture', {})
+        if not isinstance(tincture_config, dict):
+            return tincture_config
+        
+        tincture_config = dict(tincture_config)
+        tinctures = tincture_config.get('tinctures') or {}
+        flask_slots = self.config.get('flask_slots') or {}
+        
+        # Tinctureにチェックされたスロットをスロット番号順に tincture1, tincture2 へ割り当て
+        tincture_slot_keys = sorted(
+            (slot_key for slot_key, slot in flask_slots.items()
+             if isinstance(slot, dict) and slot.get('is_tincture', False)),
+            key=lambda slot_key: int(slot_key.rsplit('_', 1)[-1]) if slot_key.rsplit('_', 1)[-1].isdigit() else 0
+        )
+        max_tinctures = 2 if tincture_config.get('experienced_herbalist', False) else 1
+        
+        slots = {}
+        for index, slot_key in enumerate(tincture_slot_keys[:max_tinctures], start=1):
+            name = f'tincture{index}'
+            tincture_settings = tinctures.get(name) or {}
+            slot = {
+                'flask_slot': slot_key,
+                'key': flask_slots[slot_key].get('key') or tincture_config.get('key', '3')
+            }
+            folder_path = tincture_settings.get('folder_path')
+            if folder_path and folder_path != '未選択':
+                slot['folder_path'] = folder_path
+            if 'threshold' in tincture_settings:
+                slot['threshold'] = tincture_settings['threshold']
+            if 'min_use_interval' in tincture_settings:
+                slot['min_use_interval'] = tincture_settings['min_use_interval']
+            slots[name] = slot
+        
+        if slots:
+            tincture_config['slots'] = slots
+        return tincture_config
+    
     def __exit__(self, exc_type, exc_val, exc_tb):
         """コンテキストマネージャーとして使用"""
         self.shutdown()
\ No newline at end of file
@@ -9,6 +9,8 @@ import logging
 from typing import Dict, Tuple, Optional
 from PyQt5.QtWidgets import QApplication, QDesktopWidget
 
+from src.utils.window_geometry import get_window_geometry, is_valid_rect
+
 
 class AreaSelector:
     """
@@ -76,11 +78,15 @@ class AreaSelector:
             }
         }
         
+        # 座標データの更新回数（検出側はこの値が変わった時だけ検出エリアを再計算する）
+        self.revision = 0
+        
         # 初期化
         self.load_config()
         
     def load_config(self) -> bool:
         """設定ファイルから座標データを読み込み（フォールバック機能付き）"""
+        self.revision += 1
         try:
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r', encoding='utf-8') as f:
@@ -301,9 +307,19 @@ class AreaSelector:
         except Exception:
             return False
         
-    def set_flask_area(self, x: int, y: int, width: int, height: int, monitor: int = 0):
-        """フラスコエリアの座標を設定"""
+    def set_flask_area(self, x: int, y: int, width: int, height: int, monitor: int = 0,
+                       reference: Optional[Dict] = None):
+        """
+        フラスコエリアの座標を設定
+        
+        Args:
+            reference: 座標を設定した時点のPoEクライアント領域（Noneの場合は現在の領域を取得。
+                       取得できない場合はモニター基準の絶対座標として扱う）
+        """
         self.logger.info(f"[SET] フラスコエリア設定開始: X={x}, Y={y}, W={width}, H={height}")
+        self.revision += 1
+        if reference is None:
+            reference = get_window_geometry().current()
         
         if "flask_area" not in self.config_data:
             self.config_data["flask_area"] = {}
@@ -320,6 +336,12 @@ class AreaSelector:
             "height": height,
             "monitor": monitor
         })
+        if is_valid_rect(reference):
+            self.config_data["flask_area"]["reference"] = {
+                key: int(reference[key]) for key in ('left', 'top', 'width', 'height')
+            }
+        else:
+            self.config_data["flask_area"].pop("reference", None)
         
         # 設定後の値をログ出力
         new_area = self.config_data["flask_area"]
@@ -335,6 +357,24 @@ class AreaSelector:
         
         
     
+    def get_flask_reference(self) -> Optional[Dict]:
+        """フラスコエリアを設定した時点のPoEクライアント領域（未記録の場合はNone）"""
+        reference = self.config_data.get("flask_area", {}).get("reference")
+        return reference if is_valid_rect(reference) else None
+    
+    def set_flask_reference(self, reference: Dict) -> bool:
+        """
+        基準のクライアント領域を記録していないフラスコエリアに、基準の領域を記録して保存
+        
+        座標は変えないため revision は進めない
+        """
+        flask_area = self.config_data.get("flask_area")
+        if not flask_area or not is_valid_rect(reference):
+            return False
+        flask_area["reference"] = {key: int(reference[key]) for key in ('left', 'top', 'width', 'height')}
+        self.logger.info(f"[SET] フラスコエリアの基準領域を記録: {flask_area['reference']}")
+        return self.save_config()
+    
     def get_full_flask_area_for_tincture(self) -> Dict:
         """フラスコエリア全体をTincture検出エリアとして取得"""
         flask_area = self.get_flask_area()
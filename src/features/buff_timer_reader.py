@@ -0,0 +1,254 @@
+"""
+バフタイマー読み取りモジュール
+バフアイコン下の青い数字を分割し、数字バンクとの一括照合で残り秒数を読み取る
+"""
+import csv
+import time
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+import cv2
+import numpy as np
+
+from src.utils.resource_path import get_asset_path
+
+logger = logging.getLogger(__name__)
+
+
+class BuffTimerReader:
+    """
+    バフタイマー（青い数字）を読み取るクラス
+
+    - 数字テンプレート（0-9とコロン）を起動時に2値化・正規化して1つの行列（数字バンク）にまとめる
+    - 読み取り時は青色マスク → 列射影による文字分割 → 全文字を1回の行列積で分類
+    """
+
+    COLON = ':'
+
+    # 正規化後の文字サイズ（高さ, 幅）
+    GLYPH_SIZE = (14, 12)
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, template_dir: Optional[str] = None):
+        """
+        Args:
+            config: divination_buff設定辞書（timer_* キーを使用）
+            template_dir: 数字テンプレートのディレクトリ
+        """
+        self.config = config or {}
+        # 同梱の数字画像は S≈119 のため、彩度の下限は計画書の150より低くしている
+        self.hsv_lower = np.array(self.config.get('timer_hsv_lower', [100, 80, 120]), dtype=np.uint8)
+        self.hsv_upper = np.array(self.config.get('timer_hsv_upper', [130, 255, 255]), dtype=np.uint8)
+        self.min_confidence = float(self.config.get('timer_min_confidence', 0.7))
+        self.min_glyph_height = int(self.config.get('timer_min_glyph_height', 5))
+        self.timer_offset = int(self.config.get('timer_offset', 35))
+
+        self.template_dir = Path(template_dir or get_asset_path("images/wine_of_the_prophet/timer_digits"))
+
+        self.labels: List[str] = []
+        self._bank: Optional[np.ndarray] = None
+        self._load_digit_bank()
+
+        self.stats = {
+            'reads': 0,
+            'successful_reads': 0,
+            'rejected_glyphs': 0,
+            'last_latency_ms': 0.0,
+            'max_latency_ms': 0.0,
+            'total_latency_ms': 0.0
+        }
+
+        logger.info(f"BuffTimerReader initialized: {len(self.labels)} glyphs in digit bank")
+
+    def _load_digit_values(self) -> Dict[str, str]:
+        """digit_metadata.csv からファイル名 -> 数字の対応を読み込み"""
+        metadata_path = self.template_dir / "digit_metadata.csv"
+        values = {f"digit_{i}.png": str(i) for i in range(10)}
+        if not metadata_path.exists():
+            return values
+
+        try:
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    if row.get('file_name') and row.get('digit_value') is not None:
+                        values[row['file_name']] = str(row['digit_value']).strip()
+        except Exception as e:
+            logger.warning(f"Failed to read digit metadata: {e}")
+        return values
+
+    def _load_digit_bank(self) -> None:
+        """数字テンプレートを読み込み、正規化済みの数字バンク行列を作成"""
+        entries = list(self._load_digit_values().items()) + [("colon.png", self.COLON)]
+        rows = []
+
+        for file_name, label in entries:
+            path = self.template_dir / file_name
+            if not path.exists():
+                logger.debug(f"Digit template not found: {path}")
+                continue
+
+            image = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+            if image is None:
+                logger.warning(f"Failed to load digit template: {path}")
+                continue
+            if image.ndim == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            elif image.shape[2] == 4:
+                image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+
+            mask = self._blue_mask(image)
+            glyphs = self._segment(mask)
+            if not glyphs:
+                logger.warning(f"No glyph found in digit template: {path}")
+                continue
+
+            # テンプレート画像全体を1文字として扱う（コロンの2点も含める）
+            left = glyphs[0][0]
+            right = glyphs[-1][1]
+            rows.append(self._normalize_glyph(mask[:, left:right]))
+            self.labels.append(label)
+
+        if not rows:
+            logger.warning(f"No timer digit templates found in {self.template_dir}")
+            self._bank = None
+            return
+
+        self._bank = self._normalize_rows(np.stack(rows))
+
+    def _blue_mask(self, image: np.ndarray) -> np.ndarray:
+        """青い数字の画素を抽出した2値マスクを作成"""
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        return cv2.inRange(hsv, self.hsv_lower, self.hsv_upper)
+
+    @staticmethod
+    def _segment(mask: np.ndarray) -> List[Tuple[int, int]]:
+        """列射影で文字ごとの列範囲 (left, right) に分割"""
+        columns = np.concatenate(([0], (mask.max(axis=0) > 0).astype(np.int8), [0]))
+        edges = np.flatnonzero(np.diff(columns))
+        return list(zip(edges[0::2], edges[1::2]))
+
+    def _normalize_glyph(self, glyph_mask: np.ndarray) -> np.ndarray:
+        """文字マスクを上下の余白を除いて固定サイズに正規化（縦横比を保持して中央配置）"""
+        rows = np.flatnonzero(glyph_mask.max(axis=1))
+        glyph = glyph_mask[rows[0]:rows[-1] + 1] if rows.size else glyph_mask
+
+        height, width = self.GLYPH_SIZE
+        scaled_width = max(1, min(width, int(round(glyph.shape[1] * height / max(1, glyph.shape[0])))))
+        resized = cv2.resize(glyph, (scaled_width, height), interpolation=cv2.INTER_AREA)
+
+        canvas = np.zeros((height, width), dtype=np.float32)
+        left = (width - scaled_width) // 2
+        canvas[:, left:left + scaled_width] = resized
+        return canvas.ravel()
+
+    @staticmethod
+    def _normalize_rows(rows: np.ndarray) -> np.ndarray:
+        """各行をゼロ平均・単位ノルムに正規化"""
+        rows = rows.astype(np.float32)
+        rows -= rows.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return rows / norms
+
+    def get_timer_area(self, icon_location: Tuple[int, int], icon_size: Tuple[int, int]) -> Dict[str, int]:
+        """
+        バフアイコン位置からタイマーエリアを算出（アイコン下端から timer_offset px）
+
+        Args:
+            icon_location: アイコン左上の座標 (x, y)
+            icon_size: アイコンのサイズ (高さ, 幅)
+
+        Returns:
+            タイマーエリア（x, y, width, height）
+        """
+        return {
+            'x': int(icon_location[0]),
+            'y': int(icon_location[1] + icon_size[0]),
+            'width': int(icon_size[1]),
+            'height': self.timer_offset
+        }
+
+    def read_timer(self, image: np.ndarray) -> Optional[Dict[str, Any]]:
+        """
+        タイマー画像から残り秒数を読み取り
+
+        Args:
+            image: タイマーエリアの画像（BGR）
+
+        Returns:
+            {'seconds', 'text', 'confidence', 'latency_ms'}。読み取れない場合はNone
+        """
+        if self._bank is None or image is None or image.size == 0:
+            return None
+
+        start = time.perf_counter()
+        try:
+            mask = self._blue_mask(image)
+            glyphs = []
+            for left, right in self._segment(mask):
+                glyph_mask = mask[:, left:right]
+                rows = np.flatnonzero(glyph_mask.max(axis=1))
+                # ノイズ（小さすぎる塊）は除外
+                if rows.size == 0 or rows[-1] - rows[0] + 1 < self.min_glyph_height:
+                    continue
+                glyphs.append(self._normalize_glyph(glyph_mask))
+
+            if not glyphs:
+                return None
+
+            # 全文字を数字バンクと1回の行列積で照合
+            scores = self._normalize_rows(np.stack(glyphs)) @ self._bank.T
+            best = scores.argmax(axis=1)
+            confidences = scores[np.arange(len(glyphs)), best]
+
+            if confidences.min() < self.min_confidence:
+                self.stats['rejected_glyphs'] += int((confidences < self.min_confidence).sum())
+                return None
+
+            text = ''.join(self.labels[i] for i in best)
+            seconds = self._parse_seconds(text)
+            if seconds is None:
+                return None
+
+            self.stats['successful_reads'] += 1
+            return {
+                'seconds': seconds,
+                'text': text,
+                'confidence': float(confidences.min()),
+                'latency_ms': (time.perf_counter() - start) * 1000
+            }
+
+        except Exception as e:
+            logger.error(f"Buff timer read failed: {e}")
+            import traceback
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            return None
+
+        finally:
+            latency = (time.perf_counter() - start) * 1000
+            self.stats['reads'] += 1
+            self.stats['last_latency_ms'] = latency
+            self.stats['max_latency_ms'] = max(self.stats['max_latency_ms'], latency)
+            self.stats['total_latency_ms'] += latency
+
+    def _parse_seconds(self, text: str) -> Optional[int]:
+        """"SS" または "M:SS" 形式の文字列を秒数に変換"""
+        parts = text.split(self.COLON)
+        if len(parts) > 2 or any(not part for part in parts):
+            return None
+        if len(parts) == 2:
+            return int(parts[0]) * 60 + int(parts[1])
+        return int(parts[0])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報（1回あたりのレイテンシを含む）を取得"""
+        reads = self.stats['reads']
+        return {
+            **self.stats,
+            'avg_latency_ms': self.stats['total_latency_ms'] / reads if reads else 0.0
+        }
+
+    def reset_stats(self) -> None:
+        """統計情報をリセット"""
+        for key in self.stats:
+            self.stats[key] = 0
@@ -0,0 +1,362 @@
+"""
+Divination Cardバフ検出モジュール
+Wine of the Prophet のDivination Cardバフアイコン（40種類）を識別する
+"""
+import csv
+import time
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+import cv2
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.utils.resource_path import get_asset_path
+from src.utils.frame_provider import get_frame_provider
+from src.utils.frame_change_gate import FrameChangeGate
+from src.utils.template_matching import match_template
+from src.features.buff_timer_reader import BuffTimerReader
+
+logger = logging.getLogger(__name__)
+
+
+class DivinationBuffDetector:
+    """
+    Divination Cardバフアイコンの検出を行うクラス
+
+    - 全テンプレートを起動時に1回だけ読み込み、同一サイズのBGR画像に正規化
+    - 縮小グレースケールで全テンプレートの相関を1回の行列演算で計算（事前フィルタ）
+    - 上位候補のみ全解像度BGRで照合し、最も優先度の高いバフを返す
+    """
+
+    # 優先度（フォルダ名は "<tier>_priority"）
+    PRIORITY_TIERS = ('highest', 'high', 'medium', 'low', 'lowest')
+
+    # バフエリアのデフォルト（wine_of_the_prophet_update_plan.md）
+    DEFAULT_AREA = {'x': 700, 'y': 50, 'width': 520, 'height': 100}
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, template_dir: Optional[str] = None):
+        """
+        Args:
+            config: divination_buff設定辞書
+            template_dir: 優先度別フォルダを含むテンプレートディレクトリ
+        """
+        self.config = config or {}
+        self.sensitivity = max(0.5, min(1.0, self.config.get('sensitivity', 0.8)))
+        self.candidate_count = max(1, int(self.config.get('candidate_count', 3)))  # アイコン位置ごとの照合候補数
+        self.prefilter_threshold = float(self.config.get('prefilter_threshold', 0.5))
+        self.prefilter_scale = max(0.1, min(1.0, float(self.config.get('prefilter_scale', 0.25))))
+        self.template_trim = max(0, int(self.config.get('template_trim', 3)))
+        self.set_detection_area(self.config.get('detection_area', self.DEFAULT_AREA))
+
+        self.template_dir = Path(template_dir or get_asset_path("images/wine_of_the_prophet/divination_card_buff"))
+        self.frame_provider = get_frame_provider()
+        self.capture_name = f"divination_buff_{id(self):x}"
+
+        # フレーム変化ゲート（バフ表示が変わらない間は前回の結果を再利用）
+        self.frame_gate = FrameChangeGate(
+            enabled=self.config.get('frame_change_gate', True),
+            threshold=float(self.config.get('frame_change_threshold', 2.0)),
+            max_age=float(self.config.get('frame_change_max_age', 1.0))
+        )
+
+        # テンプレート情報
+        self.templates: List[Dict[str, Any]] = []
+        self.template_size: Tuple[int, int] = (0, 0)
+        self._coarse_matrix: Optional[np.ndarray] = None
+        self._coarse_size: Tuple[int, int] = (0, 0)
+        self._load_templates()
+
+        # タイマー読み取り（アイコン下の青い数字から残り秒数を取得）
+        self.timer_reader = BuffTimerReader(self.config) if self.config.get('read_timer', True) else None
+
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.stats = {
+            'frames': 0,
+            'detections': 0,
+            'skipped_matches': 0,
+            'candidates_verified': 0,
+            'last_latency_ms': 0.0,
+            'max_latency_ms': 0.0,
+            'total_latency_ms': 0.0
+        }
+
+        logger.info(f"DivinationBuffDetector initialized: {len(self.templates)} templates, "
+                    f"sensitivity={self.sensitivity}, candidates={self.candidate_count}")
+
+    def _load_card_names(self) -> Dict[str, str]:
+        """card_metadata.csv からファイル名 -> カード名の対応を読み込み"""
+        metadata_path = self.template_dir / "card_metadata.csv"
+        names = {}
+        if not metadata_path.exists():
+            logger.debug(f"Card metadata not found: {metadata_path}")
+            return names
+
+        try:
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    if row.get('File_Name'):
+                        names[row['File_Name'].lower()] = row.get('Card_Name') or row['File_Name']
+        except Exception as e:
+            logger.warning(f"Failed to read card metadata: {e}")
+        return names
+
+    def _load_templates(self) -> None:
+        """全バフテンプレートを読み込み、同一サイズに正規化して事前フィルタ用の行列を作成"""
+        card_names = self._load_card_names()
+        raw_templates = []
+
+        for tier in self.PRIORITY_TIERS:
+            tier_dir = self.template_dir / f"{tier}_priority"
+            if not tier_dir.exists():
+                logger.debug(f"Buff template folder not found: {tier_dir}")
+                continue
+
+            for path in sorted(tier_dir.glob("*.png")):
+                image = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+                if image is None:
+                    logger.warning(f"Failed to load buff template: {path}")
+                    continue
+                if image.ndim == 2:
+                    image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+                elif image.shape[2] == 4:
+                    image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+
+                file_name = path.name
+                raw_templates.append({
+                    'file_name': file_name,
+                    'card_name': card_names.get(file_name.lower(), path.stem.replace('_', ' ').title()),
+                    'priority': tier,
+                    'priority_rank': self.PRIORITY_TIERS.index(tier),
+                    'image': image
+                })
+
+        if not raw_templates:
+            logger.warning(f"No divination buff templates found in {self.template_dir}")
+            self.templates = []
+            self._coarse_matrix = None
+            return
+
+        # トリミング済み画像のマージンのばらつきを吸収するため、中央を共通サイズで切り出す
+        height = min(t['image'].shape[0] for t in raw_templates) - self.template_trim * 2
+        width = min(t['image'].shape[1] for t in raw_templates) - self.template_trim * 2
+        for template in raw_templates:
+            image = template['image']
+            top = (image.shape[0] - height) // 2
+            left = (image.shape[1] - width) // 2
+            template['image'] = np.ascontiguousarray(image[top:top + height, left:left + width])
+
+        self.templates = raw_templates
+        self.template_size = (height, width)
+
+        # 事前フィルタ用: 縮小グレースケールをゼロ平均・単位ノルムにして1つの行列にまとめる
+        coarse = [self._to_coarse(t['image']) for t in self.templates]
+        self._coarse_size = coarse[0].shape
+        self._coarse_matrix = np.stack([self._normalize_rows(c.reshape(1, -1))[0] for c in coarse])
+
+        logger.info(f"Loaded {len(self.templates)} divination buff templates (normalized to {width}x{height})")
+
+    def _to_coarse(self, image: np.ndarray) -> np.ndarray:
+        """事前フィルタ用の縮小グレースケール画像を作成"""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        if self.prefilter_scale >= 1.0:
+            return gray
+        size = (max(1, int(round(gray.shape[1] * self.prefilter_scale))),
+                max(1, int(round(gray.shape[0] * self.prefilter_scale))))
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+    @staticmethod
+    def _normalize_rows(rows: np.ndarray) -> np.ndarray:
+        """各行をゼロ平均・単位ノルムに正規化（TM_CCOEFF_NORMED相当の内積にするため）"""
+        rows = rows.astype(np.float32)
+        rows -= rows.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return rows / norms
+
+    def set_detection_area(self, area: Dict[str, int]) -> None:
+        """バフ検出エリアを設定（x, y, width, height）"""
+        self.detection_area = {
+            'top': int(area.get('y', area.get('top', self.DEFAULT_AREA['y']))),
+            'left': int(area.get('x', area.get('left', self.DEFAULT_AREA['x']))),
+            'width': int(area.get('width', self.DEFAULT_AREA['width'])),
+            'height': int(area.get('height', self.DEFAULT_AREA['height']))
+        }
+        if hasattr(self, 'frame_gate'):
+            self.frame_gate.reset()
+
+    def _capture_buff_area(self) -> np.ndarray:
+        """バフエリアをキャプチャ（共有フレームプロバイダー経由）"""
+        return self.frame_provider.get_region(self.detection_area, name=self.capture_name)
+
+    def _prefilter(self, frame: np.ndarray) -> List[List[Tuple[float, int, Tuple[int, int]]]]:
+        """
+        縮小グレースケールで全テンプレートの相関を一括計算し、アイコン位置ごとの上位候補を返す
+
+        Returns:
+            アイコン位置ごとの候補リスト。各候補は (事前スコア, テンプレート番号, 全解像度での候補位置)
+        """
+        coarse_frame = self._to_coarse(frame)
+        coarse_h, coarse_w = self._coarse_size
+        if coarse_frame.shape[0] < coarse_h or coarse_frame.shape[1] < coarse_w:
+            return []
+
+        # 全ウィンドウ x 全テンプレートの相関を1回の行列積で計算
+        windows = sliding_window_view(coarse_frame, (coarse_h, coarse_w))
+        grid_h, grid_w = windows.shape[:2]
+        window_matrix = self._normalize_rows(windows.reshape(grid_h * grid_w, -1))
+        scores = window_matrix @ self._coarse_matrix.T
+
+        best_windows = scores.argmax(axis=0)
+        best_scores = scores[best_windows, np.arange(scores.shape[1])]
+
+        # 各テンプレートの最良位置をアイコン単位にまとめる（スコア降順に近い位置へ割り当て）
+        clusters: List[List[Tuple[float, int, Tuple[int, int]]]] = []
+        for index in np.argsort(best_scores)[::-1]:
+            score = float(best_scores[index])
+            if score < self.prefilter_threshold:
+                break
+            row, col = divmod(int(best_windows[index]), grid_w)
+            for cluster in clusters:
+                _, _, (cluster_col, cluster_row) = cluster[0]
+                if abs(cluster_col - col) <= coarse_w // 2 and abs(cluster_row - row) <= coarse_h // 2:
+                    if len(cluster) < self.candidate_count:
+                        cluster.append((score, int(index), (col, row)))
+                    break
+            else:
+                clusters.append([(score, int(index), (col, row))])
+
+        # 候補位置を全解像度座標に変換
+        return [[(score, index, (int(round(col / self.prefilter_scale)), int(round(row / self.prefilter_scale))))
+                 for score, index, (col, row) in cluster]
+                for cluster in clusters]
+
+    def _verify(self, frame: np.ndarray, template_index: int, location: Tuple[int, int]) -> Tuple[float, Tuple[int, int]]:
+        """候補位置周辺のみ全解像度BGRで照合"""
+        template = self.templates[template_index]['image']
+        margin = int(np.ceil(1.0 / self.prefilter_scale)) + 2
+        left = max(0, location[0] - margin)
+        top = max(0, location[1] - margin)
+        right = min(frame.shape[1], location[0] + template.shape[1] + margin)
+        bottom = min(frame.shape[0], location[1] + template.shape[0] + margin)
+
+        confidence, match_loc = match_template(frame[top:bottom, left:right], template)
+        return confidence, (match_loc[0] + left, match_loc[1] + top)
+
+    def detect_current_buff(self, frame: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
+        """
+        現在のDivination Cardバフを検出
+
+        Args:
+            frame: バフエリアの画像（Noneの場合はキャプチャ）
+
+        Returns:
+            最も優先度の高いバフの情報（card_name, file_name, priority, confidence, location,
+            remaining_seconds, latency_ms）。
+            検出できない場合はNone
+        """
+        if not self.templates:
+            return None
+
+        start = time.perf_counter()
+        try:
+            if frame is None:
+                frame = self._capture_buff_area()
+
+            if not self.frame_gate.has_changed(frame):
+                self.stats['skipped_matches'] += 1
+                return self.last_result
+
+            # アイコン位置ごとに最も一致したカードを特定
+            buffs = []
+            for cluster in self._prefilter(frame):
+                best = None
+                for _, index, location in cluster:
+                    confidence, match_loc = self._verify(frame, index, location)
+                    self.stats['candidates_verified'] += 1
+                    if confidence >= self.sensitivity and (best is None or confidence > best[0]):
+                        best = (confidence, index, match_loc)
+                if best is not None:
+                    buffs.append(best)
+
+            # 表示中のバフのうち優先度が高いもの、同じ優先度なら信頼度が高いものを採用
+            result = None
+            if buffs:
+                confidence, index, match_loc = min(
+                    buffs, key=lambda buff: (self.templates[buff[1]]['priority_rank'], -buff[0]))
+                template = self.templates[index]
+                result = {
+                    'card_name': template['card_name'],
+                    'file_name': template['file_name'],
+                    'priority': template['priority'],
+                    'priority_rank': template['priority_rank'],
+                    'confidence': confidence,
+                    'location': match_loc,
+                    'buff_count': len(buffs),
+                    'remaining_seconds': self._read_remaining_seconds(frame, match_loc)
+                }
+
+            if result is not None:
+                self.stats['detections'] += 1
+                logger.debug(f"Divination buff detected: {result['card_name']} ({result['priority']}, confidence: {result['confidence']:.3f})")
+
+            self.last_result = result
+            return result
+
+        except Exception as e:
+            logger.error(f"Divination buff detection failed: {e}")
+            import traceback
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            self.frame_gate.reset()
+            return None
+
+        finally:
+            latency = (time.perf_counter() - start) * 1000
+            self.stats['frames'] += 1
+            self.stats['last_latency_ms'] = latency
+            self.stats['max_latency_ms'] = max(self.stats['max_latency_ms'], latency)
+            self.stats['total_latency_ms'] += latency
+            if self.last_result is not None:
+                self.last_result['latency_ms'] = latency
+
+    def _read_remaining_seconds(self, frame: np.ndarray, icon_location: Tuple[int, int]) -> Optional[int]:
+        """同じフレームからアイコン下のタイマーを読み取り、残り秒数を返す"""
+        if self.timer_reader is None:
+            return None
+
+        area = self.timer_reader.get_timer_area(icon_location, self.template_size)
+        timer_image = frame[area['y']:area['y'] + area['height'], area['x']:area['x'] + area['width']]
+        if timer_image.size == 0:
+            return None
+
+        timer = self.timer_reader.read_timer(timer_image)
+        return timer['seconds'] if timer else None
+
+    def update_sensitivity(self, new_sensitivity: float) -> None:
+        """検出感度を更新"""
+        self.sensitivity = max(0.5, min(1.0, new_sensitivity))
+        self.frame_gate.reset()
+        logger.info(f"DivinationBuffDetector sensitivity updated: {self.sensitivity:.3f}")
+
+    def release(self) -> None:
+        """共有フレームプロバイダーからバフエリアの登録を解除"""
+        self.frame_provider.unregister_region(self.capture_name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報（フレームあたりのレイテンシを含む）を取得"""
+        frames = self.stats['frames']
+        return {
+            **self.stats,
+            'avg_latency_ms': self.stats['total_latency_ms'] / frames if frames else 0.0,
+            'template_count': len(self.templates),
+            'timer': self.timer_reader.get_stats() if self.timer_reader else None
+        }
+
+    def reset_stats(self) -> None:
+        """統計情報をリセット"""
+        for key in self.stats:
+            self.stats[key] = 0
+        self.frame_gate.reset_stats()
+        if self.timer_reader:
+            self.timer_reader.reset_stats()
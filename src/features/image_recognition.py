@@ -4,11 +4,15 @@ OpenCVによるテンプレートマッチング機能
 """
 import cv2
 import numpy as np
+import time
 import logging
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, Any
 from pathlib import Path
-import mss
-from src.utils.resource_path import get_asset_path
+from src.utils.resource_path import get_asset_path, get_resource_path
+from src.utils.frame_provider import get_frame_provider
+from src.utils.frame_change_gate import FrameChangeGate
+from src.utils.template_matching import match_template, pyramid_match, to_coarse
+from src.utils.window_geometry import get_window_geometry, rebase_area, is_valid_rect
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +26,14 @@ class TinctureDetector:
         "Right": 2
     }
     
-    def __init__(self, monitor_config: str = "Primary", sensitivity: float = None, area_selector=None, config=None):
+    # マッチング方式
+    MATCH_STRATEGIES = ('full', 'pyramid')
+    
+    # フラスコエリアに並ぶスロット数（スロットごとの探索範囲はエリアを等分して求める）
+    FLASK_SLOT_COUNT = 5
+    
+    def __init__(self, monitor_config: str = "Primary", sensitivity: float = None, area_selector=None, config=None,
+                 template_dir: Optional[str] = None, flask_slot: Optional[int] = None):
         """
         TinctureDetector の初期化
         
@@ -31,10 +42,21 @@ class TinctureDetector:
             sensitivity: 検出感度 (0.5-1.0)
             area_selector: AreaSelectorインスタンス（オプション）
             config: 設定辞書（検出モード設定含む）
+            template_dir: テンプレートフォルダ（idle/active/cooldownサブフォルダを含む。Noneの場合はSap of the Seasons）
+            flask_slot: フラスコスロット番号（1-5）。指定した場合はフラスコエリアのそのスロット部分だけを探索
         """
         self.monitor_config = monitor_config
         self.area_selector = area_selector
         self.config = config or {}
+        self.flask_slot = flask_slot if flask_slot and 1 <= flask_slot <= self.FLASK_SLOT_COUNT else None
+        
+        # 共有フレームプロバイダー（mssハンドルとモニター情報を保持）
+        self.frame_provider = get_frame_provider()
+        self.capture_name = f"tincture_{id(self):x}"
+        
+        # PoEクライアント領域の監視（領域が変わった時だけ検出エリアを再計算）
+        self.window_geometry = get_window_geometry()
+        self._flask_area_cache: Optional[Tuple[Tuple, Dict[str, int]]] = None
         
         # 感度の設定（設定ファイルから取得またはデフォルト値）
         if sensitivity is None:
@@ -99,18 +121,74 @@ class TinctureDetector:
             except Exception as e:
                 logger.warning(f"[INIT] 検出エリア情報の取得に失敗: {e}")
         
-        # テンプレート画像を読み込み（Idle + Active状態）
-        self.template_idle_path = Path(get_asset_path("images/tincture/sap_of_the_seasons/idle/sap_of_the_seasons_idle.png"))
-        self.template_active_path = Path(get_asset_path("images/tincture/sap_of_the_seasons/active/sap_of_the_seasons_active.png"))
+        # テンプレート画像を読み込み（Idle + Active + Cooldown状態）
+        if template_dir:
+            self._set_template_paths(template_dir)
+        else:
+            self.template_idle_path = Path(get_asset_path("images/tincture/sap_of_the_seasons/idle/sap_of_the_seasons_idle.png"))
+            self.template_active_path = Path(get_asset_path("images/tincture/sap_of_the_seasons/active/sap_of_the_seasons_active.png"))
+            self.template_cooldown_dir = Path(get_asset_path("images/tincture/sap_of_the_seasons/cooldown"))
         
         self.template_idle = None
         self.template_active = None
+        self.templates_cooldown: Dict[str, np.ndarray] = {}
+        self._coarse_templates: Dict[Tuple[str, float], np.ndarray] = {}
         self._load_templates()
         
+        # 直近の検出結果（1フレーム分の全テンプレート信頼度）
+        self.last_detection: Optional[Dict[str, Any]] = None
+        self.last_capture_area: Optional[Dict[str, int]] = None
+        
+        # ROIトラッキング設定（確実な一致後は直前の位置周辺のみ探索）
+        self.roi_tracking = tincture_config.get('roi_tracking', True)
+        self.roi_margin = int(tincture_config.get('roi_margin', 16))
+        self.roi_max_misses = int(tincture_config.get('roi_max_misses', 3))
+        self._roi_anchor: Optional[Tuple[int, int]] = None
+        self._roi_area_key: Optional[Tuple[int, ...]] = None
+        self._roi_misses = 0
+        
+        # マッチング方式（'full': 全解像度BGR, 'pyramid': 縮小グレースケール粗探索＋全解像度検証）
+        self.match_strategy = tincture_config.get('match_strategy', 'full')
+        if self.match_strategy not in self.MATCH_STRATEGIES:
+            logger.warning(f"Unknown match strategy '{self.match_strategy}' - using 'full'")
+            self.match_strategy = 'full'
+        self.pyramid_scale = max(0.1, min(0.9, float(tincture_config.get('pyramid_scale', 0.5))))
+        
+        # フレーム変化ゲート（変化のないフレームでは前回の判定を再利用）
+        self.frame_gate = FrameChangeGate(
+            enabled=tincture_config.get('frame_change_gate', True),
+            threshold=float(tincture_config.get('frame_change_threshold', 2.0)),
+            max_age=float(tincture_config.get('frame_change_max_age', 1.0))
+        )
+        
+        # 検出処理の統計情報
+        self.detection_stats = {
+            'roi_hits': 0,
+            'roi_misses': 0,
+            'roi_resets': 0,
+            'full_searches': 0
+        }
+        
         logger.info(f"TinctureDetector initialized: monitor={monitor_config}, sensitivity={sensitivity}, mode={self.detection_mode}")
     
+    def _set_template_paths(self, template_dir: str) -> None:
+        """Tinctureフォルダ（idle/active/cooldownサブフォルダ）からテンプレートパスを設定"""
+        folder = Path(template_dir)
+        if not folder.is_absolute():
+            folder = Path(get_resource_path(template_dir))
+        
+        def first_png(subfolder: str) -> Path:
+            candidates = sorted((folder / subfolder).glob("*.png"))
+            return candidates[0] if candidates else folder / subfolder / f"{folder.name}_{subfolder}.png"
+        
+        self.template_idle_path = first_png("idle")
+        self.template_active_path = first_png("active")
+        self.template_cooldown_dir = folder / "cooldown"
+        logger.info(f"[INIT] Tinctureテンプレートフォルダ: {folder}")
+    
     def _load_templates(self):
-        """Idle状態とActive状態のテンプレート画像を読み込み"""
+        """Idle/Active/Cooldown状態のテンプレート画像を読み込み"""
+        self._coarse_templates = {}
         try:
             # Idle状態テンプレート
             if not self.template_idle_path.exists():
@@ -133,10 +211,35 @@ class TinctureDetector:
                 logger.warning(f"Active template not found: {self.template_active_path}")
                 logger.warning("Active state detection will be disabled")
             
+            # Cooldown状態テンプレート（任意、進捗別に複数）
+            self.templates_cooldown = {}
+            if self.template_cooldown_dir.exists():
+                for cooldown_path in sorted(self.template_cooldown_dir.glob("*_cooldown_p*.png")):
+                    template = cv2.imread(str(cooldown_path))
+                    if template is None:
+                        logger.warning(f"Cooldown template file exists but failed to load: {cooldown_path}")
+                        continue
+                    # ファイル名末尾の "pXXX" をテンプレート名として使用
+                    name = f"cooldown_{cooldown_path.stem.rsplit('_', 1)[-1]}"
+                    self.templates_cooldown[name] = template
+                    logger.info(f"Loaded cooldown template: {cooldown_path}")
+            else:
+                logger.debug(f"Cooldown template directory not found: {self.template_cooldown_dir}")
+            
         except Exception as e:
             logger.error(f"Failed to load templates: {e}")
             raise
     
+    def _get_state_templates(self) -> Dict[str, np.ndarray]:
+        """1フレームで照合する全状態テンプレートを取得（照合順）"""
+        templates = {}
+        if self.template_active is not None:
+            templates['active'] = self.template_active
+        if self.template_idle is not None:
+            templates['idle'] = self.template_idle
+        templates.update(self.templates_cooldown)
+        return templates
+    
     def _capture_screen(self) -> np.ndarray:
         """画面をキャプチャ（検出エリア限定）"""
         try:
@@ -150,17 +253,8 @@ class TinctureDetector:
             elif self.detection_mode == 'full_flask_area' and self.area_selector:
                 # フラスコエリア全体を使用（新しいモード）
                 try:
-                    full_area = self.area_selector.get_full_flask_area_for_tincture()
-                    capture_area = {
-                        'top': full_area['y'],
-                        'left': full_area['x'],
-                        'width': full_area['width'],
-                        'height': full_area['height']
-                    }
-                    logger.info(f"[DETECTION] モード: full_flask_area - フラスコエリア全体使用")
-                    logger.info(f"[DETECTION] エリア座標: X={full_area['x']}, Y={full_area['y']}, W={full_area['width']}, H={full_area['height']}")
-                    logger.info(f"[DETECTION] 検出範囲面積: {full_area['width'] * full_area['height']}px^2")
-                    logger.debug(f"Full flask area raw data: {full_area}")
+                    capture_area = self._get_flask_capture_area()
+                    logger.debug(f"[DETECTION] モード: full_flask_area - エリア: {capture_area}")
                 except Exception as e:
                     logger.warning(f"Failed to get full flask area, using fallback: {e}")
                     capture_area = self._get_fallback_area()
@@ -169,16 +263,8 @@ class TinctureDetector:
                 # AreaSelectorから検出エリアを取得（従来の3番スロット方法）
                 try:
                     # Legacy mode removed - fallback to full flask area
-                    tincture_area = self.area_selector.get_full_flask_area_for_tincture()
-                    capture_area = {
-                        'top': tincture_area['y'],
-                        'left': tincture_area['x'],
-                        'width': tincture_area['width'],
-                        'height': tincture_area['height']
-                    }
-                    logger.info(f"[DETECTION] モード: auto_slot3 - 3番スロット自動計算")
-                    logger.info(f"[DETECTION] エリア座標: X={tincture_area['x']}, Y={tincture_area['y']}, W={tincture_area['width']}, H={tincture_area['height']}")
-                    logger.debug(f"3rd slot area raw data: {tincture_area}")
+                    capture_area = self._get_flask_capture_area()
+                    logger.debug(f"[DETECTION] モード: auto_slot3 - エリア: {capture_area}")
                 except Exception as e:
                     logger.warning(f"Failed to get configured area, using fallback: {e}")
                     capture_area = self._get_fallback_area()
@@ -187,52 +273,95 @@ class TinctureDetector:
                 capture_area = self._get_fallback_area()
                 logger.info(f"[DETECTION] モード: fallback - AreaSelector未設定")
             
-            # スクリーンショットを撮影（新しいmssインスタンスを使用）
-            with mss.mss() as sct:
-                screenshot = sct.grab(capture_area)
-                
-                # numpy配列に変換
-                img_array = np.array(screenshot)
-                
-                # BGRに変換（OpenCV形式）
-                img_bgr = cv2.cvtColor(img_array, cv2.COLOR_BGRA2BGR)
-                
-                return img_bgr
+            # 共有フレームプロバイダーから取得（他の検出器と同じグラブを共有）
+            self.last_capture_area = capture_area
+            return self.frame_provider.get_region(capture_area, name=self.capture_name)
             
         except Exception as e:
             logger.error(f"Failed to capture screen: {e}")
             raise
     
+    def _get_flask_capture_area(self) -> Dict[str, int]:
+        """
+        フラスコエリアをPoEクライアント領域基準で変換したキャプチャエリアを取得
+        
+        AreaSelectorの座標が変わった場合、またはクライアント領域の位置・サイズが変わった場合のみ再計算する。
+        クライアント領域が取得できない場合は設定された座標をそのまま使う。
+        """
+        client_rect = self.window_geometry.current()
+        key = (id(self.area_selector), getattr(self.area_selector, 'revision', None),
+               self.window_geometry.generation if client_rect else None)
+        if self._flask_area_cache is not None and self._flask_area_cache[0] == key:
+            return dict(self._flask_area_cache[1])
+        
+        full_area = self.area_selector.get_full_flask_area_for_tincture()
+        capture_area = {
+            'top': full_area['y'],
+            'left': full_area['x'],
+            'width': full_area['width'],
+            'height': full_area['height']
+        }
+        if client_rect:
+            reference = self._get_flask_reference(client_rect)
+            if reference != client_rect:
+                capture_area = rebase_area(capture_area, reference, client_rect)
+        
+        logger.info(f"[DETECTION] 検出エリア: X={capture_area['left']}, Y={capture_area['top']}, "
+                    f"W={capture_area['width']}, H={capture_area['height']} (client: {client_rect})")
+        self._flask_area_cache = (key, capture_area)
+        self.reset_roi_tracking()
+        return dict(capture_area)
+    
+    def _get_flask_reference(self, client_rect: Dict[str, int]) -> Dict[str, int]:
+        """
+        フラスコエリアを設定した時点のクライアント領域
+        
+        基準を記録していない設定（以前のバージョンで保存したもの）は、ウィンドウモードの場合もあるため
+        現在のクライアント領域で設定したものとみなし、以後の基準として保存する
+        """
+        get_reference = getattr(self.area_selector, 'get_flask_reference', None)
+        reference = get_reference() if callable(get_reference) else None
+        if isinstance(reference, dict) and is_valid_rect(reference):
+            return reference
+        
+        set_reference = getattr(self.area_selector, 'set_flask_reference', None)
+        if callable(set_reference):
+            try:
+                set_reference(client_rect)
+            except Exception as e:
+                logger.warning(f"Failed to save flask area reference: {e}")
+        return client_rect
+    
     def _get_fallback_area(self) -> Dict[str, int]:
         """フォールバック用の検出エリアを取得"""
         try:
-            # モニター情報を取得（新しいmssインスタンスを使用）
-            with mss.mss() as sct:
-                # モニターを選択
-                monitor_index = self.MONITOR_CONFIGS[self.monitor_config]
-                if monitor_index >= len(sct.monitors) - 1:
-                    monitor_index = 0  # プライマリモニターにフォールバック
-                    logger.warning(f"指定されたモニター({self.monitor_config})が見つかりません。プライマリモニターを使用します")
-                
-                monitor = sct.monitors[monitor_index + 1]  # monitors[0]は全画面
-                
-                # 画面右上部分のみキャプチャ（Tinctureアイコンの位置）
-                width = monitor['width']
-                height = monitor['height']
-                
-                # 右上の約1/4エリアをキャプチャ（従来の方式）
-                fallback_area = {
-                    'top': monitor['top'],
-                    'left': monitor['left'] + width // 2,
-                    'width': width // 2,
-                    'height': height // 4
-                }
-                
-                logger.info(f"[FALLBACK] モニター解像度: {width}x{height}")
-                logger.info(f"[FALLBACK] エリア座標: X={fallback_area['left']}, Y={fallback_area['top']}, W={fallback_area['width']}, H={fallback_area['height']}")
-                logger.info(f"[FALLBACK] 検出範囲面積: {fallback_area['width'] * fallback_area['height']}px^2")
-                
-                return fallback_area
+            # モニター情報を取得（フレームプロバイダーのキャッシュを使用）
+            monitors = self.frame_provider.get_monitors()
+            # モニターを選択
+            monitor_index = self.MONITOR_CONFIGS[self.monitor_config]
+            if monitor_index >= len(monitors) - 1:
+                monitor_index = 0  # プライマリモニターにフォールバック
+                logger.warning(f"指定されたモニター({self.monitor_config})が見つかりません。プライマリモニターを使用します")
+            
+            monitor = monitors[monitor_index + 1]  # monitors[0]は全画面
+            
+            # 画面右上部分のみキャプチャ（Tinctureアイコンの位置）
+            width = monitor['width']
+            height = monitor['height']
+            
+            # 右上の約1/4エリアをキャプチャ（従来の方式）
+            fallback_area = {
+                'top': monitor['top'],
+                'left': monitor['left'] + width // 2,
+                'width': width // 2,
+                'height': height // 4
+            }
+            
+            logger.info(f"[FALLBACK] モニター解像度: {width}x{height}")
+            logger.info(f"[FALLBACK] エリア座標: X={fallback_area['left']}, Y={fallback_area['top']}, W={fallback_area['width']}, H={fallback_area['height']}")
+            logger.info(f"[FALLBACK] 検出範囲面積: {fallback_area['width'] * fallback_area['height']}px^2")
+            
+            return fallback_area
             
         except Exception as e:
             logger.error(f"Failed to get fallback area: {e}")
@@ -246,6 +375,10 @@ class TinctureDetector:
             logger.warning(f"[EMERGENCY] 緊急フォールバック: X={emergency_area['left']}, Y={emergency_area['top']}, W={emergency_area['width']}, H={emergency_area['height']}")
             return emergency_area
     
+    def release(self) -> None:
+        """共有フレームプロバイダーから検出エリアの登録を解除"""
+        self.frame_provider.unregister_region(self.capture_name)
+    
     def detect_tincture_icon(self) -> bool:
         """Tincture Idle状態を検出（下位互換性のため）"""
         return self.detect_tincture_idle()
@@ -346,51 +479,338 @@ class TinctureDetector:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return False
     
-    def get_tincture_state(self) -> str:
-        """Tincture の現在の状態を取得（詳細ログ付き）"""
-        try:
-            logger.debug("=== Starting Tincture State Detection ===")
-            
-            # テンプレートの状態を確認
-            active_available = self.template_active is not None
-            idle_available = self.template_idle is not None
-            
-            logger.debug(f"Template availability: Active={active_available}, Idle={idle_available}")
+    def _match_template(self, screen: np.ndarray, template: np.ndarray) -> float:
+        """テンプレートマッチングを実行して最大信頼度を返す"""
+        confidence, _ = self._match_template_location(screen, template)
+        return confidence
+    
+    def _match_template_location(self, screen: np.ndarray, template: np.ndarray,
+                                 coarse_screen: Optional[np.ndarray] = None,
+                                 name: Optional[str] = None) -> Tuple[float, Tuple[int, int]]:
+        """テンプレートマッチングを実行して最大信頼度と位置を返す（マッチング方式に応じて切替）"""
+        # テンプレートが検出エリアより大きい場合は照合不可
+        if template.shape[0] > screen.shape[0] or template.shape[1] > screen.shape[1]:
+            logger.debug(f"Template {template.shape[:2]} larger than screen {screen.shape[:2]} - skipped")
+            return 0.0, (0, 0)
+        
+        if self.match_strategy == 'pyramid':
+            # 縮小グレースケールで候補を求め、周辺のみ全解像度BGRで検証
+            return pyramid_match(
+                screen, template, self.pyramid_scale,
+                coarse_image=coarse_screen,
+                coarse_template=self._get_coarse_template(name, template)
+            )
+        
+        return match_template(screen, template)
+    
+    def _get_coarse_template(self, name: Optional[str], template: np.ndarray) -> np.ndarray:
+        """粗探索用の縮小グレースケールテンプレートを取得（テンプレート名ごとにキャッシュ）"""
+        if name is None:
+            return to_coarse(template, self.pyramid_scale)
+        
+        cache_key = (name, self.pyramid_scale)
+        coarse = self._coarse_templates.get(cache_key)
+        if coarse is None:
+            coarse = to_coarse(template, self.pyramid_scale)
+            self._coarse_templates[cache_key] = coarse
+        return coarse
+    
+    def set_match_strategy(self, strategy: str, pyramid_scale: Optional[float] = None) -> None:
+        """マッチング方式を設定（'full': 全解像度BGR, 'pyramid': 粗探索＋全解像度検証）"""
+        if strategy not in self.MATCH_STRATEGIES:
+            raise ValueError(f"Invalid match strategy: {strategy}. Supported strategies: {', '.join(self.MATCH_STRATEGIES)}")
+        
+        self.match_strategy = strategy
+        if pyramid_scale is not None:
+            self.pyramid_scale = max(0.1, min(0.9, float(pyramid_scale)))
+        self._coarse_templates = {}
+        self.frame_gate.reset()
+        logger.info(f"Match strategy set to: {self.match_strategy} (pyramid scale: {self.pyramid_scale})")
+    
+    def detect_states(self, screen: Optional[np.ndarray] = None,
+                      area_key: Optional[Tuple[int, ...]] = None) -> Dict[str, Any]:
+        """
+        1フレームで全状態テンプレートを照合して状態を判定
+        
+        Args:
+            screen: 照合対象のフレーム（Noneの場合は1回だけキャプチャ）
+            area_key: screen を渡す場合の検出エリアの識別子（変わるとROI・変化ゲートを破棄。
+                      Noneの場合はフレームサイズ）
             
-            if not idle_available:
+        Returns:
+            state（ACTIVE/IDLE/COOLDOWN/UNKNOWN/ERROR）、テンプレート別の信頼度と位置、
+            処理段階別の所要時間（timings: capture_ms/match_ms/decide_ms）を含む辞書
+        """
+        detection = {
+            'state': "UNKNOWN",
+            'confidences': {},
+            'locations': {},
+            'best_template': None,
+            'search_window': None,
+            'cooldown_progress': None,
+            'reused': False,
+            'timings': {}
+        }
+        
+        try:
+            if self.template_idle is None:
                 logger.error("Idle template not available - cannot perform detection")
-                return "ERROR"
-            
-            # Active状態をチェック（優先）
-            if active_available:
-                logger.debug("Checking ACTIVE state first (priority detection)...")
-                active_detected = self.detect_tincture_active()
-                if active_detected:
-                    logger.info("Tincture state determined: ACTIVE (priority check successful)")
-                    return "ACTIVE"
-                else:
-                    logger.debug("ACTIVE state not detected, proceeding to IDLE check")
-            else:
-                logger.warning("Active template not available - skipping ACTIVE detection")
-            
-            # Idle状態をチェック
-            logger.debug("Checking IDLE state...")
-            idle_detected = self.detect_tincture_idle()
-            if idle_detected:
-                logger.info("Tincture state determined: IDLE")
-                return "IDLE"
-            else:
-                logger.debug("IDLE state not detected")
+                detection['state'] = "ERROR"
+                return detection
+            
+            # 1ティックにつき1回だけキャプチャ
+            if screen is None:
+                capture_start = time.perf_counter()
+                screen = self._capture_screen()
+                detection['timings']['capture_ms'] = (time.perf_counter() - capture_start) * 1000
+                area_key = self.get_capture_area_key(screen)
+            elif area_key is None:
+                area_key = screen.shape
+            logger.debug(f"Screen captured, shape: {screen.shape}")
             
-            # どちらも検出されない場合
-            logger.debug("Tincture state determined: UNKNOWN (no templates matched)")
-            return "UNKNOWN"
+            # 前回マッチング時から変化がなければ前回の判定を再利用
+            if not self._can_reuse_detection():
+                self.frame_gate.reset()
+            if not self.frame_gate.has_changed(*self._get_gate_region(screen, area_key, self.last_detection)):
+                reused = dict(self.last_detection)
+                reused['reused'] = True
+                reused['timings'] = detection['timings']
+                logger.debug(f"Frame unchanged - reusing tincture state: {reused['state']}")
+                return reused
+            
+            # ROIトラッキング中は直前の一致位置周辺のみを探索（スロット指定時はスロット部分に限定）
+            roi_window = self._get_search_window(screen, area_key)
+            if roi_window is None:
+                self.detection_stats['full_searches'] += 1
+            window = self._restrict_to_slot(roi_window, screen)
+            if window is None:
+                search, offset_x, offset_y = screen, 0, 0
+            else:
+                offset_x, offset_y, right, bottom = window
+                search = screen[offset_y:bottom, offset_x:right]
+            detection['search_window'] = window
+            
+            # ピラミッド方式では縮小画像を全テンプレートで共有
+            match_start = time.perf_counter()
+            coarse_search = to_coarse(search, self.pyramid_scale) if self.match_strategy == 'pyramid' else None
+            
+            for name, template in self._get_state_templates().items():
+                confidence, location = self._match_template_location(search, template, coarse_search, name)
+                detection['confidences'][name] = confidence
+                detection['locations'][name] = (location[0] + offset_x, location[1] + offset_y)
+            decide_start = time.perf_counter()
+            detection['timings']['match_ms'] = (decide_start - match_start) * 1000
+            
+            detection['state'], detection['best_template'] = self._decide_state(detection['confidences'])
+            if detection['state'] == "COOLDOWN":
+                detection['cooldown_progress'] = self._estimate_cooldown_progress(detection['best_template'])
+            self._update_roi_tracking(detection, roi_window is not None)
+            # 次回の比較範囲（今回一致したアイコンの範囲）を基準に設定
+            self.frame_gate.prime(*self._get_gate_region(screen, area_key, detection))
+            detection['timings']['decide_ms'] = (time.perf_counter() - decide_start) * 1000
+            logger.debug(f"Tincture state: {detection['state']} (confidences: "
+                         f"{', '.join(f'{k}={v:.3f}' for k, v in detection['confidences'].items())})")
             
         except Exception as e:
             logger.error(f"Error determining tincture state: {e}")
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
-            return "ERROR"
+            detection['state'] = "ERROR"
+        
+        self.last_detection = detection
+        return detection
+    
+    def get_capture_area_key(self, screen: np.ndarray) -> Tuple[int, ...]:
+        """直前にキャプチャした検出エリアの識別子（共有フレームを判定する他スロットの検出器に渡す）"""
+        return tuple(self.last_capture_area.values()) if self.last_capture_area else screen.shape
+    
+    def _restrict_to_slot(self, window: Optional[Tuple[int, int, int, int]],
+                          screen: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+        """
+        探索窓をフラスコスロットの範囲（エリアを等分した列＋ROIの余白）に限定
+        
+        同じテンプレートを使う複数スロットを位置で区別するため。スロット未指定の場合はそのまま返す。
+        """
+        if self.flask_slot is None:
+            return window
+        
+        height, width = screen.shape[:2]
+        max_width = max(t.shape[1] for t in self._get_state_templates().values())
+        slot_width = width / self.FLASK_SLOT_COUNT
+        margin = max(self.roi_margin, (max_width - int(slot_width)) // 2 + 1)
+        slot_left = max(0, int((self.flask_slot - 1) * slot_width) - margin)
+        slot_right = min(width, int(self.flask_slot * slot_width) + margin)
+        
+        left, top, right, bottom = window if window is not None else (0, 0, width, height)
+        left, right = max(left, slot_left), min(right, slot_right)
+        if right <= left:
+            # 追跡位置がスロット外の場合はスロット全体を探索
+            left, top, right, bottom = slot_left, 0, slot_right, height
+        if (left, top, right, bottom) == (0, 0, width, height):
+            return None
+        return left, top, right, bottom
+    
+    def _get_gate_region(self, screen: np.ndarray, area_key: Tuple[int, ...],
+                         detection: Optional[Dict[str, Any]]) -> Tuple[np.ndarray, Tuple]:
+        """
+        フレーム変化ゲートで比較する範囲を取得
+        
+        判定結果で一致したアイコンの範囲だけを比較する（フラスコエリア全体では1個のアイコンの変化が
+        平均に埋もれて閾値を超えないため）。一致がない場合はフレーム全体。
+        
+        Returns:
+            (比較する画像, ゲートの識別子)
+        """
+        best = detection.get('best_template') if detection else None
+        template = self._get_state_templates().get(best) if best else None
+        if template is not None:
+            left, top = detection['locations'][best]
+            right = min(screen.shape[1], left + template.shape[1])
+            bottom = min(screen.shape[0], top + template.shape[0])
+            if 0 <= left < right and 0 <= top < bottom:
+                box = (left, top, right, bottom)
+                return screen[top:bottom, left:right], (area_key, box)
+        return screen, (area_key, None)
+    
+    def _get_search_window(self, screen: np.ndarray, area_key: Tuple[int, ...]) -> Optional[Tuple[int, int, int, int]]:
+        """
+        ROIトラッキングの探索窓を取得
+        
+        Returns:
+            (left, top, right, bottom) のフレーム内座標。全域探索の場合はNone
+        """
+        if not self.roi_tracking:
+            return None
+        
+        # 検出エリアが変わった場合は追跡位置を破棄
+        if area_key != self._roi_area_key:
+            if self._roi_anchor is not None:
+                logger.debug("Detection area changed - ROI tracking reset")
+                self.detection_stats['roi_resets'] += 1
+            self._roi_area_key = area_key
+            self._roi_anchor = None
+            self._roi_misses = 0
+        
+        if self._roi_anchor is None:
+            return None
+        
+        templates = self._get_state_templates().values()
+        max_height = max(t.shape[0] for t in templates)
+        max_width = max(t.shape[1] for t in templates)
+        
+        anchor_x, anchor_y = self._roi_anchor
+        left = max(0, anchor_x - self.roi_margin)
+        top = max(0, anchor_y - self.roi_margin)
+        right = min(screen.shape[1], anchor_x + max_width + self.roi_margin)
+        bottom = min(screen.shape[0], anchor_y + max_height + self.roi_margin)
+        
+        # 窓が全域と変わらない場合は通常探索
+        if left == 0 and top == 0 and right == screen.shape[1] and bottom == screen.shape[0]:
+            return None
+        return left, top, right, bottom
+    
+    def _update_roi_tracking(self, detection: Dict[str, Any], used_window: bool) -> None:
+        """検出結果に応じてROIトラッキング状態を更新"""
+        if not self.roi_tracking:
+            return
+        
+        best = detection['best_template']
+        if best is not None:
+            # 確実な一致: 追跡位置を更新
+            self._roi_anchor = detection['locations'][best]
+            self._roi_misses = 0
+            if used_window:
+                self.detection_stats['roi_hits'] += 1
+        elif used_window:
+            self.detection_stats['roi_misses'] += 1
+            self._roi_misses += 1
+            if self._roi_misses >= self.roi_max_misses:
+                # N回連続で不一致の場合は全域探索に戻す
+                logger.debug(f"ROI tracking lost after {self._roi_misses} misses - falling back to full area search")
+                self._roi_anchor = None
+                self._roi_misses = 0
+                self.detection_stats['roi_resets'] += 1
+    
+    def _can_reuse_detection(self) -> bool:
+        """前回の判定結果を再利用できるか"""
+        return self.last_detection is not None and self.last_detection['state'] != "ERROR"
+    
+    def reset_roi_tracking(self) -> None:
+        """ROIトラッキング状態とフレーム変化ゲートの基準を破棄（次回は全域探索）"""
+        self.frame_gate.reset()
+        self._roi_anchor = None
+        self._roi_area_key = None
+        self._roi_misses = 0
+    
+    def get_detection_stats(self) -> Dict[str, Any]:
+        """検出処理の統計情報を取得"""
+        gate_stats = self.frame_gate.get_stats()
+        return {
+            **self.detection_stats,
+            'skipped_matches': gate_stats['skipped_matches'],
+            'frame_change_gate': gate_stats['enabled'],
+            'match_strategy': self.match_strategy,
+            'roi_tracking': self.roi_tracking,
+            'roi_anchor': self._roi_anchor
+        }
+    
+    def reset_detection_stats(self) -> None:
+        """検出処理の統計情報をリセット"""
+        for key in self.detection_stats:
+            self.detection_stats[key] = 0
+        self.frame_gate.reset_stats()
+    
+    def _decide_state(self, confidences: Dict[str, float]) -> Tuple[str, Optional[str]]:
+        """
+        テンプレート別信頼度から状態を決定
+        
+        同一フレームで全テンプレートを照合しているため、感度を満たすテンプレートのうち
+        最も信頼度が高いものを採用する（同点の場合はActive → Idle → Cooldownの順）
+        """
+        best = None
+        for name, confidence in confidences.items():
+            if confidence >= self.sensitivity and (best is None or confidence > confidences[best]):
+                best = name
+        
+        if best is None:
+            return "UNKNOWN", None
+        if best == 'active':
+            return "ACTIVE", best
+        if best == 'idle':
+            return "IDLE", best
+        return "COOLDOWN", best
+    
+    @staticmethod
+    def _get_template_progress(name: str) -> Optional[float]:
+        """Cooldownテンプレート名（cooldown_pXXX）から回復進捗（0.0-1.0）を取得"""
+        if not name.startswith('cooldown_p'):
+            return None
+        try:
+            return int(name[len('cooldown_p'):]) / 100.0
+        except ValueError:
+            return None
+    
+    def _estimate_cooldown_progress(self, best_template: Optional[str]) -> Optional[float]:
+        """
+        最も一致したCooldownテンプレートから回復進捗（0.0-1.0）を推定
+        
+        進捗はテンプレートの段階（p030/p050/p095など）に量子化される
+        """
+        if best_template is None:
+            return None
+        return self._get_template_progress(best_template)
+    
+    def get_tincture_state(self) -> str:
+        """Tincture の現在の状態を取得（1フレームで全状態を判定）"""
+        logger.debug("=== Starting Tincture State Detection ===")
+        detection = self.detect_states()
+        
+        state = detection['state']
+        if state in ("ACTIVE", "IDLE"):
+            confidence = detection['confidences'].get(detection['best_template'], 0.0)
+            logger.info(f"Tincture state determined: {state} (confidence: {confidence:.3f} >= {self.sensitivity})")
+        
+        return state
     
     def get_detection_area_info(self) -> Dict[str, any]:
         """検出エリアの情報を取得（デバッグ用）"""
@@ -449,6 +869,7 @@ class TinctureDetector:
                     'width': area_dict.get('width', 80),
                     'height': area_dict.get('height', 120)
                 }
+                self.reset_roi_tracking()
                 logger.info(f"Updated manual detection area: {self.manual_detection_area}")
             else:
                 logger.warning("Cannot update manual detection area: detection mode is not manual")
@@ -461,6 +882,7 @@ class TinctureDetector:
         try:
             if mode in ['manual', 'auto_slot3', 'full_flask_area']:
                 self.detection_mode = mode
+                self.reset_roi_tracking()
                 if mode == 'manual' and area_dict:
                     self.update_manual_detection_area(area_dict)
                 logger.info(f"Detection mode set to: {mode}")
@@ -473,6 +895,7 @@ class TinctureDetector:
     def reload_templates(self) -> None:
         """テンプレートを再読み込み"""
         self._load_templates()
+        self.reset_roi_tracking()
         logger.info("Templates reloaded")
     
     def reload_template(self) -> None:
@@ -483,6 +906,7 @@ class TinctureDetector:
         """感度を動的に更新"""
         old_sensitivity = self.sensitivity
         self.sensitivity = max(0.5, min(1.0, new_sensitivity))
+        self.frame_gate.reset()
         logger.info(f"TinctureDetector sensitivity updated: {old_sensitivity:.3f} -> {self.sensitivity:.3f}")
         
         # 設定辞書も更新（存在する場合）
@@ -493,10 +917,8 @@ class TinctureDetector:
     def _get_default_sensitivity(self) -> float:
         """設定ファイルからデフォルト感度を取得"""
         try:
-            from src.core.config_manager import ConfigManager
-            config_manager = ConfigManager()
-            default_config = config_manager.load_config()
-            return default_config.get('tincture', {}).get('sensitivity', 0.7)
+            from src.core.config_store import get_config_store
+            return get_config_store().snapshot().get('tincture', {}).get('sensitivity', 0.7)
         except Exception as e:
             logger.warning(f"Failed to load default sensitivity from config: {e}")
             return 0.7  # フォールバック値
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+複数Tincture検出モジュール
+1回のキャプチャで全Tinctureスロットの状態を判定する
+"""
+import time
+import logging
+from typing import Dict, Any, Optional
+
+from src.features.image_recognition import TinctureDetector
+
+logger = logging.getLogger(__name__)
+
+
+class MultiTinctureDetector:
+    """
+    複数のTinctureスロットを1フレームで判定するクラス
+
+    スロットごとにテンプレートセット（TinctureDetector）を持ち、
+    フラスコエリアを1回だけキャプチャして全スロットを同じフレームで判定する。
+    検出コストはキャプチャ・スレッド数ではなくテンプレート数に比例する。
+    """
+
+    def __init__(self, slots: Dict[str, Dict[str, Any]], monitor_config: str = "Primary",
+                 sensitivity: float = 0.7, area_selector=None, config=None):
+        """
+        Args:
+            slots: スロット名 -> {'folder_path', 'threshold', ...} の辞書（順序が優先順）
+            monitor_config: モニター設定 ("Primary", "Center", "Right")
+            sensitivity: thresholdが未設定のスロットで使用する検出感度
+            area_selector: AreaSelectorインスタンス（全スロットで共有）
+            config: 設定辞書（検出モード設定含む）
+        """
+        if not slots:
+            raise ValueError("MultiTinctureDetector requires at least one tincture slot")
+
+        self.monitor_config = monitor_config
+        self.sensitivity = sensitivity
+        self.area_selector = area_selector
+        self.config = config or {}
+        self.slots = slots
+
+        self.detectors: Dict[str, TinctureDetector] = {}
+        for name, slot in slots.items():
+            detector = TinctureDetector(
+                monitor_config=monitor_config,
+                sensitivity=slot.get('threshold', sensitivity),
+                area_selector=self.area_selector,
+                config=self.config,
+                template_dir=slot.get('folder_path'),
+                flask_slot=self._parse_flask_slot(slot.get('flask_slot'))
+            )
+            # 最初の検出器が生成したAreaSelectorを以降のスロットで共有
+            if self.area_selector is None:
+                self.area_selector = detector.area_selector
+            self.detectors[name] = detector
+
+        self.primary_slot = next(iter(self.detectors))
+
+        self.stats = {
+            'frames': 0,
+            'capture_errors': 0,
+            'last_frame_ms': 0.0
+        }
+
+        logger.info(f"MultiTinctureDetector initialized: slots={list(self.detectors.keys())}")
+
+    @staticmethod
+    def _parse_flask_slot(flask_slot: Any) -> Optional[int]:
+        """'slot_3' 形式のフラスコスロットを番号に変換（未設定・不正な場合はNone）"""
+        if isinstance(flask_slot, int):
+            return flask_slot
+        if isinstance(flask_slot, str) and flask_slot.rsplit('_', 1)[-1].isdigit():
+            return int(flask_slot.rsplit('_', 1)[-1])
+        return None
+
+    @property
+    def primary_detector(self) -> TinctureDetector:
+        """キャプチャ領域を決定する代表スロットの検出器"""
+        return self.detectors[self.primary_slot]
+
+    def set_detector(self, slot_name: str, detector: TinctureDetector) -> Optional[TinctureDetector]:
+        """スロットの検出器を置き換え（キャリブレーション時など）、旧検出器を返す"""
+        old_detector = self.detectors.get(slot_name)
+        self.detectors[slot_name] = detector
+        return old_detector
+
+    def detect_all(self) -> Dict[str, Dict[str, Any]]:
+        """
+        フラスコエリアを1回キャプチャして全スロットの状態を判定
+
+        Returns:
+            スロット名 -> TinctureDetector.detect_states() の結果
+        """
+        start = time.perf_counter()
+        try:
+            frame = self.primary_detector._capture_screen()
+        except Exception as e:
+            logger.error(f"Failed to capture tincture area: {e}")
+            self.stats['capture_errors'] += 1
+            return {name: {'state': "ERROR", 'confidences': {}, 'locations': {},
+                           'best_template': None, 'cooldown_progress': None}
+                    for name in self.detectors}
+
+        # 検出エリアが変わった場合に全スロットのROI・変化ゲートを破棄するよう、代表スロットのエリアを渡す
+        area_key = self.primary_detector.get_capture_area_key(frame)
+        detections = {name: detector.detect_states(frame, area_key) for name, detector in self.detectors.items()}
+
+        self.stats['frames'] += 1
+        self.stats['last_frame_ms'] = (time.perf_counter() - start) * 1000
+        return detections
+
+    def update_sensitivity(self, sensitivity: float, slots: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """検出感度を更新（スロット個別のthresholdを優先）"""
+        self.sensitivity = sensitivity
+        slots = slots or self.slots
+        for name, detector in self.detectors.items():
+            detector.update_sensitivity(slots.get(name, {}).get('threshold', sensitivity))
+
+    def set_area_selector(self, area_selector) -> None:
+        """全スロットの検出器のAreaSelectorを更新"""
+        self.area_selector = area_selector
+        for detector in self.detectors.values():
+            detector.area_selector = area_selector
+
+    def release(self) -> None:
+        """共有フレームプロバイダーから全スロットの検出エリアを解除"""
+        for detector in self.detectors.values():
+            detector.release()
+
+    def get_detection_stats(self) -> Dict[str, Any]:
+        """全スロットの検出統計を取得"""
+        return {
+            **self.stats,
+            'slots': {name: detector.get_detection_stats() for name, detector in self.detectors.items()}
+        }
+
+    def reset_detection_stats(self) -> None:
+        """全スロットの検出統計をリセット"""
+        self.stats['frames'] = 0
+        self.stats['capture_errors'] = 0
+        self.stats['last_frame_ms'] = 0.0
+        for detector in self.detectors.values():
+            detector.reset_detection_stats()
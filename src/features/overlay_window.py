@@ -7,10 +7,11 @@ import sys
 from PyQt5.QtWidgets import QApplication, QWidget
 from PyQt5.QtCore import Qt, QPoint, QRect, QTimer, pyqtSignal
 from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QKeyEvent, QMouseEvent, QWheelEvent
-from pynput import keyboard
 import threading
 import logging
 
+from src.utils.input_hub import get_input_hub
+
 class OverlayWindow(QWidget):
     """
     半透明オーバーレイウィンドウクラス
@@ -45,8 +46,8 @@ class OverlayWindow(QWidget):
         # 表示状態
         self.is_visible = False
         
-        # キーボードリスナー
-        self.keyboard_listener = None
+        # グローバルホットキーの登録ID
+        self.hotkey_binding = None
         
         # ウィンドウ設定
         self.init_ui()
@@ -237,18 +238,10 @@ class OverlayWindow(QWidget):
         self.update()
         
     def setup_global_hotkeys(self):
-        """グローバルホットキーの設定"""
-        def on_press(key):
-            try:
-                if key == keyboard.Key.f9:
-                    self.toggle_visibility()
-            except AttributeError:
-                pass
-                
-        # キーボードリスナーを開始
-        self.keyboard_listener = keyboard.Listener(on_press=on_press)
-        self.keyboard_listener.daemon = True
-        self.keyboard_listener.start()
+        """グローバルホットキーの設定（F9: 表示切り替え）"""
+        self.hotkey_binding = get_input_hub().register_key(
+            'f9', lambda key_name: self.toggle_visibility(), label='overlay_toggle'
+        )
         
     def toggle_visibility(self):
         """表示/非表示の切り替え"""
@@ -303,8 +296,9 @@ class OverlayWindow(QWidget):
         
     def closeEvent(self, event):
         """ウィンドウ終了時の処理"""
-        if self.keyboard_listener:
-            self.keyboard_listener.stop()
+        if self.hotkey_binding is not None:
+            get_input_hub().unregister(self.hotkey_binding)
+            self.hotkey_binding = None
         event.accept()
 
 
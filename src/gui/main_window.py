@@ -161,7 +161,7 @@ class MainWindow(QMainWindow):
             # MacroControllerに反映（実行中の場合）
             if self.macro_controller and hasattr(self.macro_controller, 'tincture_module'):
                 tincture_config = self.config.get('tincture', {})
-                self.macro_controller.tincture_module.update_config(tincture_config)
+                self.macro_controller.update_tincture_config(tincture_config)
             
             self.log_message(f"Tincture設定を保存: 感度={sensitivity_config:.3f}, チェック間隔={check_interval_config:.3f}s")
             
@@ -185,8 +185,8 @@ class MainWindow(QMainWindow):
                 'min_use_interval': self.min_use_interval_spinbox.value() / 1000.0
             }
             
-            # 実行中のモジュールに適用
-            self.macro_controller.tincture_module.update_config(temp_config)
+            # 実行中のモジュールにだけ適用（保持している設定は変更しない）
+            self.macro_controller.update_tincture_config(temp_config, temporary=True)
             self.log_message(f"Tincture設定を一時適用: 感度={temp_config['sensitivity']:.3f}")
             
         except Exception as e:
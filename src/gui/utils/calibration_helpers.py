@@ -184,6 +184,9 @@ class CalibrationHelpers:
                 # 既存のdetectorを置き換え
                 old_detector = tincture_module.detector
                 tincture_module.detector = new_detector
+                if old_detector is not None:
+                    # 共有フレームプロバイダーから旧検出器の領域を解除
+                    old_detector.release()
                 
                 # ログ出力
                 logger.info("TinctureDetector reinitialized with new settings")
@@ -306,15 +309,20 @@ class CalibrationHelpers:
                 tincture_module = self.main_window.macro_controller.tincture_module
                 if tincture_module and tincture_module.detector:
                     
-                    # 検出テストを実行
-                    state = tincture_module.detector.get_tincture_state()
+                    # 検出テストを実行（共有フレームプロバイダーの1フレームで全状態を判定）
+                    detection = tincture_module.detector.detect_states()
+                    state = detection['state']
+                    confidence = detection['confidences'].get(detection['best_template'], 0.0)
                     
                     if state == "IDLE":
-                        result = "✓ Tincture IDLE状態を検出しました"
+                        result = f"✓ Tincture IDLE状態を検出しました (信頼度: {confidence:.3f})"
                         self.main_window.test_result_label.setStyleSheet("color: green;")
                     elif state == "ACTIVE":
-                        result = "✓ Tincture ACTIVE状態を検出しました"
+                        result = f"✓ Tincture ACTIVE状態を検出しました (信頼度: {confidence:.3f})"
                         self.main_window.test_result_label.setStyleSheet("color: blue;")
+                    elif state == "COOLDOWN":
+                        result = f"✓ Tincture COOLDOWN状態を検出しました (信頼度: {confidence:.3f})"
+                        self.main_window.test_result_label.setStyleSheet("color: orange;")
                     else:
                         result = "✗ Tinctureを検出できませんでした"
                         self.main_window.test_result_label.setStyleSheet("color: red;")
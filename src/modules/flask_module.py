@@ -5,10 +5,11 @@ import threading
 import time
 import random
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Callable, List
 
 from src.utils.keyboard_input import KeyboardController
 from src.utils.flask_timer_manager import FlaskTimerManager
+from src.utils.input_dispatcher import get_input_dispatcher, PRIORITY_NORMAL
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +25,13 @@ class FlaskModule:
         self.config = config
         self.window_manager = window_manager
         self.keyboard = KeyboardController()
+        self.dispatcher = get_input_dispatcher()
         self.running = False
         
         # FlaskTimerManagerを使用
-        self.timer_manager = FlaskTimerManager(key_press_callback=self._use_flask)
+        self.timer_manager = FlaskTimerManager(key_press_callback=self._use_flask,
+                                               burst_callback=self._use_flask_burst,
+                                               burst_window_ms=config.get('burst_window_ms', 0))
         
         logger.info("FlaskModule initialized with timer manager")
         
@@ -52,24 +56,57 @@ class FlaskModule:
         """フラスコ自動使用を停止"""
         self.running = False
         self.timer_manager.stop_all_timers()
+        self.dispatcher.cancel(source='flask')
         logger.info("Flask module stopped")
     
-    def _use_flask(self, key: str):
-        """フラスコ使用時の処理"""
+    def _use_flask(self, key: str, on_pressed: Optional[Callable[[Optional[int]], None]] = None) -> bool:
+        """
+        フラスコ使用時の処理（キー押下は入力ディスパッチャーで非同期に実行）
+        
+        Args:
+            key: 使用キー
+            on_pressed: キー押下後に押下時刻（time.monotonic_ns()）を受け取る関数
+            
+        Returns:
+            キー押下を要求した場合True
+        """
         if not self.running:
-            return
+            return False
             
         # POEアクティブチェック
         if self.window_manager and hasattr(self.window_manager, 'is_poe_active'):
             if not self.window_manager.is_poe_active():
                 logger.debug(f"Flask use skipped - POE not active (key: {key})")
-                return
+                return False
+        
+        self.dispatcher.submit(key, PRIORITY_NORMAL, source='flask',
+                               press=self.keyboard.press_key, on_done=on_pressed)
+        logger.debug(f"Flask use requested (key: {key})")
+        return True
+    
+    def _use_flask_burst(self, keys: List[str], on_pressed: Optional[Callable] = None) -> bool:
+        """
+        同時期に使用予定の複数フラスコを1回の連続押下で使用
+        
+        Args:
+            keys: 使用キーのリスト
+            on_pressed: 押下後にキーごとの押下時刻のリストを受け取る関数
+            
+        Returns:
+            キー押下を要求した場合True
+        """
+        if not self.running:
+            return False
+        
+        if self.window_manager and hasattr(self.window_manager, 'is_poe_active'):
+            if not self.window_manager.is_poe_active():
+                logger.debug(f"Flask burst skipped - POE not active (keys: {keys})")
+                return False
         
-        try:
-            self.keyboard.press_key(key)
-            logger.debug(f"Flask used (key: {key})")
-        except Exception as e:
-            logger.error(f"Error using flask: {e}")
+        self.dispatcher.submit_burst(keys, PRIORITY_NORMAL, source='flask',
+                                     press_burst=self.keyboard.press_keys_burst, on_done=on_pressed)
+        logger.debug(f"Flask burst requested (keys: {keys})")
+        return True
     
     def update_config(self, new_config: Dict[str, Any]):
         """設定を更新"""
@@ -83,12 +120,14 @@ class FlaskModule:
             'enabled': self.config.get('enabled', False),
             'running': self.running,
             'flask_count': 0,
-            'active_flasks': []
+            'active_flasks': [],
+            'burst': {}
         }
         
         if hasattr(self, 'timer_manager'):
             # タイマーマネージャーから情報を取得
             status['flask_count'] = self.timer_manager.get_timer_count()
+            status['burst'] = self.timer_manager.get_burst_stats()
             
             # アクティブなフラスコの情報を取得
             all_stats = self.timer_manager.get_all_stats()
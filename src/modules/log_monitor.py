@@ -6,25 +6,27 @@ import os
 import time
 import threading
 import logging
-import re
 from pathlib import Path
 from typing import Dict, Any, Optional, Callable
 from datetime import datetime, timedelta
 
-# Grace Period機能用インポート
-try:
-    from pynput import mouse, keyboard
-    PYNPUT_AVAILABLE = True
-except ImportError:
-    PYNPUT_AVAILABLE = False
-    mouse, keyboard = None, None
+from src.utils.log_tailer import LogTailer
+from src.utils.log_analytics import SessionAnalytics
+from src.utils.log_event_bus import LogEventBus, get_log_event_bus
+from src.utils.log_parser import (
+    LogLineParser, LogEvent, EVENT_AREA_ENTER, EVENT_AREA_EXIT, SAFE_AREAS, is_safe_area
+)
+
+# Grace Period機能用インポート（入力フックはプロセス共通のInputHubを使用）
+from src.utils.input_hub import InputHub, get_input_hub, PYNPUT_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
 class LogMonitor:
     """POEログファイルを監視してマクロを自動制御するクラス"""
     
-    def __init__(self, config: Dict[str, Any], macro_controller=None, full_config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any], macro_controller=None, full_config: Dict[str, Any] = None,
+                 event_bus: Optional[LogEventBus] = None):
         self.config = config
         self.macro_controller = macro_controller
         self.full_config = full_config or {}
@@ -32,44 +34,39 @@ class LogMonitor:
         # ログファイルパス（Steam版優先で自動検出）
         self.log_file_path = Path(config.get('log_path', self._find_client_log_path()))
         
-        # 監視設定
-        self.check_interval = config.get('check_interval', 0.5)  # 0.5秒間隔
+        # 監視設定（変更通知が使えない場合のポーリング間隔の上限・下限）
+        self.check_interval = config.get('check_interval', 0.5)
+        self.min_check_interval = config.get('min_check_interval', 0.02)
+        self.watch_backend = config.get('watch_backend', 'auto')
+        # 起動時に既存ログの末尾から現在のエリアを復元（ログの最終更新がこの秒数より古い場合は行わない）
+        self.startup_recovery = config.get('startup_recovery', True)
+        self.recovery_max_idle = config.get('recovery_max_idle', 600)
         self.enabled = config.get('enabled', False)
         
         # 監視状態
         self.running = False
         self.monitor_thread = None
         self.last_position = 0
+        self.tailer: Optional[LogTailer] = None
         
         # エリア状態
         self.in_area = False
         self.current_area = None
         
-        # ログパターン（実際のClient.txtの形式に合わせて修正）
-        self.area_enter_pattern = re.compile(
-            r'.*You have entered (.+)\.$', 
-            re.IGNORECASE
-        )
-        self.area_exit_pattern = re.compile(
-            r'.*You have left (.+)\.$', 
-            re.IGNORECASE
-        )
+        # ログ解析器（対象のシステムメッセージを含む行だけを構造化イベントに変換）
+        self.parser = LogLineParser()
         
         # 安全エリア（マクロを自動ONにしない）リスト
-        self.safe_areas = {
-            # Act拠点（実際のエリア名）
-            "lioneye's watch",  # Act1 & Act6
-            "the forest encampment",  # Act2
-            "the sarn encampment",  # Act3 & Act8
-            "highgate",  # Act4 & Act9
-            "overseer's tower",  # Act5
-            "the bridge encampment",  # Act7
-            "oriath docks",  # Act10
-            
-            # エンドゲーム拠点
-            "karui shore",
-            "kingsmarch",
-        }
+        self.safe_areas = set(SAFE_AREAS)
+        
+        # セッション分析（エリア別滞在時間・周回数・マクロ稼働率）
+        self.analytics = SessionAnalytics(is_safe=self._is_safe_area)
+        
+        # ログイベントの配信（解析したイベントは購読者にだけ配信スレッドから届く）
+        # バスはプロセス共通のため、stop() で購読を解除し start() で再登録する
+        self.event_bus = event_bus or get_log_event_bus()
+        self.subscriptions = []
+        self._subscribe_events()
         
         # 統計情報
         self.stats = {
@@ -77,7 +74,9 @@ class LogMonitor:
             'areas_exited': 0,
             'macro_activations': 0,
             'macro_deactivations': 0,
-            'last_area_change': None
+            'last_area_change': None,
+            'recovered_area': None,
+            'recovery_ms': 0.0
         }
         
         # コールバック
@@ -104,7 +103,8 @@ class LogMonitor:
         
         # Grace Period状態管理
         self.grace_period_active = False
-        self.input_listeners = []
+        self.input_hub: Optional[InputHub] = None  # 初回のGrace Period開始時に取得
+        self.input_bindings = []  # InputHubの登録ID
         self.grace_period_timer = None
         self.grace_period_start_time = None
         
@@ -144,17 +144,30 @@ class LogMonitor:
             logger.error(f"Log file not found: {self.log_file_path}")
             return
             
-        self.running = True
-        
-        # 現在のファイル位置を記録（末尾から監視開始）
+        # ファイルを開いたまま末尾から追従
         try:
-            with open(self.log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                f.seek(0, 2)  # ファイル末尾へ
-                self.last_position = f.tell()
+            self.tailer = LogTailer(
+                self.log_file_path,
+                min_interval=self.min_check_interval,
+                max_interval=self.check_interval,
+                backend=self.watch_backend
+            )
+            if not self.tailer.open(from_end=True):
+                raise IOError(f"cannot open {self.log_file_path}")
+            self.last_position = self.tailer.position
         except Exception as e:
             logger.error(f"Failed to initialize log position: {e}")
+            if self.tailer:
+                self.tailer.close()
+                self.tailer = None
             return
             
+        self._subscribe_events()
+        if self.startup_recovery:
+            self._recover_state()
+            
+        self.running = True
+        
         # 監視スレッドを開始
         self.monitor_thread = threading.Thread(
             target=self._monitor_loop,
@@ -164,17 +177,71 @@ class LogMonitor:
         
         logger.info(f"Log monitor started, watching: {self.log_file_path}")
         
+    def _recover_state(self):
+        """既存ログの末尾から最新のエリア入退場を探し、現在のエリア状態を復元"""
+        try:
+            start_time = time.perf_counter()
+            idle_seconds = time.time() - self.log_file_path.stat().st_mtime
+            if self.recovery_max_idle and idle_seconds > self.recovery_max_idle:
+                logger.info(f"Skipping area recovery - log idle for {idle_seconds:.0f}s")
+                return
+                
+            event = self.parser.find_last(self.log_file_path, (EVENT_AREA_ENTER, EVENT_AREA_EXIT))
+            self.stats['recovery_ms'] = (time.perf_counter() - start_time) * 1000
+            
+            if event is None or event.type != EVENT_AREA_ENTER:
+                logger.info("No current area found in log, starting outside area")
+                return
+                
+            area_name = event.payload.get('area') or "Unknown Area"
+            self.stats['recovered_area'] = area_name
+            self.analytics.record_area(event.timestamp, area_name)
+            logger.info(f"Recovered current area from log: {area_name} "
+                        f"(entered {event.timestamp}, {self.stats['recovery_ms']:.1f}ms)")
+            
+            if self._is_safe_area(area_name):
+                # 町・隠れ家ではエリア外として扱い、次のマップ入場で通常どおりマクロを開始
+                self.current_area = area_name
+            else:
+                # 戦闘エリアは通常の入場処理（Grace Period含む）でマクロを有効化
+                self._handle_area_enter(area_name)
+            
+        except Exception as e:
+            logger.error(f"Failed to recover area state: {e}")
+            
+    def _subscribe_events(self):
+        """イベントバスにエリア入退場の処理とセッション分析を登録（登録済みの場合は何もしない）"""
+        if self.subscriptions:
+            return
+        self.subscriptions = [
+            self.event_bus.subscribe(self._handle_event, (EVENT_AREA_ENTER, EVENT_AREA_EXIT), name='LogMonitor'),
+            self.event_bus.subscribe(self.analytics.feed, name='SessionAnalytics')
+        ]
+        
+    def _unsubscribe_events(self):
+        """イベントバスの購読を解除"""
+        for subscription_id in self.subscriptions:
+            self.event_bus.unsubscribe(subscription_id)
+        self.subscriptions = []
+        
     def stop(self):
-        """ログ監視を停止"""
+        """ログ監視を停止（イベントバスの購読も解除）"""
+        self._unsubscribe_events()
         if not self.running:
             return
             
         self.running = False
+        if self.tailer:
+            self.tailer.wake()
         
         if self.monitor_thread:
             self.monitor_thread.join(timeout=2.0)
             self.monitor_thread = None
             
+        if self.tailer:
+            self.tailer.close()
+            self.tailer = None
+            
         logger.info("Log monitor stopped")
         
     def update_config(self, config: Dict[str, Any]):
@@ -182,6 +249,10 @@ class LogMonitor:
         self.config = config
         self.enabled = config.get('enabled', False)
         self.check_interval = config.get('check_interval', 0.5)
+        self.min_check_interval = config.get('min_check_interval', 0.02)
+        if self.tailer:
+            self.tailer.min_interval = self.min_check_interval
+            self.tailer.max_interval = max(self.min_check_interval, self.check_interval)
         
         # ログファイルパスが変更された場合は再起動
         new_log_path = Path(config.get('log_path', self.log_file_path))
@@ -200,40 +271,40 @@ class LogMonitor:
             'running': self.running,
             'in_area': self.in_area,
             'current_area': self.current_area,
-            'log_file_exists': self.log_file_path.exists()
+            'log_file_exists': self.log_file_path.exists(),
+            'parser': self.parser.get_stats(),
+            'session': self.analytics.get_summary(),
+            'event_bus': self.event_bus.get_stats(),
+            'tailer': self.tailer.get_stats() if self.tailer else None
         }
         
+    def on_macro_state_changed(self, running: bool):
+        """マクロのON/OFFをセッション分析に記録"""
+        self.analytics.record_macro_state(running)
+        
     def set_callbacks(self, on_area_enter: Callable = None, on_area_exit: Callable = None):
         """コールバック関数を設定"""
         self.on_area_enter = on_area_enter
         self.on_area_exit = on_area_exit
         
     def _monitor_loop(self):
-        """ログファイル監視のメインループ"""
+        """ログファイル監視のメインループ（追記を変更通知で待ち、届いた分をまとめて解析）"""
         consecutive_errors = 0
         max_consecutive_errors = 10
+        tailer = self.tailer
         
         while self.running:
             try:
-                # ファイルサイズをチェック
-                if not self.log_file_path.exists():
-                    logger.warning(f"Log file disappeared: {self.log_file_path}")
-                    time.sleep(self.check_interval)
+                data = tailer.read()
+                if data:
+                    self._process_data(data)
+                elif tailer.check_rotation():
+                    # ローテーション・切り詰め後は新しいファイルの先頭から読む
                     continue
-                    
-                current_size = self.log_file_path.stat().st_size
-                
-                # ファイルが小さくなった場合（ローテーション）
-                if current_size < self.last_position:
-                    logger.info("Log file rotated, resetting position")
-                    self.last_position = 0
-                    
-                # 新しいデータがある場合
-                if current_size > self.last_position:
-                    self._read_new_lines()
+                self.last_position = tailer.position
                     
                 consecutive_errors = 0
-                time.sleep(self.check_interval)
+                tailer.wait(had_data=bool(data))
                 
             except Exception as e:
                 consecutive_errors += 1
@@ -245,45 +316,40 @@ class LogMonitor:
                     
                 time.sleep(self.check_interval * 2)  # エラー時は少し長く待つ
                 
-    def _read_new_lines(self):
-        """新しい行を読み込んで解析"""
+    def _process_data(self, data: bytes):
+        """読み取った行（改行終わりのバイト列）をまとめて解析し、イベントバスに渡す（購読者の処理は待たない）"""
         try:
-            with open(self.log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                f.seek(self.last_position)
-                new_lines = f.readlines()
-                self.last_position = f.tell()
-                
-                for line in new_lines:
-                    line = line.strip()
-                    if line:
-                        self._parse_log_entry(line)
-                        
+            events = self.parser.parse_batch(data)
+            if events:
+                self.event_bus.publish_batch(events)
+                    
         except Exception as e:
             logger.error(f"Error reading log file: {e}")
             
     def _parse_log_entry(self, line: str):
         """ログエントリを解析してエリア入退場を検出"""
         try:
-            # エリア入場の検出
-            if self.area_enter_pattern.search(line):
-                self._handle_area_enter(line)
-                return
-                
-            # エリア退場の検出
-            if self.area_exit_pattern.search(line):
-                self._handle_area_exit(line)
-                return
+            event = self.parser.parse_line(line)
+            if event is not None:
+                self.event_bus.dispatch(event)
                 
         except Exception as e:
             logger.error(f"Error parsing log entry: {e}")
             
-    def _handle_area_enter(self, line: str):
+    def _handle_event(self, event: LogEvent):
+        """エリア入退場イベントを処理（イベントバスの配信スレッドから呼ばれる）"""
+        if event.type == EVENT_AREA_ENTER:
+            self._handle_area_enter(event.payload.get('area') or "Unknown Area")
+        elif event.type == EVENT_AREA_EXIT:
+            self._handle_area_exit(event.payload.get('area') or "Unknown Area")
+            
+    def _handle_area_enter(self, area_name: str):
         """エリア入場時の処理"""
         if self.in_area:
             return  # 既にエリア内
             
         self.in_area = True
-        self.current_area = self._extract_area_name(line)
+        self.current_area = area_name
         self.stats['areas_entered'] += 1
         self.stats['last_area_change'] = time.time()
         
@@ -331,7 +397,7 @@ class LogMonitor:
             except Exception as e:
                 logger.error(f"Error in area enter callback: {e}")
                 
-    def _handle_area_exit(self, line: str):
+    def _handle_area_exit(self, area_name: str):
         """エリア退場時の処理"""
         if not self.in_area:
             return  # 既にエリア外
@@ -357,37 +423,9 @@ class LogMonitor:
             except Exception as e:
                 logger.error(f"Error in area exit callback: {e}")
                 
-    def _extract_area_name(self, line: str) -> str:
-        """ログ行からエリア名を抽出"""
-        try:
-            # "You have entered [エリア名]." 形式から抽出
-            match = self.area_enter_pattern.search(line)
-            if match:
-                return match.group(1).strip()
-            
-            # "You have left [エリア名]." 形式から抽出
-            match = self.area_exit_pattern.search(line)
-            if match:
-                return match.group(1).strip()
-                
-        except Exception as e:
-            logger.error(f"Error extracting area name: {e}")
-            
-        return "Unknown Area"
-        
     def _is_safe_area(self, area_name: str) -> bool:
         """安全なエリア（町・隠れ家）かどうかを判定"""
-        if not area_name:
-            return False
-            
-        area_lower = area_name.lower()
-        
-        # Hideoutは部分一致で判定
-        if "hideout" in area_lower:
-            return True
-            
-        # その他の安全エリアは完全一致で判定
-        return area_lower in self.safe_areas
+        return is_safe_area(area_name, self.safe_areas)
                 
     def _activate_macro(self):
         """マクロを有効化"""
@@ -481,85 +519,51 @@ class LogMonitor:
         self._activate_macro()
     
     def _start_input_monitoring(self):
-        """入力監視を開始"""
+        """入力監視を開始（共通フックに設定されたトリガーのみ登録）"""
         if not PYNPUT_AVAILABLE:
             return
             
         try:
-            # マウス監視（設定されたマウスボタンがある場合のみ）
-            if self.mouse_triggers:
-                mouse_listener = mouse.Listener(
-                    on_click=self._on_mouse_click
+            if self.input_hub is None:
+                self.input_hub = get_input_hub()
+            self._stop_input_monitoring()
+            
+            # マウス監視（設定されたマウスボタンのみ）
+            for button in self.mouse_triggers:
+                self.input_bindings.append(
+                    self.input_hub.register_button(button, self._on_mouse_click, label='log_monitor_grace_period')
                 )
-                mouse_listener.start()
-                self.input_listeners.append(mouse_listener)
-                logger.debug(f"Mouse input monitoring started for buttons: {self.mouse_triggers}")
             
-            # キーボード監視（設定されたキーがある場合のみ）
-            if self.keyboard_triggers:
-                keyboard_listener = keyboard.Listener(
-                    on_press=self._on_key_press
+            # キーボード監視（設定されたキーのみ）
+            for key in self.keyboard_triggers:
+                self.input_bindings.append(
+                    self.input_hub.register_key(key, self._on_key_press, label='log_monitor_grace_period')
                 )
-                keyboard_listener.start()
-                self.input_listeners.append(keyboard_listener)
-                logger.debug(f"Keyboard input monitoring started for keys: {self.keyboard_triggers}")
+            logger.debug(f"Input monitoring started for buttons: {self.mouse_triggers}, keys: {self.keyboard_triggers}")
                 
         except Exception as e:
             logger.error(f"Error starting input monitoring: {e}")
     
     def _stop_input_monitoring(self):
-        """入力監視を停止"""
-        for listener in self.input_listeners:
-            try:
-                listener.stop()
-            except Exception as e:
-                logger.error(f"Error stopping input listener: {e}")
-                
-        self.input_listeners.clear()
+        """入力監視を停止（登録のみ解除し、フックは停止しない）"""
+        if self.input_hub is not None:
+            self.input_hub.unregister_all(self.input_bindings)
+        self.input_bindings.clear()
         logger.debug("Input monitoring stopped")
     
-    def _on_mouse_click(self, x, y, button, pressed):
-        """マウスクリック時の処理（特定ボタンのみ）"""
-        if not pressed or not self.grace_period_active:
+    def _on_mouse_click(self, button_name: str):
+        """トリガーに設定したマウスボタンの押下"""
+        if not self.grace_period_active:
             return
-            
-        try:
-            # pynputのボタン名を取得
-            button_name = button.name if hasattr(button, 'name') else str(button)
-            
-            # 設定された特定のマウスボタンのみを処理
-            if button_name in self.mouse_triggers:
-                logger.debug(f"Grace Period trigger input detected: mouse_{button_name}")
-                self._on_grace_period_input(f"mouse_{button_name}")
-            else:
-                logger.debug(f"Ignored mouse button (not in triggers): {button_name}")
-                
-        except Exception as e:
-            logger.error(f"Error handling mouse click: {e}")
+        logger.debug(f"Grace Period trigger input detected: mouse_{button_name}")
+        self._on_grace_period_input(f"mouse_{button_name}")
     
-    def _on_key_press(self, key):
-        """キー押下時の処理（特定キーのみ）"""
+    def _on_key_press(self, key_name: str):
+        """トリガーに設定したキーの押下"""
         if not self.grace_period_active:
             return
-            
-        try:
-            # キーの文字列表現を取得
-            if hasattr(key, 'char') and key.char:
-                key_str = key.char.lower()
-            elif hasattr(key, 'name'):
-                key_str = key.name.lower()
-            else:
-                key_str = str(key).lower()
-            
-            # 設定された特定のキーのみを処理
-            if key_str in self.keyboard_triggers:
-                logger.debug(f"Grace Period trigger input detected: {key_str}")
-                self._on_grace_period_input(key_str)
-            else:
-                logger.debug(f"Ignored key (not in triggers): {key_str}")
-                
-        except Exception as e:
-            logger.error(f"Error handling key press: {e}")
+        logger.debug(f"Grace Period trigger input detected: {key_name}")
+        self._on_grace_period_input(key_name)
     
     def _on_grace_period_input(self, input_type: str):
         """Grace Period中の入力検知時の処理"""
@@ -1,13 +1,15 @@
 """
 スキル自動使用モジュール
 """
-import threading
+import copy
 import time
 import random
 import logging
 from typing import Dict, Any
 
 from src.utils.keyboard_input import KeyboardController
+from src.utils.scheduler import get_scheduler
+from src.utils.input_dispatcher import get_input_dispatcher, PRIORITY_LOW
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +28,11 @@ class SkillModule:
         
         self.config = config
         self.keyboard = KeyboardController()
-        self.running = False
-        self.threads = []
+        self.dispatcher = get_input_dispatcher()
+        self.running = False  # マクロ制御側から開始されている間True（モジュール無効化中もジョブなしで維持）
+        self.scheduler = get_scheduler()
+        self.jobs = []  # スケジューラーに登録したジョブ名
+        self.scheduled_skills = {}  # ジョブ登録時のスキル設定（設定更新時の比較用）
         self.window_manager = window_manager
         self.stats = {
             'berserk': {'count': 0, 'last_used': None},
@@ -44,12 +49,13 @@ class SkillModule:
             logger.warning("Skill module already running")
             return
         
-        # スキルモジュール全体が無効の場合は開始しない
+        self.running = True
+        
+        # スキルモジュール全体が無効の場合はジョブを登録しない（稼働中に有効化されたら update_config() で登録）
         if not self.config.get('enabled', False):
-            logger.info("Skill module is disabled, not starting")
+            logger.info("Skill module is disabled, no skills scheduled")
             return
             
-        self.running = True
         logger.info("Skill module start signal sent")
         
         # スキルごとに自動使用を開始
@@ -59,29 +65,27 @@ class SkillModule:
                 continue
                 
             if skill_config.get('enabled', False):
-                thread = threading.Thread(
-                    target=self._skill_loop,
-                    args=(skill_name, skill_config),
-                    daemon=True
-                )
-                thread.start()
-                self.threads.append(thread)
+                self._schedule_skill(skill_name, skill_config)
                 logger.info(f"Started skill loop for {skill_name}")
         
-        if not self.threads:
+        if not self.jobs:
             logger.info("No skills are enabled for automation")
     
     def stop(self):
         """スキル自動使用を即座停止"""
         self.running = False
         logger.info("Skill module stop signal sent")
-        
-        # 短いタイムアウトでスレッド終了を待機（高速チェックで早期終了）
-        for thread in self.threads:
-            thread.join(timeout=0.15)  # 1.0 -> 0.15に短縮
-        self.threads.clear()
+        self._clear_jobs()
         logger.info("Skill module stopped")
     
+    def _clear_jobs(self):
+        """スケジューラーからジョブを削除し、未実行のキー入力を取り消す（待機中のスレッドはないため即座に停止）"""
+        for job_name in self.jobs:
+            self.scheduler.remove_job(job_name)
+        self.jobs.clear()
+        self.scheduled_skills.clear()
+        self.dispatcher.cancel(source='skill')
+    
     def update_config(self, config: Dict[str, Any]):
         """設定の更新"""
         # 設定の型チェック
@@ -90,11 +94,60 @@ class SkillModule:
             return
         
         self.config = config
-        logger.info("Skill module configuration updated")
+        if not self.running:
+            logger.info("Skill module configuration updated")
+            return
+        
+        if not config.get('enabled', False):
+            # マクロの稼働中はジョブだけを削除し、再度有効化された時点で登録し直す
+            self._clear_jobs()
+            logger.info("Skill module configuration updated (module disabled)")
+            return
+        
+        # 登録済みジョブの設定と比較し（無効化から戻った場合は全スキルを登録）、変更のあったスキルだけを追加・削除・更新（変更のないスキルの位相は維持）
+        new_skills = self._enabled_skills(config)
+        changed = []
+        for skill_name in [name for name in self.scheduled_skills if name not in new_skills]:
+            job_name = f"skill_{skill_name}"
+            self.scheduler.remove_job(job_name)
+            if job_name in self.jobs:
+                self.jobs.remove(job_name)
+            del self.scheduled_skills[skill_name]
+            changed.append(skill_name)
+        for skill_name, skill_config in new_skills.items():
+            scheduled = self.scheduled_skills.get(skill_name)
+            if scheduled == skill_config:
+                continue
+            if scheduled is None:
+                self._schedule_skill(skill_name, skill_config)
+            else:
+                # キーは使用時に現在の設定から読むため、間隔の変更のみスケジューラーに反映
+                if scheduled.get('interval') != skill_config.get('interval'):
+                    self.scheduler.update_interval(f"skill_{skill_name}",
+                                                   self._random_interval(skill_config['interval']))
+                self.scheduled_skills[skill_name] = copy.deepcopy(skill_config)
+            changed.append(skill_name)
+        
+        logger.info(f"Skill module configuration updated (changed skills: {sorted(changed)})")
+    
+    @staticmethod
+    def _enabled_skills(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """自動使用が有効なスキルの設定"""
+        return {
+            skill_name: skill_config for skill_name, skill_config in config.items()
+            if skill_name != 'enabled' and isinstance(skill_config, dict) and skill_config.get('enabled', False)
+        }
     
     def get_stats(self) -> Dict[str, Any]:
-        """統計情報を取得"""
-        return self.stats.copy()
+        """統計情報を取得（スケジューラー上の起動遅れを含む）"""
+        stats = {name: dict(values) for name, values in self.stats.items()}
+        jobs = self.scheduler.get_stats()['jobs']
+        for skill_name, values in stats.items():
+            job_stats = jobs.get(f"skill_{skill_name}")
+            if job_stats:
+                values['avg_lateness_ms'] = job_stats['avg_lateness_ms']
+                values['max_lateness_ms'] = job_stats['max_lateness_ms']
+        return stats
     
     def manual_use(self, skill_name: str):
         """手動でスキルを使用"""
@@ -115,39 +168,40 @@ class SkillModule:
                 logger.debug(f"{skill_name}: Error checking POE window status: {e}")
                 # エラーが発生してもキー入力を継続
         
-        # POEがアクティブの場合のみキー入力を実行
-        try:
-            self.keyboard.press_key(key)
-            self.stats[skill_name]['count'] += 1
-            self.stats[skill_name]['last_used'] = time.time()
-            logger.debug(f"{skill_name}: Skill used (key: {key}, count: {self.stats[skill_name]['count']})")
-        except Exception as e:
-            logger.error(f"{skill_name}: Error using skill: {e}")
+        # POEがアクティブの場合のみキー入力を要求（入力ディスパッチャーで非同期に実行）
+        def on_pressed(key_down_ns):
+            if key_down_ns is None:
+                return
+            skill_stats = self.stats.setdefault(skill_name, {'count': 0, 'last_used': None})
+            skill_stats['count'] += 1
+            skill_stats['last_used'] = time.time()
+            logger.debug(f"{skill_name}: Skill used (key: {key}, count: {skill_stats['count']})")
+        
+        self.dispatcher.submit(key, PRIORITY_LOW, source='skill',
+                               press=self.keyboard.press_key, on_done=on_pressed)
     
     def set_window_manager(self, window_manager):
         """WindowManagerの参照を設定"""
         self.window_manager = window_manager
         logger.debug("SkillModule: WindowManager reference set")
     
-    def _skill_loop(self, skill_name: str, config: Dict[str, Any]):
-        """個別スキルのループ処理（即座停止対応）"""
+    def _schedule_skill(self, skill_name: str, config: Dict[str, Any]):
+        """スキルをスケジューラーに登録（初回は即座に使用し、以降はランダム間隔）"""
         key = config['key']
-        interval = config['interval']
+        job_name = f"skill_{skill_name}"
         
-        # 初回使用
-        self._use_skill(key, skill_name)
-        
-        while self.running:
-            # ランダム遅延（アンチチート対策）
-            delay = random.uniform(interval[0], interval[1])
-            logger.debug(f"{skill_name}: Waiting {delay:.3f}s before next use")
-            
-            # より短い間隔（20ms）でチェックして即座に反応
-            for _ in range(int(delay * 50)):  # 10 -> 50に変更（20ms間隔）
-                if not self.running:
-                    logger.debug(f"{skill_name}: Fast stop detected")
-                    break
-                time.sleep(0.02)  # 0.1 -> 0.02に変更（高速チェック）
-            
+        def use_skill():
             if self.running:
-                self._use_skill(key, skill_name)
\ No newline at end of file
+                # 設定の更新でキーが変わった場合もジョブを作り直さずに反映
+                current = self.config.get(skill_name)
+                self._use_skill(current.get('key', key) if isinstance(current, dict) else key, skill_name)
+        
+        self.scheduler.add_job(job_name, use_skill, self._random_interval(config['interval']))
+        if job_name not in self.jobs:
+            self.jobs.append(job_name)
+        self.scheduled_skills[skill_name] = copy.deepcopy(config)
+    
+    @staticmethod
+    def _random_interval(interval):
+        """ランダム遅延（アンチチート対策）の間隔関数"""
+        return lambda: random.uniform(interval[0], interval[1])
@@ -5,18 +5,24 @@ Path of Exile の Tincture アイテムを自動で使用する機能
 import time
 import threading
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
 from src.features.image_recognition import TinctureDetector
+from src.features.multi_tincture_detector import MultiTinctureDetector
 from src.utils.keyboard_input import KeyboardController
-from src.core.config_manager import ConfigManager
+from src.core.config_store import get_config_store
+from src.utils.scheduler import get_scheduler
+from src.utils.input_dispatcher import get_input_dispatcher, PRIORITY_HIGH
 
 logger = logging.getLogger(__name__)
 
 
 class TinctureModule:
-    """Tincture自動使用モジュール"""
+    """Tincture自動使用モジュール（複数Tinctureスロット対応）"""
+    
+    # 使用後にActive状態になるまで判定を保留する時間（秒）
+    POST_USE_WAIT = 3.5
     
     def __init__(self, config: Dict[str, Any], window_manager=None):
         """
@@ -33,8 +39,10 @@ class TinctureModule:
         
         self.config = config
         self.running = False
-        self.thread: Optional[threading.Thread] = None
-        self.last_use_time = 0
+        self.thread: Optional[threading.Thread] = None  # 検出を実行するワーカースレッド
+        self._tick_event: Optional[threading.Event] = None  # スケジューラーからの検出要求
+        self.scheduler = get_scheduler()
+        self.job_name = f"tincture_{id(self):x}"
         self.window_manager = window_manager
         
         # 設定の読み込み
@@ -47,6 +55,16 @@ class TinctureModule:
         self.check_interval = config.get('check_interval', 0.1)  # 100ms
         self.min_use_interval = config.get('min_use_interval', 0.5)  # 500ms
         
+        # クールダウン進捗からの予測ウェイクアップ設定
+        self.predictive_wakeup = config.get('predictive_wakeup', True)
+        self.wakeup_lead = config.get('wakeup_lead', 0.3)  # 予測使用可能時刻の何秒前に起きるか
+        self.max_predictive_sleep = config.get('max_predictive_sleep', 2.0)  # 予測スリープの上限
+        
+        # Tinctureスロット（スロットごとのキー・最小使用間隔・実行時状態）
+        self.slot_configs = self._build_slot_configs(config)
+        self.slot_states: Dict[str, Dict[str, Any]] = {}
+        self._sync_slot_states()
+        
         # AreaSelectorを初期化
         try:
             from src.features.area_selector import AreaSelector
@@ -55,18 +73,13 @@ class TinctureModule:
             logger.warning("AreaSelector not available")
             self.area_selector = None
         
-        # 単一の検出器のみ初期化（設定とAreaSelectorを渡す）
+        # 全スロットを1回のキャプチャで判定する検出器（設定とAreaSelectorを渡す）
         # TinctureDetectorに全設定を渡して検出モードを適用
-        full_config = {'tincture': config}
-        self.detector = TinctureDetector(
-            monitor_config=self.monitor_config,
-            sensitivity=self.sensitivity,
-            area_selector=self.area_selector,
-            config=full_config
-        )
+        self.multi_detector = self._create_multi_detector()
         
         # キーボード制御
         self.keyboard = KeyboardController()
+        self.dispatcher = get_input_dispatcher()
         
         # 統計情報
         self.stats = {
@@ -75,11 +88,96 @@ class TinctureModule:
             'failed_detections': 0,
             'active_detections': 0,
             'idle_detections': 0,
+            'cooldown_detections': 0,
             'unknown_detections': 0,
+            'predictive_sleeps': 0,
+            'predictive_sleep_seconds': 0.0,
             'last_use_timestamp': None
         }
         
-        logger.info(f"TinctureModule initialized: enabled={self.enabled}, key={self.key}, active_detection={self.detector.template_active is not None}")
+        logger.info(f"TinctureModule initialized: enabled={self.enabled}, slots={list(self.slot_configs.keys())}, "
+                    f"keys={[slot['key'] for slot in self.slot_configs.values()]}, active_detection={self.detector.template_active is not None}")
+    
+    def _build_slot_configs(self, config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        設定からTinctureスロット一覧を作成
+        
+        'slots'が未設定の場合は従来の単一Tincture（key/min_use_interval）を1スロットとして扱う
+        """
+        slots = config.get('slots') or {}
+        if not isinstance(slots, dict) or not slots:
+            return {'tincture1': {'key': self.key, 'min_use_interval': self.min_use_interval}}
+        
+        slot_configs = {}
+        for name, slot in slots.items():
+            if not isinstance(slot, dict):
+                logger.warning(f"Invalid tincture slot config for {name}: {slot}")
+                continue
+            slot_configs[name] = {
+                **slot,
+                'key': slot.get('key') or self.key,
+                'min_use_interval': slot.get('min_use_interval', self.min_use_interval)
+            }
+        return slot_configs or {'tincture1': {'key': self.key, 'min_use_interval': self.min_use_interval}}
+    
+    def _sync_slot_states(self) -> None:
+        """スロット構成に合わせて実行時状態を作成（既存スロットの使用時刻は保持）"""
+        states = {}
+        for name in self.slot_configs:
+            states[name] = self.slot_states.get(name) or {
+                'state': "N/A",
+                'last_use_time': 0,
+                'hold_until': 0,
+                'total_uses': 0,
+                'cooldown_marks': {},  # 進捗段階 -> (直前の観測時刻, 今回のクールダウンで初めて観測した時刻)
+                'cooldown_rate': None,  # 回復速度（進捗/秒、サイクルを跨いで保持）
+                'last_observed': None,  # 直前に検出結果を処理した時刻
+                'predicted_ready_time': None,
+                'cooldown_progress': None
+            }
+        self.slot_states = states
+        # 代表スロットのキーを従来のkey属性として公開
+        self.key = self.slot_configs[self.primary_slot]['key']
+    
+    def _create_multi_detector(self) -> MultiTinctureDetector:
+        """スロット構成から検出器を作成"""
+        return MultiTinctureDetector(
+            slots=self.slot_configs,
+            monitor_config=self.monitor_config,
+            sensitivity=self.sensitivity,
+            area_selector=self.area_selector,
+            config={'tincture': self.config}
+        )
+    
+    @property
+    def primary_slot(self) -> str:
+        """代表スロット名（手動使用・従来APIの対象）"""
+        return next(iter(self.slot_configs))
+    
+    @property
+    def detector(self) -> TinctureDetector:
+        """代表スロットの検出器（従来の単一検出器API）"""
+        return self.multi_detector.detectors[self.primary_slot]
+    
+    @detector.setter
+    def detector(self, new_detector: TinctureDetector) -> None:
+        self.multi_detector.set_detector(self.primary_slot, new_detector)
+    
+    @property
+    def last_use_time(self) -> float:
+        """代表スロットの最終使用時刻"""
+        return self.slot_states[self.primary_slot]['last_use_time']
+    
+    @last_use_time.setter
+    def last_use_time(self, value: float) -> None:
+        self.slot_states[self.primary_slot]['last_use_time'] = value
+    
+    @property
+    def predicted_ready_time(self) -> Optional[float]:
+        """最も早く使用可能になると予測されるスロットの時刻"""
+        times = [state['predicted_ready_time'] for state in self.slot_states.values()
+                 if state['predicted_ready_time'] is not None]
+        return min(times) if times else None
     
     
     def start(self) -> None:
@@ -95,8 +193,15 @@ class TinctureModule:
         try:
             self.running = True
             logger.info("Tincture module start signal sent")
-            self.thread = threading.Thread(target=self._tincture_loop, daemon=True)
+            logger.info("Tincture monitoring started (with Active state detection)")
+            logger.debug(f"Detection interval: {self.check_interval}s, Slots: {self.slot_configs}")
+            # 検出（キャプチャ・テンプレートマッチング）は専用のワーカーで実行し、
+            # 共有スケジューラーのスレッドでは検出の要求だけを行う（フラスコ・スキルの期限を遅らせない）
+            self._tick_event = threading.Event()
+            self.thread = threading.Thread(target=self._detection_loop, args=(self._tick_event,),
+                                           name="TinctureDetection", daemon=True)
             self.thread.start()
+            self.scheduler.add_job(self.job_name, self._request_tick, self.check_interval)
             logger.info("Tincture module started successfully")
             
         except Exception as e:
@@ -114,100 +219,203 @@ class TinctureModule:
             self.running = False
             logger.info("Tincture module stop signal sent")
             
-            # 短いタイムアウトでスレッド終了を待機（高速チェックで早期終了）
-            if self.thread and self.thread.is_alive():
-                self.thread.join(timeout=0.1)  # 2.0 -> 0.1に短縮
-                if self.thread.is_alive():
-                    logger.warning("Tincture thread still running (fast stop)")
+            # スケジューラーから検出ジョブを削除し、ワーカーを終了させる（検出中の場合は終了を待たない）
+            self.scheduler.remove_job(self.job_name)
+            if self._tick_event is not None:
+                self._tick_event.set()
+                self._tick_event = None
+            self.thread = None
+            self.dispatcher.cancel(source='tincture')
+            logger.info("Tincture monitoring ended")
+            
+            # 停止中は共有キャプチャ対象から検出エリアを外す
+            if self.multi_detector:
+                self.multi_detector.release()
             
             logger.info("Tincture module stopped")
             
         except Exception as e:
             logger.error(f"Error stopping tincture module: {e}")
     
-    def _tincture_loop(self) -> None:
-        """Active状態を考慮したTincture管理ループ"""
-        logger.info("Tincture monitoring started (with Active state detection)")
-        logger.debug(f"Detection interval: {self.check_interval}s, Min use interval: {self.min_use_interval}s")
+    def _request_tick(self) -> float:
+        """
+        スケジューラーのジョブ: 検出ワーカーに1ティック分の検出を要求（即座に戻る）
         
-        while self.running:
-            try:
-                # 現在の状態を取得
-                current_state = self.detector.get_tincture_state()
-                logger.debug(f"Current Tincture state: {current_state}")
+        Returns:
+            次回の要求までの秒数（通常はワーカーが検出後に設定し直すため、その保険）
+        """
+        tick_event = self._tick_event
+        if tick_event is not None:
+            tick_event.set()
+        return self.max_predictive_sleep + self.check_interval
+    
+    def _detection_loop(self, tick_event: threading.Event) -> None:
+        """検出ワーカー: 要求ごとに検出し、次回の検出時刻をスケジューラーに設定"""
+        while True:
+            tick_event.wait()
+            tick_event.clear()
+            if not self.running or self._tick_event is not tick_event:
+                break
+            delay = self._tincture_tick()
+            if self.running and self._tick_event is tick_event:
+                self.scheduler.reschedule(self.job_name, delay)
+        logger.debug("Tincture detection worker finished")
+    
+    def _tincture_tick(self) -> float:
+        """
+        Active状態を考慮したTincture管理の1ティック（全スロットを1フレームで判定）
+        
+        Returns:
+            次回の検出までの秒数（検出ワーカーがスケジューラーに設定）
+        """
+        if not self.running:
+            return self.check_interval
+        
+        try:
+            # 全スロットの状態を取得（1フレームで全状態とクールダウン進捗を判定）
+            detections = self.multi_detector.detect_all()
+            
+            for slot_name, detection in detections.items():
+                if slot_name in self.slot_states:
+                    self._process_slot_detection(slot_name, detection, time.time())
+            
+            # 使用直後・クールダウン中のスロットは必要な時刻まで検出を休止
+            return self._get_next_check_delay(time.time())
+            
+        except Exception as e:
+            logger.error(f"Error in tincture loop: {e}")
+            import traceback
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            return self.check_interval * 2
+    
+    def _process_slot_detection(self, slot_name: str, detection: Dict[str, Any], current_time: float) -> None:
+        """1スロット分の検出結果を処理（必要に応じてTinctureを使用）"""
+        slot = self.slot_states[slot_name]
+        slot_config = self.slot_configs[slot_name]
+        current_state = detection['state']
+        slot['state'] = current_state
+        slot['cooldown_progress'] = detection.get('cooldown_progress')
+        logger.debug(f"Current Tincture state [{slot_name}]: {current_state}")
+        
+        if current_state == "ACTIVE":
+            # Active状態の場合は何もしない（維持する）
+            logger.debug(f"Tincture [{slot_name}] is ACTIVE - maintaining state, no action needed")
+            self.stats['active_detections'] += 1
+            
+        elif current_state == "IDLE":
+            # Idle状態でかつ最小使用間隔を満たしている場合のみ使用
+            time_since_last_use = current_time - slot['last_use_time']
+            
+            if current_time < slot['hold_until']:
+                # 使用直後（Active状態になるまで待つ）
+                logger.debug(f"Tincture [{slot_name}] waiting to become active after use")
+                self.stats['idle_detections'] += 1
+            elif time_since_last_use >= slot_config['min_use_interval']:
+                logger.info(f"Tincture IDLE detected! Using tincture [{slot_name}] (key: {slot_config['key']}) - last use: {time_since_last_use:.2f}s ago")
+                success = self._use_tincture(slot_config['key'])
                 
-                if current_state == "ACTIVE":
-                    # Active状態の場合は何もしない（維持する）
-                    logger.debug("Tincture is ACTIVE - maintaining state, no action needed")
-                    self.stats['active_detections'] += 1
-                    
-                elif current_state == "IDLE":
-                    # Idle状態でかつ最小使用間隔を満たしている場合のみ使用
-                    current_time = time.time()
-                    time_since_last_use = current_time - self.last_use_time
+                if success:
+                    # 統計を更新
+                    slot['last_use_time'] = current_time
+                    slot['total_uses'] += 1
+                    self.stats['total_uses'] += 1
+                    self.stats['successful_detections'] += 1
+                    self.stats['idle_detections'] += 1
+                    self.stats['last_use_timestamp'] = current_time
                     
-                    if time_since_last_use >= self.min_use_interval:
-                        logger.info(f"Tincture IDLE detected! Using tincture (key: {self.key}) - last use: {time_since_last_use:.2f}s ago")
-                        success = self._use_tincture()
-                        
-                        if success:
-                            # 統計を更新
-                            self.last_use_time = current_time
-                            self.stats['total_uses'] += 1
-                            self.stats['successful_detections'] += 1
-                            self.stats['idle_detections'] += 1
-                            self.stats['last_use_timestamp'] = current_time
-                            
-                            logger.info(f"Tincture used successfully. Total uses: {self.stats['total_uses']}")
-                            
-                            # 使用後はより長い待機を設定（Active状態になるまで待つ）
-                            logger.debug("Waiting 3-4 seconds for tincture to become active...")
-                            # 3.5秒を350回に分割して高速チェック
-                            for _ in range(350):
-                                if not self.running:
-                                    logger.debug("Tincture: Fast stop during post-use wait")
-                                    break
-                                time.sleep(0.01)  # 10ms間隔
-                        else:
-                            logger.warning("Tincture use failed")
-                    else:
-                        logger.debug(f"Skipping use - minimum interval not met ({time_since_last_use:.2f}s < {self.min_use_interval}s)")
-                        self.stats['idle_detections'] += 1
-                        
-                elif current_state == "UNKNOWN":
-                    # UNKNOWN状態
-                    self.stats['failed_detections'] += 1
-                    self.stats['unknown_detections'] += 1
-                    logger.debug("Tincture state unknown")
+                    logger.info(f"Tincture used successfully. Total uses: {self.stats['total_uses']}")
                     
+                    # 使用後はActive状態になるまでこのスロットの判定を保留
+                    logger.debug(f"Waiting {self.POST_USE_WAIT}s for tincture [{slot_name}] to become active...")
+                    slot['hold_until'] = current_time + self.POST_USE_WAIT
                 else:
-                    # ERROR状態など
-                    self.stats['failed_detections'] += 1
-                    logger.debug(f"Tincture state error or unexpected: {current_state}")
-                
-                # 高速チェック対応の検出間隔（即座停止のため）
-                # チェック間隔を細かく分割してrunningチェック
-                sleep_chunks = max(1, int(self.check_interval / 0.01))  # 10ms間隔でチェック
-                for _ in range(sleep_chunks):
-                    if not self.running:
-                        logger.debug("Tincture: Fast stop detected")
-                        break
-                    time.sleep(0.01)  # 10ms間隔で高速チェック
+                    logger.warning(f"Tincture use failed [{slot_name}]")
+            else:
+                logger.debug(f"Skipping use [{slot_name}] - minimum interval not met ({time_since_last_use:.2f}s < {slot_config['min_use_interval']}s)")
+                self.stats['idle_detections'] += 1
                 
-            except Exception as e:
-                logger.error(f"Error in tincture loop: {e}")
-                import traceback
-                logger.error(f"Traceback: {traceback.format_exc()}")
-                # エラー時の待機も高速チェック対応
-                error_sleep = self.check_interval * 2
-                error_chunks = max(1, int(error_sleep / 0.01))
-                for _ in range(error_chunks):
-                    if not self.running:
-                        break
-                    time.sleep(0.01)
+        elif current_state == "COOLDOWN":
+            # クールダウン中は使用不可（チャージ回復待ち）
+            logger.debug(f"Tincture [{slot_name}] is on COOLDOWN - waiting for recharge")
+            self.stats['cooldown_detections'] += 1
+            
+        elif current_state == "UNKNOWN":
+            # UNKNOWN状態
+            self.stats['failed_detections'] += 1
+            self.stats['unknown_detections'] += 1
+            logger.debug(f"Tincture [{slot_name}] state unknown")
+            
+        else:
+            # ERROR状態など
+            self.stats['failed_detections'] += 1
+            logger.debug(f"Tincture [{slot_name}] state error or unexpected: {current_state}")
+        
+        self._update_cooldown_prediction(slot, detection, current_time)
+    
+    def _update_cooldown_prediction(self, slot: Dict[str, Any], detection: Dict[str, Any], now: float) -> None:
+        """
+        クールダウン進捗の観測から使用可能になる時刻を予測
+        
+        段階が切り替わった時刻は「直前の観測時刻」から「初めて観測した時刻」の間のどこかであり、
+        予測スリープ明けは後者が大きく遅れる。予測が実際の回復を追い越さないよう、
+        回復速度は速め（最新段階は直前の観測時刻、最古段階は初観測時刻で計算）に、
+        使用可能時刻は早め（最新段階の直前の観測時刻を起点）に見積もる。
+        """
+        previous = slot['last_observed']
+        slot['last_observed'] = now
+        progress = detection.get('cooldown_progress')
+        marks = slot['cooldown_marks']
+        if detection['state'] != "COOLDOWN" or progress is None:
+            if detection['state'] in ("IDLE", "ACTIVE"):
+                # クールダウン終了: 今回のサイクルの観測を破棄（回復速度は保持）
+                marks.clear()
+            slot['predicted_ready_time'] = None
+            return
+        
+        if progress not in marks:
+            marks[progress] = (previous if previous is not None else now, now)
+            
+            # 2段階以上観測できたら回復速度を更新
+            lowest = min(marks)
+            highest = max(marks)
+            reached_after, seen = marks[highest]
+            elapsed = reached_after - marks[lowest][1]
+            # 切り替わり時刻の幅が広い観測（予測スリープ明けなど）は既存の回復速度を優先
+            precise = seen - reached_after <= self.check_interval * 2
+            if highest > lowest and elapsed > 0 and (precise or not slot['cooldown_rate']):
+                slot['cooldown_rate'] = (highest - lowest) / elapsed
+                logger.debug(f"Tincture cooldown rate estimated: {slot['cooldown_rate']:.3f}/s")
+        
+        if slot['cooldown_rate']:
+            # 最新段階に達した可能性のある最も早い時刻から残り時間を算出
+            latest = max(marks)
+            slot['predicted_ready_time'] = marks[latest][0] + (1.0 - latest) / slot['cooldown_rate']
+    
+    def _get_slot_check_delay(self, slot: Dict[str, Any], now: float) -> Tuple[float, bool]:
+        """スロットの次回検出までの待機時間と、それが予測スリープかどうかを取得"""
+        # 使用直後はActive状態になるまで判定不要
+        if slot['hold_until'] - now > self.check_interval:
+            return slot['hold_until'] - now, False
+        
+        if not self.predictive_wakeup or slot['predicted_ready_time'] is None:
+            return self.check_interval, False
         
-        logger.info("Tincture monitoring ended")
+        remaining = slot['predicted_ready_time'] - self.wakeup_lead - now
+        if remaining <= self.check_interval:
+            # 遷移直前は通常間隔でポーリング
+            return self.check_interval, False
+        
+        return min(remaining, self.max_predictive_sleep), True
     
+    def _get_next_check_delay(self, now: float) -> float:
+        """次の検出までの待機時間を取得（全スロットのうち最も早く検出が必要な時刻まで休止）"""
+        delay, predictive = min(self._get_slot_check_delay(slot, now) for slot in self.slot_states.values())
+        
+        if predictive:
+            self.stats['predictive_sleeps'] += 1
+            self.stats['predictive_sleep_seconds'] += delay - self.check_interval
+            logger.debug(f"Tincture on cooldown - sleeping {delay:.2f}s until predicted recharge")
+        return delay
     
     def update_config(self, new_config: Dict[str, Any]) -> None:
         """設定を更新"""
@@ -228,11 +436,25 @@ class TinctureModule:
             self.sensitivity = new_config.get('sensitivity', self.sensitivity)
             self.check_interval = new_config.get('check_interval', 0.1)
             self.min_use_interval = new_config.get('min_use_interval', 0.5)
+            self.predictive_wakeup = new_config.get('predictive_wakeup', True)
+            self.wakeup_lead = new_config.get('wakeup_lead', 0.3)
+            self.max_predictive_sleep = new_config.get('max_predictive_sleep', 2.0)
+            
+            # スロット構成を更新（テンプレートフォルダが変わった場合は検出器を再作成）
+            old_folders = {name: slot.get('folder_path') for name, slot in self.slot_configs.items()}
+            self.slot_configs = self._build_slot_configs(new_config)
+            self._sync_slot_states()
+            new_folders = {name: slot.get('folder_path') for name, slot in self.slot_configs.items()}
+            if old_folders != new_folders:
+                logger.info(f"Tincture slots changed: {list(old_folders.keys())} -> {list(new_folders.keys())}")
+                old_detector = self.multi_detector
+                self.multi_detector = self._create_multi_detector()
+                old_detector.release()
             
             # 検出器の感度を更新
             if old_sensitivity != self.sensitivity:
                 logger.info(f"TinctureModule sensitivity updated: {old_sensitivity:.3f} -> {self.sensitivity:.3f}")
-            self.detector.update_sensitivity(self.sensitivity)
+            self.multi_detector.update_sensitivity(self.sensitivity, self.slot_configs)
             
             # 有効/無効の状態変化に応じて起動/停止
             if old_enabled != self.enabled:
@@ -240,6 +462,10 @@ class TinctureModule:
                     self.start()
                 else:
                     self.stop()
+            elif self.running:
+                # 新しい設定で即座に再判定（予測スリープ中でも待たない）
+                self.scheduler.update_interval(self.job_name, self.check_interval)
+                self.scheduler.reschedule(self.job_name, 0.0)
             
             logger.info("Tincture module configuration updated")
             
@@ -251,9 +477,9 @@ class TinctureModule:
         try:
             self.area_selector = new_area_selector
             
-            # TinctureDetectorのarea_selectorを更新
-            if self.detector:
-                self.detector.area_selector = new_area_selector
+            # 全スロットのTinctureDetectorのarea_selectorを更新
+            if self.multi_detector:
+                self.multi_detector.set_area_selector(new_area_selector)
                 logger.info("Detection area updated successfully in TinctureModule")
             else:
                 logger.warning("TinctureDetector not available for area update")
@@ -274,31 +500,54 @@ class TinctureModule:
                 **self.stats,
                 'active_detections': self.stats.get('active_detections', 0),
                 'idle_detections': self.stats.get('idle_detections', 0),
+                'cooldown_detections': self.stats.get('cooldown_detections', 0),
                 'unknown_detections': self.stats.get('unknown_detections', 0)
-            }
+            },
+            'slots': self._get_slot_summary(),
+            'detection': self.multi_detector.get_detection_stats() if self.multi_detector else {}
         }
     
     def get_status(self) -> Dict[str, Any]:
         """現在のステータスを取得"""
-        # 現在の状態を取得（ステータスチェック時のみ）
-        current_state = "N/A"
-        try:
-            if self.running and self.detector:
-                current_state = self.detector.get_tincture_state()
-        except Exception as e:
-            logger.debug(f"Failed to get current state in get_status: {e}")
+        # 現在の状態（検出ループが判定した最新の状態を使用し、追加のキャプチャは行わない）
+        primary = self.slot_states[self.primary_slot]
+        current_state = primary['state'] if self.running else "N/A"
+        
+        predicted_ready_in = None
+        if self.predicted_ready_time is not None:
+            predicted_ready_in = max(0.0, self.predicted_ready_time - time.time())
         
         return {
             'enabled': self.enabled,
             'running': self.running,
             'current_state': current_state,
+            'cooldown_progress': primary['cooldown_progress'],
+            'predicted_ready_in': predicted_ready_in,
+            'slots': self._get_slot_summary(),
             'last_use_time': self.last_use_time,
             'total_uses': self.stats['total_uses'],
             'active_detections': self.stats.get('active_detections', 0),
             'idle_detections': self.stats.get('idle_detections', 0),
+            'cooldown_detections': self.stats.get('cooldown_detections', 0),
             'unknown_detections': self.stats.get('unknown_detections', 0)
         }
     
+    def _get_slot_summary(self) -> Dict[str, Dict[str, Any]]:
+        """スロットごとの状態概要を取得"""
+        now = time.time()
+        summary = {}
+        for name, slot in self.slot_states.items():
+            predicted = slot['predicted_ready_time']
+            summary[name] = {
+                'key': self.slot_configs[name]['key'],
+                'state': slot['state'],
+                'total_uses': slot['total_uses'],
+                'last_use_time': slot['last_use_time'],
+                'cooldown_progress': slot['cooldown_progress'],
+                'predicted_ready_in': max(0.0, predicted - now) if predicted is not None else None
+            }
+        return summary
+    
     def manual_use(self) -> bool:
         """手動でTinctureを使用"""
         try:
@@ -320,6 +569,7 @@ class TinctureModule:
             if success:
                 # 使用時刻と統計の更新
                 self.last_use_time = current_time
+                self.slot_states[self.primary_slot]['total_uses'] += 1
                 self.stats['total_uses'] += 1
                 self.stats['last_use_timestamp'] = current_time
             
@@ -337,23 +587,29 @@ class TinctureModule:
             'failed_detections': 0,
             'active_detections': 0,
             'idle_detections': 0,
+            'cooldown_detections': 0,
             'unknown_detections': 0,
+            'predictive_sleeps': 0,
+            'predictive_sleep_seconds': 0.0,
             'last_use_timestamp': None
         }
+        for slot in self.slot_states.values():
+            slot['total_uses'] = 0
+        if self.multi_detector:
+            self.multi_detector.reset_detection_stats()
         logger.info("Tincture statistics reset")
     
     def _get_default_sensitivity(self) -> float:
         """設定ファイルからデフォルト感度を取得"""
         try:
-            config_manager = ConfigManager()
-            default_config = config_manager.load_config()
-            return default_config.get('tincture', {}).get('sensitivity', 0.7)
+            return get_config_store().snapshot().get('tincture', {}).get('sensitivity', 0.7)
         except Exception as e:
             logger.warning(f"Failed to load default sensitivity from config: {e}")
             return 0.7  # フォールバック値
     
-    def _use_tincture(self) -> bool:
+    def _use_tincture(self, key: Optional[str] = None) -> bool:
         """Tinctureを使用（POEウィンドウアクティブチェック付き）"""
+        key = key or self.key
         # Path of Exileがアクティブでない場合はスキップ
         if hasattr(self, 'window_manager') and self.window_manager:
             try:
@@ -364,10 +620,10 @@ class TinctureModule:
                 logger.debug(f"Error checking POE window status: {e}")
                 # エラーが発生してもキー入力を継続
         
-        # POEがアクティブの場合のみキー入力を実行
+        # POEがアクティブの場合のみキー入力を要求（検出ループを止めないよう非同期に実行）
         try:
-            self.keyboard.press_key(self.key)
-            logger.debug(f"Tincture used (key: {self.key})")
+            self.dispatcher.submit(key, PRIORITY_HIGH, source='tincture', press=self.keyboard.press_key)
+            logger.debug(f"Tincture use requested (key: {key})")
             return True
         except Exception as e:
             logger.error(f"Error using tincture: {e}")
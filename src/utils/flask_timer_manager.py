@@ -2,17 +2,19 @@
 Flask timer manager for independent flask timers
 """
 import time
-import threading
 import logging
-from typing import Dict, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
+
+from src.utils.scheduler import DeadlineScheduler, get_scheduler, NS_PER_MS
 
 logger = logging.getLogger(__name__)
 
 class FlaskTimer:
-    """個別のフラスコタイマー"""
+    """個別のフラスコタイマー（共有デッドラインスケジューラーのジョブとして動作）"""
     
     def __init__(self, slot_num: int, key: str, duration_ms: int, 
-                 use_callback: Callable, use_when_full: bool = False):
+                 use_callback: Callable, use_when_full: bool = False,
+                 scheduler: Optional[DeadlineScheduler] = None, job_prefix: str = "flask"):
         """
         初期化
         
@@ -22,6 +24,8 @@ class FlaskTimer:
             duration_ms: 持続時間（ミリ秒）
             use_callback: 使用時のコールバック関数
             use_when_full: チャージフル時のみ使用するか（廃止予定）
+            scheduler: 使用するスケジューラー（Noneの場合はプロセス共通）
+            job_prefix: スケジューラーのジョブ名の接頭辞（共有スケジューラー上で管理クラスごとに一意）
         """
         self.slot_num = slot_num
         self.key = key
@@ -31,50 +35,116 @@ class FlaskTimer:
         
         self.last_use_time = 0
         self.is_running = False
-        self.timer_thread = None
+        self.scheduler = scheduler or get_scheduler()
+        self.job_name = f"{job_prefix}_slot_{slot_num}"
+        # 同時期に使用予定の他タイマーとまとめて押下する場合の調整関数（処理した場合True）
+        self.burst_coordinator: Optional[Callable[['FlaskTimer'], bool]] = None
         
         # 統計情報
         self.total_uses = 0
         self.total_skips = 0  # 削除可能  # チャージフル待ちでスキップした回数
+        
+        # ドリフト統計（目標時刻に対する実際のキー押下時刻のずれ）
+        self.press_latency_ns = 0  # 起動からキー押下までの遅延（指数移動平均）
+        self.drift_stats = self._new_drift_stats()
+    
+    @staticmethod
+    def _new_drift_stats() -> Dict:
+        """ドリフト統計の初期値"""
+        return {
+            'samples': 0,
+            'last_drift_ms': 0.0,
+            'max_drift_ms': 0.0,
+            'total_drift_ms': 0.0,
+            'total_abs_drift_ms': 0.0
+        }
     
-    def start(self):
-        """タイマーを開始"""
+    def start(self, first_delay: float = 0.0):
+        """タイマーを開始（初回は first_delay 秒後、既定では即座に使用）"""
         if self.is_running:
             return
         
         self.is_running = True
-        self.timer_thread = threading.Thread(target=self._timer_loop, daemon=True)
-        self.timer_thread.start()
+        self.scheduler.add_job(self.job_name, self._on_due, self.duration_ms / 1000.0, first_delay=first_delay)
         logger.info(f"Flask timer started for slot {self.slot_num} (key: {self.key})")
     
     def stop(self):
         """タイマーを停止"""
         self.is_running = False
-        if self.timer_thread:
-            self.timer_thread.join(timeout=1.0)
+        self.scheduler.remove_job(self.job_name)
         logger.info(f"Flask timer stopped for slot {self.slot_num}")
     
-    def _timer_loop(self):
-        """タイマーループ"""
-        while self.is_running:
-            try:
-                current_time = time.time() * 1000  # ミリ秒
-                
-                # 持続時間が経過したかチェック
-                if current_time - self.last_use_time >= self.duration_ms:
-                    # フラスコを使用（常に使用する）
-                    if self.use_callback:
-                        self.use_callback(self.key)
-                    self.last_use_time = current_time
-                    self.total_uses += 1
-                    logger.debug(f"Flask used: slot {self.slot_num}, key {self.key}")
-                
-                # 100ms待機
-                time.sleep(0.1)
-                
-            except Exception as e:
-                logger.error(f"Error in flask timer loop for slot {self.slot_num}: {e}")
-                time.sleep(1.0)  # エラー時は長めに待機
+    def set_duration(self, duration_ms: int):
+        """
+        持続時間を変更（ジョブは作り直さず、次回使用は前回使用から新しい持続時間後）
+        
+        Args:
+            duration_ms: 新しい持続時間（ミリ秒）
+        """
+        old_duration_ms = self.duration_ms
+        self.duration_ms = duration_ms
+        if not self.is_running or old_duration_ms == duration_ms:
+            return
+        self.scheduler.update_interval(self.job_name, duration_ms / 1000.0)
+        target_ns = self.scheduler.get_target_ns(self.job_name)
+        if target_ns is not None and self.total_uses > 0:
+            # 予定中の次回使用を持続時間の差だけずらす（既に過ぎている場合は即座に使用）
+            new_target_ns = target_ns + int((duration_ms - old_duration_ms) * NS_PER_MS)
+            self.scheduler.reschedule(self.job_name, (new_target_ns - time.monotonic_ns()) / 1e9)
+    
+    def _on_due(self):
+        """持続時間が経過した時にスケジューラーから呼ばれる"""
+        if not self.is_running:
+            return
+        if self.burst_coordinator and self.burst_coordinator(self):
+            return
+        fired_ns, target_ns = self.begin_use()
+        if self.use_callback:
+            # キー押下は非同期のため、押下時刻は完了通知で受け取る
+            self.use_callback(self.key, on_pressed=lambda key_down_ns: self.on_pressed(fired_ns, key_down_ns, target_ns))
+        logger.debug(f"Flask used: slot {self.slot_num}, key {self.key}")
+    
+    def begin_use(self, early: bool = False):
+        """
+        使用開始を記録し、(起動時刻, 目標時刻) を返す
+        
+        Args:
+            early: 予定より前倒しで使用する場合True（次回は今から持続時間後に再スケジュール）
+        """
+        fired_ns = time.monotonic_ns()
+        target_ns = self.scheduler.get_target_ns(self.job_name)
+        if early:
+            self.scheduler.reschedule(self.job_name, self.duration_ms / 1000.0)
+        self.last_use_time = time.time() * 1000
+        self.total_uses += 1
+        return fired_ns, target_ns
+    
+    def on_pressed(self, fired_ns: int, key_down_ns: Optional[int], target_ns: Optional[int],
+                   update_lead: bool = True):
+        """キー押下完了時の処理（押下時刻が分かる場合は遅延を計測し、次回以降の起動を遅延分だけ早める）"""
+        if key_down_ns is None or target_ns is None:
+            return
+        self._record_press_timing(fired_ns, key_down_ns, target_ns, update_lead)
+        self.last_use_time = time.time() * 1000 - (time.monotonic_ns() - key_down_ns) / NS_PER_MS
+    
+    def _record_press_timing(self, fired_ns: int, key_down_ns: int, target_ns: int, update_lead: bool = True):
+        """キー押下の遅延とドリフトを記録し、スケジューラーの起動補正を更新"""
+        # バースト内の2番目以降のキーは前のキーの押下時間を含むため補正には使わない
+        if update_lead:
+            latency_ns = max(0, key_down_ns - fired_ns)
+            if self.press_latency_ns:
+                self.press_latency_ns += (latency_ns - self.press_latency_ns) // 4
+            else:
+                self.press_latency_ns = latency_ns
+            self.scheduler.set_lead(self.job_name, self.press_latency_ns / 1e9)
+        
+        drift_ms = (key_down_ns - target_ns) / NS_PER_MS
+        stats = self.drift_stats
+        stats['samples'] += 1
+        stats['last_drift_ms'] = drift_ms
+        stats['max_drift_ms'] = max(stats['max_drift_ms'], abs(drift_ms))
+        stats['total_drift_ms'] += drift_ms
+        stats['total_abs_drift_ms'] += abs(drift_ms)
     
     def _should_use_flask(self) -> bool:
         """フラスコを使用すべきかどうかを判断（廃止）"""
@@ -86,35 +156,69 @@ class FlaskTimer:
             self.use_callback(self.key)
         self.last_use_time = time.time() * 1000
         self.total_uses += 1
+        # 次回使用は強制使用時点から持続時間後
+        if self.is_running:
+            self.scheduler.reschedule(self.job_name, self.duration_ms / 1000.0)
         logger.info(f"Flask force used: slot {self.slot_num}, key {self.key}")
     
     def reset_stats(self):
         """統計情報をリセット"""
         self.total_uses = 0
         self.total_skips = 0
+        self.drift_stats = self._new_drift_stats()
         logger.info(f"Stats reset for slot {self.slot_num}")
     
     def get_stats(self) -> Dict:
         """統計情報を取得"""
+        job_stats = self.scheduler.get_stats()['jobs'].get(self.job_name, {}) if self.is_running else {}
+        samples = self.drift_stats['samples']
         return {
             'total_uses': self.total_uses,
             'total_skips': self.total_skips,
             'last_use_time': self.last_use_time,
             'duration_ms': self.duration_ms,
-            'is_running': self.is_running
+            'is_running': self.is_running,
+            'avg_lateness_ms': job_stats.get('avg_lateness_ms', 0.0),
+            'max_lateness_ms': job_stats.get('max_lateness_ms', 0.0),
+            'press_latency_ms': self.press_latency_ns / NS_PER_MS,
+            'drift': {
+                'samples': samples,
+                'last_ms': self.drift_stats['last_drift_ms'],
+                'max_abs_ms': self.drift_stats['max_drift_ms'],
+                'avg_ms': self.drift_stats['total_drift_ms'] / samples if samples else 0.0,
+                'avg_abs_ms': self.drift_stats['total_abs_drift_ms'] / samples if samples else 0.0
+            }
         }
 
 class FlaskTimerManager:
     """フラスコタイマー管理クラス"""
     
-    def __init__(self, key_press_callback: Optional[Callable] = None):
+    # 全タイマー開始時の初回使用までの秒数
+    START_DELAY = 0.05
+    
+    def __init__(self, key_press_callback: Optional[Callable] = None,
+                 scheduler: Optional[DeadlineScheduler] = None,
+                 burst_callback: Optional[Callable] = None, burst_window_ms: int = 0):
         """
         初期化
         
         Args:
             key_press_callback: キー押下時のコールバック関数
+            scheduler: 全タイマーで共有するスケジューラー（Noneの場合はプロセス共通）
+            burst_callback: 複数キーをまとめて押下するコールバック関数 (keys, on_pressed)
+            burst_window_ms: この時間内に使用予定のフラスコをまとめて押下する（0で無効）
         """
         self.key_press_callback = key_press_callback
+        self.scheduler = scheduler or get_scheduler()
+        # 共有スケジューラー上で他の管理クラスのタイマーと名前が衝突しないよう接頭辞を付ける
+        self.job_prefix = f"flask_{id(self):x}"
+        self.burst_callback = burst_callback
+        self.burst_window_ms = burst_window_ms
+        self.burst_stats = {
+            'presses': 0,
+            'bursts': 0,
+            'coalesced_presses': 0
+        }
         self.timers: Dict[int, FlaskTimer] = {}
         self.is_enabled = False
     
@@ -143,8 +247,11 @@ class FlaskTimerManager:
             key=key,
             duration_ms=duration_ms,
             use_callback=self._use_flask,
-            use_when_full=use_when_full
+            use_when_full=use_when_full,
+            scheduler=self.scheduler,
+            job_prefix=self.job_prefix
         )
+        timer.burst_coordinator = self._coordinate_burst
         
         self.timers[slot_num] = timer
         
@@ -169,8 +276,10 @@ class FlaskTimerManager:
     def start_all_timers(self):
         """全てのタイマーを開始"""
         self.is_enabled = True
+        # 全タイマーの登録が終わってから初回使用させ、1回の連続押下にまとめる
+        first_delay = self.START_DELAY if self.burst_window_ms > 0 and len(self.timers) > 1 else 0.0
         for timer in self.timers.values():
-            timer.start()
+            timer.start(first_delay)
         logger.info(f"All flask timers started ({len(self.timers)} timers)")
     
     def stop_all_timers(self):
@@ -215,6 +324,8 @@ class FlaskTimerManager:
         else:
             for timer in self.timers.values():
                 timer.reset_stats()
+            for key in self.burst_stats:
+                self.burst_stats[key] = 0
             logger.info("All flask stats reset")
     
     def get_stats(self, slot_num: Optional[int] = None) -> Dict:
@@ -255,29 +366,118 @@ class FlaskTimerManager:
             return self.timers[slot_num].is_running
         return False
     
-    def _use_flask(self, key: str):
-        """フラスコ使用時の内部処理"""
+    def _coordinate_burst(self, timer: FlaskTimer) -> bool:
+        """
+        期限が来たタイマーと、burst_window_ms 以内に期限が来る他のタイマーを1回の連続押下にまとめる
+        
+        Returns:
+            バーストとして処理した場合True（Falseの場合はタイマーが単独で押下する）
+        """
+        members = [timer]
+        if self.burst_window_ms > 0 and self.burst_callback:
+            horizon_ns = time.monotonic_ns() + int(self.burst_window_ms * NS_PER_MS)
+            for other in self.timers.values():
+                if other is timer or not other.is_running or other.key == timer.key:
+                    continue
+                target_ns = self.scheduler.get_target_ns(other.job_name)
+                if target_ns is not None and target_ns - other.press_latency_ns <= horizon_ns:
+                    members.append(other)
+        
+        self.burst_stats['presses'] += len(members)
+        if len(members) == 1:
+            return False
+        
+        # 期限が来たタイマーを先頭に、他は予定を前倒しして同時に押下
+        uses = [member.begin_use(early=member is not timer) for member in members]
+        
+        def on_pressed(key_down_times):
+            for index, (member, (fired_ns, target_ns)) in enumerate(zip(members, uses)):
+                key_down_ns = key_down_times[index] if key_down_times else None
+                member.on_pressed(fired_ns, key_down_ns, target_ns, update_lead=index == 0)
+        
+        try:
+            self.burst_callback([member.key for member in members], on_pressed=on_pressed)
+        except Exception as e:
+            logger.error(f"Error in burst press callback for keys {[m.key for m in members]}: {e}")
+        
+        self.burst_stats['bursts'] += 1
+        self.burst_stats['coalesced_presses'] += len(members)
+        logger.debug(f"Flask burst: slots {[m.slot_num for m in members]}")
+        return True
+    
+    def get_burst_stats(self) -> Dict:
+        """バースト統計（まとめて押下したフラスコの割合）を取得"""
+        presses = self.burst_stats['presses']
+        return {
+            **self.burst_stats,
+            'burst_window_ms': self.burst_window_ms,
+            'coalescing_ratio': self.burst_stats['coalesced_presses'] / presses if presses else 0.0
+        }
+    
+    def _use_flask(self, key: str, on_pressed: Optional[Callable] = None):
+        """フラスコ使用時の内部処理（on_pressedはキー押下時刻を受け取る完了通知）"""
         if self.key_press_callback:
             try:
-                self.key_press_callback(key)
+                if on_pressed is not None:
+                    self.key_press_callback(key, on_pressed=on_pressed)
+                else:
+                    self.key_press_callback(key)
             except Exception as e:
                 logger.error(f"Error in key press callback for key {key}: {e}")
         else:
             logger.warning(f"No key press callback set, cannot use flask key: {key}")
     
-    def update_config(self, flask_config: Dict):
+    def update_config(self, flask_config: Dict) -> Dict[str, List[int]]:
         """
-        設定を更新
+        設定を更新（変更のあったスロットだけを反映し、変更のないタイマーの位相は維持）
         
         Args:
             flask_config: フラスコ設定の辞書
+            
+        Returns:
+            {'added': [...], 'removed': [...], 'updated': [...]} 変更したスロット番号
         """
-        # 現在のタイマーを停止・削除
-        self.clear_all_timers()
+        self.burst_window_ms = flask_config.get('burst_window_ms', self.burst_window_ms)
+        slots = self._parse_flask_slots(flask_config.get('flask_slots', {}))
+        changes = {'added': [], 'removed': [], 'updated': []}
+        
+        # 設定から無くなったスロットのタイマーを削除
+        for slot_num in [num for num in self.timers if num not in slots]:
+            self.remove_flask_timer(slot_num)
+            changes['removed'].append(slot_num)
+        
+        for slot_num, (key, duration_ms) in slots.items():
+            timer = self.timers.get(slot_num)
+            if timer is None:
+                self.add_flask_timer(slot_num, key, duration_ms, use_when_full=False)
+                changes['added'].append(slot_num)
+            elif timer.key != key or timer.duration_ms != duration_ms:
+                # キー・持続時間はタイマーを作り直さずに変更
+                timer.key = key
+                timer.set_duration(duration_ms)
+                changes['updated'].append(slot_num)
+                logger.info(f"Flask timer updated: slot {slot_num}, key {key}, duration {duration_ms}ms")
         
-        # 新しい設定でタイマーを作成
-        flask_slots = flask_config.get('flask_slots', {})
+        # 有効/無効が変わった場合のみ全タイマーを開始・停止
+        enabled = flask_config.get('enabled', False)
+        if enabled and not self.is_enabled:
+            self.start_all_timers()
+        elif not enabled and self.is_enabled:
+            self.stop_all_timers()
         
+        logger.info(f"Flask timer config updated: {self.get_timer_count()} timers "
+                    f"(added: {changes['added']}, removed: {changes['removed']}, updated: {changes['updated']})")
+        return changes
+    
+    @staticmethod
+    def _parse_flask_slots(flask_slots: Dict) -> Dict[int, Tuple[str, int]]:
+        """
+        フラスコスロット設定から自動使用するスロットを取り出す
+        
+        Returns:
+            スロット番号 -> (使用キー, 持続時間ms)
+        """
+        slots = {}
         for slot_key, slot_config in flask_slots.items():
             if slot_key.startswith('slot_'):
                 try:
@@ -297,14 +497,8 @@ class FlaskTimerManager:
                     duration_ms = slot_config.get('duration_ms', 5000)
                     
                     if key.strip():
-                        # use_when_fullはFalseなのでタイマーを作成
-                        self.add_flask_timer(slot_num, key, duration_ms, use_when_full=False)
+                        slots[slot_num] = (key, duration_ms)
                     
                 except (ValueError, KeyError) as e:
                     logger.error(f"Error parsing flask slot config {slot_key}: {e}")
-        
-        # フラスコが有効な場合はタイマーを開始
-        if flask_config.get('enabled', False):
-            self.start_all_timers()
-        
-        logger.info(f"Flask timer config updated: {self.get_timer_count()} timers loaded")
\ No newline at end of file
+        return slots
@@ -0,0 +1,263 @@
+"""
+フォーカス追跡モジュール
+Path of Exileのウィンドウハンドルをキャッシュし、前面ウィンドウのハンドル比較だけでフォーカスを判定する
+"""
+import sys
+import time
+import threading
+import logging
+from typing import Dict, Any, Optional, List, Tuple, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+class Win32FocusBackend:
+    """user32 API によるウィンドウ情報の取得"""
+
+    name = 'win32'
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        self._ctypes = ctypes
+        user32 = ctypes.WinDLL('user32', use_last_error=True)
+        user32.GetForegroundWindow.restype = wintypes.HWND
+        user32.IsWindow.argtypes = [wintypes.HWND]
+        user32.IsWindowVisible.argtypes = [wintypes.HWND]
+        user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
+        user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+        self._enum_proc_type = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        user32.EnumWindows.argtypes = [self._enum_proc_type, wintypes.LPARAM]
+        user32.GetClientRect.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.RECT)]
+        user32.ClientToScreen.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.POINT)]
+        self._wintypes = wintypes
+        self._user32 = user32
+
+    def get_foreground_handle(self) -> Optional[int]:
+        """前面ウィンドウのハンドル"""
+        return self._user32.GetForegroundWindow() or None
+
+    def is_window(self, handle: int) -> bool:
+        """ハンドルが有効なウィンドウかどうか"""
+        return bool(self._user32.IsWindow(handle))
+
+    def get_window_title(self, handle: int) -> str:
+        """ウィンドウタイトル"""
+        length = self._user32.GetWindowTextLengthW(handle)
+        if length <= 0:
+            return ''
+        buffer = self._ctypes.create_unicode_buffer(length + 1)
+        self._user32.GetWindowTextW(handle, buffer, length + 1)
+        return buffer.value
+
+    def list_windows(self) -> List[Tuple[int, str]]:
+        """可視のトップレベルウィンドウの (ハンドル, タイトル) 一覧"""
+        windows = []
+
+        def callback(handle, _):
+            if self._user32.IsWindowVisible(handle):
+                title = self.get_window_title(handle)
+                if title:
+                    windows.append((handle, title))
+            return True
+
+        self._user32.EnumWindows(self._enum_proc_type(callback), 0)
+        return windows
+
+    def get_client_rect(self, handle: int) -> Optional[Tuple[int, int, int, int]]:
+        """クライアント領域の (left, top, width, height)（スクリーン座標）"""
+        rect = self._wintypes.RECT()
+        if not self._user32.GetClientRect(handle, self._ctypes.byref(rect)):
+            return None
+        origin = self._wintypes.POINT(0, 0)
+        if not self._user32.ClientToScreen(handle, self._ctypes.byref(origin)):
+            return None
+        return origin.x, origin.y, rect.right - rect.left, rect.bottom - rect.top
+
+
+class StubFocusBackend:
+    """
+    メモリ上のウィンドウ一覧によるバックエンド（Windows以外の環境・テスト・ベンチマーク用）
+
+    set_windows() / set_foreground() で状態を設定する
+    """
+
+    name = 'stub'
+
+    def __init__(self, windows: Optional[Dict[int, str]] = None, foreground: Optional[int] = None):
+        self.windows: Dict[int, str] = dict(windows or {})
+        self.foreground = foreground
+        self.client_rects: Dict[int, Tuple[int, int, int, int]] = {}
+        # 呼び出し回数（テスト・ベンチマーク用）
+        self.calls = {'foreground': 0, 'title': 0, 'list': 0}
+
+    def set_windows(self, windows: Dict[int, str]) -> None:
+        self.windows = dict(windows)
+
+    def set_foreground(self, handle: Optional[int]) -> None:
+        self.foreground = handle
+
+    def get_foreground_handle(self) -> Optional[int]:
+        self.calls['foreground'] += 1
+        return self.foreground
+
+    def is_window(self, handle: int) -> bool:
+        return handle in self.windows
+
+    def get_window_title(self, handle: int) -> str:
+        self.calls['title'] += 1
+        return self.windows.get(handle, '')
+
+    def list_windows(self) -> List[Tuple[int, str]]:
+        self.calls['list'] += 1
+        return list(self.windows.items())
+
+    def set_client_rect(self, handle: int, rect: Tuple[int, int, int, int]) -> None:
+        self.client_rects[handle] = rect
+
+    def get_client_rect(self, handle: int) -> Optional[Tuple[int, int, int, int]]:
+        return self.client_rects.get(handle)
+
+
+def create_focus_backend():
+    """実行環境に合ったバックエンドを作成（Windows以外・失敗時はスタブ）"""
+    if sys.platform == 'win32':
+        try:
+            return Win32FocusBackend()
+        except Exception as e:
+            logger.error(f"Failed to initialize win32 focus backend: {e}")
+    logger.info("Focus tracking uses the stub backend (POE is never reported as focused)")
+    return StubFocusBackend()
+
+
+class FocusTracker:
+    """
+    Path of Exileウィンドウのフォーカス追跡
+
+    - PoEのウィンドウハンドルをキャッシュし、is_focused() は前面ウィンドウのハンドルと比較するだけで答える
+    - 前面ウィンドウが変わった場合のみ、そのウィンドウのタイトルを1回だけ確認する
+    - キャッシュしたハンドルは validate_interval 秒ごとにタイトルを再確認する（ハンドル再利用対策）
+    - ウィンドウ一覧の全走査は、キャッシュしたハンドルが無効になった場合の get_handle() のみ
+    """
+
+    def __init__(self, title_patterns: Iterable[str], backend=None, validate_interval: float = 1.0,
+                 refresh_interval: float = 1.0):
+        """
+        Args:
+            title_patterns: PoEウィンドウのタイトルに含まれる文字列
+            backend: ウィンドウ情報の取得元（Noneの場合は create_focus_backend()）
+            validate_interval: キャッシュしたハンドルのタイトルを再確認する間隔（秒）
+            refresh_interval: ウィンドウ一覧を全走査する最短間隔（秒）
+        """
+        self.title_patterns = [pattern.lower() for pattern in title_patterns]
+        self.backend = backend or create_focus_backend()
+        self.validate_interval = validate_interval
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self._handle: Optional[int] = None
+        self._validated_at = 0.0
+        self._refreshed_at: Optional[float] = None
+        # 直前に確認した前面ウィンドウ（PoE以外）。起動中でタイトルが未設定の場合があるため定期的に再確認する
+        self._other_foreground: Optional[int] = None
+        self._other_checked_at = 0.0
+
+        self.stats = {
+            'checks': 0,
+            'cache_hits': 0,
+            'title_checks': 0,
+            'refreshes': 0,
+            'handle_changes': 0
+        }
+
+    def matches(self, title: str) -> bool:
+        """タイトルがPoEウィンドウのものかどうか"""
+        title = title.lower()
+        return any(pattern in title for pattern in self.title_patterns)
+
+    def is_focused(self) -> bool:
+        """PoEウィンドウが前面かどうか（キー入力ごとに呼ばれる）"""
+        self.stats['checks'] += 1
+        try:
+            foreground = self.backend.get_foreground_handle()
+            if not foreground:
+                return False
+
+            now = time.monotonic()
+            with self._lock:
+                if foreground == self._handle:
+                    if now - self._validated_at < self.validate_interval:
+                        self.stats['cache_hits'] += 1
+                        return True
+                elif foreground == self._other_foreground:
+                    if now - self._other_checked_at < self.validate_interval:
+                        self.stats['cache_hits'] += 1
+                        return False
+
+                # 前面ウィンドウが変わった（またはキャッシュの再確認時期）: そのウィンドウだけ確認
+                self.stats['title_checks'] += 1
+                if self.matches(self.backend.get_window_title(foreground)):
+                    self._set_handle(foreground, now)
+                    self._other_foreground = None
+                    return True
+                if foreground == self._handle:
+                    self._handle = None
+                self._other_foreground = foreground
+                self._other_checked_at = now
+                return False
+
+        except Exception as e:
+            logger.debug(f"Error checking POE focus: {e}")
+            return False
+
+    def get_handle(self, refresh: bool = True) -> Optional[int]:
+        """
+        PoEウィンドウのハンドルを取得（前面でなくてもよい）
+
+        Args:
+            refresh: キャッシュが無効な場合にウィンドウ一覧を走査するか
+        """
+        with self._lock:
+            if self._handle is not None and self.backend.is_window(self._handle):
+                return self._handle
+            self._handle = None
+            if not refresh:
+                return None
+
+            now = time.monotonic()
+            if self._refreshed_at is not None and now - self._refreshed_at < self.refresh_interval:
+                return None
+            self._refreshed_at = now
+            self.stats['refreshes'] += 1
+            try:
+                for handle, title in self.backend.list_windows():
+                    if self.matches(title):
+                        self._set_handle(handle, now)
+                        return handle
+            except Exception as e:
+                logger.debug(f"Error listing windows: {e}")
+            return None
+
+    def _set_handle(self, handle: int, now: float) -> None:
+        """キャッシュするハンドルを更新（ロック保持中に呼ぶ）"""
+        if handle != self._handle:
+            self.stats['handle_changes'] += 1
+            logger.debug(f"POE window handle cached: {handle}")
+        self._handle = handle
+        self._validated_at = now
+
+    def invalidate(self) -> None:
+        """キャッシュを破棄"""
+        with self._lock:
+            self._handle = None
+            self._other_foreground = None
+            self._refreshed_at = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        return {
+            **self.stats,
+            'backend': self.backend.name,
+            'handle': self._handle
+        }
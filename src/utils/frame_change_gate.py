@@ -0,0 +1,109 @@
+"""
+フレーム変化ゲート
+前回処理したフレームから変化がない場合にテンプレートマッチングを省略する
+"""
+import time
+import logging
+from typing import Optional, Dict, Any, Hashable
+
+import numpy as np
+import cv2
+
+logger = logging.getLogger(__name__)
+
+
+class FrameChangeGate:
+    """
+    縮小グレースケール画像の平均絶対差分（MAD）でフレーム変化を判定するクラス
+
+    基準フレームは最後に「変化あり」と判定したフレームのため、
+    ゆっくりとした変化も蓄積して検出される。
+    """
+
+    def __init__(self, enabled: bool = True, threshold: float = 2.0,
+                 max_age: float = 1.0, downsample: int = 4):
+        """
+        Args:
+            enabled: ゲートを有効にするか（無効時は常に変化ありと判定）
+            threshold: 変化ありと判定するMADの閾値（0-255スケール）
+            max_age: 変化がなくても再処理を強制するまでの最大秒数
+            downsample: 比較用に縮小する倍率
+        """
+        self.enabled = enabled
+        self.threshold = threshold
+        self.max_age = max_age
+        self.downsample = max(1, int(downsample))
+
+        self._reference: Optional[np.ndarray] = None
+        self._reference_key: Optional[Hashable] = None
+        self._reference_time = 0.0
+
+        self.stats = {
+            'checks': 0,
+            'skipped_matches': 0,
+            'last_difference': 0.0
+        }
+
+    def _signature(self, frame: np.ndarray) -> np.ndarray:
+        """比較用の縮小グレースケール画像を作成"""
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        height, width = frame.shape[:2]
+        size = (max(1, width // self.downsample), max(1, height // self.downsample))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    def has_changed(self, frame: np.ndarray, key: Optional[Hashable] = None) -> bool:
+        """
+        前回処理したフレームから意味のある変化があるかを判定
+
+        Args:
+            frame: 判定対象のフレーム（BGRまたはグレースケール）
+            key: 検出エリアなどの識別子（異なる場合は常に変化ありと判定）
+
+        Returns:
+            変化あり（マッチングが必要）の場合True
+        """
+        if not self.enabled:
+            return True
+
+        self.stats['checks'] += 1
+        signature = self._signature(frame)
+        now = time.perf_counter()
+
+        if (self._reference is not None
+                and key == self._reference_key
+                and signature.shape == self._reference.shape
+                and now - self._reference_time < self.max_age):
+            difference = float(cv2.absdiff(signature, self._reference).mean())
+            self.stats['last_difference'] = difference
+            if difference < self.threshold:
+                self.stats['skipped_matches'] += 1
+                return False
+
+        self._reference = signature
+        self._reference_key = key
+        self._reference_time = now
+        return True
+
+    def prime(self, frame: np.ndarray, key: Optional[Hashable] = None) -> None:
+        """処理したフレームを基準として設定（判定は行わない）"""
+        if not self.enabled:
+            return
+        self._reference = self._signature(frame)
+        self._reference_key = key
+        self._reference_time = time.perf_counter()
+
+    def reset(self) -> None:
+        """基準フレームを破棄（次回は必ず変化ありと判定）"""
+        self._reference = None
+        self._reference_key = None
+
+    def reset_stats(self) -> None:
+        """統計情報をリセット"""
+        for key in self.stats:
+            self.stats[key] = 0
+        self.stats['last_difference'] = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        return {**self.stats, 'enabled': self.enabled, 'threshold': self.threshold}
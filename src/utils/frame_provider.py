@@ -0,0 +1,258 @@
+"""
+共有フレームプロバイダー
+全ての画面キャプチャ利用者に1つのキャプチャサービスからフレームを配布する
+"""
+import threading
+import time
+import logging
+from typing import Optional, Dict, List, Any, Tuple
+
+import numpy as np
+import cv2
+import mss
+
+logger = logging.getLogger(__name__)
+
+
+class FrameProvider:
+    """
+    長寿命・スレッドセーフな画面キャプチャサービス
+
+    - mssハンドルはスレッドごとに1つだけ生成して使い回す（フレーム毎の生成を排除）
+    - モニター情報はキャッシュし、refresh_monitors()で明示的に更新する
+    - 重なる・近接する登録領域はまとめて外接矩形を1回だけグラブし、各利用者には切り出して返す
+      （離れた領域は外接矩形が画面の大半になるため、同じハンドルで領域ごとにグラブする）
+    """
+
+    def __init__(self, max_frame_age: float = 0.05, merge_margin: int = 64):
+        """
+        Args:
+            max_frame_age: キャッシュしたフレームを再利用できる最大経過時間（秒）
+            merge_margin: この距離（ピクセル）以内の領域を1回のグラブにまとめる
+        """
+        self.max_frame_age = max_frame_age
+        self.merge_margin = merge_margin
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._handles: List[Any] = []
+        self._monitors: Optional[List[Dict[str, int]]] = None
+
+        # 利用者ごとの要求領域（名前 -> {'top', 'left', 'width', 'height'}）
+        self._regions: Dict[str, Dict[str, int]] = {}
+
+        # 直近にグラブしたフレーム（BGRA）: [(領域, フレーム, グラブ時刻)]
+        self._frames: List[Tuple[Dict[str, int], np.ndarray, float]] = []
+
+        self.stats = {
+            'grabs': 0,
+            'frames_served': 0,
+            'cache_hits': 0,
+            'last_grab_ms': 0.0
+        }
+
+    def _get_sct(self):
+        """呼び出しスレッド用のmssハンドルを取得（mssはスレッド間で共有できないため）"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+            with self._lock:
+                self._handles.append(sct)
+            logger.debug(f"Created capture handle for thread {threading.current_thread().name}")
+        return sct
+
+    def get_monitors(self) -> List[Dict[str, int]]:
+        """キャッシュ済みのモニター情報を取得（monitors[0]は全画面）"""
+        with self._lock:
+            if self._monitors is None:
+                self._monitors = [dict(m) for m in self._get_sct().monitors]
+                logger.info(f"Monitor geometry cached: {len(self._monitors) - 1} monitor(s)")
+            return [dict(m) for m in self._monitors]
+
+    def refresh_monitors(self) -> List[Dict[str, int]]:
+        """モニター情報を再取得（解像度変更時など）"""
+        with self._lock:
+            self._monitors = None
+            self._frames = []
+        return self.get_monitors()
+
+    def register_region(self, name: str, region: Dict[str, int]) -> None:
+        """毎ティックのグラブ対象に領域を登録"""
+        with self._lock:
+            self._regions[name] = self._normalize_region(region)
+
+    def unregister_region(self, name: str) -> None:
+        """登録済み領域を解除"""
+        with self._lock:
+            self._regions.pop(name, None)
+
+    def get_registered_regions(self) -> Dict[str, Dict[str, int]]:
+        """登録済み領域の一覧を取得"""
+        with self._lock:
+            return {name: dict(region) for name, region in self._regions.items()}
+
+    def get_region(self, region: Dict[str, int], name: Optional[str] = None) -> np.ndarray:
+        """
+        指定領域のフレームを取得（BGR形式）
+
+        Args:
+            region: {'top', 'left', 'width', 'height'}（スクリーン絶対座標）
+            name: 利用者名（指定時は領域を登録し、他の利用者とまとめてグラブする）
+
+        Returns:
+            キャプチャした画像（numpy配列、BGR形式）
+        """
+        area = self._normalize_region(region)
+
+        with self._lock:
+            if name is not None:
+                self._regions[name] = area
+
+            cached = self._find_frame(area, time.perf_counter())
+            if cached is None:
+                cached = self._grab_group(area)
+            else:
+                self.stats['cache_hits'] += 1
+
+            origin, frame, _ = cached
+            self.stats['frames_served'] += 1
+
+        top = area['top'] - origin['top']
+        left = area['left'] - origin['left']
+        crop = frame[top:top + area['height'], left:left + area['width']]
+        # BGRAからBGRに変換（新しい配列を返すため利用者間で共有されない）
+        return cv2.cvtColor(crop, cv2.COLOR_BGRA2BGR)
+
+    def invalidate(self) -> None:
+        """キャッシュ済みフレームを破棄（次回要求時に必ずグラブする）"""
+        with self._lock:
+            self._frames = []
+
+    def _find_frame(self, area: Dict[str, int], now: float) -> Optional[Tuple[Dict[str, int], np.ndarray, float]]:
+        """要求領域を含む最大経過時間内のフレームを探す（ロック保持中に呼ぶ）"""
+        for cached in self._frames:
+            frame_area, _, frame_time = cached
+            if now - frame_time <= self.max_frame_age and self._contains(frame_area, area):
+                return cached
+        return None
+
+    def _group_area(self, requested: Dict[str, int]) -> Dict[str, int]:
+        """要求領域と、それに重なる・近接する登録済み領域（連鎖を含む）の外接矩形（ロック保持中に呼ぶ）"""
+        group = dict(requested)
+        remaining = list(self._regions.values())
+        merged = True
+        while merged:
+            merged = False
+            for area in list(remaining):
+                if self._gap(group, area) <= self.merge_margin:
+                    group = self._bounding_box(group, area)
+                    remaining.remove(area)
+                    merged = True
+        return group
+
+    def _grab_group(self, requested: Dict[str, int]) -> Tuple[Dict[str, int], np.ndarray, float]:
+        """要求領域を含むグループを1回でグラブしてキャッシュに追加（ロック保持中に呼ぶ）"""
+        area = self._group_area(requested)
+
+        start = time.perf_counter()
+        screenshot = self._get_sct().grab(area)
+        grabbed = (area, np.asarray(screenshot), time.perf_counter())
+
+        # 古いフレームと、今回の領域に含まれるフレームは破棄
+        self._frames = [
+            cached for cached in self._frames
+            if grabbed[2] - cached[2] <= self.max_frame_age and not self._contains(area, cached[0])
+        ]
+        self._frames.append(grabbed)
+
+        self.stats['grabs'] += 1
+        self.stats['last_grab_ms'] = (grabbed[2] - start) * 1000
+        return grabbed
+
+    @staticmethod
+    def _gap(a: Dict[str, int], b: Dict[str, int]) -> int:
+        """2つの領域の間隔（縦横の大きい方。重なる場合は0）"""
+        dx = max(0, b['left'] - (a['left'] + a['width']), a['left'] - (b['left'] + b['width']))
+        dy = max(0, b['top'] - (a['top'] + a['height']), a['top'] - (b['top'] + b['height']))
+        return max(dx, dy)
+
+    @staticmethod
+    def _bounding_box(a: Dict[str, int], b: Dict[str, int]) -> Dict[str, int]:
+        """2つの領域の外接矩形"""
+        left = min(a['left'], b['left'])
+        top = min(a['top'], b['top'])
+        right = max(a['left'] + a['width'], b['left'] + b['width'])
+        bottom = max(a['top'] + a['height'], b['top'] + b['height'])
+        return {'top': top, 'left': left, 'width': right - left, 'height': bottom - top}
+
+    @staticmethod
+    def _normalize_region(region: Dict[str, int]) -> Dict[str, int]:
+        """領域を整数のmss形式に正規化"""
+        return {
+            'top': int(region['top']),
+            'left': int(region['left']),
+            'width': int(region['width']),
+            'height': int(region['height'])
+        }
+
+    @staticmethod
+    def _contains(outer: Optional[Dict[str, int]], inner: Dict[str, int]) -> bool:
+        """outerがinnerを完全に含むかどうか"""
+        if outer is None:
+            return False
+        return (outer['left'] <= inner['left']
+                and outer['top'] <= inner['top']
+                and inner['left'] + inner['width'] <= outer['left'] + outer['width']
+                and inner['top'] + inner['height'] <= outer['top'] + outer['height'])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        with self._lock:
+            return {
+                **self.stats,
+                'registered_regions': len(self._regions),
+                'frame_areas': [dict(cached[0]) for cached in self._frames]
+            }
+
+    def close(self) -> None:
+        """全てのmssハンドルを解放"""
+        with self._lock:
+            for sct in self._handles:
+                try:
+                    sct.close()
+                except Exception as e:
+                    logger.debug(f"Failed to close capture handle: {e}")
+            self._handles.clear()
+            self._local = threading.local()
+            self._frames = []
+        logger.debug("Frame provider closed")
+
+
+_frame_provider: Optional[FrameProvider] = None
+_frame_provider_lock = threading.Lock()
+
+
+def get_frame_provider() -> FrameProvider:
+    """プロセス共通のFrameProviderを取得"""
+    global _frame_provider
+    with _frame_provider_lock:
+        if _frame_provider is None:
+            _frame_provider = FrameProvider()
+        return _frame_provider
+
+
+def set_frame_provider(provider: Optional[FrameProvider]) -> Optional[FrameProvider]:
+    """
+    プロセス共通のフレームプロバイダーを差し替え（リプレイ再生など）
+
+    Args:
+        provider: 新しいプロバイダー（Noneの場合は次回取得時に画面キャプチャ用を生成）
+
+    Returns:
+        差し替え前のプロバイダー
+    """
+    global _frame_provider
+    with _frame_provider_lock:
+        previous = _frame_provider
+        _frame_provider = provider
+        return previous
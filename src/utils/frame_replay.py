@@ -0,0 +1,237 @@
+"""
+フレームリプレイモジュール
+画像ディレクトリまたは圧縮録画（.npz）からフレームを供給するオフライン用キャプチャソース
+"""
+import csv
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Optional, Dict, List, Sequence
+
+import numpy as np
+import cv2
+
+from src.utils.frame_provider import FrameProvider
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class ReplayFrameProvider(FrameProvider):
+    """
+    記録済みフレームを再生するフレームプロバイダー
+
+    FrameProviderと同じインターフェースを持つため、検出器の frame_provider に
+    そのまま差し替えられる（set_frame_provider() でプロセス全体にも適用可能）。
+
+    - 各フレームはスクリーン座標 origin を左上とする画像として扱い、要求領域を切り出して返す
+    - フレームが要求領域を含まない場合は、検出エリアを切り出し済みのフレームとみなしてそのまま返す
+    - フレームは advance() で進める。frame_interval 指定時は経過時間に応じて自動で進む
+    """
+
+    def __init__(self, source: str, loop: bool = False, frame_interval: Optional[float] = None,
+                 origin: Sequence[int] = (0, 0)):
+        """
+        Args:
+            source: フレーム画像のディレクトリ、または save_recording() で作成した .npz ファイル
+            loop: 最後のフレームの後に先頭へ戻るか
+            frame_interval: 実時間再生時のフレーム間隔（秒）。Noneの場合は advance() で進める
+            origin: フレーム左上のスクリーン座標 (left, top)
+        """
+        super().__init__(max_frame_age=0.0)
+        self.source = Path(source)
+        self.loop = loop
+        self.frame_interval = frame_interval
+        self.origin = {'left': int(origin[0]), 'top': int(origin[1])}
+
+        self._paths: List[Path] = []
+        self._frames: Optional[np.ndarray] = None
+        self.labels: List[Optional[str]] = []
+        self._load_source()
+
+        self._index = 0
+        self._started = time.perf_counter()
+        self._current: Optional[np.ndarray] = None
+        self._current_index = -1
+
+        self.stats.update({
+            'frames_loaded': 0,
+            'last_capture_ms': 0.0,
+            'last_convert_ms': 0.0
+        })
+
+        logger.info(f"ReplayFrameProvider initialized: {len(self)} frames from {self.source}")
+
+    def __len__(self) -> int:
+        return len(self._frames) if self._frames is not None else len(self._paths)
+
+    def _load_source(self) -> None:
+        """再生元のフレーム一覧とラベルを読み込み"""
+        if self.source.is_dir():
+            self._paths = sorted(p for p in self.source.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+            labels = self._load_directory_labels()
+            self.labels = [labels.get(p.name) for p in self._paths]
+        elif self.source.suffix.lower() == '.npz':
+            with np.load(self.source, allow_pickle=False) as recording:
+                self._frames = recording['frames']
+                if 'labels' in recording.files:
+                    self.labels = [str(label) or None for label in recording['labels']]
+                if 'origin' in recording.files:
+                    self.origin = {'left': int(recording['origin'][0]), 'top': int(recording['origin'][1])}
+            if not self.labels:
+                self.labels = [None] * len(self._frames)
+        else:
+            raise ValueError(f"Unsupported replay source: {self.source}")
+
+        if len(self) == 0:
+            raise ValueError(f"No frames found in replay source: {self.source}")
+
+    def _load_directory_labels(self) -> Dict[str, str]:
+        """labels.csv（file,state）または labels.json（{file: state}）を読み込み"""
+        labels = {}
+        csv_path = self.source / "labels.csv"
+        json_path = self.source / "labels.json"
+        try:
+            if csv_path.exists():
+                with open(csv_path, 'r', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        if row.get('file') and row.get('state'):
+                            labels[row['file']] = row['state'].strip().upper()
+            elif json_path.exists():
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    labels = {name: str(state).upper() for name, state in json.load(f).items()}
+        except Exception as e:
+            logger.warning(f"Failed to read replay labels: {e}")
+        return labels
+
+    @property
+    def index(self) -> int:
+        """現在のフレーム番号"""
+        if self.frame_interval:
+            position = int((time.perf_counter() - self._started) / self.frame_interval)
+            return position % len(self) if self.loop else min(position, len(self) - 1)
+        return self._index
+
+    def advance(self) -> bool:
+        """
+        次のフレームに進める
+
+        Returns:
+            進めた場合True（loop無効で最後のフレームに達している場合False）
+        """
+        if self._index + 1 >= len(self):
+            if not self.loop:
+                return False
+            self._index = 0
+        else:
+            self._index += 1
+        return True
+
+    def rewind(self) -> None:
+        """先頭フレームに戻す"""
+        self._index = 0
+        self._started = time.perf_counter()
+
+    def current_label(self) -> Optional[str]:
+        """現在のフレームのラベル（状態名）を取得"""
+        return self.labels[self.index] if self.labels else None
+
+    def _load_frame(self, index: int) -> np.ndarray:
+        """フレームを読み込み（同じフレームは再読み込みしない）"""
+        if index != self._current_index:
+            if self._frames is not None:
+                frame = self._frames[index]
+            else:
+                frame = cv2.imread(str(self._paths[index]), cv2.IMREAD_UNCHANGED)
+                if frame is None:
+                    raise IOError(f"Failed to load replay frame: {self._paths[index]}")
+            self._current = frame
+            self._current_index = index
+            self.stats['frames_loaded'] += 1
+        return self._current
+
+    def get_monitors(self) -> List[Dict[str, int]]:
+        """先頭フレームのサイズを1台のモニターとして返す"""
+        with self._lock:
+            if self._monitors is None:
+                height, width = self._load_frame(self.index).shape[:2]
+                monitor = {'top': self.origin['top'], 'left': self.origin['left'], 'width': width, 'height': height}
+                self._monitors = [dict(monitor), dict(monitor)]
+            return [dict(m) for m in self._monitors]
+
+    def get_region(self, region: Dict[str, int], name: Optional[str] = None) -> np.ndarray:
+        """
+        現在のフレームから指定領域を取得（BGR形式）
+
+        Args:
+            region: {'top', 'left', 'width', 'height'}（スクリーン絶対座標）
+            name: 利用者名（FrameProviderとの互換用に登録のみ行う）
+
+        Returns:
+            切り出した画像（BGR形式）
+        """
+        area = self._normalize_region(region)
+
+        with self._lock:
+            if name is not None:
+                self._regions[name] = area
+
+            start = time.perf_counter()
+            frame = self._load_frame(self.index)
+            convert_start = time.perf_counter()
+
+            top = area['top'] - self.origin['top']
+            left = area['left'] - self.origin['left']
+            if (top >= 0 and left >= 0
+                    and top + area['height'] <= frame.shape[0]
+                    and left + area['width'] <= frame.shape[1]):
+                frame = frame[top:top + area['height'], left:left + area['width']]
+
+            if frame.ndim == 2:
+                image = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+            elif frame.shape[2] == 4:
+                image = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+            else:
+                image = frame.copy()
+
+            self.stats['frames_served'] += 1
+            self.stats['last_capture_ms'] = (convert_start - start) * 1000
+            self.stats['last_convert_ms'] = (time.perf_counter() - convert_start) * 1000
+            return image
+
+    def invalidate(self) -> None:
+        """読み込み済みフレームを破棄"""
+        with self._lock:
+            self._current = None
+            self._current_index = -1
+
+    def close(self) -> None:
+        """読み込み済みフレームを解放"""
+        self.invalidate()
+        logger.debug("Replay frame provider closed")
+
+
+def save_recording(path: str, frames: Sequence[np.ndarray], labels: Optional[Sequence[str]] = None,
+                   origin: Sequence[int] = (0, 0)) -> Path:
+    """
+    フレーム列を圧縮録画（.npz）として保存
+
+    Args:
+        path: 保存先パス
+        frames: 同一サイズのフレーム（BGR/BGRA）
+        labels: フレームごとの状態ラベル
+        origin: フレーム左上のスクリーン座標 (left, top)
+
+    Returns:
+        保存したファイルのパス
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'frames': np.stack(frames), 'origin': np.array(origin, dtype=np.int32)}
+    if labels is not None:
+        data['labels'] = np.array([label or '' for label in labels])
+    np.savez_compressed(path, **data)
+    logger.info(f"Saved replay recording: {path} ({len(frames)} frames)")
+    return path
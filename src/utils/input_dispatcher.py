@@ -0,0 +1,350 @@
+"""
+入力ディスパッチャー
+キー押下要求をキューに積み、1つのワーカースレッドで順番に実行する
+"""
+import heapq
+import itertools
+import threading
+import time
+import logging
+from typing import Callable, Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+# 優先度（小さいほど先に実行）
+PRIORITY_HIGH = 0    # Tincture・手動操作
+PRIORITY_NORMAL = 1  # フラスコ
+PRIORITY_LOW = 2     # スキル
+
+NS_PER_MS = 1_000_000
+
+
+class InputRequest:
+    """キー押下要求（keys指定時は複数キーの連続押下）"""
+
+    def __init__(self, key: str, priority: int, source: Optional[str],
+                 press: Optional[Callable], on_done: Optional[Callable], keys: Optional[List[str]] = None):
+        self.key = key
+        self.keys = keys
+        self.priority = priority
+        self.source = source
+        self.press = press
+        self.on_done = on_done
+        self.submitted_ns = time.monotonic_ns()
+        self.cancelled = False
+
+    @property
+    def pressed_keys(self) -> List[str]:
+        """この要求で押下する個々のキー"""
+        return self.keys if self.keys else [self.key]
+
+
+class InputDispatcher:
+    """
+    ノンブロッキングのキー入力ディスパッチャー
+
+    - submit() は要求をキューに積んで即座に戻る（呼び出し元スレッドは待機しない）
+    - 1つのワーカーが優先度順・投入順に実行するため、異なるスレッドのkeyDown/keyUpが交錯しない
+    - 未実行の同じキーの要求は1つにまとめる（優先度が高い要求が来た場合は置き換え）。
+      連続押下の要求も個々のキー単位で判定する
+    - キュー待ち時間と実行時間を記録する
+    """
+
+    def __init__(self, keyboard=None):
+        """
+        Args:
+            keyboard: press_key(key) を持つキーボードコントローラー（Noneの場合は初回使用時に生成）
+        """
+        self._keyboard = keyboard
+        self._condition = threading.Condition()
+        self._queue = []
+        # 個々のキー -> そのキーを押下する未実行の要求（連続押下の要求は含む全キーで登録）
+        self._pending: Dict[str, InputRequest] = {}
+        self._sequence = itertools.count()
+        self._running = False
+        self.thread: Optional[threading.Thread] = None
+
+        self.stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict[str, Any]:
+        """統計情報の初期値"""
+        return {
+            'submitted': 0,
+            'executed': 0,
+            'bursts': 0,
+            'burst_keys': 0,
+            'deduplicated': 0,
+            'cancelled': 0,
+            'errors': 0,
+            'max_queue_depth': 0,
+            'last_wait_ms': 0.0,
+            'max_wait_ms': 0.0,
+            'total_wait_ms': 0.0,
+            'last_exec_ms': 0.0,
+            'max_exec_ms': 0.0,
+            'total_exec_ms': 0.0
+        }
+
+    @property
+    def keyboard(self):
+        """既定のキーボードコントローラー"""
+        if self._keyboard is None:
+            from src.utils.keyboard_input import KeyboardController
+            self._keyboard = KeyboardController()
+        return self._keyboard
+
+    def start(self) -> None:
+        """ワーカースレッドを開始"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self.thread = threading.Thread(target=self._run, name="InputDispatcher", daemon=True)
+            self.thread.start()
+        logger.info("Input dispatcher started")
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """ワーカースレッドを停止（未実行の要求は破棄）"""
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._discard_pending()
+            self._condition.notify_all()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
+        logger.info("Input dispatcher stopped")
+
+    def submit(self, key: str, priority: int = PRIORITY_NORMAL, source: Optional[str] = None,
+               press: Optional[Callable[[str], Any]] = None,
+               on_done: Optional[Callable[[Optional[int]], None]] = None) -> bool:
+        """
+        キー押下要求を投入（即座に戻る）
+
+        Args:
+            key: 押下するキー
+            priority: 優先度（PRIORITY_HIGH / PRIORITY_NORMAL / PRIORITY_LOW）
+            source: 要求元の名前（統計・一括キャンセル用）
+            press: 押下処理（Noneの場合は既定のキーボードコントローラー）
+            on_done: 実行後に呼ばれる関数。キー押下時刻（monotonic_ns、失敗時はNone）を受け取る
+
+        Returns:
+            要求が投入された、または同じキーの要求が既に待機中の場合True
+        """
+        with self._condition:
+            pending = self._pending.get(key)
+            if pending is not None:
+                # 連続押下に含まれるキーは他のキーの押下を崩さないよう置き換えない
+                if priority >= pending.priority or pending.keys:
+                    self.stats['deduplicated'] += 1
+                    return True
+                # より高い優先度で置き換え
+                pending.cancelled = True
+                self.stats['deduplicated'] += 1
+
+            self._enqueue(InputRequest(key, priority, source, press, on_done))
+
+        self.start()
+        return True
+
+    def submit_burst(self, keys: List[str], priority: int = PRIORITY_NORMAL, source: Optional[str] = None,
+                     press_burst: Optional[Callable[[List[str]], Any]] = None,
+                     on_done: Optional[Callable[[List[Optional[int]]], None]] = None) -> bool:
+        """
+        複数キーの連続押下要求を1つの要求として投入（即座に戻る）
+
+        Args:
+            keys: 押下するキーのリスト
+            priority: 優先度
+            source: 要求元の名前
+            press_burst: 連続押下処理（Noneの場合は既定のキーボードコントローラー）
+            on_done: 実行後に呼ばれる関数。キーごとの押下時刻のリスト（失敗時はNone）を受け取る
+
+        Returns:
+            要求が投入された場合True
+        """
+        if len(keys) == 1:
+            single_done = (lambda key_down_ns: on_done([key_down_ns])) if on_done else None
+            press = (lambda key: press_burst([key])[0]) if press_burst else None
+            return self.submit(keys[0], priority, source, press, single_done)
+
+        with self._condition:
+            burst_keys = []
+            for key in keys:
+                pending = self._pending.get(key)
+                if pending is not None and pending.keys:
+                    # 待機中の別の連続押下に含まれるキーは押下しない
+                    self.stats['deduplicated'] += 1
+                    continue
+                if pending is not None:
+                    # 同じキーの単発要求が待機中なら取り消してバーストに含める
+                    pending.cancelled = True
+                    del self._pending[key]
+                    self.stats['deduplicated'] += 1
+                burst_keys.append(key)
+
+            if not burst_keys:
+                return True
+            if len(burst_keys) < len(keys) and on_done:
+                # 押下しなかったキーは押下時刻なし（None）として元のキー順で通知
+                on_done = self._expand_burst_result(keys, burst_keys, on_done)
+            self._enqueue(InputRequest('+'.join(burst_keys), priority, source, press_burst, on_done,
+                                       keys=burst_keys))
+
+        self.start()
+        return True
+
+    @staticmethod
+    def _expand_burst_result(keys: List[str], burst_keys: List[str],
+                             on_done: Callable[[List[Optional[int]]], None]) -> Callable:
+        """押下したキーの結果を元のキー順の結果に展開する完了通知を作成"""
+        def expanded(key_down_times):
+            times = dict(zip(burst_keys, key_down_times)) if key_down_times else {}
+            on_done([times.get(key) for key in keys])
+        return expanded
+
+    def _enqueue(self, request: InputRequest) -> None:
+        """要求をキューに積み、押下する全キーで登録（ロック保持中に呼ぶ）"""
+        for key in request.pressed_keys:
+            self._pending[key] = request
+        heapq.heappush(self._queue, (request.priority, next(self._sequence), request))
+        self.stats['submitted'] += 1
+        self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self._pending_count())
+        self._condition.notify()
+
+    def _pending_count(self) -> int:
+        """未実行の要求数（ロック保持中に呼ぶ）"""
+        return len({id(request) for request in self._pending.values()})
+
+    def cancel(self, source: Optional[str] = None, key: Optional[str] = None) -> int:
+        """
+        未実行の要求を取り消し
+
+        Args:
+            source: 指定した要求元の要求のみ取り消す
+            key: 指定したキーの要求のみ取り消す
+
+        Returns:
+            取り消した要求数
+        """
+        with self._condition:
+            cancelled = 0
+            for pending_key, request in list(self._pending.items()):
+                if (source is None or request.source == source) and (key is None or pending_key == key):
+                    if not request.cancelled:
+                        request.cancelled = True
+                        cancelled += 1
+                    self._forget(request)
+            self.stats['cancelled'] += cancelled
+            return cancelled
+
+    def _forget(self, request: InputRequest) -> None:
+        """要求の全キーの登録を解除（ロック保持中に呼ぶ）"""
+        for key in request.pressed_keys:
+            if self._pending.get(key) is request:
+                del self._pending[key]
+
+    def _discard_pending(self) -> None:
+        """全ての未実行要求を破棄（ロック保持中に呼ぶ）"""
+        for request in self._pending.values():
+            request.cancelled = True
+        self.stats['cancelled'] += self._pending_count()
+        self._pending.clear()
+        self._queue.clear()
+
+    def get_queue_depth(self) -> int:
+        """未実行の要求数"""
+        with self._condition:
+            return self._pending_count()
+
+    def _next_request(self) -> Optional[InputRequest]:
+        """次に実行する要求を待機して取得（停止時はNone）"""
+        with self._condition:
+            while self._running:
+                while self._queue and self._queue[0][2].cancelled:
+                    heapq.heappop(self._queue)
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+
+                _, _, request = heapq.heappop(self._queue)
+                self._forget(request)
+                return request
+        return None
+
+    def _run(self) -> None:
+        """ワーカーループ"""
+        while True:
+            request = self._next_request()
+            if request is None:
+                break
+
+            started_ns = time.monotonic_ns()
+            key_down_ns = [None] * len(request.keys) if request.keys else None
+            try:
+                if request.keys:
+                    press_burst = request.press or self.keyboard.press_keys_burst
+                    result = press_burst(request.keys)
+                    key_down_ns = list(result) if result else [started_ns] * len(request.keys)
+                    self.stats['bursts'] += 1
+                    self.stats['burst_keys'] += len(request.keys)
+                else:
+                    press = request.press or self.keyboard.press_key
+                    result = press(request.key)
+                    key_down_ns = result if isinstance(result, int) else started_ns
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Input dispatch failed for key {request.key} ({request.source}): {e}")
+            finished_ns = time.monotonic_ns()
+
+            self._record_latency((started_ns - request.submitted_ns) / NS_PER_MS,
+                                 (finished_ns - started_ns) / NS_PER_MS)
+
+            if request.on_done:
+                try:
+                    request.on_done(key_down_ns)
+                except Exception as e:
+                    logger.error(f"Error in input completion callback ({request.source}): {e}")
+
+    def _record_latency(self, wait_ms: float, exec_ms: float) -> None:
+        """キュー待ち時間と実行時間を記録"""
+        with self._condition:
+            stats = self.stats
+            stats['executed'] += 1
+            stats['last_wait_ms'] = wait_ms
+            stats['max_wait_ms'] = max(stats['max_wait_ms'], wait_ms)
+            stats['total_wait_ms'] += wait_ms
+            stats['last_exec_ms'] = exec_ms
+            stats['max_exec_ms'] = max(stats['max_exec_ms'], exec_ms)
+            stats['total_exec_ms'] += exec_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        with self._condition:
+            executed = self.stats['executed']
+            return {
+                **self.stats,
+                'avg_wait_ms': self.stats['total_wait_ms'] / executed if executed else 0.0,
+                'avg_exec_ms': self.stats['total_exec_ms'] / executed if executed else 0.0,
+                'queue_depth': self._pending_count(),
+                'running': self._running
+            }
+
+    def reset_stats(self) -> None:
+        """統計情報をリセット"""
+        with self._condition:
+            self.stats = self._new_stats()
+
+
+_input_dispatcher: Optional[InputDispatcher] = None
+_input_dispatcher_lock = threading.Lock()
+
+
+def get_input_dispatcher() -> InputDispatcher:
+    """プロセス共通のInputDispatcherを取得"""
+    global _input_dispatcher
+    with _input_dispatcher_lock:
+        if _input_dispatcher is None:
+            _input_dispatcher = InputDispatcher()
+        return _input_dispatcher
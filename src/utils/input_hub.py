@@ -0,0 +1,333 @@
+"""
+グローバル入力ハブ
+キーボードとマウスのフックを1つずつだけ持ち、キー名・ボタン名の表から登録済みハンドラーへ振り分ける
+"""
+import itertools
+import threading
+import time
+import logging
+from typing import Callable, Dict, Any, Optional, Iterable, List, Tuple
+
+# pynputの条件付きインポート
+try:
+    from pynput import mouse, keyboard
+    PYNPUT_AVAILABLE = True
+except ImportError:
+    PYNPUT_AVAILABLE = False
+    mouse, keyboard = None, None
+
+logger = logging.getLogger(__name__)
+
+NS_PER_US = 1_000
+
+# 修飾キー名 -> 修飾キーの種類
+MODIFIER_KEYS = {
+    'ctrl': 'ctrl', 'ctrl_l': 'ctrl', 'ctrl_r': 'ctrl',
+    'shift': 'shift', 'shift_l': 'shift', 'shift_r': 'shift',
+    'alt': 'alt', 'alt_l': 'alt', 'alt_r': 'alt', 'alt_gr': 'alt',
+}
+
+# 名前を持たない仮想キーコード -> キー名（Windowsの低レベルフック向け）
+VK_NAMES = {
+    19: 'pause',
+    120: 'f9',
+    122: 'f11',
+    123: 'f12',
+}
+
+
+def normalize_key(key) -> Optional[str]:
+    """pynputのキーを表の検索に使う名前（小文字）に変換"""
+    char = getattr(key, 'char', None)
+    if char:
+        return char.lower()
+    name = getattr(key, 'name', None)
+    if name:
+        return name.lower()
+    vk = getattr(key, 'vk', None)
+    if vk is not None:
+        return VK_NAMES.get(vk)
+    return None
+
+
+class InputBinding:
+    """キーまたはマウスボタンへのハンドラー登録"""
+
+    def __init__(self, binding_id: int, device: str, name: str, handler: Callable[[str], Any],
+                 modifiers: Iterable[str], label: Optional[str]):
+        self.id = binding_id
+        self.device = device
+        self.name = name
+        self.handler = handler
+        self.modifiers = frozenset(modifiers)
+        self.label = label or getattr(handler, '__qualname__', str(handler))
+        self.calls = 0
+        self.errors = 0
+
+
+class InputHub:
+    """
+    プロセス共通の入力フック
+
+    - キーボード・マウスのフックは最初の登録時に1つずつ起動し、以後は登録・解除しても作り直さない
+    - ただしマウスフックはマウス移動ごとにコールバックが走るため、マウスの登録がなくなったら停止する
+    - 押下されたキー名・ボタン名で表を1回引き、登録のないキーは何もせずに戻る
+    - 同じキーに修飾キー付きの登録がある場合は、押されている修飾キーを最も多く満たす登録だけを呼ぶ
+      （Ctrl+Shift+F12 では F12 単独の登録は呼ばれない）
+    - ハンドラーはフックのスレッドから呼ばれるため、重い処理は別スレッドで行うこと
+    """
+
+    def __init__(self, auto_start: bool = True):
+        """
+        Args:
+            auto_start: True の場合、登録時にフックを起動する（False はテスト用）
+        """
+        self.auto_start = auto_start
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._bindings: Dict[int, InputBinding] = {}
+        # (デバイス, 名前) -> 登録（修飾キーの多い順）
+        self._routes: Dict[Tuple[str, str], List[InputBinding]] = {}
+        self._held_modifiers = set()
+        self.keyboard_listener = None
+        self.mouse_listener = None
+
+        self.stats = {
+            'key_events': 0,
+            'mouse_events': 0,
+            'dispatched': 0,
+            'handler_errors': 0,
+            'hook_starts': 0,
+            'last_dispatch_us': 0.0,
+            'max_dispatch_us': 0.0
+        }
+
+    def register_key(self, key: str, handler: Callable[[str], Any], modifiers: Iterable[str] = (),
+                     label: Optional[str] = None) -> int:
+        """
+        キー押下のハンドラーを登録
+
+        Args:
+            key: キー名（'q', 'f12', 'pause' など。大文字小文字は区別しない）
+            handler: 押下されたキー名を受け取る関数
+            modifiers: 同時に押されている必要がある修飾キー（'ctrl', 'shift', 'alt'）
+            label: 統計用の名前
+
+        Returns:
+            登録ID（unregister() に使用）
+        """
+        return self._register('keyboard', key.lower(), handler, modifiers, label)
+
+    def register_button(self, button: str, handler: Callable[[str], Any], label: Optional[str] = None) -> int:
+        """
+        マウスボタン押下のハンドラーを登録
+
+        Args:
+            button: ボタン名（'left', 'right', 'middle' など）
+            handler: 押下されたボタン名を受け取る関数
+            label: 統計用の名前
+
+        Returns:
+            登録ID（unregister() に使用）
+        """
+        return self._register('mouse', button.lower(), handler, (), label)
+
+    def _register(self, device: str, name: str, handler: Callable[[str], Any],
+                  modifiers: Iterable[str], label: Optional[str]) -> int:
+        """登録して振り分け表を再作成"""
+        with self._lock:
+            binding = InputBinding(next(self._ids), device, name, handler, modifiers, label)
+            self._bindings[binding.id] = binding
+            self._rebuild_routes()
+        logger.debug(f"Input binding added: {device}:{'+'.join(sorted(binding.modifiers) + [name])} -> {binding.label}")
+        if self.auto_start:
+            self.ensure_running()
+        return binding.id
+
+    def unregister(self, binding_id: int) -> bool:
+        """登録を解除（マウスの登録がなくなった場合はマウスフックを停止）"""
+        idle_mouse_listener = None
+        with self._lock:
+            if self._bindings.pop(binding_id, None) is None:
+                return False
+            self._rebuild_routes()
+            if self.mouse_listener is not None and \
+                    not any(binding.device == 'mouse' for binding in self._bindings.values()):
+                idle_mouse_listener, self.mouse_listener = self.mouse_listener, None
+        if idle_mouse_listener is not None:
+            self._stop_listener(idle_mouse_listener)
+            logger.info("Mouse hook stopped (no mouse bindings)")
+        return True
+
+    def unregister_all(self, binding_ids: Iterable[int]) -> None:
+        """複数の登録をまとめて解除"""
+        for binding_id in list(binding_ids):
+            self.unregister(binding_id)
+
+    def _rebuild_routes(self) -> None:
+        """振り分け表を再作成（ロック保持中に呼ぶ。フックのスレッドが参照中の表は置き換えのみで変更しない）"""
+        routes: Dict[Tuple[str, str], List[InputBinding]] = {}
+        for binding in self._bindings.values():
+            routes.setdefault((binding.device, binding.name), []).append(binding)
+        for bindings in routes.values():
+            bindings.sort(key=lambda binding: len(binding.modifiers), reverse=True)
+        self._routes = routes
+
+    def ensure_running(self) -> bool:
+        """
+        必要なフックを起動（停止しているフックは作り直す）
+
+        Returns:
+            必要なフックが全て動作中の場合True
+        """
+        if not PYNPUT_AVAILABLE:
+            return False
+
+        with self._lock:
+            devices = {binding.device for binding in self._bindings.values()}
+            try:
+                if 'keyboard' in devices and not self._is_alive(self.keyboard_listener):
+                    if self.keyboard_listener is not None:
+                        logger.warning("Keyboard hook has stopped, restarting...")
+                    self._held_modifiers.clear()
+                    self.keyboard_listener = keyboard.Listener(
+                        on_press=self._on_press,
+                        on_release=self._on_release,
+                        suppress=False  # 仮想キー入力も検知
+                    )
+                    self.keyboard_listener.daemon = True
+                    self.keyboard_listener.start()
+                    self.stats['hook_starts'] += 1
+                    logger.info("Keyboard hook started")
+
+                if 'mouse' in devices and not self._is_alive(self.mouse_listener):
+                    if self.mouse_listener is not None:
+                        logger.warning("Mouse hook has stopped, restarting...")
+                    self.mouse_listener = mouse.Listener(on_click=self._on_click)
+                    self.mouse_listener.daemon = True
+                    self.mouse_listener.start()
+                    self.stats['hook_starts'] += 1
+                    logger.info("Mouse hook started")
+            except Exception as e:
+                logger.error(f"Error starting input hooks: {e}")
+                return False
+        return True
+
+    @staticmethod
+    def _is_alive(listener) -> bool:
+        """フックが動作中かどうか"""
+        return listener is not None and listener.running
+
+    @staticmethod
+    def _stop_listener(listener) -> None:
+        """フックを停止（フックのスレッド内のハンドラーから呼ばれても待たずに戻る）"""
+        try:
+            listener.stop()
+        except Exception as e:
+            logger.error(f"Error stopping input hook: {e}")
+
+    def stop(self) -> None:
+        """フックを停止（登録は保持し、次の ensure_running() で再開する）"""
+        with self._lock:
+            for listener in (self.keyboard_listener, self.mouse_listener):
+                if listener is not None:
+                    self._stop_listener(listener)
+            self.keyboard_listener = None
+            self.mouse_listener = None
+            self._held_modifiers.clear()
+        logger.info("Input hooks stopped")
+
+    def _on_press(self, key) -> None:
+        """キーボードフック: キー押下"""
+        self.stats['key_events'] += 1
+        name = normalize_key(key)
+        if name is None:
+            return
+        modifier = MODIFIER_KEYS.get(name)
+        if modifier is not None:
+            self._held_modifiers.add(modifier)
+        self._dispatch('keyboard', name)
+
+    def _on_release(self, key) -> None:
+        """キーボードフック: キー解放（修飾キーの状態のみ更新）"""
+        modifier = MODIFIER_KEYS.get(normalize_key(key))
+        if modifier is not None:
+            self._held_modifiers.discard(modifier)
+
+    def _on_click(self, x, y, button, pressed) -> None:
+        """マウスフック: ボタン押下"""
+        if not pressed:
+            return
+        self.stats['mouse_events'] += 1
+        name = getattr(button, 'name', None) or str(button)
+        self._dispatch('mouse', name.lower())
+
+    def _dispatch(self, device: str, name: str) -> int:
+        """
+        表を引いてハンドラーを呼び出す
+
+        Returns:
+            呼び出したハンドラー数
+        """
+        bindings = self._routes.get((device, name))
+        if not bindings:
+            return 0
+
+        start_ns = time.monotonic_ns()
+        held = self._held_modifiers
+        matched = [binding for binding in bindings if binding.modifiers <= held]
+        if not matched:
+            return 0
+        # 修飾キーを最も多く満たす登録だけを呼ぶ（表は修飾キーの多い順）
+        best = len(matched[0].modifiers)
+        called = 0
+        for binding in matched:
+            if len(binding.modifiers) != best:
+                break
+            try:
+                binding.handler(name)
+                binding.calls += 1
+                called += 1
+            except Exception as e:
+                binding.errors += 1
+                self.stats['handler_errors'] += 1
+                logger.error(f"Error in input handler ({binding.label}): {e}")
+                import traceback
+                logger.error(f"Traceback: {traceback.format_exc()}")
+
+        elapsed_us = (time.monotonic_ns() - start_ns) / NS_PER_US
+        self.stats['dispatched'] += called
+        self.stats['last_dispatch_us'] = elapsed_us
+        self.stats['max_dispatch_us'] = max(self.stats['max_dispatch_us'], elapsed_us)
+        return called
+
+    def get_status(self) -> Dict[str, Any]:
+        """フックの状態・登録一覧・統計情報を取得"""
+        with self._lock:
+            return {
+                **self.stats,
+                'pynput_available': PYNPUT_AVAILABLE,
+                'keyboard_hook': self._is_alive(self.keyboard_listener),
+                'mouse_hook': self._is_alive(self.mouse_listener),
+                'bindings': {
+                    f"{b.id}:{b.label}": {
+                        'input': f"{b.device}:{'+'.join(sorted(b.modifiers) + [b.name])}",
+                        'calls': b.calls,
+                        'errors': b.errors
+                    }
+                    for b in self._bindings.values()
+                }
+            }
+
+
+_input_hub: Optional[InputHub] = None
+_input_hub_lock = threading.Lock()
+
+
+def get_input_hub() -> InputHub:
+    """プロセス共通のInputHubを取得"""
+    global _input_hub
+    with _input_hub_lock:
+        if _input_hub is None:
+            _input_hub = InputHub()
+        return _input_hub
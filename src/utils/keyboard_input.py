@@ -5,7 +5,7 @@
 import time
 import random
 import logging
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List
 import pyautogui
 import pynput.keyboard as keyboard
 
@@ -20,13 +20,16 @@ class KeyboardController:
         self._controller = keyboard.Controller()
         logger.info("KeyboardController initialized")
         
-    def press_key(self, key: str, delay_range: Tuple[float, float] = (0.05, 0.1)) -> None:
+    def press_key(self, key: str, delay_range: Tuple[float, float] = (0.05, 0.1)) -> int:
         """
         指定されたキーを押下する（人間らしい遅延付き）
         
         Args:
             key: 押下するキー
             delay_range: キー押下時間の範囲（秒）
+            
+        Returns:
+            キーを押し下げた時刻（time.monotonic_ns()）。タイマーの遅延補正に使用
         """
         try:
             # 押下前の微小遅延（0-50ms）
@@ -37,6 +40,7 @@ class KeyboardController:
             press_duration = random.uniform(*delay_range)
             
             logger.debug(f"Pressing key: {key} for {press_duration:.3f}s")
+            key_down_ns = time.monotonic_ns()
             pyautogui.keyDown(key)
             time.sleep(press_duration)
             pyautogui.keyUp(key)
@@ -44,11 +48,46 @@ class KeyboardController:
             # 押下後の微小遅延（0-30ms）
             post_delay = random.uniform(0, 0.03)
             time.sleep(post_delay)
+            return key_down_ns
             
         except Exception as e:
             logger.error(f"Failed to press key {key}: {e}")
             raise
 
+    def press_keys_burst(self, keys: List[str], hold_range: Tuple[float, float] = (0.03, 0.05),
+                         gap_range: Tuple[float, float] = (0.01, 0.025)) -> List[int]:
+        """
+        複数キーを短い間隔で1回ずつ連続押下（同時に使用予定のフラスコをまとめて押す）
+        
+        Args:
+            keys: 押下するキーのリスト（この順で押下）
+            hold_range: 各キーの押下時間の範囲（秒）
+            gap_range: キー間の間隔の範囲（秒）
+            
+        Returns:
+            各キーを押し下げた時刻（time.monotonic_ns()）のリスト
+        """
+        try:
+            # 押下前の微小遅延はバースト全体で1回だけ
+            time.sleep(random.uniform(0, 0.05))
+            
+            logger.debug(f"Pressing key burst: {', '.join(keys)}")
+            key_down_times = []
+            for index, key in enumerate(keys):
+                if index:
+                    time.sleep(random.uniform(*gap_range))
+                key_down_times.append(time.monotonic_ns())
+                pyautogui.keyDown(key)
+                time.sleep(random.uniform(*hold_range))
+                pyautogui.keyUp(key)
+            
+            time.sleep(random.uniform(0, 0.03))
+            return key_down_times
+            
+        except Exception as e:
+            logger.error(f"Failed to press key burst {keys}: {e}")
+            raise
+
     def press_key_combination(self, keys: list[str]) -> None:
         """
         複数キーの組み合わせを押下（例：Ctrl+Shift+F1）
@@ -0,0 +1,289 @@
+"""
+セッション分析モジュール
+エリア入場イベントからエリア別の滞在時間・マップ周回数・町/戦闘時間・マクロ稼働率を集計する
+"""
+import os
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from src.utils.log_parser import (
+    LogLineParser, LogEvent, EVENT_AREA_ENTER, EVENT_SLAIN, EVENT_LEVEL_UP, EVENT_DISCONNECT, is_safe_area
+)
+
+logger = logging.getLogger(__name__)
+
+# エリア数の上限を超えた分をまとめる名前
+OTHER_AREA = '(other)'
+
+
+class SessionAnalytics:
+    """
+    ストリーミングのセッション分析
+
+    - エリア入場ごとに直前のエリアの滞在区間を確定し、合計値だけを更新する（イベント列は保持しない）
+    - エリア別集計は max_areas 件まで（超えた分は OTHER_AREA にまとめる）
+    - 直近1時間のマップ周回数は1時間分の周回時刻だけを保持して数える
+    - 1区間が max_segment_seconds を超えた分は離席（idle）として扱う
+    - feed() はイベントバスの配信スレッド、record_macro_state() はマクロ制御側、
+      get_summary() はGUIスレッドから呼ばれるため、集計状態はロックで保護する
+    """
+
+    # 回数だけを数えるイベント
+    EVENT_COUNTERS = {
+        EVENT_SLAIN: 'deaths',
+        EVENT_LEVEL_UP: 'level_ups',
+        EVENT_DISCONNECT: 'disconnects'
+    }
+
+    def __init__(self, is_safe: Callable[[str], bool] = is_safe_area, max_areas: int = 500,
+                 max_segment_seconds: float = 3600, run_gap_seconds: float = 600):
+        """
+        Args:
+            is_safe: 町・隠れ家かどうかの判定関数
+            max_areas: エリア別集計の最大件数
+            max_segment_seconds: 1回の滞在として数える最大秒数
+            run_gap_seconds: 同じ戦闘エリアに再入場した場合に別の周回とみなす間隔（秒）
+        """
+        self.is_safe = is_safe
+        self.max_areas = max_areas
+        self.max_segment_seconds = max_segment_seconds
+        self.run_gap_seconds = run_gap_seconds
+
+        self.current_area: Optional[str] = None
+        self.current_since: Optional[datetime] = None
+        self.first_timestamp: Optional[datetime] = None
+        self.last_combat_area: Optional[str] = None
+        self.last_combat_time: Optional[datetime] = None
+        self._recent_runs = deque()
+
+        # エリア名 -> [滞在秒数, 入場回数]
+        self.areas: Dict[str, List[float]] = {}
+        self.totals = {
+            'town_seconds': 0.0,
+            'combat_seconds': 0.0,
+            'idle_seconds': 0.0,
+            'area_changes': 0,
+            'map_runs': 0,
+            'deaths': 0,
+            'level_ups': 0,
+            'disconnects': 0,
+            'macro_on_seconds': 0.0
+        }
+
+        self.macro_on_since: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def feed(self, event: LogEvent) -> None:
+        """ログイベントを反映"""
+        if event.type == EVENT_AREA_ENTER:
+            self.record_area(event.timestamp, event.payload.get('area') or 'Unknown Area')
+        else:
+            self.count_event(event.type)
+
+    def count_event(self, event_type: str) -> None:
+        """死亡・レベルアップ・切断などの回数を加算（対象外の種別は無視）"""
+        key = self.EVENT_COUNTERS.get(event_type)
+        if key is not None:
+            with self._lock:
+                self.totals[key] += 1
+
+    def record_area(self, timestamp: datetime, area: str) -> None:
+        """エリア入場を記録し、直前のエリアの滞在区間を確定"""
+        with self._lock:
+            self._record_area(timestamp, area)
+
+    def _record_area(self, timestamp: datetime, area: str) -> None:
+        """record_area() の本体（ロック保持中に呼ぶ）"""
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self._close_segment(timestamp)
+
+        entry = self._area_entry(area)
+        entry[1] += 1
+        self.totals['area_changes'] += 1
+
+        if not self.is_safe(area):
+            # 町・隠れ家から別の戦闘エリア（または時間を空けて同じエリア）に入ったら新しい周回
+            is_new_run = (area != self.last_combat_area or self.last_combat_time is None
+                          or (timestamp - self.last_combat_time).total_seconds() > self.run_gap_seconds)
+            if is_new_run and (self.current_area is None or self.is_safe(self.current_area)):
+                self.totals['map_runs'] += 1
+                self._recent_runs.append(timestamp)
+                self._prune_recent_runs(timestamp)
+            self.last_combat_area = area
+            self.last_combat_time = timestamp
+
+        self.current_area = area
+        self.current_since = timestamp
+
+    def record_macro_state(self, running: bool, timestamp: Optional[datetime] = None) -> None:
+        """マクロのON/OFFを記録"""
+        timestamp = timestamp or datetime.now()
+        with self._lock:
+            if running and self.macro_on_since is None:
+                self.macro_on_since = timestamp
+            elif not running and self.macro_on_since is not None:
+                self.totals['macro_on_seconds'] += max(0.0, (timestamp - self.macro_on_since).total_seconds())
+                self.macro_on_since = None
+
+    def _prune_recent_runs(self, now: datetime) -> None:
+        """1時間より前の周回時刻を破棄"""
+        while self._recent_runs and now - self._recent_runs[0] > timedelta(hours=1):
+            self._recent_runs.popleft()
+
+    def _area_entry(self, area: str) -> List[float]:
+        """エリア別集計の項目を取得（上限を超えた場合は OTHER_AREA）"""
+        entry = self.areas.get(area)
+        if entry is None:
+            if len(self.areas) >= self.max_areas:
+                area = OTHER_AREA
+                entry = self.areas.get(area)
+            if entry is None:
+                entry = self.areas[area] = [0.0, 0]
+        return entry
+
+    def _segment_seconds(self, until: datetime) -> Tuple[float, float]:
+        """現在のエリアの滞在秒数を (有効秒数, 離席秒数) で返す"""
+        if self.current_since is None:
+            return 0.0, 0.0
+        seconds = max(0.0, (until - self.current_since).total_seconds())
+        active = min(seconds, self.max_segment_seconds)
+        return active, seconds - active
+
+    def _close_segment(self, until: datetime) -> None:
+        """現在のエリアの滞在区間を集計に加算"""
+        if self.current_area is None:
+            return
+        active, idle = self._segment_seconds(until)
+        self._area_entry(self.current_area)[0] += active
+        self.totals['idle_seconds'] += idle
+        key = 'town_seconds' if self.is_safe(self.current_area) else 'combat_seconds'
+        self.totals[key] += active
+
+    def get_summary(self, now: Optional[datetime] = None, top: int = 20) -> Dict[str, Any]:
+        """
+        集計結果を取得（現在のエリアの滞在中の時間も含める）
+
+        Args:
+            now: 集計の終端時刻（Noneの場合は現在時刻）
+            top: エリア別集計の表示件数
+        """
+        now = now or datetime.now()
+        with self._lock:
+            return self._summarize(now, top)
+
+    def _summarize(self, now: datetime, top: int) -> Dict[str, Any]:
+        """get_summary() の本体（ロック保持中に呼ぶ）"""
+        totals = dict(self.totals)
+        areas = {area: list(entry) for area, entry in self.areas.items()}
+
+        if self.current_area is not None:
+            active, idle = self._segment_seconds(now)
+            entry = areas.get(self.current_area) or areas.get(OTHER_AREA)
+            if entry is not None:
+                entry[0] += active
+            totals['idle_seconds'] += idle
+            totals['town_seconds' if self.is_safe(self.current_area) else 'combat_seconds'] += active
+        if self.macro_on_since is not None:
+            totals['macro_on_seconds'] += max(0.0, (now - self.macro_on_since).total_seconds())
+
+        self._prune_recent_runs(now)
+
+        active_seconds = totals['town_seconds'] + totals['combat_seconds']
+        hours = active_seconds / 3600
+        ranked = sorted(areas.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return {
+            **totals,
+            'active_seconds': active_seconds,
+            'first_timestamp': self.first_timestamp.isoformat() if self.first_timestamp else None,
+            'current_area': self.current_area,
+            'maps_per_hour': totals['map_runs'] / hours if hours else 0.0,
+            'maps_last_hour': len(self._recent_runs),
+            'combat_ratio': totals['combat_seconds'] / active_seconds if active_seconds else 0.0,
+            'macro_duty_cycle': totals['macro_on_seconds'] / active_seconds if active_seconds else 0.0,
+            'top_areas': [{'area': area, 'seconds': entry[0], 'visits': int(entry[1])} for area, entry in ranked],
+            'tracked_areas': len(areas)
+        }
+
+
+def _index_chunk(path: str, start: int, end: int) -> List[Tuple[datetime, str, Optional[str]]]:
+    """ファイルの [start, end) を解析して集計対象の (時刻, イベント種別, エリア名) を返す（並列処理の単位）"""
+    parser = LogLineParser()
+    entries = []
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = f.read(min(remaining, 16 * 1024 * 1024))
+            if not data:
+                break
+            remaining -= len(data)
+            # 読み取り単位の末尾で行が切れないよう、次の改行まで読み足す
+            if remaining > 0 and not data.endswith(b'\n'):
+                tail = f.readline()
+                remaining -= len(tail)
+                data += tail
+            for event in parser.parse_batch(data):
+                if event.type == EVENT_AREA_ENTER:
+                    entries.append((event.timestamp, event.type, event.payload.get('area') or 'Unknown Area'))
+                elif event.type in SessionAnalytics.EVENT_COUNTERS:
+                    entries.append((event.timestamp, event.type, None))
+    return entries
+
+
+def _chunk_bounds(path: str, chunk_size: int) -> List[Tuple[int, int]]:
+    """ファイルを行の途中で切らないように chunk_size 程度の範囲に分割"""
+    size = os.path.getsize(path)
+    bounds = []
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            end = min(size, start + chunk_size)
+            if end < size:
+                f.seek(end)
+                end += len(f.readline())
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+
+def index_log(path: str, workers: int = 1, chunk_size: int = 64 * 1024 * 1024,
+              analytics: Optional[SessionAnalytics] = None) -> SessionAnalytics:
+    """
+    過去の Client.txt 全体を集計（バッチモード）
+
+    Args:
+        path: Client.txt のパス
+        workers: 並列に解析するプロセス数（1の場合は逐次）
+        chunk_size: 1プロセスが解析する範囲のバイト数
+        analytics: 集計先（Noneの場合は新規作成）
+
+    Returns:
+        集計済みの SessionAnalytics
+    """
+    analytics = analytics or SessionAnalytics()
+    bounds = _chunk_bounds(path, chunk_size)
+    logger.info(f"Indexing {path}: {len(bounds)} chunks, {workers} workers")
+
+    if workers > 1 and len(bounds) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for entries in executor.map(_index_chunk, [path] * len(bounds), *zip(*bounds)):
+                _apply_entries(analytics, entries)
+    else:
+        for start, end in bounds:
+            _apply_entries(analytics, _index_chunk(path, start, end))
+
+    return analytics
+
+
+def _apply_entries(analytics: SessionAnalytics, entries: List[Tuple[datetime, str, Optional[str]]]) -> None:
+    """_index_chunk() の結果を順に集計に反映"""
+    for timestamp, event_type, area in entries:
+        if event_type == EVENT_AREA_ENTER:
+            analytics.record_area(timestamp, area)
+        else:
+            analytics.count_event(event_type)
@@ -0,0 +1,221 @@
+"""
+ログイベントバス
+解析済みのログイベントを、種別とフィルターで登録した購読者へ専用スレッドから配信する
+"""
+import itertools
+import threading
+import time
+import logging
+from collections import deque
+from typing import Callable, Dict, Any, Optional, Iterable, List
+
+from src.utils.log_parser import LogEvent
+
+logger = logging.getLogger(__name__)
+
+NS_PER_MS = 1_000_000
+
+
+class LogSubscription:
+    """イベントの購読登録"""
+
+    def __init__(self, subscription_id: int, handler: Callable[[LogEvent], Any],
+                 event_types: Optional[Iterable[str]], predicate: Optional[Callable[[LogEvent], bool]],
+                 name: Optional[str]):
+        self.id = subscription_id
+        self.handler = handler
+        self.event_types = frozenset(event_types) if event_types else None
+        self.predicate = predicate
+        self.name = name or getattr(handler, '__qualname__', str(handler))
+        self.delivered = 0
+        self.errors = 0
+
+
+class LogEventBus:
+    """
+    ノンブロッキングのログイベント配信
+
+    - publish() はキューに積んで即座に戻る（ログ追従スレッドは購読者の処理を待たない）
+    - 購読者は種別ごとの表で引くため、各イベントは関心のある購読者にだけ届く
+    - キューは max_queue 件までで、溢れた場合は古いイベントから捨てる
+    - dispatch() は同じ振り分けを呼び出し元スレッドで同期的に行う（手動テスト用）
+    """
+
+    def __init__(self, max_queue: int = 10000):
+        """
+        Args:
+            max_queue: 未配信イベントの最大件数
+        """
+        self._condition = threading.Condition()
+        self._queue = deque()
+        self.max_queue = max_queue
+        self._ids = itertools.count(1)
+        self._subscriptions: Dict[int, LogSubscription] = {}
+        # イベント種別 -> 購読者（None は全種別の購読者）
+        self._routes: Dict[Optional[str], List[LogSubscription]] = {None: []}
+        self._running = False
+        self.thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'published': 0,
+            'delivered': 0,
+            'unrouted': 0,
+            'dropped': 0,
+            'handler_errors': 0,
+            'max_queue_depth': 0,
+            'last_latency_ms': 0.0,
+            'max_latency_ms': 0.0
+        }
+
+    def start(self) -> None:
+        """配信スレッドを開始"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self.thread = threading.Thread(target=self._run, name="LogEventBus", daemon=True)
+            self.thread.start()
+        logger.info("Log event bus started")
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """配信スレッドを停止（未配信のイベントは破棄）"""
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._queue.clear()
+            self._condition.notify_all()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
+        logger.info("Log event bus stopped")
+
+    def subscribe(self, handler: Callable[[LogEvent], Any], event_types: Optional[Iterable[str]] = None,
+                  predicate: Optional[Callable[[LogEvent], bool]] = None, name: Optional[str] = None) -> int:
+        """
+        購読を登録
+
+        Args:
+            handler: イベントを受け取る関数（配信スレッドから呼ばれる）
+            event_types: 受け取るイベント種別（Noneの場合は全て）
+            predicate: 追加の条件（Trueを返したイベントのみ受け取る）
+            name: 統計用の名前
+
+        Returns:
+            購読ID（unsubscribe() に使用）
+        """
+        with self._condition:
+            subscription = LogSubscription(next(self._ids), handler, event_types, predicate, name)
+            self._subscriptions[subscription.id] = subscription
+            self._rebuild_routes()
+        logger.debug(f"Log event subscriber added: {subscription.name} {sorted(event_types or [])}")
+        return subscription.id
+
+    def unsubscribe(self, subscription_id: int) -> bool:
+        """購読を解除"""
+        with self._condition:
+            if self._subscriptions.pop(subscription_id, None) is None:
+                return False
+            self._rebuild_routes()
+        return True
+
+    def _rebuild_routes(self) -> None:
+        """種別ごとの購読者表を再作成（ロック保持中に呼ぶ。配信中の表は置き換えのみで変更しない）"""
+        routes: Dict[Optional[str], List[LogSubscription]] = {None: []}
+        for subscription in self._subscriptions.values():
+            for event_type in subscription.event_types or (None,):
+                routes.setdefault(event_type, []).append(subscription)
+        self._routes = routes
+
+    def publish(self, event: LogEvent) -> None:
+        """イベントを配信キューに積む（即座に戻る）"""
+        self.publish_batch((event,))
+
+    def publish_batch(self, events: Iterable[LogEvent]) -> None:
+        """複数のイベントをまとめて配信キューに積む（購読者のいない種別は積まない）"""
+        routes = self._routes
+        queued_ns = time.monotonic_ns()
+        with self._condition:
+            for event in events:
+                self.stats['published'] += 1
+                if event.type not in routes and not routes[None]:
+                    self.stats['unrouted'] += 1
+                    continue
+                if len(self._queue) >= self.max_queue:
+                    self._queue.popleft()
+                    self.stats['dropped'] += 1
+                self._queue.append((queued_ns, event))
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], len(self._queue))
+            self._condition.notify()
+        self.start()
+
+    def dispatch(self, event: LogEvent) -> int:
+        """
+        イベントを呼び出し元スレッドで同期的に配信
+
+        Returns:
+            イベントを受け取った購読者数
+        """
+        routes = self._routes
+        delivered = 0
+        for subscription in routes.get(event.type, []) + routes[None]:
+            if subscription.predicate is not None:
+                try:
+                    if not subscription.predicate(event):
+                        continue
+                except Exception as e:
+                    logger.error(f"Error in log event filter ({subscription.name}): {e}")
+                    continue
+            try:
+                subscription.handler(event)
+                subscription.delivered += 1
+                delivered += 1
+            except Exception as e:
+                subscription.errors += 1
+                self.stats['handler_errors'] += 1
+                logger.error(f"Error in log event subscriber ({subscription.name}): {e}")
+                import traceback
+                logger.error(f"Traceback: {traceback.format_exc()}")
+        self.stats['delivered'] += delivered
+        return delivered
+
+    def _run(self) -> None:
+        """配信ループ"""
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._running:
+                    break
+                queued_ns, event = self._queue.popleft()
+
+            latency_ms = (time.monotonic_ns() - queued_ns) / NS_PER_MS
+            self.stats['last_latency_ms'] = latency_ms
+            self.stats['max_latency_ms'] = max(self.stats['max_latency_ms'], latency_ms)
+            self.dispatch(event)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報（購読者ごとの配信数を含む）を取得"""
+        with self._condition:
+            return {
+                **self.stats,
+                'queue_depth': len(self._queue),
+                'running': self._running,
+                'subscribers': {
+                    f"{s.id}:{s.name}": {'types': sorted(s.event_types) if s.event_types else None,
+                                         'delivered': s.delivered, 'errors': s.errors}
+                    for s in self._subscriptions.values()
+                }
+            }
+
+
+_log_event_bus: Optional[LogEventBus] = None
+_log_event_bus_lock = threading.Lock()
+
+
+def get_log_event_bus() -> LogEventBus:
+    """プロセス共通のLogEventBusを取得"""
+    global _log_event_bus
+    with _log_event_bus_lock:
+        if _log_event_bus is None:
+            _log_event_bus = LogEventBus()
+        return _log_event_bus
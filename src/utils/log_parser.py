@@ -0,0 +1,257 @@
+"""
+Client.txt 解析モジュール
+読み取ったバイト列から対象のシステムメッセージを持つ行だけを探し出し、構造化イベントに変換する
+"""
+import re
+import mmap
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Union, Iterable
+
+logger = logging.getLogger(__name__)
+
+# イベント種別
+EVENT_AREA_ENTER = 'area_enter'
+EVENT_AREA_EXIT = 'area_exit'
+EVENT_SLAIN = 'slain'
+EVENT_LEVEL_UP = 'level_up'
+EVENT_DISCONNECT = 'disconnect'
+EVENT_LOGIN = 'login'
+
+# 行ヘッダー: "2025/07/05 06:07:24 113538687 cff945b9 [INFO Client 14940] 本文"
+# システムメッセージの本文は ": " で始まる（チャットは "#名前: " などになる）
+HEADER_PATTERN = re.compile(
+    rb'(\d{4})/(\d\d)/(\d\d) (\d\d):(\d\d):(\d\d) (\d+) (\w+) \[(\w+) Client (\d+)\] (.*)'
+)
+
+# クライアント起動ごとに出力されるセッション開始行
+SESSION_START_MARKER = b'***** LOG FILE OPENING *****'
+
+# 判定ルール: (行に含まれる固定文字列, イベント種別, 本文のパターン)
+# 固定文字列で候補行を絞り込み、本文のパターンに一致した行だけをイベントにする
+MESSAGE_RULES = [
+    (b'] : You have entered ', EVENT_AREA_ENTER, re.compile(rb': You have entered (?P<area>.+)\.$')),
+    (b'] : You have left ', EVENT_AREA_EXIT, re.compile(rb': You have left (?P<area>.+)\.$')),
+    (b' has been slain.', EVENT_SLAIN, re.compile(rb': (?P<character>\S+) has been slain\.$')),
+    (b' is now level ', EVENT_LEVEL_UP,
+     re.compile(rb': (?P<character>\S+) \((?P<character_class>\w+)\) is now level (?P<level>\d+)$')),
+    (b'] Abnormal disconnect', EVENT_DISCONNECT, re.compile(rb'Abnormal disconnect: ?(?P<reason>.*)$')),
+    (b'] Connected to ', EVENT_LOGIN, re.compile(rb'Connected to (?P<server>\S+) in (?P<latency_ms>\d+)ms\.$')),
+]
+
+# 安全エリア（町・拠点）。隠れ家は名前に "hideout" を含むかで判定
+SAFE_AREAS = frozenset({
+    # Act拠点（実際のエリア名）
+    "lioneye's watch",  # Act1 & Act6
+    "the forest encampment",  # Act2
+    "the sarn encampment",  # Act3 & Act8
+    "highgate",  # Act4 & Act9
+    "overseer's tower",  # Act5
+    "the bridge encampment",  # Act7
+    "oriath docks",  # Act10
+
+    # エンドゲーム拠点
+    "karui shore",
+    "kingsmarch",
+})
+
+
+def is_safe_area(area_name: Optional[str], safe_areas=SAFE_AREAS) -> bool:
+    """安全なエリア（町・隠れ家）かどうかを判定"""
+    if not area_name:
+        return False
+
+    area_lower = area_name.lower()
+
+    # Hideoutは部分一致で判定
+    if "hideout" in area_lower:
+        return True
+
+    # その他の安全エリアは完全一致で判定
+    return area_lower in safe_areas
+
+
+class LogEvent:
+    """Client.txt の1行から作成した構造化イベント"""
+
+    __slots__ = ('timestamp', 'uptime_ms', 'client_id', 'level', 'type', 'payload', 'offset')
+
+    def __init__(self, timestamp: datetime, uptime_ms: int, client_id: int, level: str,
+                 event_type: str, payload: Dict[str, Any], offset: int = 0):
+        self.timestamp = timestamp
+        self.uptime_ms = uptime_ms    # クライアント起動からの経過ミリ秒
+        self.client_id = client_id    # クライアントのプロセスID
+        self.level = level
+        self.type = event_type
+        self.payload = payload
+        self.offset = offset          # 読み取ったバイト列内での行の開始位置
+
+    def __repr__(self):
+        return f"LogEvent({self.type}, {self.timestamp}, {self.payload})"
+
+
+class LogLineParser:
+    """
+    Client.txt のバッチ解析器
+
+    - 行を分割せず、読み取ったバイト列全体に対して判定ルールの固定文字列を検索する
+      （チャット・取引・デバッグ出力などの大半の行は正規表現を一度も通らない）
+    - 見つかった行だけをヘッダー → 本文の順に1回ずつ解析してイベントにする
+    """
+
+    def __init__(self, rules: Optional[List] = None):
+        """
+        Args:
+            rules: (行に含まれる固定文字列, イベント種別, 本文のパターン) のリスト（Noneの場合は MESSAGE_RULES）
+        """
+        self.rules = list(rules or MESSAGE_RULES)
+
+        self.stats = {
+            'batches': 0,
+            'bytes': 0,
+            'candidates': 0,
+            'events': 0,
+            'malformed': 0,
+            'last_parse_ms': 0.0,
+            'total_parse_ms': 0.0
+        }
+
+    def parse_batch(self, data: bytes) -> List[LogEvent]:
+        """
+        改行区切りのバイト列からイベントを抽出
+
+        Args:
+            data: 1回の読み取りで得た完全な行のバイト列
+
+        Returns:
+            行の出現順のイベントリスト
+        """
+        start = time.perf_counter()
+        hits = []
+        for needle, event_type, pattern in self.rules:
+            position = data.find(needle)
+            while position != -1:
+                line_start = data.rfind(b'\n', 0, position) + 1
+                line_end = data.find(b'\n', position)
+                if line_end == -1:
+                    line_end = len(data)
+                hits.append((line_start, line_end, event_type, pattern))
+                position = data.find(needle, line_end)
+
+        hits.sort(key=lambda hit: hit[0])
+        events = []
+        for line_start, line_end, event_type, pattern in hits:
+            event = self._parse_candidate(data[line_start:line_end].rstrip(b'\r'), event_type, pattern)
+            if event is not None:
+                event.offset = line_start
+                events.append(event)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats['batches'] += 1
+        self.stats['bytes'] += len(data)
+        self.stats['candidates'] += len(hits)
+        self.stats['events'] += len(events)
+        self.stats['last_parse_ms'] = elapsed
+        self.stats['total_parse_ms'] += elapsed
+        return events
+
+    def parse_line(self, line: Union[str, bytes]) -> Optional[LogEvent]:
+        """1行を解析（対象外の行はNone）"""
+        if isinstance(line, str):
+            line = line.encode('utf-8')
+        line = line.rstrip(b'\r\n')
+        for needle, event_type, pattern in self.rules:
+            if needle in line:
+                return self._parse_candidate(line, event_type, pattern)
+        return None
+
+    def find_last(self, path, event_types: Optional[Iterable[str]] = None, block_size: int = 1024 * 1024,
+                  max_scan_bytes: int = 64 * 1024 * 1024) -> Optional[LogEvent]:
+        """
+        ファイルを末尾から後方へブロック単位で走査し、最新のイベントを取得
+
+        ファイルはメモリマップし、末尾から見つかった時点で終了するため、
+        読み取り量はファイルサイズではなく最新イベントまでの距離で決まる。
+
+        Args:
+            path: Client.txt のパス
+            event_types: 対象のイベント種別（Noneの場合は全て）
+            block_size: 1回に走査するバイト数
+            max_scan_bytes: 走査する最大バイト数（これより前は見ない）
+
+        Returns:
+            最新のイベント。セッション開始行の後に対象イベントが無い場合はNone
+        """
+        wanted = set(event_types) if event_types else None
+        rules = [rule for rule in self.rules if wanted is None or rule[1] in wanted]
+        needles = [rule[0] for rule in rules] + [SESSION_START_MARKER]
+        overlap = max(len(needle) for needle in needles) - 1
+
+        with open(path, 'rb') as f:
+            size = f.seek(0, 2)
+            if size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                limit = max(0, size - max_scan_bytes)
+                end = search_limit = size
+                while end > limit:
+                    start = max(limit, end - block_size)
+                    # ブロック境界をまたぐ一致を拾うため、後ろのブロックと overlap バイト重ねて検索
+                    search_end = min(search_limit, end + overlap)
+                    hits = [(mm.rfind(needle, start, search_end), index) for index, needle in enumerate(needles)]
+                    position, index = max(hits)
+                    if position < 0:
+                        end = start
+                        continue
+                    if index == len(rules):
+                        return None
+
+                    line_start = mm.rfind(b'\n', 0, position) + 1
+                    line_end = mm.find(b'\n', position)
+                    line = mm[line_start:line_end if line_end != -1 else size].rstrip(b'\r')
+                    _, event_type, pattern = rules[index]
+                    event = self._parse_candidate(line, event_type, pattern)
+                    if event is not None:
+                        event.offset = line_start
+                        return event
+                    # 解析できない行はその手前から探し直す
+                    end = search_limit = line_start
+        return None
+
+    def _parse_candidate(self, line: bytes, event_type: str, pattern) -> Optional[LogEvent]:
+        """候補行をヘッダーと本文に分けて解析"""
+        header = HEADER_PATTERN.match(line)
+        if header is None:
+            self.stats['malformed'] += 1
+            return None
+
+        body = pattern.match(header.group(11))
+        if body is None:
+            self.stats['malformed'] += 1
+            return None
+
+        try:
+            timestamp = datetime(*(int(value) for value in header.group(1, 2, 3, 4, 5, 6)))
+        except ValueError:
+            self.stats['malformed'] += 1
+            return None
+
+        payload = {name: int(value) if value.isdigit() else value.decode('utf-8', errors='ignore').strip()
+                   for name, value in body.groupdict().items() if value is not None}
+        return LogEvent(
+            timestamp=timestamp,
+            uptime_ms=int(header.group(7)),
+            client_id=int(header.group(10)),
+            level=header.group(9).decode('ascii', errors='ignore'),
+            event_type=event_type,
+            payload=payload
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報（処理速度を含む）を取得"""
+        total_ms = self.stats['total_parse_ms']
+        return {
+            **self.stats,
+            'mb_per_second': self.stats['bytes'] / 1e6 / (total_ms / 1000) if total_ms else 0.0
+        }
@@ -0,0 +1,367 @@
+"""
+ログファイル追従モジュール
+ファイルハンドルを開いたまま追記分だけを読み取り、OSの変更通知で待機する
+"""
+import os
+import sys
+import time
+import select
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# 1回の読み取りサイズ
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class _PollNotifier:
+    """変更通知なし（待機時間の経過でのみ起きる）"""
+
+    name = 'poll'
+
+    def __init__(self):
+        self._wake_event = threading.Event()
+
+    def wait(self, timeout: float) -> bool:
+        """timeout 秒待機（変更通知があった場合True）"""
+        self._wake_event.wait(timeout)
+        self._wake_event.clear()
+        return False
+
+    def wake(self) -> None:
+        """待機中のスレッドを起こす"""
+        self._wake_event.set()
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyNotifier:
+    """Linux inotify によるディレクトリ変更通知（ローテーションを検出するためディレクトリを監視）"""
+
+    name = 'inotify'
+
+    IN_MODIFY = 0x002
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+
+    def __init__(self, directory: Path):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = (self.IN_MODIFY | self.IN_ATTRIB | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM
+                | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE)
+        if libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, f"inotify_add_watch failed: {directory}")
+
+        self._wake_read, self._wake_write = os.pipe()
+
+    def wait(self, timeout: float) -> bool:
+        """変更通知または timeout 秒経過まで待機（変更通知があった場合True）"""
+        readable, _, _ = select.select([self._fd, self._wake_read], [], [], timeout)
+        if self._wake_read in readable:
+            os.read(self._wake_read, 4096)
+        if self._fd not in readable:
+            return False
+        # 溜まったイベントは全て読み捨てる（どのイベントでも追記分を読みに行く）
+        try:
+            while os.read(self._fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def wake(self) -> None:
+        """待機中のスレッドを起こす"""
+        os.write(self._wake_write, b'\0')
+
+    def close(self) -> None:
+        for fd in (self._fd, self._wake_read, self._wake_write):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class _WindowsNotifier:
+    """Windows FindFirstChangeNotification によるディレクトリ変更通知"""
+
+    name = 'windows'
+
+    FILE_NOTIFY_CHANGE_FILE_NAME = 0x001
+    FILE_NOTIFY_CHANGE_SIZE = 0x008
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x010
+    WAIT_OBJECT_0 = 0
+
+    def __init__(self, directory: Path):
+        import ctypes
+        from ctypes import wintypes
+
+        self._ctypes = ctypes
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        kernel32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        kernel32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+        kernel32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+        kernel32.CreateEventW.restype = wintypes.HANDLE
+        kernel32.CreateEventW.argtypes = [ctypes.c_void_p, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+        kernel32.SetEvent.argtypes = [wintypes.HANDLE]
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+        kernel32.WaitForMultipleObjects.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE),
+                                                    wintypes.BOOL, wintypes.DWORD]
+        self._kernel32 = kernel32
+
+        flags = (self.FILE_NOTIFY_CHANGE_FILE_NAME | self.FILE_NOTIFY_CHANGE_SIZE
+                 | self.FILE_NOTIFY_CHANGE_LAST_WRITE)
+        change_handle = kernel32.FindFirstChangeNotificationW(str(directory), False, flags)
+        if not change_handle or change_handle == wintypes.HANDLE(-1).value:
+            raise ctypes.WinError(ctypes.get_last_error())
+
+        wake_handle = kernel32.CreateEventW(None, False, False, None)
+        if not wake_handle:
+            kernel32.FindCloseChangeNotification(change_handle)
+            raise ctypes.WinError(ctypes.get_last_error())
+
+        self._change_handle = change_handle
+        self._wake_handle = wake_handle
+        self._handles = (wintypes.HANDLE * 2)(change_handle, wake_handle)
+
+    def wait(self, timeout: float) -> bool:
+        """変更通知または timeout 秒経過まで待機（変更通知があった場合True）"""
+        result = self._kernel32.WaitForMultipleObjects(2, self._handles, False, int(timeout * 1000))
+        if result == self.WAIT_OBJECT_0:
+            self._kernel32.FindNextChangeNotification(self._change_handle)
+            return True
+        return False
+
+    def wake(self) -> None:
+        """待機中のスレッドを起こす"""
+        self._kernel32.SetEvent(self._wake_handle)
+
+    def close(self) -> None:
+        self._kernel32.FindCloseChangeNotification(self._change_handle)
+        self._kernel32.CloseHandle(self._wake_handle)
+
+
+def create_notifier(directory: Path, backend: str = 'auto'):
+    """
+    変更通知オブジェクトを作成（利用できない場合はポーリングにフォールバック）
+
+    Args:
+        directory: 監視するディレクトリ
+        backend: 'auto' / 'inotify' / 'windows' / 'poll'
+    """
+    if backend == 'auto':
+        backend = 'inotify' if sys.platform.startswith('linux') else 'windows' if sys.platform == 'win32' else 'poll'
+
+    try:
+        if backend == 'inotify':
+            return _InotifyNotifier(directory)
+        if backend == 'windows':
+            return _WindowsNotifier(directory)
+    except Exception as e:
+        logger.warning(f"Change notification ({backend}) unavailable, falling back to polling: {e}")
+    return _PollNotifier()
+
+
+class LogTailer:
+    """
+    追記されるログファイルの追従読み取り
+
+    - ファイルはバイナリモードで開いたままにし、追記分だけを読む（毎回開き直さない）
+    - 読み取り結果は完全な行（改行終わり）のみ返し、書きかけの末尾行は次回に持ち越す
+    - ファイルの置き換え（ローテーション）と切り詰め（サイズ縮小）を検出して先頭から読み直す
+    - wait() はOSの変更通知で即座に起き、通知が使えない・遅れる場合は適応的なポーリング間隔で起きる
+      （データがあれば最短間隔に戻し、無ければ最長間隔まで倍々に延ばす）
+    """
+
+    def __init__(self, path, min_interval: float = 0.02, max_interval: float = 0.5,
+                 backend: str = 'auto'):
+        """
+        Args:
+            path: ログファイルのパス
+            min_interval: ポーリング間隔の最小値（秒）
+            max_interval: ポーリング間隔の最大値（秒）
+            backend: 変更通知の方式（'auto' / 'inotify' / 'windows' / 'poll'）
+        """
+        self.path = Path(path)
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backend = backend
+
+        self._file = None
+        self._file_id = None
+        self._partial = b''
+        self.position = 0
+        self.interval = min_interval
+        self.notifier = None
+
+        self.stats = {
+            'reads': 0,
+            'bytes_read': 0,
+            'wakeups': 0,
+            'notifications': 0,
+            'rotations': 0,
+            'truncations': 0,
+            'last_data_time': None
+        }
+
+    def open(self, from_end: bool = True) -> bool:
+        """
+        ファイルを開いて追従を開始
+
+        Args:
+            from_end: Trueの場合はファイル末尾から（既存の内容は読まない）
+
+        Returns:
+            開けた場合True
+        """
+        if self.notifier is None:
+            self.notifier = create_notifier(self.path.parent, self.backend)
+            logger.info(f"Log tailer using {self.notifier.name} change notification")
+
+        if not self._open_file():
+            return False
+        if from_end:
+            self._file.seek(0, os.SEEK_END)
+            self.position = self._file.tell()
+        return True
+
+    def _open_file(self) -> bool:
+        """ファイルハンドルを開き直す（位置は先頭）"""
+        self._close_file()
+        try:
+            self._file = open(self.path, 'rb')
+        except OSError as e:
+            logger.debug(f"Log file not available: {self.path} ({e})")
+            return False
+
+        stat = os.fstat(self._file.fileno())
+        self._file_id = (stat.st_dev, stat.st_ino)
+        self._partial = b''
+        self.position = 0
+        return True
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def close(self) -> None:
+        """ファイルハンドルと変更通知を解放"""
+        self._close_file()
+        if self.notifier is not None:
+            self.notifier.close()
+            self.notifier = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def read(self) -> bytes:
+        """
+        追記された完全な行をまとめて読み取り
+
+        Returns:
+            改行で終わるバイト列（新しい行が無ければ空）
+        """
+        if self._file is None and not self._open_file():
+            return b''
+
+        chunks = [self._partial] if self._partial else []
+        while True:
+            chunk = self._file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            self.position += len(chunk)
+            self.stats['bytes_read'] += len(chunk)
+
+        if not chunks:
+            return b''
+
+        data = b''.join(chunks)
+        end = data.rfind(b'\n') + 1
+        self._partial = data[end:]
+        if end:
+            self.stats['reads'] += 1
+            self.stats['last_data_time'] = time.time()
+        return data[:end]
+
+    def check_rotation(self) -> bool:
+        """
+        ファイルの置き換え・切り詰めを検出して開き直す（データが無い時に呼ぶ）
+
+        Returns:
+            先頭から読み直す状態になった場合True
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            # ファイルが一時的に存在しない（ローテーション中）
+            return False
+
+        if self._file is None or (stat.st_dev, stat.st_ino) != self._file_id:
+            if self._file is not None:
+                logger.info("Log file replaced, reopening from start")
+                self.stats['rotations'] += 1
+            return self._open_file()
+
+        if stat.st_size < self.position:
+            logger.info("Log file truncated, resetting position")
+            self.stats['truncations'] += 1
+            self._file.seek(0)
+            self._partial = b''
+            self.position = 0
+            return True
+        return False
+
+    def wait(self, had_data: bool) -> bool:
+        """
+        次の追記まで待機
+
+        Args:
+            had_data: 直前の read() でデータがあったか（ポーリング間隔の調整に使用）
+
+        Returns:
+            変更通知で起きた場合True
+        """
+        self.interval = self.min_interval if had_data else min(self.max_interval, self.interval * 2)
+        notified = self.notifier.wait(self.interval) if self.notifier else False
+        self.stats['wakeups'] += 1
+        if notified:
+            self.stats['notifications'] += 1
+            self.interval = self.min_interval
+        return notified
+
+    def wake(self) -> None:
+        """wait() 中のスレッドを起こす（停止時に使用）"""
+        if self.notifier is not None:
+            self.notifier.wake()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        return {
+            **self.stats,
+            'backend': self.notifier.name if self.notifier else None,
+            'position': self.position,
+            'interval': self.interval
+        }
@@ -0,0 +1,140 @@
+"""
+プロセス検索モジュール
+Path of ExileのPIDをキャッシュし、全プロセスの走査はキャッシュが無効な場合だけ行う
+"""
+import time
+import threading
+import logging
+from typing import Dict, Any, Optional, Iterable
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessLocator:
+    """
+    PID キャッシュ付きのプロセス検索
+
+    - 見つけたプロセスの PID と起動時刻を記録し、次回は PID の存在と起動時刻の一致だけで確認する
+      （PID が再利用された場合は起動時刻が変わるため別プロセスと判定できる）
+    - キャッシュが無効な場合のみ全プロセスを走査する。まずプロセス名だけで探し、
+      見つからない場合に限り取得コストの高い実行ファイルパスで探す
+    - start_watcher() でバックグラウンド監視を有効にすると、呼び出し時には常にキャッシュが温まっている
+    """
+
+    def __init__(self, name_patterns: Iterable[str] = ('pathofexile', 'poe'),
+                 exe_patterns: Iterable[str] = ('pathofexile',)):
+        """
+        Args:
+            name_patterns: プロセス名に含まれる文字列（小文字）
+            exe_patterns: 実行ファイルパスに含まれる文字列（小文字）
+        """
+        self.name_patterns = tuple(name_patterns)
+        self.exe_patterns = tuple(exe_patterns)
+
+        self._lock = threading.Lock()
+        self._process: Optional[psutil.Process] = None
+        self._create_time: Optional[float] = None
+
+        self._watch_stop = threading.Event()
+        self._watch_thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'lookups': 0,
+            'cache_hits': 0,
+            'scans': 0,
+            'exe_scans': 0,
+            'last_scan_ms': 0.0
+        }
+
+    def locate(self) -> Optional[psutil.Process]:
+        """プロセスを取得（キャッシュが有効ならPIDの確認のみ）"""
+        with self._lock:
+            self.stats['lookups'] += 1
+            if self._process is not None and self._is_cached_alive():
+                self.stats['cache_hits'] += 1
+                return self._process
+            self._process = None
+            self._create_time = None
+            return self._scan()
+
+    def _is_cached_alive(self) -> bool:
+        """キャッシュしたPIDが同じプロセスのまま存在するか（ロック保持中に呼ぶ）"""
+        try:
+            return psutil.Process(self._process.pid).create_time() == self._create_time
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+
+    def _scan(self) -> Optional[psutil.Process]:
+        """全プロセスを走査（ロック保持中に呼ぶ）"""
+        start = time.perf_counter()
+        self.stats['scans'] += 1
+        try:
+            process = self._scan_by('name', self.name_patterns)
+            if process is None and self.exe_patterns:
+                self.stats['exe_scans'] += 1
+                process = self._scan_by('exe', self.exe_patterns)
+
+            if process is not None:
+                self._process = process
+                self._create_time = process.create_time()
+                logger.debug(f"Found POE process: {process.info}")
+            return process
+
+        except Exception as e:
+            logger.error(f"Error searching for POE process: {e}")
+            return None
+        finally:
+            self.stats['last_scan_ms'] = (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def _scan_by(attr: str, patterns) -> Optional[psutil.Process]:
+        """プロセス名または実行ファイルパスで走査"""
+        for proc in psutil.process_iter(['pid', attr]):
+            try:
+                value = (proc.info.get(attr) or '').lower()
+                if value and any(pattern in value for pattern in patterns):
+                    return proc
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+        return None
+
+    def invalidate(self) -> None:
+        """キャッシュを破棄"""
+        with self._lock:
+            self._process = None
+            self._create_time = None
+
+    def start_watcher(self, interval: float = 5.0) -> None:
+        """バックグラウンドでキャッシュを定期的に確認・更新"""
+        if self._watch_thread and self._watch_thread.is_alive():
+            return
+        self._watch_stop.clear()
+
+        def watch():
+            while not self._watch_stop.is_set():
+                try:
+                    self.locate()
+                except Exception as e:
+                    logger.error(f"Error in process watcher: {e}")
+                self._watch_stop.wait(interval)
+
+        self._watch_thread = threading.Thread(target=watch, name="ProcessLocator", daemon=True)
+        self._watch_thread.start()
+        logger.debug(f"Process watcher started (interval: {interval}s)")
+
+    def stop_watcher(self) -> None:
+        """バックグラウンド監視を停止"""
+        self._watch_stop.set()
+        if self._watch_thread and self._watch_thread is not threading.current_thread():
+            self._watch_thread.join(timeout=1.0)
+        self._watch_thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        return {
+            **self.stats,
+            'pid': self._process.pid if self._process is not None else None,
+            'watching': bool(self._watch_thread and self._watch_thread.is_alive())
+        }
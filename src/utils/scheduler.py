@@ -0,0 +1,292 @@
+"""
+デッドラインスケジューラー
+次回実行時刻の優先度付きキュー（ヒープ）を1つのスレッドで処理する
+
+時刻は全て time.monotonic_ns() の整数ナノ秒で扱い、次回の目標時刻は
+実行完了時刻ではなく前回の目標時刻に間隔を加算して求める（ドリフトしない）。
+"""
+import heapq
+import itertools
+import threading
+import time
+import logging
+from typing import Callable, Dict, Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# 間隔は固定秒数、または毎回の間隔を返す関数（スキルのランダム間隔など）
+Interval = Union[float, Callable[[], float]]
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MS = 1_000_000
+
+
+class ScheduledJob:
+    """スケジューラーに登録されたジョブ"""
+
+    def __init__(self, name: str, callback: Callable[[], Any], interval: Interval):
+        """
+        Args:
+            name: ジョブ名（一意）
+            callback: 実行する関数。数値を返した場合はそれを次回までの秒数として使用
+            interval: 実行間隔（秒）または間隔を返す関数
+        """
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.target_ns = 0   # 処理を行いたい目標時刻
+        self.lead_ns = 0     # 目標時刻より何ns前に起動するか（処理の立ち上がり遅延の補正）
+        self.generation = 0
+
+        self.stats = {
+            'runs': 0,
+            'errors': 0,
+            'overruns': 0,
+            'last_lateness_ms': 0.0,
+            'max_lateness_ms': 0.0,
+            'total_lateness_ms': 0.0
+        }
+
+    @property
+    def fire_ns(self) -> int:
+        """スケジューラーが起動する時刻（目標時刻 - 補正）"""
+        return self.target_ns - self.lead_ns
+
+    def get_interval(self) -> float:
+        """次回までの間隔（秒）を取得"""
+        return float(self.interval() if callable(self.interval) else self.interval)
+
+    def record_lateness(self, lateness_ms: float) -> None:
+        """予定時刻からの遅れを記録"""
+        self.stats['runs'] += 1
+        self.stats['last_lateness_ms'] = lateness_ms
+        self.stats['max_lateness_ms'] = max(self.stats['max_lateness_ms'], lateness_ms)
+        self.stats['total_lateness_ms'] += lateness_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        runs = self.stats['runs']
+        return {
+            **self.stats,
+            'avg_lateness_ms': self.stats['total_lateness_ms'] / runs if runs else 0.0,
+            'lead_ms': self.lead_ns / NS_PER_MS,
+            'next_run_in': max(0.0, (self.fire_ns - time.monotonic_ns()) / NS_PER_SECOND)
+        }
+
+
+class DeadlineScheduler:
+    """
+    単一スレッドのデッドラインスケジューラー
+
+    - 全ジョブの次回実行時刻をヒープで管理し、最も早い時刻まで正確に待機する
+    - ジョブの追加・削除・再スケジュール時は待機中のスレッドを即座に起こす
+    - ジョブごとに予定時刻からの遅れ（lateness）を記録する
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._heap = []
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._sequence = itertools.count()
+        self._running = False
+        self.thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'wakeups': 0,
+            'early_wakeups': 0
+        }
+
+    def start(self) -> None:
+        """スケジューラースレッドを開始"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self.thread = threading.Thread(target=self._run, name="DeadlineScheduler", daemon=True)
+            self.thread.start()
+        logger.info("Deadline scheduler started")
+
+    def shutdown(self, timeout: float = 1.0) -> None:
+        """スケジューラースレッドを停止（登録済みジョブは保持）"""
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._condition.notify_all()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
+        logger.info("Deadline scheduler stopped")
+
+    def add_job(self, name: str, callback: Callable[[], Any], interval: Interval,
+                first_delay: float = 0.0) -> ScheduledJob:
+        """
+        ジョブを登録（同名のジョブは置き換え）
+
+        Args:
+            name: ジョブ名
+            callback: 実行する関数（数値を返した場合は次回までの秒数として使用）
+            interval: 実行間隔（秒）または間隔を返す関数
+            first_delay: 初回実行までの秒数
+
+        Returns:
+            登録したジョブ
+        """
+        job = ScheduledJob(name, callback, interval)
+        with self._condition:
+            old_job = self._jobs.get(name)
+            if old_job is not None:
+                old_job.generation = -1
+            self._jobs[name] = job
+            self._push(job, time.monotonic_ns() + self._to_ns(first_delay))
+        self.start()
+        logger.debug(f"Scheduler job added: {name}")
+        return job
+
+    def remove_job(self, name: str) -> bool:
+        """ジョブを削除（ヒープ上のエントリは取り出し時に破棄）"""
+        with self._condition:
+            job = self._jobs.pop(name, None)
+            if job is None:
+                return False
+            job.generation = -1
+            self._condition.notify_all()
+        logger.debug(f"Scheduler job removed: {name}")
+        return True
+
+    def reschedule(self, name: str, delay: float) -> bool:
+        """ジョブの次回実行を現在から delay 秒後に変更"""
+        with self._condition:
+            job = self._jobs.get(name)
+            if job is None:
+                return False
+            job.generation += 1
+            self._push(job, time.monotonic_ns() + self._to_ns(delay))
+        return True
+
+    def set_lead(self, name: str, lead: float) -> bool:
+        """
+        ジョブの起動補正を設定（目標時刻より lead 秒前に起動する）
+
+        キー入力のように呼び出しから実際の処理までに遅延がある場合、
+        計測した遅延を設定すると処理時刻が目標時刻に揃う。次回の起動から反映される。
+        """
+        with self._condition:
+            job = self._jobs.get(name)
+            if job is None:
+                return False
+            job.lead_ns = self._to_ns(lead)
+        return True
+
+    def update_interval(self, name: str, interval: Interval) -> bool:
+        """ジョブの実行間隔を変更（次回実行時刻は維持）"""
+        with self._condition:
+            job = self._jobs.get(name)
+            if job is None:
+                return False
+            job.interval = interval
+            self._condition.notify_all()
+        return True
+
+    def get_target_ns(self, name: str) -> Optional[int]:
+        """ジョブの現在の目標時刻（実行中のジョブでは今回の目標時刻）を取得"""
+        with self._condition:
+            job = self._jobs.get(name)
+            return job.target_ns if job is not None else None
+
+    def has_job(self, name: str) -> bool:
+        """ジョブが登録されているか"""
+        with self._condition:
+            return name in self._jobs
+
+    @staticmethod
+    def _to_ns(seconds: float) -> int:
+        """秒を0以上の整数ナノ秒に変換"""
+        return max(0, int(round(seconds * NS_PER_SECOND)))
+
+    def _push(self, job: ScheduledJob, target_ns: int) -> None:
+        """ヒープにジョブを追加して待機中のスレッドを起こす（ロック保持中に呼ぶ）"""
+        job.target_ns = target_ns
+        heapq.heappush(self._heap, (job.fire_ns, next(self._sequence), job, job.generation))
+        self._condition.notify_all()
+
+    def _next_due_job(self) -> Optional[ScheduledJob]:
+        """次に実行すべきジョブを待機して取得（停止時はNone）"""
+        with self._condition:
+            while self._running:
+                # 削除・再スケジュール済みの古いエントリを破棄
+                while self._heap and self._heap[0][2].generation != self._heap[0][3]:
+                    heapq.heappop(self._heap)
+
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                deadline_ns = self._heap[0][0]
+                remaining_ns = deadline_ns - time.monotonic_ns()
+                if remaining_ns > 0:
+                    self._condition.wait(timeout=remaining_ns / NS_PER_SECOND)
+                    self.stats['wakeups'] += 1
+                    if time.monotonic_ns() < deadline_ns:
+                        self.stats['early_wakeups'] += 1
+                    continue
+
+                _, _, job, _ = heapq.heappop(self._heap)
+                return job
+        return None
+
+    def _run(self) -> None:
+        """スケジューラーループ"""
+        while True:
+            job = self._next_due_job()
+            if job is None:
+                break
+
+            fire_ns = job.fire_ns
+            job.record_lateness((time.monotonic_ns() - fire_ns) / NS_PER_MS)
+            generation = job.generation
+
+            try:
+                result = job.callback()
+                delay = float(result) if isinstance(result, (int, float)) and not isinstance(result, bool) \
+                    else job.get_interval()
+            except Exception as e:
+                job.stats['errors'] += 1
+                logger.error(f"Error in scheduled job {job.name}: {e}")
+                import traceback
+                logger.error(f"Traceback: {traceback.format_exc()}")
+                try:
+                    delay = job.get_interval()
+                except Exception:
+                    delay = 1.0
+
+            with self._condition:
+                # 実行中に削除・再スケジュールされていなければ次回を登録
+                if self._jobs.get(job.name) is job and job.generation == generation:
+                    # 次回の目標時刻は前回の目標時刻からの絶対時刻（処理時間を加算しない）
+                    next_target = job.target_ns + self._to_ns(delay)
+                    now = time.monotonic_ns()
+                    if next_target - job.lead_ns < now:
+                        # 処理が間隔より長引いた場合は遅れを取り戻そうとせず即座に実行
+                        job.stats['overruns'] += 1
+                        next_target = now + job.lead_ns
+                    job.generation += 1
+                    self._push(job, next_target)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """スケジューラーと全ジョブの統計情報を取得"""
+        with self._condition:
+            jobs = {name: job.get_stats() for name, job in self._jobs.items()}
+            return {**self.stats, 'running': self._running, 'job_count': len(jobs), 'jobs': jobs}
+
+
+_scheduler: Optional[DeadlineScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> DeadlineScheduler:
+    """プロセス共通のDeadlineSchedulerを取得"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = DeadlineScheduler()
+        return _scheduler
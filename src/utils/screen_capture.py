@@ -6,8 +6,7 @@ import numpy as np
 import cv2
 import logging
 from typing import Optional, Tuple
-import mss
-import mss.tools
+from src.utils.frame_provider import get_frame_provider
 
 logger = logging.getLogger(__name__)
 
@@ -19,15 +18,17 @@ class ScreenCapture:
         Args:
             monitor_index: モニター番号（0: プライマリ, 1: 中央モニター）
         """
-        self.sct = mss.mss()
+        # 共有フレームプロバイダー（mssハンドルとモニター情報を保持）
+        self.frame_provider = get_frame_provider()
         self.monitor_index = monitor_index + 1  # mssは1-indexed
         
         # モニター情報の取得
-        if self.monitor_index >= len(self.sct.monitors):
+        monitors = self.frame_provider.get_monitors()
+        if self.monitor_index >= len(monitors):
             logger.warning(f"Monitor index {monitor_index} not found, using primary monitor")
             self.monitor_index = 1
             
-        self.monitor = self.sct.monitors[self.monitor_index]
+        self.monitor = monitors[self.monitor_index]
         logger.info(f"Screen capture initialized for monitor {monitor_index}: {self.monitor}")
         
     def capture_region(self, x: int, y: int, width: int, height: int) -> np.ndarray:
@@ -49,12 +50,8 @@ class ScreenCapture:
                 "height": height
             }
             
-            screenshot = self.sct.grab(region)
-            img = np.array(screenshot)
-            # BGRAからBGRに変換
-            img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-            
-            return img
+            # 共有フレームプロバイダー経由で取得（BGR形式）
+            return self.frame_provider.get_region(region)
             
         except Exception as e:
             logger.error(f"Failed to capture screen region: {e}")
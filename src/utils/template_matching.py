@@ -0,0 +1,90 @@
+"""
+テンプレートマッチング共通処理
+全解像度マッチングと、縮小グレースケールによる粗探索＋全解像度検証（ピラミッド）マッチング
+"""
+import logging
+from typing import Tuple, Optional
+
+import numpy as np
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# 粗探索用テンプレートの最小サイズ（これ未満になる場合は全解像度で照合）
+MIN_COARSE_TEMPLATE_SIZE = 8
+
+
+def match_template(image: np.ndarray, template: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+    """
+    TM_CCOEFF_NORMEDで照合し、最大信頼度と位置を返す
+
+    テンプレートが画像より大きい場合は照合不可として (0.0, (0, 0)) を返す
+    """
+    if template.shape[0] > image.shape[0] or template.shape[1] > image.shape[1]:
+        return 0.0, (0, 0)
+
+    result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return float(max_val), max_loc
+
+
+def to_coarse(image: np.ndarray, scale: float) -> np.ndarray:
+    """粗探索用の縮小グレースケール画像を作成"""
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    height, width = image.shape[:2]
+    size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def pyramid_match(image: np.ndarray, template: np.ndarray, scale: float = 0.5,
+                  coarse_image: Optional[np.ndarray] = None,
+                  coarse_template: Optional[np.ndarray] = None,
+                  verify_margin: int = 4) -> Tuple[float, Tuple[int, int]]:
+    """
+    粗探索＋全解像度検証によるテンプレートマッチング
+
+    縮小グレースケール画像で候補位置を求め、その周辺の小さな窓だけを
+    全解像度（元のチャンネル数）で照合する。返す信頼度は全解像度照合の値のため、
+    match_template() と同じ閾値で判定できる。
+
+    Args:
+        image: 探索対象画像（BGR）
+        template: テンプレート画像（BGR）
+        scale: 粗探索の縮小率（0 < scale < 1）
+        coarse_image: 事前に作成した縮小画像（複数テンプレートで共有する場合）
+        coarse_template: 事前に作成した縮小テンプレート
+        verify_margin: 検証窓の余白（全解像度px）
+
+    Returns:
+        (信頼度, 全解像度での位置)
+    """
+    if template.shape[0] > image.shape[0] or template.shape[1] > image.shape[1]:
+        return 0.0, (0, 0)
+
+    if coarse_template is None:
+        coarse_template = to_coarse(template, scale)
+    if coarse_image is None:
+        coarse_image = to_coarse(image, scale)
+
+    # 縮小しすぎて特徴が失われる場合は全解像度で照合
+    if (min(coarse_template.shape[:2]) < MIN_COARSE_TEMPLATE_SIZE
+            or coarse_template.shape[0] > coarse_image.shape[0]
+            or coarse_template.shape[1] > coarse_image.shape[1]):
+        return match_template(image, template)
+
+    # 粗探索で候補位置を取得
+    result = cv2.matchTemplate(coarse_image, coarse_template, cv2.TM_CCOEFF_NORMED)
+    _, _, _, coarse_loc = cv2.minMaxLoc(result)
+
+    # 全解像度の候補位置周辺のみを検証
+    margin = int(np.ceil(1.0 / scale)) + verify_margin
+    candidate_x = int(round(coarse_loc[0] / scale))
+    candidate_y = int(round(coarse_loc[1] / scale))
+    left = max(0, candidate_x - margin)
+    top = max(0, candidate_y - margin)
+    right = min(image.shape[1], candidate_x + template.shape[1] + margin)
+    bottom = min(image.shape[0], candidate_y + template.shape[0] + margin)
+
+    confidence, location = match_template(image[top:bottom, left:right], template)
+    return confidence, (location[0] + left, location[1] + top)
@@ -0,0 +1,128 @@
+"""
+ウィンドウジオメトリ監視モジュール
+PoEのクライアント領域の位置・サイズを追跡し、検出エリアをクライアント領域基準で再計算する
+"""
+import time
+import threading
+import logging
+from typing import Callable, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# 矩形は {'left', 'top', 'width', 'height'}（スクリーン座標）
+Rect = Dict[str, int]
+
+
+def rebase_area(area: Rect, reference: Rect, current: Rect) -> Rect:
+    """
+    reference のクライアント領域で設定したエリアを current のクライアント領域に合わせて変換
+
+    PoEのHUD（フラスコ欄）は画面の左下を基準に配置され、高さに比例して拡大縮小されるため、
+    位置はクライアント領域の左端・下端からの相対位置、サイズは高さの比率で変換する
+
+    Args:
+        area: 変換するエリア（スクリーン座標）
+        reference: エリア設定時のクライアント領域
+        current: 現在のクライアント領域
+    """
+    scale = current['height'] / reference['height']
+    reference_bottom = reference['top'] + reference['height']
+    current_bottom = current['top'] + current['height']
+    return {
+        'left': current['left'] + round((area['left'] - reference['left']) * scale),
+        'top': current_bottom - round((reference_bottom - area['top']) * scale),
+        'width': max(1, round(area['width'] * scale)),
+        'height': max(1, round(area['height'] * scale))
+    }
+
+
+def is_valid_rect(rect: Optional[Rect]) -> bool:
+    """面積のある矩形かどうか（最小化中のウィンドウは0x0になる）"""
+    return bool(rect) and rect.get('width', 0) > 0 and rect.get('height', 0) > 0
+
+
+class WindowGeometryWatcher:
+    """
+    PoEクライアント領域の監視
+
+    - current() は最大 interval 秒に1回だけクライアント領域を問い合わせ、それ以外はキャッシュを返す
+    - 位置・サイズが変わった場合のみ generation を進めるため、利用側は generation が変わった時だけ
+      検出エリアを再計算すればよい
+    - 最小化などで領域が取得できない間は、最後に取得できた領域を返す
+    """
+
+    def __init__(self, rect_provider: Optional[Callable[[], Optional[Rect]]] = None, interval: float = 1.0):
+        """
+        Args:
+            rect_provider: クライアント領域を返す関数（Noneの場合は初回使用時にWindowManagerを作成）
+            interval: クライアント領域を問い合わせる最短間隔（秒）
+        """
+        self._rect_provider = rect_provider
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._rect: Optional[Rect] = None
+        self._checked_at: Optional[float] = None
+        self.generation = 0
+
+        self.stats = {
+            'polls': 0,
+            'changes': 0,
+            'unavailable': 0
+        }
+
+    def set_rect_provider(self, rect_provider: Callable[[], Optional[Rect]]) -> None:
+        """クライアント領域の取得元を設定（次回の current() で再取得する）"""
+        with self._lock:
+            self._rect_provider = rect_provider
+            self._checked_at = None
+
+    def current(self) -> Optional[Rect]:
+        """現在のクライアント領域（一度も取得できていない場合はNone）"""
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.interval:
+                return self._rect
+            self._checked_at = now
+            self.stats['polls'] += 1
+
+            try:
+                if self._rect_provider is None:
+                    from src.utils.window_manager import WindowManager
+                    self._rect_provider = WindowManager().get_poe_client_rect
+                rect = self._rect_provider()
+            except Exception as e:
+                logger.debug(f"Error getting POE client rect: {e}")
+                rect = None
+
+            if not is_valid_rect(rect):
+                self.stats['unavailable'] += 1
+                return self._rect
+
+            if rect != self._rect:
+                if self._rect is not None:
+                    logger.info(f"POE client area changed: {self._rect} -> {rect}")
+                self._rect = dict(rect)
+                self.generation += 1
+                self.stats['changes'] += 1
+            return self._rect
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        return {
+            **self.stats,
+            'generation': self.generation,
+            'rect': self._rect
+        }
+
+
+_window_geometry: Optional[WindowGeometryWatcher] = None
+_window_geometry_lock = threading.Lock()
+
+
+def get_window_geometry() -> WindowGeometryWatcher:
+    """プロセス共通のWindowGeometryWatcherを取得"""
+    global _window_geometry
+    with _window_geometry_lock:
+        if _window_geometry is None:
+            _window_geometry = WindowGeometryWatcher()
+        return _window_geometry
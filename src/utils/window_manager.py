@@ -6,50 +6,49 @@ import logging
 import time
 from typing import Optional, List
 import psutil
-import pygetwindow as gw
+
+from src.utils.focus_tracker import FocusTracker
+from src.utils.process_locator import ProcessLocator
+
+# pygetwindowはWindows以外ではインポート時に例外を送出する
+try:
+    import pygetwindow as gw
+except (ImportError, NotImplementedError):
+    gw = None
 
 logger = logging.getLogger(__name__)
 
 class WindowManager:
     """ウィンドウ管理クラス"""
     
-    def __init__(self):
+    def __init__(self, focus_backend=None, process_watch_interval: float = 0):
+        """
+        Args:
+            focus_backend: フォーカス判定に使うウィンドウ情報の取得元（Noneの場合は環境に合わせて自動選択）
+            process_watch_interval: PoEプロセスをバックグラウンドで確認する間隔（秒、0で無効）
+        """
         self.poe_window_titles = [
             "Path of Exile",
             "PathOfExile",
             "Path of Exile - ",  # タイトルにバージョン情報が含まれる場合
         ]
+        # キー入力ごとのフォーカス判定用（ウィンドウ一覧を走査しない）
+        self.focus_tracker = FocusTracker(self.poe_window_titles, backend=focus_backend)
+        # PoEプロセスのPIDキャッシュ
+        self.process_locator = ProcessLocator()
+        if process_watch_interval > 0:
+            self.process_locator.start_watcher(process_watch_interval)
     
     def find_poe_process(self) -> Optional[psutil.Process]:
-        """Path of Exileプロセスを検索"""
-        try:
-            for proc in psutil.process_iter(['pid', 'name', 'exe']):
-                try:
-                    proc_info = proc.info
-                    proc_name = proc_info.get('name', '').lower()
-                    
-                    # Path of Exileの実行ファイル名で検索
-                    if 'pathofexile' in proc_name or 'poe' in proc_name:
-                        logger.debug(f"Found POE process: {proc_info}")
-                        return proc
-                    
-                    # 実行ファイルパスでも検索
-                    exe_path = proc_info.get('exe', '')
-                    if exe_path and 'pathofexile' in exe_path.lower():
-                        logger.debug(f"Found POE process by exe: {proc_info}")
-                        return proc
-                        
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-                    
-        except Exception as e:
-            logger.error(f"Error searching for POE process: {e}")
-            
-        return None
+        """Path of Exileプロセスを検索（キャッシュしたPIDを確認し、無効な場合のみ全プロセスを走査）"""
+        return self.process_locator.locate()
     
-    def find_poe_windows(self) -> List[gw.Win32Window]:
+    def find_poe_windows(self) -> List['gw.Win32Window']:
         """Path of Exileウィンドウを検索"""
         poe_windows = []
+        if gw is None:
+            logger.debug("pygetwindow is not available on this platform")
+            return poe_windows
         
         try:
             # すべてのウィンドウを取得
@@ -148,16 +147,27 @@ class WindowManager:
         return False
     
     def is_poe_active(self) -> bool:
-        """Path of Exileウィンドウがアクティブかどうかチェック"""
+        """Path of Exileウィンドウがアクティブかどうかチェック（キャッシュしたハンドルと前面ウィンドウを比較）"""
+        return self.focus_tracker.is_focused()
+    
+    def close(self):
+        """バックグラウンド監視を停止"""
+        self.process_locator.stop_watcher()
+    
+    def get_poe_client_rect(self) -> Optional[dict]:
+        """Path of Exileのクライアント領域（枠・タイトルバーを除く描画領域）をスクリーン座標で取得"""
         try:
-            poe_windows = self.find_poe_windows()
-            for window in poe_windows:
-                if window.isActive:
-                    return True
+            handle = self.focus_tracker.get_handle()
+            if handle is None:
+                return None
+            rect = self.focus_tracker.backend.get_client_rect(handle)
+            if rect is None:
+                return None
+            left, top, width, height = rect
+            return {'left': left, 'top': top, 'width': width, 'height': height}
         except Exception as e:
-            logger.debug(f"Error checking if POE is active: {e}")
-            
-        return False
+            logger.debug(f"Error getting POE client rect: {e}")
+            return None
     
     def get_poe_window_info(self) -> Optional[dict]:
         """Path of Exileウィンドウの情報を取得"""
@@ -173,7 +183,8 @@ class WindowManager:
                     'height': window.height,
                     'is_active': window.isActive,
                     'is_minimized': window.isMinimized,
-                    'is_maximized': window.isMaximized
+                    'is_maximized': window.isMaximized,
+                    'client_rect': self.get_poe_client_rect()
                 }
         except Exception as e:
             logger.error(f"Error getting POE window info: {e}")
@@ -0,0 +1,104 @@
+"""
+設定ストアのテストスクリプト
+"""
+import sys
+import os
+import shutil
+import time
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.config_store import ConfigStore
+
+try:
+    from src.core.macro_controller import MacroController
+    CONTROLLER_DEPENDENCIES_AVAILABLE = True
+except ImportError as e:
+    print(f"依存関係が不足しています: {e}")
+    CONTROLLER_DEPENDENCIES_AVAILABLE = False
+
+
+class TestConfigStore(unittest.TestCase):
+    """ConfigStore のテストクラス"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.default_path = self.temp_dir / 'default_config.yaml'
+        self.user_path = self.temp_dir / 'user_config.yaml'
+        self.default_path.write_text(
+            "flask:\n  enabled: true\n  burst_window_ms: 200\ntincture:\n  sensitivity: 0.7\n",
+            encoding='utf-8'
+        )
+        self.store = ConfigStore(self.default_path, self.user_path)
+
+    def tearDown(self):
+        self.store.stop_watcher()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_cached_immutable_snapshot(self):
+        """ファイルが変わらない限り解析せず、スナップショットは変更できないこと"""
+        snapshot = self.store.snapshot()
+        for _ in range(10):
+            self.assertIs(self.store.snapshot(), snapshot)
+        self.assertEqual(self.store.get_stats()['parses'], 1)
+        self.assertEqual(snapshot['tincture']['sensitivity'], 0.7)
+
+        with self.assertRaises(TypeError):
+            snapshot['flask']['enabled'] = False
+
+        # load() は変更可能なコピー
+        config = self.store.load()
+        config['flask']['enabled'] = False
+        self.assertTrue(self.store.snapshot()['flask']['enabled'])
+
+    def test_reload_and_notify(self):
+        """ユーザー設定の保存・外部での変更を検知して購読者に通知すること"""
+        changes = []
+        self.store.snapshot()
+        self.store.subscribe(lambda snapshot, previous: changes.append(
+            (previous['flask']['burst_window_ms'], snapshot['flask']['burst_window_ms'])))
+
+        config = self.store.load()
+        config['flask']['burst_window_ms'] = 100
+        self.store.save_user_config(config)
+        self.assertEqual(changes, [(200, 100)])
+
+        # 外部エディタでの変更（サイズが変わる）
+        self.user_path.write_text("flask:\n  burst_window_ms: 50\n", encoding='utf-8')
+        self.assertEqual(self.store.snapshot()['flask']['burst_window_ms'], 50)
+        self.assertTrue(self.store.snapshot()['flask']['enabled'])
+        self.assertEqual(changes, [(200, 100), (100, 50)])
+
+        # 内容が同じ再保存では通知しない
+        self.store.save_user_config(self.store.load())
+        self.assertEqual(len(changes), 2)
+
+    @unittest.skipIf(not CONTROLLER_DEPENDENCIES_AVAILABLE, "Required dependencies not available")
+    def test_watcher_applies_external_edit_to_controller(self):
+        """外部エディタでの変更を変更確認スレッドが検知し、MacroControllerの update_config() に渡すこと"""
+        controller = MacroController.__new__(MacroController)
+        controller.update_config = Mock()
+        self.store.snapshot()
+        self.store.subscribe(controller._on_config_changed)
+        self.store.start_watcher(0.02)
+
+        # 更新時刻の分解能が粗い環境でも変更を検知できるようサイズも変える
+        self.user_path.write_text("flask:\n  burst_window_ms: 50\n", encoding='utf-8')
+        deadline = time.time() + 2.0
+        while not controller.update_config.called and time.time() < deadline:
+            time.sleep(0.01)
+
+        controller.update_config.assert_called_once()
+        config = controller.update_config.call_args.args[0]
+        self.assertEqual(config['flask']['burst_window_ms'], 50)
+        config['flask']['enabled'] = False  # 変更可能なコピーを渡す
+
+
+if __name__ == '__main__':
+    unittest.main()
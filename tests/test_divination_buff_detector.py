@@ -0,0 +1,67 @@
+"""
+Divination Cardバフ検出のテストスクリプト
+"""
+import sys
+import os
+import unittest
+from unittest.mock import patch
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+try:
+    import numpy as np
+    import cv2
+    from src.features.divination_buff_detector import DivinationBuffDetector
+    DEPENDENCIES_AVAILABLE = True
+except ImportError as e:
+    print(f"依存関係が不足しています: {e}")
+    DEPENDENCIES_AVAILABLE = False
+
+
+@unittest.skipIf(not DEPENDENCIES_AVAILABLE, "Required dependencies not available")
+class TestDivinationBuffDetector(unittest.TestCase):
+    """DivinationBuffDetector のテストクラス"""
+
+    def setUp(self):
+        """テストの準備（同梱のバフテンプレートを使用）"""
+        with patch('src.features.divination_buff_detector.get_frame_provider'):
+            self.detector = DivinationBuffDetector({'frame_change_gate': False})
+        if not self.detector.templates:
+            self.skipTest("Buff templates not available")
+        self.rng = np.random.default_rng(0)
+
+    def _make_frame(self, placements):
+        """ノイズ背景にバフアイコンを配置したフレームを作成"""
+        frame = self.rng.integers(0, 40, (100, 520, 3), dtype=np.uint8)
+        for x, template in placements:
+            path = self.detector.template_dir / f"{template['priority']}_priority" / template['file_name']
+            icon = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)[..., :3]
+            frame[10:10 + icon.shape[0], x:x + icon.shape[1]] = icon
+        return frame
+
+    def test_identifies_every_card(self):
+        """全テンプレートが正しいカードとして識別されること"""
+        for i, template in enumerate(self.detector.templates):
+            result = self.detector.detect_current_buff(self._make_frame([(10 + (i * 11) % 400, template)]))
+            self.assertIsNotNone(result, template['file_name'])
+            self.assertEqual(result['file_name'], template['file_name'])
+            self.assertEqual(result['priority'], template['priority'])
+
+    def test_highest_priority_buff_selected(self):
+        """複数表示時は優先度の高いバフが選ばれること"""
+        lowest = next(t for t in self.detector.templates if t['priority'] == 'lowest')
+        high = next(t for t in self.detector.templates if t['priority'] == 'high')
+
+        result = self.detector.detect_current_buff(self._make_frame([(20, lowest), (200, high)]))
+
+        self.assertEqual(result['file_name'], high['file_name'])
+        self.assertEqual(result['buff_count'], 2)
+
+    def test_no_buff(self):
+        """バフが表示されていない場合はNoneを返すこと"""
+        self.assertIsNone(self.detector.detect_current_buff(self._make_frame([])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+フラスコタイマーマネージャーのテストスクリプト
+"""
+import sys
+import os
+import time
+import threading
+import unittest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.scheduler import DeadlineScheduler
+from src.utils.flask_timer_manager import FlaskTimerManager
+
+
+class TestFlaskBurst(unittest.TestCase):
+    """FlaskTimerManager のバースト押下のテストクラス"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.scheduler = DeadlineScheduler()
+        self.singles = []
+        self.bursts = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def _press(self, key, on_pressed=None):
+        """単発押下を記録"""
+        with self.lock:
+            self.singles.append(key)
+        if on_pressed:
+            on_pressed(time.monotonic_ns())
+
+    def _press_burst(self, keys, on_pressed=None):
+        """連続押下を記録"""
+        with self.lock:
+            self.bursts.append(list(keys))
+        if on_pressed:
+            on_pressed([time.monotonic_ns()] * len(keys))
+
+    def _create_manager(self, burst_window_ms):
+        manager = FlaskTimerManager(key_press_callback=self._press, scheduler=self.scheduler,
+                                    burst_callback=self._press_burst, burst_window_ms=burst_window_ms)
+        manager.add_flask_timer(1, '1', 300)
+        manager.add_flask_timer(2, '2', 320)
+        manager.add_flask_timer(3, '3', 5000)
+        return manager
+
+    def test_nearby_deadlines_are_coalesced(self):
+        """ウィンドウ内に期限が来るフラスコが1回の連続押下にまとめられること"""
+        manager = self._create_manager(burst_window_ms=100)
+        manager.start_all_timers()
+        time.sleep(0.45)
+        manager.stop_all_timers()
+
+        with self.lock:
+            # 開始直後は全スロット、2回目は期限の近いスロット1・2がまとめて押下される
+            self.assertEqual(sorted(self.bursts[0]), ['1', '2', '3'])
+            self.assertEqual(sorted(self.bursts[1]), ['1', '2'])
+            self.assertEqual(self.singles, [])
+
+        stats = manager.get_burst_stats()
+        self.assertEqual(stats['bursts'], 2)
+        self.assertEqual(stats['coalescing_ratio'], 1.0)
+        self.assertEqual(manager.timers[3].total_uses, 1)
+
+    def test_disabled_window_presses_individually(self):
+        """ウィンドウが0の場合は各フラスコを単独で押下すること"""
+        manager = self._create_manager(burst_window_ms=0)
+        manager.start_all_timers()
+        time.sleep(0.1)
+        manager.stop_all_timers()
+
+        with self.lock:
+            self.assertEqual(sorted(self.singles), ['1', '2', '3'])
+            self.assertEqual(self.bursts, [])
+        self.assertEqual(manager.get_burst_stats()['coalescing_ratio'], 0.0)
+
+
+    def test_managers_share_scheduler_without_collision(self):
+        """同じスケジューラーを共有する管理クラス同士でタイマーが置き換わらないこと"""
+        first = self._create_manager(burst_window_ms=0)
+        second = self._create_manager(burst_window_ms=0)
+        first.start_all_timers()
+        second.start_all_timers()
+        self.assertNotEqual(first.timers[1].job_name, second.timers[1].job_name)
+
+        second.remove_flask_timer(1)
+
+        self.assertTrue(self.scheduler.has_job(first.timers[1].job_name))
+        first.stop_all_timers()
+        second.stop_all_timers()
+
+
+class TestFlaskConfigUpdate(unittest.TestCase):
+    """FlaskTimerManager.update_config の差分反映のテストクラス"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.scheduler = DeadlineScheduler()
+        self.manager = FlaskTimerManager(key_press_callback=lambda key, on_pressed=None: None,
+                                         scheduler=self.scheduler)
+        self.manager.update_config(self._config('1', 5000))
+
+    def tearDown(self):
+        self.manager.stop_all_timers()
+        self.scheduler.shutdown()
+
+    @staticmethod
+    def _config(slot_1_key, slot_2_duration_ms):
+        return {
+            'enabled': True,
+            'flask_slots': {
+                'slot_1': {'key': slot_1_key, 'duration_ms': 5000},
+                'slot_2': {'key': '2', 'duration_ms': slot_2_duration_ms},
+                'slot_3': {'key': '3', 'duration_ms': 5000, 'is_tincture': True}
+            }
+        }
+
+    def test_key_change_keeps_other_timers(self):
+        """1スロットのキー変更で他のタイマーが作り直されず、予定時刻も変わらないこと"""
+        time.sleep(0.05)
+        timer_2 = self.manager.timers[2]
+        target_ns = self.scheduler.get_target_ns(timer_2.job_name)
+
+        changes = self.manager.update_config(self._config('q', 5000))
+
+        self.assertEqual(changes, {'added': [], 'removed': [], 'updated': [1]})
+        self.assertEqual(self.manager.timers[1].key, 'q')
+        self.assertIs(self.manager.timers[2], timer_2)
+        self.assertEqual(self.scheduler.get_target_ns(timer_2.job_name), target_ns)
+        self.assertEqual(sorted(self.manager.timers), [1, 2])
+
+    def test_duration_change_keeps_phase(self):
+        """持続時間の変更で次回使用が前回使用から新しい持続時間後になること"""
+        time.sleep(0.05)
+        target_ns = self.scheduler.get_target_ns(self.manager.timers[2].job_name)
+
+        self.manager.update_config(self._config('1', 6000))
+
+        shift_ms = (self.scheduler.get_target_ns(self.manager.timers[2].job_name) - target_ns) / 1_000_000
+        self.assertAlmostEqual(shift_ms, 1000, delta=1)
+        self.assertTrue(self.manager.timers[2].is_running)
+
+if __name__ == '__main__':
+    unittest.main()
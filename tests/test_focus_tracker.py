@@ -0,0 +1,70 @@
+"""
+フォーカス追跡のテストスクリプト
+"""
+import sys
+import os
+import unittest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.focus_tracker import FocusTracker, StubFocusBackend
+
+
+class TestFocusTracker(unittest.TestCase):
+    """FocusTracker のテストクラス"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.backend = StubFocusBackend({1: 'Path of Exile', 2: 'Notepad', 3: 'Discord'})
+        self.tracker = FocusTracker(['Path of Exile'], backend=self.backend, validate_interval=60)
+
+    def test_focus_from_handle_comparison(self):
+        """前面ウィンドウが変わらない間はタイトルを取得せずに判定すること"""
+        self.backend.set_foreground(1)
+        results = [self.tracker.is_focused() for _ in range(100)]
+        self.assertTrue(all(results))
+        self.assertEqual(self.backend.calls['title'], 1)
+
+        self.backend.set_foreground(2)
+        results = [self.tracker.is_focused() for _ in range(100)]
+        self.assertFalse(any(results))
+        self.assertEqual(self.backend.calls['title'], 2)
+        self.assertEqual(self.backend.calls['list'], 0)
+
+        self.backend.set_foreground(1)
+        self.assertTrue(self.tracker.is_focused())
+        self.assertEqual(self.backend.calls['title'], 2)
+
+    def test_stale_handle(self):
+        """ゲームの再起動でハンドルが変わった場合に追従すること"""
+        self.backend.set_foreground(1)
+        self.assertTrue(self.tracker.is_focused())
+        self.assertEqual(self.tracker.get_handle(), 1)
+
+        # 再起動: 古いハンドルは無効になり、新しいハンドルで起動
+        self.backend.set_windows({2: 'Notepad', 5: 'Path of Exile'})
+        self.backend.set_foreground(2)
+        self.assertFalse(self.tracker.is_focused())
+        self.assertEqual(self.tracker.get_handle(), 5)
+        self.assertEqual(self.backend.calls['list'], 1)
+
+        self.backend.set_foreground(5)
+        self.assertTrue(self.tracker.is_focused())
+        self.assertEqual(self.tracker.get_stats()['handle'], 5)
+
+    def test_other_foreground_is_rechecked(self):
+        """PoE以外と判定した前面ウィンドウも再確認間隔の後にタイトルを確認し直すこと"""
+        self.tracker.validate_interval = 0.0
+        self.backend.set_windows({7: ''})
+        self.backend.set_foreground(7)
+        self.assertFalse(self.tracker.is_focused())
+
+        # 起動が進んでタイトルが設定された
+        self.backend.set_windows({7: 'Path of Exile'})
+        self.assertTrue(self.tracker.is_focused())
+        self.assertEqual(self.backend.calls['title'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+共有フレームプロバイダーのテストスクリプト
+"""
+import sys
+import os
+import unittest
+from unittest.mock import Mock
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+try:
+    import numpy as np
+    from src.utils.frame_provider import FrameProvider
+    DEPENDENCIES_AVAILABLE = True
+except ImportError as e:
+    print(f"依存関係が不足しています: {e}")
+    DEPENDENCIES_AVAILABLE = False
+
+
+@unittest.skipIf(not DEPENDENCIES_AVAILABLE, "Required dependencies not available")
+class TestFrameProvider(unittest.TestCase):
+    """FrameProvider のテストクラス"""
+
+    def setUp(self):
+        """テストの準備（画面の代わりに座標をエンコードしたBGRA画像を返す）"""
+        self.sct = Mock()
+        self.sct.monitors = [{'top': 0, 'left': 0, 'width': 400, 'height': 300}] * 2
+        self.sct.grab.side_effect = self._fake_grab
+
+        self.provider = FrameProvider(max_frame_age=10.0)
+        self.provider._get_sct = Mock(return_value=self.sct)
+
+    def _fake_grab(self, area):
+        """各画素のB=x, G=yとなるBGRA画像を返す"""
+        ys, xs = np.mgrid[area['top']:area['top'] + area['height'],
+                          area['left']:area['left'] + area['width']]
+        frame = np.zeros((area['height'], area['width'], 4), dtype=np.uint8)
+        frame[..., 0] = xs % 256
+        frame[..., 1] = ys % 256
+        return frame
+
+    def test_union_grab_shared_between_consumers(self):
+        """近接する登録済み領域は1回のグラブで共有されること"""
+        flask = {'top': 200, 'left': 10, 'width': 50, 'height': 40}
+        buff = {'top': 150, 'left': 100, 'width': 60, 'height': 30}
+        self.provider.register_region('buff', buff)
+
+        flask_img = self.provider.get_region(flask, name='flask')
+        buff_img = self.provider.get_region(buff, name='buff')
+
+        self.assertEqual(self.sct.grab.call_count, 1)
+        self.assertEqual(flask_img.shape, (40, 50, 3))
+        self.assertEqual(buff_img.shape, (30, 60, 3))
+        # 切り出し位置が正しいこと
+        self.assertEqual(int(flask_img[0, 0, 0]), 10)
+        self.assertEqual(int(flask_img[0, 0, 1]), 200)
+        self.assertEqual(int(buff_img[0, 0, 0]), 100)
+        self.assertEqual(int(buff_img[0, 0, 1]), 150)
+
+    def test_distant_regions_are_grabbed_separately(self):
+        """離れた領域は外接矩形ではなく領域ごとにグラブし、それぞれキャッシュすること"""
+        flask = {'top': 250, 'left': 10, 'width': 50, 'height': 40}
+        buff = {'top': 10, 'left': 300, 'width': 60, 'height': 30}
+        self.provider.register_region('buff', buff)
+
+        for _ in range(3):
+            flask_img = self.provider.get_region(flask, name='flask')
+            buff_img = self.provider.get_region(buff, name='buff')
+
+        grabbed = [call.args[0] for call in self.sct.grab.call_args_list]
+        self.assertEqual(grabbed, [flask, buff])
+        self.assertEqual(self.provider.get_stats()['cache_hits'], 4)
+        self.assertEqual(int(flask_img[0, 0, 1]), 250)
+        self.assertEqual(int(buff_img[0, 0, 0]), 300 % 256)
+
+    def test_stale_frame_is_regrabbed(self):
+        """最大経過時間を過ぎたフレームは再グラブされること"""
+        self.provider.max_frame_age = 0.0
+        region = {'top': 0, 'left': 0, 'width': 10, 'height': 10}
+
+        self.provider.get_region(region)
+        self.provider.get_region(region)
+
+        self.assertEqual(self.sct.grab.call_count, 2)
+
+    def test_monitor_geometry_cached(self):
+        """モニター情報はキャッシュされること"""
+        first = self.provider.get_monitors()
+        self.sct.monitors = []
+
+        self.assertEqual(self.provider.get_monitors(), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
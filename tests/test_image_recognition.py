@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 try:
     from src.features.image_recognition import TinctureDetector
+    from src.utils.window_geometry import WindowGeometryWatcher
     import cv2
     import mss
     DEPENDENCIES_AVAILABLE = True
@@ -284,6 +285,195 @@ class TestImageRecognitionIntegration(unittest.TestCase):
             self.fail(f"統合テストが失敗しました: {e}")
 
 
+@unittest.skipIf(not DEPENDENCIES_AVAILABLE, "Required dependencies not available")
+class TestTinctureStateDetection(unittest.TestCase):
+    """1フレームでの状態判定（detect_states）のテスト"""
+    
+    def setUp(self):
+        """テストの準備"""
+        config = {
+            'tincture': {
+                'detection_mode': 'manual',
+                'detection_area': {'x': 0, 'y': 0, 'width': 300, 'height': 200}
+            }
+        }
+        self.detector = TinctureDetector(sensitivity=0.7, area_selector=Mock(), config=config)
+        if self.detector.template_idle is None:
+            self.skipTest("Tincture templates not found")
+    
+    def _frame_with(self, template):
+        """テンプレートを埋め込んだテスト用フレームを作成"""
+        frame = np.zeros((200, 300, 3), dtype=np.uint8)
+        frame[50:50 + template.shape[0], 60:60 + template.shape[1]] = template
+        return frame
+    
+    def test_single_capture_per_tick(self):
+        """1回の判定でキャプチャが1回だけ行われること"""
+        frame = self._frame_with(self.detector.template_idle)
+        with patch.object(self.detector, '_capture_screen', return_value=frame) as mock_capture:
+            state = self.detector.get_tincture_state()
+        
+        self.assertEqual(mock_capture.call_count, 1)
+        self.assertEqual(state, "IDLE")
+    
+    def test_confidences_for_all_templates(self):
+        """全状態テンプレートの信頼度が返されること"""
+        detection = self.detector.detect_states(self._frame_with(self.detector.template_idle))
+        
+        self.assertEqual(set(detection['confidences']), set(self.detector._get_state_templates()))
+        self.assertAlmostEqual(detection['confidences']['idle'], 1.0, places=3)
+        self.assertIs(self.detector.last_detection, detection)
+    
+    def test_cooldown_state(self):
+        """クールダウンテンプレートに一致した場合はCOOLDOWNとなること"""
+        if not self.detector.templates_cooldown:
+            self.skipTest("Cooldown templates not found")
+        
+        name, template = next(iter(self.detector.templates_cooldown.items()))
+        detection = self.detector.detect_states(self._frame_with(template))
+        
+        self.assertEqual(detection['state'], "COOLDOWN")
+        self.assertEqual(detection['best_template'], name)
+        self.assertEqual(detection['cooldown_progress'], int(name[len('cooldown_p'):]) / 100.0)
+    
+    def test_unknown_state(self):
+        """どのテンプレートにも一致しない場合はUNKNOWNとなること"""
+        detection = self.detector.detect_states(np.zeros((200, 300, 3), dtype=np.uint8))
+        self.assertEqual(detection['state'], "UNKNOWN")
+
+
+    def test_roi_tracking_hits_and_fallback(self):
+        """一致後は探索窓を縮小し、連続不一致で全域探索に戻ること"""
+        self.detector.frame_gate.enabled = False
+        frame = self._frame_with(self.detector.template_idle)
+        
+        first = self.detector.detect_states(frame)
+        self.assertIsNone(first['search_window'])
+        
+        second = self.detector.detect_states(frame)
+        self.assertIsNotNone(second['search_window'])
+        self.assertEqual(second['state'], "IDLE")
+        self.assertEqual(second['locations']['idle'], (60, 50))
+        
+        blank = np.zeros_like(frame)
+        for _ in range(self.detector.roi_max_misses):
+            self.detector.detect_states(blank)
+        
+        stats = self.detector.get_detection_stats()
+        self.assertEqual(stats['roi_hits'], 1)
+        self.assertEqual(stats['roi_misses'], self.detector.roi_max_misses)
+        self.assertEqual(stats['roi_resets'], 1)
+        self.assertIsNone(self.detector.detect_states(frame)['search_window'])
+
+    def test_unchanged_frame_skips_matching(self):
+        """変化のないフレームでは前回の判定を再利用すること"""
+        frame = self._frame_with(self.detector.template_idle)
+        self.detector.detect_states(frame)
+        
+        with patch.object(self.detector, '_match_template_location') as mock_match:
+            detection = self.detector.detect_states(frame.copy())
+        
+        mock_match.assert_not_called()
+        self.assertTrue(detection['reused'])
+        self.assertEqual(detection['state'], "IDLE")
+        self.assertEqual(self.detector.get_detection_stats()['skipped_matches'], 1)
+        
+        # 変化があれば再度マッチングする
+        self.assertFalse(self.detector.detect_states(np.zeros_like(frame))['reused'])
+
+    def test_icon_change_in_large_area_is_detected(self):
+        """広い検出エリアでもアイコン1個分の変化で再マッチングすること"""
+        template = self.detector.template_idle
+        frame = np.zeros((600, 900, 3), dtype=np.uint8)
+        frame[50:50 + template.shape[0], 60:60 + template.shape[1]] = template
+        self.detector.detect_states(frame)
+        
+        dimmed = frame.copy()
+        dimmed[50:50 + template.shape[0], 60:60 + template.shape[1]] //= 2
+        # フレーム全体の差分はゲートの閾値未満
+        self.assertLess(float(np.abs(dimmed.astype(int) - frame.astype(int)).mean()),
+                        self.detector.frame_gate.threshold)
+        
+        detection = self.detector.detect_states(dimmed)
+        self.assertFalse(detection['reused'])
+
+    def test_pyramid_strategy_matches_full(self):
+        """ピラミッド方式でも全解像度と同じ状態・位置・信頼度となること"""
+        self.detector.frame_gate.enabled = False
+        self.detector.roi_tracking = False
+        frame = self._frame_with(self.detector.template_idle)
+        
+        full = self.detector.detect_states(frame)
+        self.detector.set_match_strategy('pyramid')
+        pyramid = self.detector.detect_states(frame)
+        
+        self.assertEqual(pyramid['state'], full['state'])
+        self.assertEqual(pyramid['locations']['idle'], full['locations']['idle'])
+        self.assertAlmostEqual(pyramid['confidences']['idle'], full['confidences']['idle'], places=3)
+        
+        with self.assertRaises(ValueError):
+            self.detector.set_match_strategy('invalid')
+
+
+class FakeAreaSelector:
+    """フラスコエリアと基準のクライアント領域だけを持つAreaSelectorの代わり"""
+    
+    def __init__(self, area, reference=None):
+        self.area = area
+        self.reference = reference
+        self.revision = 1
+        self.saved_references = []
+    
+    def get_full_flask_area_for_tincture(self):
+        return dict(self.area)
+    
+    def get_flask_reference(self):
+        return self.reference
+    
+    def set_flask_reference(self, reference):
+        self.reference = dict(reference)
+        self.saved_references.append(self.reference)
+        return True
+
+
+@unittest.skipIf(not DEPENDENCIES_AVAILABLE, "Required dependencies not available")
+class TestFlaskCaptureArea(unittest.TestCase):
+    """クライアント領域基準の検出エリア（_get_flask_capture_area）のテスト"""
+    
+    def _detector(self, selector, client):
+        self.client = client
+        detector = TinctureDetector(sensitivity=0.7, area_selector=selector,
+                                    config={'tincture': {'detection_mode': 'full_flask_area'}})
+        detector.window_geometry = WindowGeometryWatcher(lambda: self.client, interval=0)
+        return detector
+    
+    def test_rebased_from_recorded_reference(self):
+        """記録された基準から現在のクライアント領域に合わせて変換されること"""
+        selector = FakeAreaSelector({'x': 245, 'y': 850, 'width': 400, 'height': 120},
+                                    reference={'left': 0, 'top': 0, 'width': 1920, 'height': 1080})
+        detector = self._detector(selector, {'left': 1920, 'top': 31, 'width': 1920, 'height': 1080})
+        
+        self.assertEqual(detector._get_flask_capture_area(),
+                         {'left': 2165, 'top': 881, 'width': 400, 'height': 120})
+        self.assertEqual(selector.saved_references, [])
+    
+    def test_legacy_area_uses_current_client(self):
+        """基準を記録していない設定は現在のクライアント領域（ウィンドウモード）で設定したものとして扱い、保存すること"""
+        windowed = {'left': 100, 'top': 130, 'width': 1280, 'height': 720}
+        selector = FakeAreaSelector({'x': 200, 'y': 760, 'width': 250, 'height': 80})
+        detector = self._detector(selector, windowed)
+        
+        self.assertEqual(detector._get_flask_capture_area(),
+                         {'left': 200, 'top': 760, 'width': 250, 'height': 80})
+        self.assertEqual(selector.saved_references, [windowed])
+        
+        # 保存した基準から、フルスクリーンへの切り替えに追従する
+        self.client = {'left': 0, 'top': 0, 'width': 1920, 'height': 1080}
+        self.assertEqual(detector._get_flask_capture_area(),
+                         {'left': 150, 'top': 945, 'width': 375, 'height': 120})
+        self.assertEqual(len(selector.saved_references), 1)
+
+
 def run_performance_test():
     """パフォーマンステスト"""
     if not DEPENDENCIES_AVAILABLE:
@@ -0,0 +1,114 @@
+"""
+入力ディスパッチャーのテストスクリプト
+"""
+import sys
+import os
+import time
+import threading
+import unittest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.input_dispatcher import InputDispatcher, PRIORITY_HIGH, PRIORITY_LOW
+
+
+class FakeKeyboard:
+    """押下順と同時実行数を記録するキーボード"""
+
+    def __init__(self, hold=0.02):
+        self.hold = hold
+        self.pressed = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def press_key(self, key):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        key_down_ns = time.monotonic_ns()
+        time.sleep(self.hold)
+        with self.lock:
+            self.pressed.append(key)
+            self.active -= 1
+        return key_down_ns
+
+
+class TestInputDispatcher(unittest.TestCase):
+    """InputDispatcher のテストクラス"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.keyboard = FakeKeyboard()
+        self.dispatcher = InputDispatcher(keyboard=self.keyboard)
+
+    def tearDown(self):
+        self.dispatcher.stop()
+
+    def test_submit_does_not_block(self):
+        """submitは押下完了を待たずに戻り、押下は1つずつ実行されること"""
+        start = time.monotonic()
+        for key in ('1', '2', '3'):
+            self.dispatcher.submit(key)
+        self.assertLess(time.monotonic() - start, 0.01)
+
+        time.sleep(0.15)
+        self.assertEqual(self.keyboard.pressed, ['1', '2', '3'])
+        self.assertEqual(self.keyboard.max_active, 1)
+
+    def test_pending_key_deduplicated(self):
+        """未実行の同じキーの要求は1つにまとめられること"""
+        self.dispatcher.submit('1')
+        for _ in range(3):
+            self.dispatcher.submit('2')
+        time.sleep(0.12)
+
+        self.assertEqual(self.keyboard.pressed.count('2'), 1)
+        self.assertEqual(self.dispatcher.get_stats()['deduplicated'], 2)
+
+    def test_burst_deduplicates_individual_keys(self):
+        """待機中の連続押下に含まれるキーは、単発・別の連続押下の要求でも重複して押下しないこと"""
+        def press_burst(keys):
+            return [self.keyboard.press_key(key) for key in keys]
+
+        done = []
+        self.dispatcher.submit('busy')
+        time.sleep(0.005)
+        self.dispatcher.submit_burst(['1', '2'], press_burst=press_burst)
+        self.dispatcher.submit('1')
+        self.dispatcher.submit_burst(['2', '3'], press_burst=press_burst, on_done=done.append)
+        self.assertEqual(self.dispatcher.get_queue_depth(), 2)
+        time.sleep(0.15)
+
+        self.assertEqual(self.keyboard.pressed, ['busy', '1', '2', '3'])
+        # 押下しなかったキーの押下時刻はNone（元のキー順）
+        self.assertIsNone(done[0][0])
+        self.assertIsInstance(done[0][1], int)
+        self.assertEqual(self.dispatcher.get_stats()['deduplicated'], 2)
+
+    def test_priority_order(self):
+        """待機中の要求は優先度順に実行されること"""
+        self.dispatcher.submit('busy')
+        time.sleep(0.005)
+        self.dispatcher.submit('skill', PRIORITY_LOW)
+        self.dispatcher.submit('tincture', PRIORITY_HIGH)
+        time.sleep(0.12)
+
+        self.assertEqual(self.keyboard.pressed, ['busy', 'tincture', 'skill'])
+
+    def test_latency_stats_and_completion(self):
+        """キュー待ち・実行時間が記録され、完了通知に押下時刻が渡されること"""
+        done = []
+        self.dispatcher.submit('1', on_done=done.append)
+        time.sleep(0.06)
+
+        stats = self.dispatcher.get_stats()
+        self.assertEqual(stats['executed'], 1)
+        self.assertGreaterEqual(stats['avg_exec_ms'], 15.0)
+        self.assertEqual(len(done), 1)
+        self.assertIsInstance(done[0], int)
+
+
+if __name__ == '__main__':
+    unittest.main()
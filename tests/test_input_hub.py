@@ -0,0 +1,98 @@
+"""
+グローバル入力ハブのテストスクリプト
+"""
+import sys
+import os
+import unittest
+from unittest.mock import Mock
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.input_hub import InputHub
+
+
+class FakeKey:
+    """pynputのキーの代わり"""
+
+    def __init__(self, char=None, name=None, vk=None):
+        self.char = char
+        self.name = name
+        self.vk = vk
+
+
+class FakeButton:
+    """pynputのマウスボタンの代わり"""
+
+    def __init__(self, name):
+        self.name = name
+
+
+class TestInputHub(unittest.TestCase):
+    """InputHub のテストクラス"""
+
+    def setUp(self):
+        """テストの準備（フックは起動せず、フックのコールバックを直接呼ぶ）"""
+        self.hub = InputHub(auto_start=False)
+        self.calls = []
+
+    def handler(self, tag):
+        return lambda name: self.calls.append((tag, name))
+
+    def test_dispatch_by_key_and_modifiers(self):
+        """キー名で振り分け、修飾キー付きの登録が単独の登録より優先されること"""
+        self.hub.register_key('f12', self.handler('emergency'), modifiers=('ctrl', 'shift'))
+        self.hub.register_key('F12', self.handler('toggle'))
+        self.hub.register_key('f11', self.handler('toggle'))
+
+        self.hub._on_press(FakeKey(name='f12'))
+        self.hub._on_press(FakeKey(vk=122))  # 名前を持たないF11
+        self.hub._on_press(FakeKey(char='a'))
+
+        self.hub._on_press(FakeKey(name='ctrl_l'))
+        self.hub._on_press(FakeKey(name='shift_r'))
+        self.hub._on_press(FakeKey(name='f12'))
+        self.hub._on_release(FakeKey(name='ctrl_l'))
+        self.hub._on_press(FakeKey(name='f12'))
+
+        self.assertEqual(self.calls, [('toggle', 'f12'), ('toggle', 'f11'), ('emergency', 'f12'), ('toggle', 'f12')])
+        self.assertEqual(self.hub.get_status()['key_events'], 7)
+
+    def test_unregister_and_mouse(self):
+        """マウスボタンの振り分けと、解除後は呼ばれないこと・例外が他の入力に影響しないこと"""
+        left = self.hub.register_button('left', self.handler('grace'))
+        self.hub.register_key('q', self.handler('grace'))
+        self.hub.register_key('q', lambda name: 1 / 0, label='broken')
+
+        self.hub._on_click(0, 0, FakeButton('left'), True)
+        self.hub._on_click(0, 0, FakeButton('left'), False)
+        self.hub._on_click(0, 0, FakeButton('right'), True)
+        self.hub._on_press(FakeKey(char='Q'))
+        self.assertTrue(self.hub.unregister(left))
+        self.assertFalse(self.hub.unregister(left))
+        self.hub._on_click(0, 0, FakeButton('left'), True)
+
+        self.assertEqual(self.calls, [('grace', 'left'), ('grace', 'q')])
+        self.assertEqual(self.hub.get_status()['handler_errors'], 1)
+
+    def test_mouse_hook_stops_without_mouse_bindings(self):
+        """マウスの登録が全て解除されたらマウスフックを停止し、キーボードフックは残すこと"""
+        self.hub.keyboard_listener = keyboard_listener = Mock(running=True)
+        self.hub.mouse_listener = mouse_listener = Mock(running=True)
+        left = self.hub.register_button('left', self.handler('grace'))
+        right = self.hub.register_button('right', self.handler('grace'))
+        key = self.hub.register_key('q', self.handler('grace'))
+
+        self.hub.unregister(left)
+        self.hub.unregister(key)
+        mouse_listener.stop.assert_not_called()
+
+        self.hub.unregister(right)
+        mouse_listener.stop.assert_called_once()
+        keyboard_listener.stop.assert_not_called()
+        self.assertIsNone(self.hub.mouse_listener)
+        self.assertIs(self.hub.keyboard_listener, keyboard_listener)
+
+
+if __name__ == '__main__':
+    unittest.main()
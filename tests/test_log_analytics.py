@@ -0,0 +1,102 @@
+"""
+セッション分析のテストスクリプト
+"""
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.log_analytics import SessionAnalytics, index_log
+
+START = datetime(2025, 7, 5, 6, 0, 0)
+
+
+class TestSessionAnalytics(unittest.TestCase):
+    """SessionAnalytics のテストクラス"""
+
+    def test_streaming_aggregates(self):
+        """町/戦闘時間・周回数・マクロ稼働率が区間ごとに集計されること"""
+        analytics = SessionAnalytics(max_segment_seconds=1800)
+        visits = [(0, 'Celestial Hideout'), (60, 'Strand'), (360, 'Celestial Hideout'),
+                  (420, 'Strand'), (480, 'Celestial Hideout'), (540, 'Dunes'), (4140, 'Celestial Hideout')]
+        for offset, area in visits:
+            analytics.record_area(START + timedelta(seconds=offset), area)
+        analytics.record_macro_state(True, START + timedelta(seconds=60))
+        analytics.record_macro_state(False, START + timedelta(seconds=360))
+
+        summary = analytics.get_summary(now=START + timedelta(seconds=4140))
+
+        self.assertEqual(summary['town_seconds'], 180)
+        # Dunes の滞在 3600 秒のうち 1800 秒を超えた分は離席扱い
+        self.assertEqual(summary['combat_seconds'], 300 + 60 + 1800)
+        self.assertEqual(summary['idle_seconds'], 1800)
+        # 短時間で同じマップに戻った場合は同じ周回
+        self.assertEqual(summary['map_runs'], 2)
+        self.assertAlmostEqual(summary['macro_duty_cycle'], 300 / (180 + 2160))
+        self.assertEqual(summary['top_areas'][0]['area'], 'Dunes')
+
+    def test_area_table_is_bounded(self):
+        """エリア別集計が上限件数を超えないこと"""
+        analytics = SessionAnalytics(max_areas=5)
+        for i in range(50):
+            analytics.record_area(START + timedelta(seconds=i), f'Area {i}')
+        self.assertEqual(len(analytics.areas), 6)
+        self.assertEqual(analytics.areas['(other)'][1], 45)
+
+    def test_summary_while_feeding_from_other_threads(self):
+        """他スレッドでエリア・マクロ状態を記録中でも集計を取得できること"""
+        analytics = SessionAnalytics()
+        errors = []
+
+        def record():
+            for i in range(3000):
+                analytics.record_area(START + timedelta(seconds=i), f'Area {i}')
+                analytics.record_macro_state(i % 2 == 0, START + timedelta(seconds=i))
+
+        # スレッド切り替えを頻繁にして競合を起こしやすくする
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            writer = threading.Thread(target=record)
+            writer.start()
+            while writer.is_alive():
+                try:
+                    analytics.get_summary(now=START)
+                except RuntimeError as e:
+                    errors.append(e)
+            writer.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(analytics.get_summary()['area_changes'], 3000)
+
+    def test_batch_index_matches_streaming(self):
+        """チャンク分割したバッチ集計が行単位の集計と一致すること"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, 'Client.txt')
+            expected = SessionAnalytics()
+            with open(path, 'w', encoding='utf-8') as f:
+                for i in range(300):
+                    timestamp = START + timedelta(seconds=i * 37)
+                    area = 'My Hideout' if i % 2 else f'Map {i % 7}'
+                    f.write(f'{timestamp:%Y/%m/%d %H:%M:%S} 1000 cff945b9 [INFO Client 1] #Exile: spam {i}\n')
+                    f.write(f'{timestamp:%Y/%m/%d %H:%M:%S} 1000 cff945b9 [INFO Client 1] : You have entered {area}.\n')
+                    expected.record_area(timestamp, area)
+
+            analytics = index_log(path, chunk_size=1000)
+            now = expected.current_since
+            self.assertEqual(analytics.get_summary(now=now), expected.get_summary(now=now))
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+ログイベントバスのテストスクリプト
+"""
+import sys
+import os
+import threading
+import unittest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.log_event_bus import LogEventBus
+from src.utils.log_parser import LogLineParser, EVENT_AREA_ENTER, EVENT_SLAIN
+
+HEADER = '2025/07/05 06:07:24 113538687 cff945b9 [INFO Client 14940]'
+
+
+class TestLogEventBus(unittest.TestCase):
+    """LogEventBus のテストクラス"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.bus = LogEventBus()
+        data = '\n'.join([
+            f'{HEADER} : You have entered The Coast.',
+            f'{HEADER} : Alice has been slain.',
+            f'{HEADER} : Bob has been slain.',
+            f'{HEADER} : Alice (Witch) is now level 12',
+        ]).encode('utf-8') + b'\n'
+        self.events = LogLineParser().parse_batch(data)
+
+    def tearDown(self):
+        self.bus.stop()
+
+    def test_routes_by_type_and_filter(self):
+        """種別とフィルターに一致するイベントだけが配信スレッドから届くこと"""
+        received = {'areas': [], 'alice_deaths': [], 'all': []}
+        threads = set()
+        done = threading.Event()
+
+        def on_all(event):
+            received['all'].append(event.type)
+            threads.add(threading.current_thread().name)
+            if len(received['all']) == len(self.events):
+                done.set()
+
+        self.bus.subscribe(lambda e: received['areas'].append(e.payload['area']), (EVENT_AREA_ENTER,))
+        self.bus.subscribe(lambda e: received['alice_deaths'].append(e), (EVENT_SLAIN,),
+                           predicate=lambda e: e.payload['character'] == 'Alice')
+        self.bus.subscribe(on_all)
+
+        self.bus.publish_batch(self.events)
+        self.assertTrue(done.wait(2.0))
+
+        self.assertEqual(received['areas'], ['The Coast'])
+        self.assertEqual(len(received['alice_deaths']), 1)
+        self.assertEqual(len(received['all']), 4)
+        self.assertEqual(threads, {'LogEventBus'})
+
+    def test_unsubscribed_types_are_not_queued(self):
+        """購読者のいない種別は配信キューに積まれず、例外を出す購読者は他に影響しないこと"""
+        delivered = []
+
+        def failing(event):
+            raise RuntimeError("subscriber failure")
+
+        failing_id = self.bus.subscribe(failing, (EVENT_SLAIN,))
+        self.bus.subscribe(delivered.append, (EVENT_SLAIN,))
+        for event in self.events:
+            self.bus.dispatch(event)
+
+        self.assertEqual(len(delivered), 2)
+        self.assertEqual(self.bus.stats['handler_errors'], 2)
+
+        self.assertTrue(self.bus.unsubscribe(failing_id))
+        self.bus.publish_batch([e for e in self.events if e.type == EVENT_AREA_ENTER])
+        self.assertEqual(self.bus.stats['unrouted'], 1)
+        self.assertEqual(self.bus.get_stats()['queue_depth'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+ログ監視（起動時のエリア復元とマクロの自動制御）のテストスクリプト
+"""
+import sys
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.modules.log_monitor import LogMonitor
+from src.utils.log_event_bus import LogEventBus
+from src.utils.log_parser import LogLineParser
+
+try:
+    from src.core.macro_controller import MacroController
+    CONTROLLER_DEPENDENCIES_AVAILABLE = True
+except ImportError as e:
+    print(f"依存関係が不足しています: {e}")
+    CONTROLLER_DEPENDENCIES_AVAILABLE = False
+
+HEADER = '2025/07/05 06:07:24 113538687 cff945b9 [INFO Client 14940]'
+
+
+class TestLogMonitorRecovery(unittest.TestCase):
+    """LogMonitor の起動時エリア復元のテストクラス"""
+
+    def setUp(self):
+        """テストの準備（一時的なClient.txtと専用のイベントバスを使用）"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'Client.txt')
+        self.bus = LogEventBus()
+        self.controller = Mock(running=False)
+        self.controller.start.side_effect = lambda: setattr(self.controller, 'running', True)
+        self.monitor = None
+
+    def tearDown(self):
+        if self.monitor:
+            self.monitor.stop()
+        self.bus.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, *areas, mode='a'):
+        with open(self.path, mode, encoding='utf-8') as f:
+            for area in areas:
+                f.write(f'{HEADER} : You have entered {area}.\n')
+
+    def _start_monitor(self):
+        config = {'enabled': True, 'log_path': self.path, 'check_interval': 0.05, 'min_check_interval': 0.01}
+        self.monitor = LogMonitor(config, macro_controller=self.controller, event_bus=self.bus)
+        self.monitor.start()
+
+    def _wait_for(self, condition, timeout=2.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if condition():
+                return True
+            time.sleep(0.01)
+        return condition()
+
+    def test_recovered_hideout_then_map_starts_macro(self):
+        """隠れ家を復元した後のマップ入場でマクロが開始されること"""
+        self._write("My Hideout", mode='w')
+        self._start_monitor()
+
+        self.assertFalse(self.monitor.in_area)
+        self.assertEqual(self.monitor.stats['recovered_area'], "My Hideout")
+        self.controller.start.assert_not_called()
+
+        self._write("Crimson Temple")
+        self.assertTrue(self._wait_for(lambda: self.controller.start.call_count == 1))
+        self.assertTrue(self.monitor.in_area)
+        self.assertEqual(self.monitor.current_area, "Crimson Temple")
+
+    def test_recovered_combat_area_activates_macro(self):
+        """戦闘エリアを復元した場合は通常の入場処理でマクロが開始されること"""
+        self._write("My Hideout", "Crimson Temple", mode='w')
+        self._start_monitor()
+
+        self.assertTrue(self.monitor.in_area)
+        self.assertEqual(self.monitor.current_area, "Crimson Temple")
+        self.assertEqual(self.controller.start.call_count, 1)
+        self.assertEqual(self.monitor.stats['areas_entered'], 1)
+
+
+class TestLogEventSubscriptions(unittest.TestCase):
+    """ログイベントバスの購読の登録・解除のテストクラス"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'Client.txt')
+        open(self.path, 'w').close()
+        self.bus = LogEventBus()
+
+    def tearDown(self):
+        self.bus.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def _subscribers(self):
+        return sorted(name.split(':', 1)[1] for name in self.bus.get_stats()['subscribers'])
+
+    def test_monitor_stop_releases_subscriptions(self):
+        """stop() で購読を解除し、再開・再作成しても重複しないこと"""
+        config = {'enabled': True, 'log_path': self.path, 'startup_recovery': False}
+        monitor = LogMonitor(config, event_bus=self.bus)
+        monitor.start()
+        monitor.start()
+        self.assertEqual(self._subscribers(), ['LogMonitor', 'SessionAnalytics'])
+
+        monitor.stop()
+        self.assertEqual(self._subscribers(), [])
+
+        monitor.start()
+        monitor.stop()
+        LogMonitor(config, event_bus=self.bus)
+        self.assertEqual(self._subscribers(), ['LogMonitor', 'SessionAnalytics'])
+
+    @unittest.skipIf(not CONTROLLER_DEPENDENCIES_AVAILABLE, "Required dependencies not available")
+    def test_controller_resubscribes_on_config_change(self):
+        """死亡時停止の設定変更で購読を置き換え、解除後は購読が残らないこと"""
+        controller = MacroController.__new__(MacroController)
+        controller.log_monitor = LogMonitor({'log_path': self.path}, event_bus=self.bus)
+        controller._log_subscriptions = []
+        controller._applied_configs = {}
+        controller._on_log_stop_event = Mock()
+
+        controller._subscribe_log_events({'stop_on_death': True, 'character_name': 'Alice'})
+        controller._subscribe_log_events({'stop_on_death': True, 'character_name': 'Bob'})
+        self.assertEqual(self._subscribers().count('MacroController.stop_on_death'), 1)
+        # 切断時停止は明示的に有効化しない限り購読しない
+        self.assertNotIn('MacroController.stop_on_disconnect', self._subscribers())
+
+        for name in ('Alice', 'Bob'):
+            self.bus.dispatch(LogLineParser().parse_line(f'{HEADER} : {name} has been slain.'))
+        self.assertEqual(controller._on_log_stop_event.call_count, 1)
+        self.assertEqual(controller._applied_configs['log_monitor']['character_name'], 'Bob')
+
+        controller._unsubscribe_log_events()
+        controller.log_monitor.stop()
+        self.assertEqual(self._subscribers(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
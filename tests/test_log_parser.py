@@ -0,0 +1,97 @@
+"""
+Client.txt 解析のテストスクリプト
+"""
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.log_parser import LogLineParser, EVENT_AREA_ENTER, EVENT_AREA_EXIT
+
+HEADER = '2025/07/05 06:07:24 113538687 cff945b9 [INFO Client 14940]'
+
+
+class TestLogLineParser(unittest.TestCase):
+    """LogLineParser のテストクラス"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.parser = LogLineParser()
+
+    def test_batch_extracts_structured_events(self):
+        """バッチ内の対象行だけが出現順に構造化イベントになること"""
+        data = '\n'.join([
+            f'{HEADER} #Exile: WTB divine',
+            f'{HEADER} : You have entered The Coast.',
+            f'{HEADER} [SHADER] Delay: ON',
+            f'{HEADER} : You have left The Coast.',
+            f'{HEADER} : You have entered Karui Shore.',
+        ]).encode('utf-8') + b'\r\n'
+
+        events = self.parser.parse_batch(data)
+
+        self.assertEqual([e.type for e in events], [EVENT_AREA_ENTER, EVENT_AREA_EXIT, EVENT_AREA_ENTER])
+        self.assertEqual([e.payload['area'] for e in events], ['The Coast', 'The Coast', 'Karui Shore'])
+        first = events[0]
+        self.assertEqual(first.timestamp.year, 2025)
+        self.assertEqual(first.uptime_ms, 113538687)
+        self.assertEqual(first.client_id, 14940)
+        self.assertEqual(first.level, 'INFO')
+
+    def test_chat_messages_are_ignored(self):
+        """チャットで同じ文言を送っても対象外になること"""
+        lines = [
+            f'{HEADER} #Exile: You have entered The Coast.',
+            f'{HEADER} @From Someone: You have entered my hideout.',
+            'You have entered The Coast.',
+        ]
+        self.assertEqual(self.parser.parse_batch('\n'.join(lines).encode('utf-8')), [])
+        for line in lines:
+            self.assertIsNone(self.parser.parse_line(line))
+        self.assertEqual(self.parser.parse_line(f'{HEADER} : You have entered Strand Map.').payload['area'],
+                         'Strand Map')
+
+
+class TestFindLast(unittest.TestCase):
+    """LogLineParser.find_last のテストクラス"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'Client.txt')
+        self.parser = LogLineParser()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, lines):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def test_finds_latest_area_across_blocks(self):
+        """小さいブロックで後方走査しても最新の入場行を見つけること"""
+        spam = [f'{HEADER} #Exile: message {i}' for i in range(200)]
+        self._write([f'{HEADER} : You have entered The Coast.'] + spam
+                    + [f'{HEADER} : You have entered Strand Map.'] + spam)
+
+        event = self.parser.find_last(self.path, (EVENT_AREA_ENTER,), block_size=64)
+
+        self.assertEqual(event.payload['area'], 'Strand Map')
+        self.assertIsNone(self.parser.find_last(self.path, (EVENT_AREA_ENTER,), max_scan_bytes=1024))
+
+    def test_stops_at_session_start(self):
+        """最新のセッションに入場行が無い場合はNoneを返すこと"""
+        self._write([
+            f'{HEADER} : You have entered The Coast.',
+            '2025/07/05 07:00:00 ***** LOG FILE OPENING *****',
+            f'{HEADER} [SHADER] Delay: ON',
+        ])
+        self.assertIsNone(self.parser.find_last(self.path, block_size=32))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+ログファイル追従のテストスクリプト
+"""
+import sys
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.log_tailer import LogTailer
+
+
+class TestLogTailer(unittest.TestCase):
+    """LogTailer のテストクラス"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'Client.txt')
+        self._write(b'old line\n', 'wb')
+        self.tailer = LogTailer(self.path, min_interval=0.01, max_interval=0.2)
+        self.assertTrue(self.tailer.open(from_end=True))
+
+    def tearDown(self):
+        self.tailer.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, data, mode='ab', path=None):
+        with open(path or self.path, mode) as f:
+            f.write(data)
+
+    def test_partial_lines_are_held_back(self):
+        """末尾から追従し、書きかけの行は改行が来るまで返さないこと"""
+        self.assertEqual(self.tailer.read(), b'')
+        self._write(b'first\nsec')
+        self.assertEqual(self.tailer.read(), b'first\n')
+        self._write(b'ond\n')
+        self.assertEqual(self.tailer.read(), b'second\n')
+
+    def test_truncation_and_rotation(self):
+        """切り詰め・置き換え後は新しい内容を先頭から読むこと"""
+        self._write(b'a long line before truncation\n')
+        self.tailer.read()
+
+        self._write(b'new\n', 'wb')
+        self.assertEqual(self.tailer.read(), b'')
+        self.assertTrue(self.tailer.check_rotation())
+        self.assertEqual(self.tailer.read(), b'new\n')
+
+        rotated = os.path.join(self.temp_dir, 'Client.new')
+        self._write(b'rotated\n', 'wb', rotated)
+        os.replace(rotated, self.path)
+        self.assertTrue(self.tailer.check_rotation())
+        self.assertEqual(self.tailer.read(), b'rotated\n')
+        self.assertEqual(self.tailer.stats['truncations'], 1)
+        self.assertEqual(self.tailer.stats['rotations'], 1)
+
+    def test_wait_wakes_on_append(self):
+        """追記されると最長間隔を待たずに読み取れること"""
+        self.tailer.interval = self.tailer.max_interval
+        timer = threading.Timer(0.05, self._write, args=(b'entered\n',))
+        timer.start()
+
+        start = time.monotonic()
+        data = b''
+        while not data and time.monotonic() - start < 2.0:
+            self.tailer.wait(had_data=False)
+            data = self.tailer.read()
+        timer.join()
+
+        self.assertEqual(data, b'entered\n')
+        self.assertLess(time.monotonic() - start, 0.05 + self.tailer.max_interval)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+マクロ統合制御（MacroController）のテストスクリプト
+"""
+import sys
+import os
+import unittest
+from unittest.mock import Mock, patch
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.scheduler import DeadlineScheduler
+
+try:
+    from src.core.macro_controller import MacroController
+    from src.modules.skill_module import SkillModule
+    DEPENDENCIES_AVAILABLE = True
+except ImportError as e:
+    print(f"依存関係が不足しています: {e}")
+    DEPENDENCIES_AVAILABLE = False
+
+
+@unittest.skipIf(not DEPENDENCIES_AVAILABLE, "Required dependencies not available")
+class TestMacroControllerStatus(unittest.TestCase):
+    """MacroController.get_status のテストクラス"""
+
+    def setUp(self):
+        """テストの準備（スキルモジュールは専用のスケジューラー、他のモジュールはモック）"""
+        self.scheduler = DeadlineScheduler()
+        with patch('src.modules.skill_module.KeyboardController'):
+            skill_module = SkillModule({
+                'enabled': True,
+                'berserk': {'enabled': True, 'key': 'e', 'interval': [30.0, 30.0]},
+                'molten_shell': {'enabled': True, 'key': 'r', 'interval': [30.0, 30.0]}
+            })
+        skill_module.scheduler = self.scheduler
+        skill_module.dispatcher = Mock()
+
+        self.controller = MacroController.__new__(MacroController)
+        self.controller.running = True
+        self.controller.waiting_for_input = False
+        self.controller.grace_period_enabled = False
+        self.controller.emergency_stop = False
+        self.controller.flask_module = Mock(get_status=Mock(return_value={'running': True}))
+        self.controller.skill_module = skill_module
+        self.controller.tincture_module = Mock(running=True, get_stats=Mock(return_value={'total_uses': 3}))
+
+    def tearDown(self):
+        self.controller.skill_module.stop()
+        self.scheduler.shutdown()
+
+    def test_status_reports_module_state(self):
+        """各モジュールの状態を取得でき、スキルはスケジューラーのジョブ数を返すこと"""
+        self.controller.skill_module.start()
+
+        with self.assertNoLogs('src.core.macro_controller', level='ERROR'):
+            status = self.controller.get_status()
+
+        self.assertTrue(status['running'])
+        self.assertEqual(status['flask'], {'running': True})
+        self.assertEqual(status['skill']['threads'], 2)
+        self.assertTrue(status['skill']['running'])
+        self.assertEqual(status['tincture']['current_state'], 'RUNNING')
+        self.assertEqual(status['tincture']['stats'], {'total_uses': 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
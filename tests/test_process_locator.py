@@ -0,0 +1,63 @@
+"""
+プロセス検索のテストスクリプト
+"""
+import sys
+import os
+import subprocess
+import time
+import unittest
+from unittest import mock
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import psutil
+
+from src.utils.process_locator import ProcessLocator
+
+
+class TestProcessLocator(unittest.TestCase):
+    """ProcessLocator のテストクラス"""
+
+    def setUp(self):
+        """テストの準備（sleep プロセスをゲームの代わりに使う）"""
+        self.child = subprocess.Popen(['sleep', '30'])
+        self.locator = ProcessLocator(name_patterns=('sleep',), exe_patterns=())
+
+    def tearDown(self):
+        self.locator.stop_watcher()
+        if self.child.poll() is None:
+            self.child.kill()
+        self.child.wait()
+
+    def test_cached_pid(self):
+        """2回目以降は全プロセスを走査せず、終了したプロセスは返さないこと"""
+        process = self.locator.locate()
+        self.assertIsNotNone(process)
+
+        with mock.patch('psutil.process_iter', wraps=psutil.process_iter) as process_iter:
+            for _ in range(10):
+                self.assertEqual(self.locator.locate().pid, process.pid)
+            process_iter.assert_not_called()
+        self.assertEqual(self.locator.get_stats()['cache_hits'], 10)
+
+        if process.pid == self.child.pid:
+            self.child.kill()
+            self.child.wait()
+            found = self.locator.locate()
+            self.assertTrue(found is None or found.pid != process.pid)
+            self.assertEqual(self.locator.get_stats()['scans'], 2)
+
+    def test_watcher(self):
+        """バックグラウンド監視でキャッシュが温まること"""
+        self.locator.start_watcher(interval=0.05)
+        for _ in range(100):
+            if self.locator.get_stats()['pid'] is not None:
+                break
+            time.sleep(0.01)
+        self.assertTrue(self.locator.get_stats()['watching'])
+        self.assertIsNotNone(self.locator.get_stats()['pid'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+デッドラインスケジューラーのテストスクリプト
+"""
+import sys
+import os
+import time
+import threading
+import unittest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.scheduler import DeadlineScheduler
+
+
+class TestDeadlineScheduler(unittest.TestCase):
+    """DeadlineScheduler のテストクラス"""
+
+    def setUp(self):
+        """テストの準備"""
+        self.scheduler = DeadlineScheduler()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def _record(self, name):
+        """呼び出し時刻を記録するコールバックを作成"""
+        def callback():
+            with self.lock:
+                self.calls.append((name, time.monotonic()))
+        return callback
+
+    def test_jobs_run_in_deadline_order(self):
+        """複数ジョブが1スレッドで間隔どおりに実行されること"""
+        self.scheduler.add_job('fast', self._record('fast'), 0.05)
+        self.scheduler.add_job('slow', self._record('slow'), 0.12)
+        time.sleep(0.27)
+        self.scheduler.remove_job('fast')
+        self.scheduler.remove_job('slow')
+
+        names = [name for name, _ in self.calls]
+        self.assertGreaterEqual(names.count('fast'), 5)
+        self.assertEqual(names.count('slow'), 3)
+
+    def test_lateness_recorded(self):
+        """予定時刻からの遅れがジョブごとに記録されること"""
+        self.scheduler.add_job('job', self._record('job'), 0.02)
+        time.sleep(0.1)
+
+        stats = self.scheduler.get_stats()['jobs']['job']
+        self.assertGreater(stats['runs'], 0)
+        self.assertLess(stats['avg_lateness_ms'], 20.0)
+
+    def test_new_job_wakes_scheduler(self):
+        """長い待機中に追加されたジョブがすぐに実行されること"""
+        self.scheduler.add_job('idle', self._record('idle'), 10.0, first_delay=10.0)
+        time.sleep(0.02)
+
+        added = time.monotonic()
+        self.scheduler.add_job('urgent', self._record('urgent'), 10.0)
+        time.sleep(0.05)
+
+        urgent = [t for name, t in self.calls if name == 'urgent']
+        self.assertEqual(len(urgent), 1)
+        self.assertLess(urgent[0] - added, 0.02)
+
+    def test_callback_return_sets_next_delay(self):
+        """コールバックの戻り値が次回までの秒数として使われること"""
+        def callback():
+            self._record('dynamic')()
+            return 0.01
+        self.scheduler.add_job('dynamic', callback, 10.0)
+        time.sleep(0.08)
+
+        self.assertGreaterEqual(len(self.calls), 3)
+
+    def test_absolute_deadlines_do_not_drift(self):
+        """処理時間が間隔に加算されず、起動補正の分だけ早く起動すること"""
+        def slow_callback():
+            self._record('slow')()
+            time.sleep(0.02)
+        job = self.scheduler.add_job('slow', slow_callback, 0.05)
+        self.scheduler.set_lead('slow', 0.01)
+        time.sleep(0.33)
+        self.scheduler.remove_job('slow')
+
+        times = [t for _, t in self.calls]
+        self.assertGreaterEqual(len(times), 6)
+        # 2回目以降の平均間隔は処理時間（20ms）を含まない
+        self.assertLess((times[-1] - times[1]) / (len(times) - 2), 0.055)
+        self.assertEqual(job.stats['overruns'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
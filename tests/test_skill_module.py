@@ -0,0 +1,109 @@
+"""
+スキル自動使用モジュールの設定更新（変更のあったスキルだけの反映）のテストスクリプト
+"""
+import sys
+import os
+import copy
+import unittest
+from unittest.mock import Mock, patch
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.scheduler import DeadlineScheduler
+
+try:
+    from src.modules.skill_module import SkillModule
+    DEPENDENCIES_AVAILABLE = True
+except ImportError as e:
+    print(f"依存関係が不足しています: {e}")
+    DEPENDENCIES_AVAILABLE = False
+
+CONFIG = {
+    'enabled': True,
+    'berserk': {'enabled': True, 'key': 'e', 'interval': [30.0, 30.0]},
+    'molten_shell': {'enabled': True, 'key': 'r', 'interval': [40.0, 40.0]},
+    'order_to_me': {'enabled': False, 'key': 't', 'interval': [50.0, 50.0]}
+}
+
+
+@unittest.skipIf(not DEPENDENCIES_AVAILABLE, "Required dependencies not available")
+class TestSkillModuleUpdateConfig(unittest.TestCase):
+    """SkillModule.update_config のテストクラス"""
+
+    def setUp(self):
+        """テストの準備（専用のスケジューラー、キー入力はモック）"""
+        self.scheduler = DeadlineScheduler()
+        with patch('src.modules.skill_module.KeyboardController'):
+            self.module = SkillModule(copy.deepcopy(CONFIG))
+        self.module.scheduler = self.scheduler
+        self.module.dispatcher = Mock()
+        self.module.start()
+
+    def tearDown(self):
+        self.module.stop()
+        self.scheduler.shutdown()
+
+    def _config(self, **skills):
+        config = copy.deepcopy(CONFIG)
+        for skill_name, values in skills.items():
+            config[skill_name].update(values)
+        return config
+
+    def _job(self, skill_name):
+        return self.scheduler._jobs[f"skill_{skill_name}"]
+
+    def _pressed_key(self, skill_name):
+        """ジョブを実行して要求されたキーを返す"""
+        self.module.dispatcher.submit.reset_mock()
+        self._job(skill_name).callback()
+        return self.module.dispatcher.submit.call_args.args[0]
+
+    def test_add_and_remove_skills(self):
+        """有効化したスキルだけを追加し、無効化したスキルだけを削除すること"""
+        self.assertEqual(sorted(self.module.jobs), ['skill_berserk', 'skill_molten_shell'])
+        berserk_job = self._job('berserk')
+
+        self.module.update_config(self._config(order_to_me={'enabled': True}, molten_shell={'enabled': False}))
+
+        self.assertEqual(sorted(self.module.jobs), ['skill_berserk', 'skill_order_to_me'])
+        self.assertFalse(self.scheduler.has_job('skill_molten_shell'))
+        # 変更のないスキルのジョブは作り直さない
+        self.assertIs(self._job('berserk'), berserk_job)
+
+    def test_interval_and_key_changes_keep_job(self):
+        """間隔・キーの変更はジョブを作り直さずに反映すること"""
+        job = self._job('berserk')
+        target_ns = self.scheduler.get_target_ns('skill_berserk')
+
+        self.module.update_config(self._config(berserk={'key': 'w', 'interval': [10.0, 10.0]}))
+
+        self.assertIs(self._job('berserk'), job)
+        self.assertEqual(job.get_interval(), 10.0)
+        self.assertEqual(self.scheduler.get_target_ns('skill_berserk'), target_ns)
+        self.assertEqual(self._pressed_key('berserk'), 'w')
+
+    def test_module_reenabled_while_running(self):
+        """マクロ稼働中にモジュールを無効化・再有効化した場合にジョブを削除・再登録すること"""
+        self.module.update_config(self._config() | {'enabled': False})
+        self.assertEqual(self.module.jobs, [])
+        self.assertFalse(self.scheduler.has_job('skill_berserk'))
+        self.assertTrue(self.module.running)
+
+        self.module.update_config(self._config())
+        self.assertEqual(sorted(self.module.jobs), ['skill_berserk', 'skill_molten_shell'])
+        self.assertEqual(self._pressed_key('molten_shell'), 'r')
+
+    def test_enabled_after_start_while_disabled(self):
+        """無効のまま開始した後に有効化された場合もジョブを登録すること"""
+        self.module.stop()
+        self.module.update_config(self._config() | {'enabled': False})
+        self.module.start()
+        self.assertEqual(self.module.jobs, [])
+
+        self.module.update_config(self._config())
+        self.assertEqual(sorted(self.module.jobs), ['skill_berserk', 'skill_molten_shell'])
+
+
+if __name__ == '__main__':
+    unittest.main()
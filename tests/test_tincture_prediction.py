@@ -0,0 +1,142 @@
+"""
+Tinctureのクールダウン進捗による予測ウェイクアップ・検出ワーカーのテスト
+"""
+import sys
+import os
+import time
+import threading
+import unittest
+from unittest.mock import patch
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.scheduler import DeadlineScheduler
+
+try:
+    from src.modules.tincture_module import TinctureModule
+    DEPENDENCIES_AVAILABLE = True
+except ImportError as e:
+    print(f"依存関係が不足しています: {e}")
+    DEPENDENCIES_AVAILABLE = False
+
+
+def cooldown(progress):
+    """クールダウン段階の検出結果"""
+    return {'state': "COOLDOWN", 'cooldown_progress': progress}
+
+
+@unittest.skipIf(not DEPENDENCIES_AVAILABLE, "Required dependencies not available")
+class TestCooldownPrediction(unittest.TestCase):
+    """TinctureModule のクールダウン予測のテストクラス"""
+
+    def setUp(self):
+        """テストの準備（検出器・キーボードはモック）"""
+        config = {
+            'enabled': True,
+            'key': '3',
+            'sensitivity': 0.7,
+            'check_interval': 0.1,
+            'wakeup_lead': 0.3,
+            'max_predictive_sleep': 2.0
+        }
+        with patch('src.modules.tincture_module.MultiTinctureDetector'), \
+                patch('src.modules.tincture_module.KeyboardController'):
+            self.module = TinctureModule(config)
+        self.slot = self.module.slot_states['tincture1']
+
+    def _observe(self, times_and_detections):
+        for now, detection in times_and_detections:
+            self.module._process_slot_detection('tincture1', detection, now)
+
+    def test_rate_estimation(self):
+        """通常間隔の観測から回復速度と使用可能時刻を推定すること"""
+        # 0.1秒間隔で観測、p030 -> p050 は 10.0〜10.1秒の間に切り替わった
+        self._observe([(10.0 - 0.1 * i, cooldown(0.3)) for i in range(5, -1, -1)])
+        self._observe([(10.1, cooldown(0.5))])
+
+        # 速め（0.2 / (10.0 - 9.5)）に見積もる
+        self.assertAlmostEqual(self.slot['cooldown_rate'], 0.4)
+        # 使用可能時刻は早め（p050に達した可能性のある最も早い時刻から）
+        self.assertAlmostEqual(self.slot['predicted_ready_time'], 10.0 + 0.5 / 0.4)
+
+    def test_sleep_length(self):
+        """予測スリープは使用可能時刻の wakeup_lead 秒前まで、上限は max_predictive_sleep"""
+        self.slot['predicted_ready_time'] = 11.0
+        delay, predictive = self.module._get_slot_check_delay(self.slot, 10.0)
+        self.assertTrue(predictive)
+        self.assertAlmostEqual(delay, 0.7)
+
+        self.slot['predicted_ready_time'] = 20.0
+        self.assertEqual(self.module._get_slot_check_delay(self.slot, 10.0), (2.0, True))
+
+        # 遷移直前は通常間隔でポーリング
+        self.slot['predicted_ready_time'] = 10.35
+        self.assertEqual(self.module._get_slot_check_delay(self.slot, 10.0), (0.1, False))
+
+    def test_late_observation_after_sleep_does_not_overshoot(self):
+        """予測スリープ明けの遅れた観測で回復速度を遅く見積もらず、予測が回復を追い越さないこと"""
+        # 実際の回復速度 0.4/s: p030=10.0, p050=10.5, p095=11.625, IDLE=11.75
+        self._observe([(10.0, cooldown(0.3)), (10.1, cooldown(0.3)), (10.5, cooldown(0.5))])
+        rate = self.slot['cooldown_rate']
+
+        # 2秒間のスリープ明けに p095 を初めて観測（実際の切り替わりは 11.625）
+        self._observe([(12.5, cooldown(0.95))])
+
+        self.assertEqual(self.slot['cooldown_rate'], rate)
+        self.assertLessEqual(self.slot['predicted_ready_time'], 11.75)
+
+    def test_marks_reset_on_idle(self):
+        """IDLE/ACTIVEを観測したら今回のサイクルの観測を破棄し、回復速度は保持すること"""
+        self._observe([(10.0, cooldown(0.3)), (10.1, cooldown(0.3)), (10.6, cooldown(0.5))])
+        rate = self.slot['cooldown_rate']
+        self.assertTrue(self.slot['cooldown_marks'])
+
+        self.module.running = True
+        with patch.object(self.module, '_use_tincture', return_value=True):
+            self._observe([(12.0, {'state': "IDLE"})])
+
+        self.assertEqual(self.slot['cooldown_marks'], {})
+        self.assertIsNone(self.slot['predicted_ready_time'])
+        self.assertEqual(self.slot['cooldown_rate'], rate)
+
+
+@unittest.skipIf(not DEPENDENCIES_AVAILABLE, "Required dependencies not available")
+class TestDetectionWorker(unittest.TestCase):
+    """検出ワーカー（スケジューラーのスレッドで検出しないこと）のテストクラス"""
+
+    def setUp(self):
+        """テストの準備（専用のスケジューラー、検出器・キーボードはモック）"""
+        self.scheduler = DeadlineScheduler()
+        with patch('src.modules.tincture_module.MultiTinctureDetector'), \
+                patch('src.modules.tincture_module.KeyboardController'):
+            self.module = TinctureModule({'enabled': True, 'key': '3', 'check_interval': 0.05})
+        self.module.scheduler = self.scheduler
+        self.detect_threads = []
+
+        def slow_detect_all():
+            self.detect_threads.append(threading.current_thread().name)
+            time.sleep(0.3)
+            return {}
+        self.module.multi_detector.detect_all.side_effect = slow_detect_all
+
+    def tearDown(self):
+        self.module.stop()
+        self.scheduler.shutdown()
+
+    def test_slow_detection_does_not_delay_other_jobs(self):
+        """検出に時間がかかっても同じスケジューラーの他のジョブが遅れないこと"""
+        fired = []
+        self.scheduler.add_job('probe', lambda: fired.append(time.monotonic()), 0.05)
+        self.module.start()
+        time.sleep(0.5)
+        self.module.stop()
+
+        self.assertTrue(self.detect_threads)
+        self.assertNotIn(self.scheduler.thread.name, self.detect_threads)
+        self.assertGreaterEqual(len(fired), 8)
+        self.assertLess(max(b - a for a, b in zip(fired, fired[1:])), 0.15)
+
+
+if __name__ == '__main__':
+    unittest.main()
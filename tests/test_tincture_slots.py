@@ -0,0 +1,195 @@
+"""
+複数Tinctureスロット（MultiTinctureDetector・スロット別状態・スロット設定の変換）のテスト
+"""
+import sys
+import os
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.features.multi_tincture_detector import MultiTinctureDetector
+
+try:
+    from src.modules.tincture_module import TinctureModule
+    from src.core.macro_controller import MacroController
+    MODULE_DEPENDENCIES_AVAILABLE = True
+except ImportError as e:
+    print(f"依存関係が不足しています: {e}")
+    MODULE_DEPENDENCIES_AVAILABLE = False
+
+
+class TestMultiTinctureDetector(unittest.TestCase):
+    """MultiTinctureDetector のテストクラス"""
+
+    def setUp(self):
+        """テストの準備（スロット2・4に同じテンプレートのTinctureを設定）"""
+        config = {
+            'tincture': {
+                'detection_mode': 'manual',
+                'detection_area': {'x': 0, 'y': 0, 'width': 500, 'height': 160}
+            }
+        }
+        slots = {
+            'tincture1': {'flask_slot': 'slot_2'},
+            'tincture2': {'flask_slot': 'slot_4'}
+        }
+        self.multi = MultiTinctureDetector(slots, sensitivity=0.7, area_selector=Mock(), config=config)
+        self.primary = self.multi.primary_detector
+        self.primary.last_capture_area = {'top': 0, 'left': 0, 'width': 500, 'height': 160}
+
+    def _frame(self, slot_num):
+        """指定スロット（幅100pxずつ）にIdleアイコンを配置したフレーム"""
+        template = self.primary.template_idle
+        frame = np.zeros((160, 500, 3), dtype=np.uint8)
+        left = (slot_num - 1) * 100 + 10
+        frame[10:10 + template.shape[0], left:left + template.shape[1]] = template
+        return frame
+
+    def test_single_capture_for_all_slots(self):
+        """全スロットを1回のキャプチャで判定すること"""
+        with patch.object(self.primary, '_capture_screen', return_value=self._frame(2)) as mock_capture:
+            detections = self.multi.detect_all()
+
+        self.assertEqual(mock_capture.call_count, 1)
+        self.assertEqual(set(detections), {'tincture1', 'tincture2'})
+        self.assertEqual(self.multi.stats['frames'], 1)
+
+    def test_slots_with_same_template_are_distinguished(self):
+        """同じテンプレートのスロットも、それぞれのスロット部分だけで判定すること"""
+        with patch.object(self.primary, '_capture_screen', return_value=self._frame(2)):
+            detections = self.multi.detect_all()
+
+        self.assertEqual(detections['tincture1']['state'], "IDLE")
+        self.assertEqual(detections['tincture1']['locations']['idle'], (110, 10))
+        self.assertEqual(detections['tincture2']['state'], "UNKNOWN")
+
+    def test_area_change_resets_all_slots(self):
+        """検出エリアが変わった場合は代表スロット以外のROIも破棄すること"""
+        secondary = self.multi.detectors['tincture2']
+        with patch.object(self.primary, '_capture_screen', return_value=self._frame(4)):
+            self.multi.detect_all()
+            self.multi.detect_all()
+            self.assertIsNotNone(secondary._roi_anchor)
+
+            self.primary.last_capture_area = {'top': 0, 'left': 40, 'width': 500, 'height': 160}
+            detections = self.multi.detect_all()
+
+        self.assertEqual(secondary._roi_area_key, (0, 40, 500, 160))
+        self.assertEqual(secondary.get_detection_stats()['roi_resets'], 1)
+        self.assertFalse(detections['tincture2']['reused'])
+
+    def test_capture_error(self):
+        """キャプチャに失敗した場合は全スロットがERRORとなること"""
+        with patch.object(self.primary, '_capture_screen', side_effect=RuntimeError("capture failed")):
+            detections = self.multi.detect_all()
+
+        self.assertEqual({d['state'] for d in detections.values()}, {"ERROR"})
+        self.assertEqual(self.multi.stats['capture_errors'], 1)
+
+
+@unittest.skipIf(not MODULE_DEPENDENCIES_AVAILABLE, "Required dependencies not available")
+class TestTinctureModuleSlots(unittest.TestCase):
+    """TinctureModule のスロット別状態のテストクラス"""
+
+    def setUp(self):
+        """テストの準備（検出器・キーボードはモック）"""
+        config = {
+            'enabled': True,
+            'key': '3',
+            'min_use_interval': 0.5,
+            'slots': {
+                'tincture1': {'flask_slot': 'slot_3', 'key': '3'},
+                'tincture2': {'flask_slot': 'slot_4', 'key': '4', 'min_use_interval': 2.0}
+            }
+        }
+        with patch('src.modules.tincture_module.MultiTinctureDetector'), \
+                patch('src.modules.tincture_module.KeyboardController'):
+            self.module = TinctureModule(config)
+        self.module.running = True
+
+    def _tick(self, states):
+        self.module.multi_detector.detect_all.return_value = {
+            name: {'state': state, 'cooldown_progress': None} for name, state in states.items()
+        }
+        with patch.object(self.module, '_use_tincture', return_value=True) as mock_use:
+            self.module._tincture_tick()
+        return [call.args[0] for call in mock_use.call_args_list]
+
+    def test_slot_configs(self):
+        """スロットごとのキー・最小使用間隔が設定されること"""
+        self.assertEqual(self.module.slot_configs['tincture1']['min_use_interval'], 0.5)
+        self.assertEqual(self.module.slot_configs['tincture2']['min_use_interval'], 2.0)
+        self.assertEqual(self.module.key, '3')
+
+    def test_each_slot_uses_its_own_key_and_state(self):
+        """IDLEのスロットだけがそのスロットのキーで使用され、状態はスロット別に保持されること"""
+        used = self._tick({'tincture1': "COOLDOWN", 'tincture2': "IDLE"})
+
+        self.assertEqual(used, ['4'])
+        self.assertEqual(self.module.slot_states['tincture1']['state'], "COOLDOWN")
+        self.assertEqual(self.module.slot_states['tincture2']['total_uses'], 1)
+        self.assertEqual(self.module.slot_states['tincture1']['total_uses'], 0)
+        # 使用直後のスロットはActiveになるまで再使用しない
+        self.assertEqual(self._tick({'tincture1': "IDLE", 'tincture2': "IDLE"}), ['3'])
+
+
+@unittest.skipIf(not MODULE_DEPENDENCIES_AVAILABLE, "Required dependencies not available")
+class TestConvertTinctureConfig(unittest.TestCase):
+    """MacroController._convert_tincture_config のテストクラス"""
+
+    def _convert(self, config, tincture_config=None):
+        controller = SimpleNamespace(config=config)
+        return MacroController._convert_tincture_config(controller, tincture_config)
+
+    def _config(self, experienced_herbalist):
+        return {
+            'tincture': {
+                'enabled': True,
+                'key': '3',
+                'experienced_herbalist': experienced_herbalist,
+                'tinctures': {
+                    'tincture1': {'folder_path': 'assets/images/tincture/a', 'threshold': 0.8},
+                    'tincture2': {'folder_path': '未選択'}
+                }
+            },
+            'flask_slots': {
+                'slot_5': {'key': '5', 'is_tincture': True},
+                'slot_1': {'key': '1', 'is_tincture': False},
+                'slot_2': {'key': '2', 'is_tincture': True}
+            }
+        }
+
+    def test_slots_in_slot_order(self):
+        """Tinctureスロットがスロット番号順に tincture1, tincture2 へ割り当てられること"""
+        converted = self._convert(self._config(experienced_herbalist=True))
+
+        self.assertEqual(converted['slots'], {
+            'tincture1': {'flask_slot': 'slot_2', 'key': '2',
+                          'folder_path': 'assets/images/tincture/a', 'threshold': 0.8},
+            'tincture2': {'flask_slot': 'slot_5', 'key': '5'}
+        })
+
+    def test_single_tincture_without_herbalist(self):
+        """Experienced Herbalistなしでは1スロットのみで、元の設定は変更されないこと"""
+        config = self._config(experienced_herbalist=False)
+        converted = self._convert(config)
+
+        self.assertEqual(list(converted['slots']), ['tincture1'])
+        self.assertNotIn('slots', config['tincture'])
+
+    def test_override_config(self):
+        """上書き設定を渡した場合は保持している設定ではなくそれを変換すること"""
+        config = self._config(experienced_herbalist=False)
+        converted = self._convert(config, {**config['tincture'], 'sensitivity': 0.9})
+
+        self.assertEqual(converted['sensitivity'], 0.9)
+        self.assertNotIn('sensitivity', config['tincture'])
+
+
+if __name__ == '__main__':
+    unittest.main()
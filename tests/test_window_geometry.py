@@ -0,0 +1,64 @@
+"""
+ウィンドウジオメトリ監視のテストスクリプト
+"""
+import sys
+import os
+import unittest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.window_geometry import WindowGeometryWatcher, rebase_area
+from src.utils.window_manager import WindowManager
+from src.utils.focus_tracker import StubFocusBackend
+
+
+class TestWindowGeometry(unittest.TestCase):
+    """WindowGeometryWatcher・rebase_area のテストクラス"""
+
+    def test_rebase_area(self):
+        """クライアント領域の移動・拡大に合わせて検出エリアが左下基準・高さの比率で変換されること"""
+        area = {'left': 245, 'top': 850, 'width': 400, 'height': 120}
+        fullscreen = {'left': 0, 'top': 0, 'width': 1920, 'height': 1080}
+
+        # 同じ大きさのウィンドウを移動
+        moved = rebase_area(area, fullscreen, {'left': 1920, 'top': 31, 'width': 1920, 'height': 1080})
+        self.assertEqual(moved, {'left': 2165, 'top': 881, 'width': 400, 'height': 120})
+
+        # 解像度の変更（1920x1080 → 2560x1440）
+        scaled = rebase_area(area, fullscreen, {'left': 0, 'top': 0, 'width': 2560, 'height': 1440})
+        self.assertEqual(scaled, {'left': 327, 'top': 1133, 'width': 533, 'height': 160})
+
+        # 横長への変更（1920x1080 → 2560x1080）: HUDは高さ基準のため左下からの位置・サイズは変わらない
+        widened = rebase_area(area, fullscreen, {'left': 0, 'top': 0, 'width': 2560, 'height': 1080})
+        self.assertEqual(widened, area)
+
+        # 高さだけの変更（1920x1080 → 1920x720）: 左端・下端を基準に高さの比率で縮小
+        shortened = rebase_area(area, fullscreen, {'left': 0, 'top': 0, 'width': 1920, 'height': 720})
+        self.assertEqual(shortened, {'left': 163, 'top': 567, 'width': 267, 'height': 80})
+
+    def test_watcher_generation(self):
+        """クライアント領域が変わった時だけ generation が進み、最小化中は直前の領域を返すこと"""
+        backend = StubFocusBackend({7: 'Path of Exile'})
+        backend.set_client_rect(7, (0, 0, 1920, 1080))
+        window_manager = WindowManager(focus_backend=backend)
+        watcher = WindowGeometryWatcher(window_manager.get_poe_client_rect, interval=0)
+
+        rect = watcher.current()
+        self.assertEqual(rect, {'left': 0, 'top': 0, 'width': 1920, 'height': 1080})
+        watcher.current()
+        self.assertEqual(watcher.generation, 1)
+
+        backend.set_client_rect(7, (100, 50, 1600, 900))
+        self.assertEqual(watcher.current()['left'], 100)
+        self.assertEqual(watcher.generation, 2)
+
+        # 最小化（0x0）
+        backend.set_client_rect(7, (-32000, -32000, 0, 0))
+        self.assertEqual(watcher.current()['left'], 100)
+        self.assertEqual(watcher.generation, 2)
+        self.assertEqual(watcher.get_stats()['unavailable'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()